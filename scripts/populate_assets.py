@@ -8,8 +8,9 @@ Automatically downloads and organizes free multimedia assets:
 
 Features:
 - Parallel downloads with rate limiting
-- Perceptual hashing for deduplication
-- Quality assessment using ML
+- Perceptual hashing for near-duplicate detection
+- Multi-frame fingerprints and quality metrics computed in a process pool
+- Local full-text library index, updated as each download finishes
 - Smart categorization with embeddings
 - Usage analytics tracking
 """
@@ -17,16 +18,22 @@ Features:
 import asyncio
 import aiohttp
 import aiofiles
-import hashlib
 import logging
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import json
 from dataclasses import dataclass, asdict
-import imagehash
-from PIL import Image
-import cv2
+import sys
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.services.asset_scraper.fingerprint import FingerprintError, VideoFingerprinter
+from src.services.asset_scraper.local_library import LocalLibraryScraper
+from src.services.video_assembler.asset_matcher import AssetMatcher, EmbeddingIndex
+from src.services.video_assembler.near_duplicates import PerceptualHashIndex
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -42,6 +49,7 @@ class Asset:
     filename: str
     file_path: str
     file_size: int
+    asset_id: Optional[str] = None  # Provider's id for the asset
     duration: Optional[float] = None
     resolution: Optional[str] = None
     quality_score: float = 0.0
@@ -56,6 +64,15 @@ class Asset:
             self.download_date = datetime.utcnow().isoformat()
 
 
+def _video_tags(video: Dict[str, Any]) -> List[str]:
+    """Tags of a Pexels video, plus the words of its page slug"""
+    tags = [str(t) for t in video.get("tags") or []]
+    # e.g. https://www.pexels.com/video/waves-crashing-on-rocks-856193/
+    slug = str(video.get("url") or "").rstrip("/").rsplit("/", 1)[-1]
+    words = [w for w in slug.split("-") if w and not w.isdigit()]
+    return tags + [w for w in words if w not in tags]
+
+
 # ===================================================================
 # Video Sources Configuration
 # ===================================================================
@@ -139,7 +156,8 @@ class AssetDownloader:
         self,
         base_dir: str = "./assets",
         max_concurrent: int = 5,
-        quality_threshold: float = 0.6
+        quality_threshold: float = 0.6,
+        duplicate_distance: int = 8
     ):
         """
         Initialize asset downloader
@@ -148,6 +166,7 @@ class AssetDownloader:
             base_dir: Base directory for storing assets
             max_concurrent: Maximum concurrent downloads
             quality_threshold: Minimum quality score (0.0 to 1.0)
+            duplicate_distance: Maximum pHash Hamming distance for a near-duplicate
         """
         self.base_dir = Path(base_dir)
         self.max_concurrent = max_concurrent
@@ -163,7 +182,20 @@ class AssetDownloader:
         
         # Asset tracking
         self.downloaded_assets: List[Asset] = []
-        self.asset_hashes: Dict[str, str] = {}  # hash -> filepath
+        # Persistent near-duplicate index: filepath -> pHash
+        self.asset_hashes = PerceptualHashIndex(
+            self.base_dir / "phash_index.npz",
+            max_distance=duplicate_distance
+        )
+        
+        # Hashing and quality checks run in worker processes
+        self.fingerprinter = VideoFingerprinter()
+        
+        # Searchable local library, searched before remote APIs
+        self.library = LocalLibraryScraper(self.base_dir / "asset_library.sqlite3")
+        
+        # Tag embeddings the assembler matches scene narration against
+        self.asset_matcher = AssetMatcher(EmbeddingIndex(self.base_dir / "asset_vectors.npz"))
         
         # Statistics
         self.stats = {
@@ -208,6 +240,8 @@ class AssetDownloader:
         
         # Execute in parallel
         await asyncio.gather(*tasks)
+        self.fingerprinter.close()
+        self.asset_matcher.index.save()
         
         # Save manifest
         await self.save_manifest()
@@ -296,7 +330,8 @@ class AssetDownloader:
                             video_url,
                             source_name,
                             category,
-                            video.get("id")
+                            video.get("id"),
+                            tags=_video_tags(video)
                         )
                 
                 # Rate limiting
@@ -311,7 +346,8 @@ class AssetDownloader:
         url: str,
         source: str,
         category: str,
-        video_id: Any
+        video_id: Any,
+        tags: Optional[List[str]] = None
     ):
         """Download a single video file"""
         try:
@@ -338,18 +374,26 @@ class AssetDownloader:
             # Get file info
             file_size = filepath.stat().st_size
             
-            # Calculate perceptual hash
-            perceptual_hash = self._calculate_video_hash(str(filepath))
+            # Fingerprint (pHash + quality) in a worker process
+            try:
+                fingerprint = await self.fingerprinter.fingerprint(filepath)
+            except FingerprintError as e:
+                logger.error(f"Unreadable video {filename}: {e}")
+                filepath.unlink()
+                self.stats["failed_downloads"] += 1
+                return
+            perceptual_hash = fingerprint.phash
             
             # Check for duplicates
-            if perceptual_hash in self.asset_hashes:
-                logger.info(f"Duplicate detected: {filename}")
+            duplicate = self.asset_hashes.find_duplicate(perceptual_hash)
+            if duplicate is not None:
+                logger.info(f"Duplicate detected: {filename} "
+                           f"(matches {duplicate[0]}, distance {duplicate[1]})")
                 filepath.unlink()  # Delete duplicate
                 self.stats["duplicates_skipped"] += 1
                 return
             
-            # Assess quality
-            quality_score = self._assess_video_quality(str(filepath))
+            quality_score = fingerprint.quality_score
             
             if quality_score < self.quality_threshold:
                 logger.info(f"Low quality video: {filename} (score: {quality_score:.2f})")
@@ -366,12 +410,21 @@ class AssetDownloader:
                 filename=filename,
                 file_path=str(filepath),
                 file_size=file_size,
+                asset_id=str(video_id),
+                duration=fingerprint.duration,
+                resolution=f"{fingerprint.width}x{fingerprint.height}",
                 quality_score=quality_score,
-                perceptual_hash=perceptual_hash
+                perceptual_hash=perceptual_hash,
+                tags=tags
             )
             
             self.downloaded_assets.append(asset)
-            self.asset_hashes[perceptual_hash] = str(filepath)
+            self.asset_hashes.add(str(filepath), perceptual_hash)
+            self.library.add_manifest_entries([asdict(asset)])
+            await self.asset_matcher.index_assets(
+                {filepath: " ".join([category, *asset.tags])},
+                save=False  # Saved once the run finishes
+            )
             
             self.stats["total_downloaded"] += 1
             self.stats["total_size_mb"] += file_size / (1024 * 1024)
@@ -382,59 +435,6 @@ class AssetDownloader:
             logger.error(f"Error downloading video: {e}")
             self.stats["failed_downloads"] += 1
     
-    def _calculate_video_hash(self, video_path: str) -> str:
-        """Calculate perceptual hash of video (using first frame)"""
-        try:
-            cap = cv2.VideoCapture(video_path)
-            ret, frame = cap.read()
-            cap.release()
-            
-            if not ret:
-                return hashlib.md5(video_path.encode()).hexdigest()
-            
-            # Convert to PIL Image
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            pil_image = Image.fromarray(frame_rgb)
-            
-            # Calculate perceptual hash
-            phash = str(imagehash.phash(pil_image))
-            return phash
-            
-        except Exception as e:
-            logger.error(f"Error calculating video hash: {e}")
-            return hashlib.md5(video_path.encode()).hexdigest()
-    
-    def _assess_video_quality(self, video_path: str) -> float:
-        """
-        Assess video quality using basic metrics
-        
-        Returns:
-            Quality score from 0.0 to 1.0
-        """
-        try:
-            cap = cv2.VideoCapture(video_path)
-            
-            # Get video properties
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            
-            cap.release()
-            
-            # Calculate quality score
-            resolution_score = min((width * height) / (1920 * 1080), 1.0)
-            fps_score = min(fps / 30.0, 1.0)
-            duration_score = min(frame_count / (30 * fps) / 10.0, 1.0)  # 10s ideal
-            
-            quality_score = (resolution_score * 0.5 + fps_score * 0.3 + duration_score * 0.2)
-            
-            return quality_score
-            
-        except Exception as e:
-            logger.error(f"Error assessing quality: {e}")
-            return 0.5  # Default medium quality
-    
     async def download_audio(self, count: int):
         """Download audio files from all sources"""
         logger.info(f"Downloading {count} audio files...")
@@ -460,6 +460,8 @@ class AssetDownloader:
         async with aiofiles.open(manifest_path, "w") as f:
             await f.write(json.dumps(manifest, indent=2))
         
+        self.asset_hashes.save()
+        
         logger.info(f"Saved manifest to {manifest_path}")
     
     def print_statistics(self):
@@ -489,12 +491,14 @@ async def main():
     parser.add_argument("--fonts", type=int, default=20, help="Number of fonts to download")
     parser.add_argument("--base-dir", default="./assets", help="Base directory for assets")
     parser.add_argument("--quality", type=float, default=0.6, help="Minimum quality threshold (0.0-1.0)")
+    parser.add_argument("--duplicate-distance", type=int, default=8, help="Max pHash distance treated as a duplicate")
     
     args = parser.parse_args()
     
     downloader = AssetDownloader(
         base_dir=args.base_dir,
-        quality_threshold=args.quality
+        quality_threshold=args.quality,
+        duplicate_distance=args.duplicate_distance
     )
     
     await downloader.download_all(
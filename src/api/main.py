@@ -20,6 +20,7 @@ from sqlalchemy.orm import Session
 import asyncio
 import logging
 import os
+from pathlib import Path
 
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -31,6 +32,7 @@ from src.api.middleware.logging import RequestLoggingMiddleware
 
 # Import logging configuration
 from src.utils.logging_config import setup_logging
+from src.utils.tracing import configure_tracing
 
 # Import Prometheus metrics
 try:
@@ -338,6 +340,10 @@ async def startup_event():
     
     # Prometheus instrumentation moved to module import time. No-op here.
     
+    # Export pipeline traces to a JSON lines file when configured
+    if os.getenv("TRACE_FILE"):
+        configure_tracing(Path(os.getenv("TRACE_FILE")))
+    
     logger.info("Initializing schedulers...")
 
     # The scheduler subsystem is optional in some test/CI environments
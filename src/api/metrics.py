@@ -99,6 +99,30 @@ cache_hit_rate = Gauge(
     ['cache_type']  # redis, local, etc.
 )
 
+scraper_circuit_state = Gauge(
+    'scraper_circuit_state',
+    'Asset scraper circuit breaker state (0=closed, 1=half-open, 2=open)',
+    ['source']
+)
+
+scraper_error_rate = Gauge(
+    'scraper_error_rate',
+    'Asset scraper error rate over recent requests (0-1)',
+    ['source']
+)
+
+scraper_latency_p90 = Gauge(
+    'scraper_latency_p90_seconds',
+    'Asset scraper p90 request latency over recent requests',
+    ['source']
+)
+
+scraper_circuit_transitions = Counter(
+    'scraper_circuit_transitions_total',
+    'Asset scraper circuit breaker state changes',
+    ['source', 'state']
+)
+
 # ============================================================================
 # INFO METRICS
 # ============================================================================
@@ -254,3 +278,34 @@ def update_cache_hit_rate(cache_type: str, hit_rate: float) -> None:
         hit_rate: Hit rate between 0 and 1
     """
     cache_hit_rate.labels(cache_type=cache_type).set(hit_rate)
+
+
+CIRCUIT_STATE_VALUES = {'closed': 0, 'half_open': 1, 'open': 2}
+
+
+def record_scraper_circuit_change(source: str, state: str) -> None:
+    """
+    Record an asset scraper circuit breaker state change
+    
+    Args:
+        source: Scraper source name (pexels, pixabay, etc.)
+        state: New state (closed, half_open, open)
+    """
+    scraper_circuit_state.labels(source=source).set(CIRCUIT_STATE_VALUES[state])
+    scraper_circuit_transitions.labels(source=source, state=state).inc()
+
+
+def update_scraper_health(source: str, state: str, error_rate: float, p90_latency: float = None) -> None:
+    """
+    Update asset scraper health gauges
+    
+    Args:
+        source: Scraper source name
+        state: Circuit state (closed, half_open, open)
+        error_rate: Error rate between 0 and 1
+        p90_latency: p90 latency in seconds, if known
+    """
+    scraper_circuit_state.labels(source=source).set(CIRCUIT_STATE_VALUES[state])
+    scraper_error_rate.labels(source=source).set(error_rate)
+    if p90_latency is not None:
+        scraper_latency_p90.labels(source=source).set(p90_latency)
@@ -13,6 +13,8 @@ from starlette.requests import Request
 from starlette.responses import Response
 from typing import Callable
 
+from src.utils.tracing import get_tracer, trace_id_from_request_id
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,8 +36,8 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         Returns:
             Response with X-Request-ID header
         """
-        # Generate unique request ID for correlation
-        request_id = str(uuid.uuid4())
+        # Reuse the caller's request ID for correlation, or generate one
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
         request.state.request_id = request_id
         
         # Start timer
@@ -59,46 +61,59 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             }
         )
         
-        # Process request
-        try:
-            response = await call_next(request)
-            duration_ms = (time.time() - start_time) * 1000
-            
-            # Log successful completion
-            logger.info(
-                "Request completed",
-                extra={
-                    "request_id": request_id,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "status_code": response.status_code,
-                    "duration_ms": round(duration_ms, 2),
-                    "event": "request_completed"
-                }
-            )
-            
-            # Add request ID to response headers for client-side correlation
-            response.headers["X-Request-ID"] = request_id
-            
-            return response
-            
-        except Exception as e:
-            duration_ms = (time.time() - start_time) * 1000
-            
-            # Log error with full context
-            logger.error(
-                "Request failed",
-                extra={
-                    "request_id": request_id,
-                    "method": request.method,
-                    "path": request.url.path,
-                    "error": str(e),
-                    "error_type": type(e).__name__,
-                    "duration_ms": round(duration_ms, 2),
-                    "event": "request_failed"
-                },
-                exc_info=True  # Include full traceback
-            )
+        # Process request inside a root span whose trace ID is derived from
+        # the request ID, so jobs scheduled by it join the same trace
+        with get_tracer().start_span(
+            f"{request.method} {request.url.path}",
+            attributes={
+                "http.method": request.method,
+                "http.target": request.url.path,
+                "request_id": request_id,
+            },
+            trace_id=trace_id_from_request_id(request_id),
+        ) as span:
+            request.state.trace_id = span.trace_id
             
-            # Re-raise to let error handlers process it
-            raise
+            try:
+                response = await call_next(request)
+                span.set_attribute("http.status_code", response.status_code)
+                duration_ms = (time.time() - start_time) * 1000
+                
+                # Log successful completion
+                logger.info(
+                    "Request completed",
+                    extra={
+                        "request_id": request_id,
+                        "method": request.method,
+                        "path": request.url.path,
+                        "status_code": response.status_code,
+                        "duration_ms": round(duration_ms, 2),
+                        "event": "request_completed"
+                    }
+                )
+                
+                # Add request ID to response headers for client-side correlation
+                response.headers["X-Request-ID"] = request_id
+                
+                return response
+                
+            except Exception as e:
+                duration_ms = (time.time() - start_time) * 1000
+                
+                # Log error with full context
+                logger.error(
+                    "Request failed",
+                    extra={
+                        "request_id": request_id,
+                        "method": request.method,
+                        "path": request.url.path,
+                        "error": str(e),
+                        "error_type": type(e).__name__,
+                        "duration_ms": round(duration_ms, 2),
+                        "event": "request_failed"
+                    },
+                    exc_info=True  # Include full traceback
+                )
+                
+                # Re-raise to let error handlers process it
+                raise
@@ -4,19 +4,40 @@ Faceless YouTube - Asset Scraper Package
 Multi-source asset scraper with caching, rate limiting, and proxy support.
 """
 
-from .base_scraper import BaseScraper, ScraperConfig, AssetType, AssetMetadata
+from .base_scraper import (
+    BaseScraper,
+    ScraperConfig,
+    AssetType,
+    AssetMetadata,
+    CircuitOpenError,
+    CircuitState,
+)
 from .pexels_scraper import PexelsScraper
 from .pixabay_scraper import PixabayScraper
 from .unsplash_scraper import UnsplashScraper
-from .scraper_manager import ScraperManager
+from .scraper_manager import ScraperManager, ScraperPriority
+from .downloader import AssetDownloader, DownloadConfig, DownloadError, DownloadResult
+from .fingerprint import FingerprintError, VideoFingerprint, VideoFingerprinter
+from .local_library import LocalLibraryScraper
 
 __all__ = [
     'BaseScraper',
     'ScraperConfig',
     'AssetType',
     'AssetMetadata',
+    'CircuitOpenError',
+    'CircuitState',
     'PexelsScraper',
     'PixabayScraper',
     'UnsplashScraper',
     'ScraperManager',
+    'ScraperPriority',
+    'AssetDownloader',
+    'DownloadConfig',
+    'DownloadError',
+    'DownloadResult',
+    'FingerprintError',
+    'VideoFingerprint',
+    'VideoFingerprinter',
+    'LocalLibraryScraper',
 ]
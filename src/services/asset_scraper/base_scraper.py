@@ -6,12 +6,16 @@ Abstract base class for all asset scrapers with caching, rate limiting, and heal
 
 import asyncio
 import hashlib
+import json
+import logging
 import time
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 from enum import Enum
-from typing import Dict, List, Optional, Any
+from typing import Callable, Deque, Dict, List, Mapping, Optional, Any
 from urllib.parse import quote
 
 import aiohttp
@@ -19,6 +23,13 @@ from pydantic import BaseModel, HttpUrl, Field
 
 from src.utils.cache import CacheManager, cached
 
+try:
+    from src.api import metrics
+except ImportError:  # prometheus_client not installed
+    metrics = None
+
+logger = logging.getLogger(__name__)
+
 
 class AssetType(str, Enum):
     """Types of media assets that can be scraped"""
@@ -64,10 +75,24 @@ class AssetMetadata(BaseModel):
     scraped_at: datetime = Field(default_factory=datetime.utcnow, description="When asset was scraped")
     popularity: Optional[int] = Field(None, description="Views/downloads/likes count")
     
+    # Local library (set for assets that are already downloaded)
+    local_path: Optional[str] = Field(None, description="Path of the downloaded file")
+    sha256: Optional[str] = Field(None, description="Content hash of the downloaded file")
+    quality_score: Optional[float] = Field(None, description="Ingest quality score (0.0 to 1.0)")
+    
+    # Freshness (set when served from the search cache)
+    cache_age: Optional[float] = Field(None, description="Seconds since the source returned this result")
+    stale: bool = Field(default=False, description="Served from cache past its TTL")
+    
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat(),
         }
+    
+    def describe(self) -> str:
+        """Title, description and tags as one text (for semantic matching)"""
+        parts = [self.title, self.description, *self.tags]
+        return " ".join(p for p in parts if p)
 
 
 @dataclass
@@ -81,6 +106,8 @@ class ScraperConfig:
     # Rate limiting
     requests_per_minute: int = 60
     requests_per_hour: int = 3600
+    burst: Optional[int] = None  # Tokens available at once (None = one minute's worth)
+    request_costs: Dict[str, float] = field(default_factory=dict)  # Asset type -> tokens per request
     
     # Retry configuration
     max_retries: int = 3
@@ -97,68 +124,255 @@ class ScraperConfig:
     # Caching
     cache_enabled: bool = True
     cache_ttl: int = 3600  # 1 hour default
+    stale_while_revalidate: int = 600  # Serve expired results this long while refreshing
+    stale_if_error: int = 86400  # Serve expired results this long if the source is down
+    
+    # Single-flight: one process fetches a missed search, others wait for it
+    single_flight_lock_ttl: float = 10.0  # seconds
+    single_flight_poll_interval: float = 0.1  # seconds
     
     # Health check
     health_check_interval: int = 300  # 5 minutes
     max_consecutive_failures: int = 5
+    
+    # Circuit breaker
+    circuit_cooldown: float = 30.0  # seconds open before probing, doubled per failed probe
+    circuit_max_cooldown: float = 600.0  # seconds
+    circuit_half_open_probes: int = 1  # Concurrent probe requests while half-open
+    health_window: int = 100  # Recent requests tracked for latency and error rate
+    error_rate_threshold: float = 0.5  # Open when this fraction of the window fails
+    error_rate_min_requests: int = 20  # Requests in the window before error rate counts
 
 
 class RateLimiter:
-    """Token bucket rate limiter for API requests"""
+    """
+    Continuous-refill token bucket rate limiter (GCRA).
+    
+    Each limit is tracked as a theoretical arrival time (TAT) that advances
+    by ``period / limit`` per token spent, so capacity refills smoothly
+    instead of all at once at a window boundary. A caller reserves its slot
+    under the lock, which only does arithmetic, then sleeps outside it;
+    slots are handed out in arrival order, so callers are served FIFO.
+    """
     
-    def __init__(self, requests_per_minute: int, requests_per_hour: int):
+    def __init__(
+        self,
+        requests_per_minute: int,
+        requests_per_hour: int,
+        burst: Optional[int] = None
+    ):
+        """
+        Initialize rate limiter.
+        
+        Args:
+            requests_per_minute: Sustained requests per minute
+            requests_per_hour: Sustained requests per hour
+            burst: Tokens available at once (default: one minute's worth)
+        """
         self.rpm = requests_per_minute
         self.rph = requests_per_hour
+        self.burst = burst
         
-        # Token buckets
-        self.minute_tokens = requests_per_minute
-        self.hour_tokens = requests_per_hour
+        # (seconds per token, bucket capacity in tokens) per limit
+        self._limits = [
+            (60.0 / requests_per_minute, float(burst or requests_per_minute)),
+            (3600.0 / requests_per_hour, float(burst or requests_per_hour)),
+        ]
+        self._tat = [time.monotonic()] * len(self._limits)
         
-        # Last refill times
-        self.last_minute_refill = time.time()
-        self.last_hour_refill = time.time()
+        # Pause requested by the provider (Retry-After / exhausted quota)
+        self._not_before = 0.0
+        # Total seconds pauses have pushed the schedule back
+        self._shifted = 0.0
         
         self.lock = asyncio.Lock()
     
-    async def acquire(self) -> None:
-        """Acquire permission to make a request, blocking if necessary"""
+    @property
+    def minute_tokens(self) -> float:
+        """Tokens currently available under the per-minute limit"""
+        return self._available(0)
+    
+    @property
+    def hour_tokens(self) -> float:
+        """Tokens currently available under the per-hour limit"""
+        return self._available(1)
+    
+    @property
+    def headroom(self) -> float:
+        """Fraction of capacity available now under the tightest limit (0.0 to 1.0)"""
+        if self._not_before > time.monotonic():
+            return 0.0
+        return min(
+            self._available(i) / capacity
+            for i, (_, capacity) in enumerate(self._limits)
+        )
+    
+    def _available(self, index: int) -> float:
+        interval, capacity = self._limits[index]
+        debt = max(0.0, self._tat[index] - time.monotonic())
+        return max(0.0, capacity - debt / interval)
+    
+    def reserve(self, cost: float = 1.0) -> float:
+        """
+        Reserve capacity for a request without waiting.
+        
+        Args:
+            cost: Tokens the request consumes
+        
+        Returns:
+            Seconds the caller must wait before sending
+        """
+        now = time.monotonic()
+        start = self._earliest_start(cost, now)
+        
+        for i, (interval, _) in enumerate(self._limits):
+            self._tat[i] = max(self._tat[i], start) + cost * interval
+        
+        return start - now
+    
+    def delay(self, cost: float = 1.0) -> float:
+        """Seconds a request would wait right now, without reserving."""
+        now = time.monotonic()
+        return self._earliest_start(cost, now) - now
+    
+    def _earliest_start(self, cost: float, now: float) -> float:
+        """Earliest start time that conforms to every limit."""
+        start = max(now, self._not_before)
+        for (interval, capacity), tat in zip(self._limits, self._tat):
+            start = max(start, tat - (capacity - min(cost, capacity)) * interval)
+        return start
+    
+    async def acquire(self, cost: float = 1.0) -> None:
+        """
+        Acquire permission to make a request, waiting for capacity if needed.
+        
+        Args:
+            cost: Tokens the request consumes (e.g. more for video searches)
+        """
         async with self.lock:
-            while True:
-                self._refill_tokens()
-                
-                if self.minute_tokens >= 1 and self.hour_tokens >= 1:
-                    self.minute_tokens -= 1
-                    self.hour_tokens -= 1
-                    return
-                
-                # Calculate wait time
-                wait_time = min(
-                    (60 - (time.time() - self.last_minute_refill)),
-                    (3600 - (time.time() - self.last_hour_refill))
-                )
-                
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
-    
-    def _refill_tokens(self) -> None:
-        """Refill token buckets based on elapsed time"""
-        now = time.time()
-        
-        # Refill minute bucket
-        if now - self.last_minute_refill >= 60:
-            self.minute_tokens = self.rpm
-            self.last_minute_refill = now
-        
-        # Refill hour bucket
-        if now - self.last_hour_refill >= 3600:
-            self.hour_tokens = self.rph
-            self.last_hour_refill = now
+            start = time.monotonic() + self.reserve(cost)
+            shifted = self._shifted
+        
+        while True:
+            # Pauses issued while we slept move our slot back by their length
+            start_at = max(start + self._shifted - shifted, self._not_before)
+            wait = start_at - time.monotonic()
+            if wait <= 0:
+                break
+            await asyncio.sleep(wait)
+    
+    def pause(self, seconds: float) -> None:
+        """
+        Hold all requests for the given number of seconds.
+        
+        Slots already handed out move back by the added pause time, so
+        queued callers resume at their original spacing instead of all
+        at once when the pause ends.
+        """
+        now = time.monotonic()
+        until = now + seconds
+        if until <= self._not_before:
+            return
+        
+        shift = until - max(now, self._not_before)
+        self._not_before = until
+        self._shifted += shift
+        for i in range(len(self._tat)):
+            self._tat[i] = max(self._tat[i], now) + shift
+    
+    def update_from_headers(self, headers: Mapping[str, str]) -> Optional[float]:
+        """
+        Honor rate limit headers from a provider response.
+        
+        Understands ``Retry-After`` (seconds or HTTP date) and the
+        ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset`` pair (reset as
+        seconds from now or a Unix timestamp). Header names are matched
+        case-insensitively.
+        
+        Args:
+            headers: Response headers
+        
+        Returns:
+            Seconds requests are paused for, or None if nothing changed
+        """
+        values = {k.lower(): v for k, v in headers.items()}
+        delay = None
+        
+        retry_after = values.get("retry-after")
+        if retry_after:
+            delay = self._parse_delay(retry_after, http_date=True)
+        
+        remaining = values.get("x-ratelimit-remaining")
+        if delay is None and remaining is not None:
+            try:
+                exhausted = float(remaining) <= 0
+            except ValueError:
+                exhausted = False
+            if exhausted:
+                reset = values.get("x-ratelimit-reset")
+                delay = self._parse_delay(reset) if reset else None
+                if delay is None:
+                    # Quota gone but no reset given: wait out one request slot
+                    delay = min(interval for interval, _ in self._limits)
+        
+        if delay is None or delay <= 0:
+            return None
+        
+        self.pause(delay)
+        return delay
+    
+    @staticmethod
+    def _parse_delay(value: str, http_date: bool = False) -> Optional[float]:
+        """Seconds until a header's reset time (relative, epoch or HTTP date)."""
+        try:
+            number = float(value)
+        except ValueError:
+            if not http_date:
+                return None
+            try:
+                return parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        
+        # Large values are Unix timestamps rather than relative seconds
+        return number - time.time() if number > 1e9 else number
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"  # Requests flow normally
+    OPEN = "open"  # Requests are refused until the cooldown ends
+    HALF_OPEN = "half_open"  # A few probe requests test recovery
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while a scraper's circuit is open."""
+    pass
 
 
 class HealthMonitor:
-    """Monitor scraper health and track failures"""
+    """
+    Monitor scraper health and act as a circuit breaker.
+    
+    The circuit opens after ``max_consecutive_failures`` failures in a row,
+    or when the error rate over the recent request window reaches
+    ``error_rate_threshold``. While open, requests are refused. After the
+    cooldown the circuit goes half-open and lets ``half_open_probes``
+    requests through: a success closes it, a failure reopens it with the
+    cooldown doubled (up to ``max_cooldown``).
+    """
     
-    def __init__(self, max_consecutive_failures: int = 5):
+    def __init__(
+        self,
+        max_consecutive_failures: int = 5,
+        latency_window: int = 100,
+        cooldown: float = 30.0,
+        max_cooldown: float = 600.0,
+        half_open_probes: int = 1,
+        error_rate_threshold: float = 0.5,
+        error_rate_min_requests: int = 20,
+        on_state_change: Optional[Callable[["CircuitState", "CircuitState"], None]] = None,
+    ):
         self.max_consecutive_failures = max_consecutive_failures
         self.consecutive_failures = 0
         self.total_requests = 0
@@ -166,25 +380,161 @@ class HealthMonitor:
         self.failed_requests = 0
         self.last_success_time: Optional[datetime] = None
         self.last_failure_time: Optional[datetime] = None
-        self.is_healthy = True
+        
+        # Response times and outcomes of recent requests
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+        self.outcomes: Deque[bool] = deque(maxlen=latency_window)
+        
+        # Circuit breaker
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.half_open_probes = half_open_probes
+        self.error_rate_threshold = error_rate_threshold
+        self.error_rate_min_requests = error_rate_min_requests
+        self.on_state_change = on_state_change
+        self.cooldown = cooldown
+        self.times_opened = 0
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes = 0
     
-    def record_success(self) -> None:
-        """Record a successful request"""
+    @property
+    def state(self) -> CircuitState:
+        """Current circuit state (an expired cooldown turns OPEN into HALF_OPEN)"""
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.cooldown
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+    
+    @property
+    def is_healthy(self) -> bool:
+        """Whether the circuit is closed"""
+        return self.state is CircuitState.CLOSED
+    
+    @is_healthy.setter
+    def is_healthy(self, healthy: bool) -> None:
+        if healthy:
+            self._close()
+        else:
+            self._open()
+    
+    @property
+    def is_available(self) -> bool:
+        """Whether the scraper may be sent requests (closed or half-open)"""
+        return self.state is not CircuitState.OPEN
+    
+    @property
+    def retry_after(self) -> float:
+        """Seconds until an open circuit goes half-open"""
+        if self._state is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+    
+    @property
+    def error_rate(self) -> float:
+        """Fraction of failed requests in the recent window"""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+    
+    def allow_request(self) -> bool:
+        """
+        Ask the circuit for permission to send a request.
+        
+        Half-open circuits hand out a limited number of probe slots; a
+        caller that gets one must call ``release_probe`` when done.
+        
+        Returns:
+            True if the request may be sent
+        """
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and self._probes < self.half_open_probes:
+            self._probes += 1
+            return True
+        return False
+    
+    def release_probe(self) -> None:
+        """Return a half-open probe slot"""
+        if self._state is CircuitState.HALF_OPEN:
+            self._probes = max(0, self._probes - 1)
+    
+    def record_success(self, latency: Optional[float] = None) -> None:
+        """Record a successful request and, optionally, how long it took"""
+        if latency is not None:
+            self.latencies.append(latency)
+        self.outcomes.append(True)
         self.consecutive_failures = 0
         self.total_requests += 1
         self.successful_requests += 1
         self.last_success_time = datetime.utcnow()
-        self.is_healthy = True
+        self._close()
     
-    def record_failure(self) -> None:
-        """Record a failed request"""
+    def record_failure(self, latency: Optional[float] = None) -> None:
+        """Record a failed request (with its latency if it timed out)"""
+        if latency is not None:
+            self.latencies.append(latency)
+        self.outcomes.append(False)
         self.consecutive_failures += 1
         self.total_requests += 1
         self.failed_requests += 1
         self.last_failure_time = datetime.utcnow()
         
-        if self.consecutive_failures >= self.max_consecutive_failures:
-            self.is_healthy = False
+        if self._state is CircuitState.HALF_OPEN:
+            # Failed probe: back off harder
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self._open()
+        elif self._state is CircuitState.CLOSED and (
+            self.consecutive_failures >= self.max_consecutive_failures
+            or (
+                len(self.outcomes) >= self.error_rate_min_requests
+                and self.error_rate >= self.error_rate_threshold
+            )
+        ):
+            self._open()
+    
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        if self._state is not CircuitState.OPEN:
+            self.times_opened += 1
+            self._transition(CircuitState.OPEN)
+    
+    def _close(self) -> None:
+        self.cooldown = self.base_cooldown
+        if self._state is not CircuitState.CLOSED:
+            # Don't let the failures that opened the circuit reopen it at once
+            self.outcomes.clear()
+            self._transition(CircuitState.CLOSED)
+    
+    def _transition(self, state: CircuitState) -> None:
+        previous, self._state = self._state, state
+        self._probes = 0
+        if self.on_state_change is not None:
+            self.on_state_change(previous, state)
+    
+    def latency_percentile(self, percentile: float = 90) -> Optional[float]:
+        """
+        Latency percentile over the recent request window.
+        
+        Args:
+            percentile: Percentile from 0 to 100
+        
+        Returns:
+            Seconds, or None before any latency has been recorded
+        """
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+    
+    @property
+    def p90_latency(self) -> Optional[float]:
+        """90th percentile latency of recent requests"""
+        return self.latency_percentile(90)
     
     def get_stats(self) -> Dict[str, Any]:
         """Get health statistics"""
@@ -196,11 +546,16 @@ class HealthMonitor:
         
         return {
             "is_healthy": self.is_healthy,
+            "circuit_state": self.state.value,
+            "retry_after": round(self.retry_after, 1),
+            "times_opened": self.times_opened,
             "consecutive_failures": self.consecutive_failures,
             "total_requests": self.total_requests,
             "successful_requests": self.successful_requests,
             "failed_requests": self.failed_requests,
             "success_rate": round(success_rate, 2),
+            "error_rate": round(self.error_rate, 3),
+            "p90_latency": round(self.p90_latency, 3) if self.latencies else None,
             "last_success": self.last_success_time.isoformat() if self.last_success_time else None,
             "last_failure": self.last_failure_time.isoformat() if self.last_failure_time else None,
         }
@@ -225,12 +580,25 @@ class BaseScraper(ABC):
         # Initialize components
         self.rate_limiter = RateLimiter(
             config.requests_per_minute,
-            config.requests_per_hour
+            config.requests_per_hour,
+            burst=config.burst
+        )
+        self.health_monitor = HealthMonitor(
+            config.max_consecutive_failures,
+            latency_window=config.health_window,
+            cooldown=config.circuit_cooldown,
+            max_cooldown=config.circuit_max_cooldown,
+            half_open_probes=config.circuit_half_open_probes,
+            error_rate_threshold=config.error_rate_threshold,
+            error_rate_min_requests=config.error_rate_min_requests,
+            on_state_change=self._on_circuit_change,
         )
-        self.health_monitor = HealthMonitor(config.max_consecutive_failures)
         
         # HTTP session (will be created async)
         self._session: Optional[aiohttp.ClientSession] = None
+        
+        # Cache misses being fetched, by cache key
+        self._in_flight: Dict[str, asyncio.Task] = {}
     
     @property
     @abstractmethod
@@ -295,6 +663,7 @@ class BaseScraper(ABC):
         self,
         method: str,
         url: str,
+        cost: float = 1.0,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -303,6 +672,7 @@ class BaseScraper(ABC):
         Args:
             method: HTTP method (GET, POST, etc.)
             url: Request URL
+            cost: Rate limit tokens the request consumes
             **kwargs: Additional arguments for aiohttp request
         
         Returns:
@@ -311,33 +681,57 @@ class BaseScraper(ABC):
         Raises:
             aiohttp.ClientError: If request fails after all retries
         """
-        # Wait for rate limiter
-        await self.rate_limiter.acquire()
-        
         session = await self._get_session()
         
         for attempt in range(self.config.max_retries):
+            probing = self.health_monitor.state is CircuitState.HALF_OPEN
+            if not self.health_monitor.allow_request():
+                raise CircuitOpenError(
+                    f"{self.source_name} circuit is {self.health_monitor.state.value}; "
+                    f"retry in {self.health_monitor.retry_after:.0f}s"
+                )
+            
             try:
+                # Every attempt, retries included, waits for the rate limiter
+                await self.rate_limiter.acquire(cost)
+                throttled = None
+                started = time.monotonic()
+                
                 async with session.request(method, url, **kwargs) as response:
+                    throttled = self.rate_limiter.update_from_headers(response.headers)
                     response.raise_for_status()
                     data = await response.json()
                     
                     # Record success
-                    self.health_monitor.record_success()
+                    self.health_monitor.record_success(time.monotonic() - started)
                     
                     return data
             
             except (aiohttp.ClientError, asyncio.TimeoutError) as e:
-                # Record failure
-                self.health_monitor.record_failure()
+                # Record failure; timeouts count toward latency too
+                self.health_monitor.record_failure(
+                    time.monotonic() - started if isinstance(e, asyncio.TimeoutError) else None
+                )
                 
                 # Last attempt - raise error
                 if attempt == self.config.max_retries - 1:
                     raise
                 
+                if isinstance(e, aiohttp.ClientResponseError) and e.status == 429 and throttled:
+                    # The provider's Retry-After already paused the limiter
+                    continue
+                
                 # Calculate backoff delay
                 delay = self.config.retry_delay * (self.config.retry_backoff ** attempt)
                 await asyncio.sleep(delay)
+            
+            finally:
+                if probing:
+                    self.health_monitor.release_probe()
+    
+    def _request_cost(self, asset_type: AssetType) -> float:
+        """Rate limit tokens for a request returning assets of this type"""
+        return self.config.request_costs.get(asset_type.value, 1.0)
     
     @abstractmethod
     async def search(
@@ -371,6 +765,13 @@ class BaseScraper(ABC):
         """
         Search for assets with caching.
         
+        Results younger than ``cache_ttl`` are served from cache. Within
+        ``stale_while_revalidate`` after that, the stale results are served
+        immediately and refreshed in the background. Up to
+        ``stale_if_error`` past the TTL, stale results are served instead
+        of failing when the source is unhealthy or the refresh errors.
+        Freshness is reported on each result (``cache_age``, ``stale``).
+        
         Args:
             query: Search query string
             asset_type: Type of assets to search for
@@ -392,31 +793,184 @@ class BaseScraper(ABC):
         )
         
         # Try cache first
-        cached_results = await self.cache_manager.get(cache_key)
-        if cached_results is not None:
-            # Reconstruct AssetMetadata objects from cached dicts
-            return [AssetMetadata(**item) for item in cached_results]
-        
-        # Cache miss - fetch from source
-        results = await self.search(query, asset_type, limit, **kwargs)
-        
-        # Cache results (convert to dicts for JSON serialization)
-        results_dicts = [item.dict() for item in results]
-        await self.cache_manager.set(
-            cache_key,
-            results_dicts,
-            ttl=self.config.cache_ttl
+        entry = self._unpack_cache_entry(await self.cache_manager.get(cache_key))
+        stale = None
+        if entry is not None:
+            age, items = entry
+            ttl = self.config.cache_ttl
+            if age <= ttl:
+                return self._from_cache(items, age)
+            
+            stale = (age, items)
+            if age <= ttl + self.config.stale_while_revalidate or (
+                not self.health_monitor.is_healthy
+                and age <= ttl + self.config.stale_if_error
+            ):
+                # Serve stale now, refresh for the next caller
+                self._start_fetch(cache_key, query, asset_type, limit, background=True, **kwargs)
+                return self._from_cache(items, age, stale=True)
+        
+        # Cache miss - concurrent identical searches share one fetch
+        task = self._start_fetch(cache_key, query, asset_type, limit, **kwargs)
+        
+        try:
+            # Shielded so one caller's cancellation doesn't cancel the others'
+            results = await asyncio.shield(task)
+        except Exception:
+            if stale is not None and stale[0] <= self.config.cache_ttl + self.config.stale_if_error:
+                logger.warning(f"{self.source_name} search failed; serving results "
+                              f"{stale[0]:.0f}s old")
+                return self._from_cache(stale[1], stale[0], stale=True)
+            raise
+        
+        return [item.copy(deep=True) for item in results]
+    
+    def _start_fetch(
+        self,
+        cache_key: str,
+        query: str,
+        asset_type: AssetType,
+        limit: int,
+        background: bool = False,
+        **kwargs
+    ) -> asyncio.Task:
+        """Join or start the single in-flight fetch for a cache key."""
+        task = self._in_flight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch_single_flight(cache_key, query, asset_type, limit, **kwargs)
+            )
+            self._in_flight[cache_key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(cache_key, None))
+        
+        if background:
+            task.add_done_callback(self._log_revalidation)
+        return task
+    
+    def _log_revalidation(self, task: asyncio.Task) -> None:
+        """Retrieve and log the outcome of a background refresh."""
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.warning(f"Background refresh of {self.source_name} search failed: {error}")
+    
+    @staticmethod
+    def _unpack_cache_entry(entry: Any) -> Optional[tuple]:
+        """Split a cache entry into (age in seconds, result dicts)."""
+        if entry is None:
+            return None
+        if isinstance(entry, list):
+            # Entry written before freshness was recorded
+            return 0.0, entry
+        return max(0.0, time.time() - entry["fetched_at"]), entry["results"]
+    
+    @staticmethod
+    def _from_cache(items: List[Dict[str, Any]], age: float, stale: bool = False) -> List[AssetMetadata]:
+        """Rebuild cached results, stamped with their freshness."""
+        return [
+            AssetMetadata(**{**item, "cache_age": age, "stale": stale})
+            for item in items
+        ]
+    
+    async def _fetch_single_flight(
+        self,
+        cache_key: str,
+        query: str,
+        asset_type: AssetType,
+        limit: int,
+        **kwargs
+    ) -> List[AssetMetadata]:
+        """
+        Fetch a missed search once across processes and cache the results.
+        
+        A short lock in the shared cache picks one process to query the
+        source; the others poll the cache for its results. If the holder
+        fails (its lock goes away without results), or holds the lock past
+        its TTL, waiters fetch for themselves.
+        """
+        lock_key = f"{cache_key}:lock"
+        token = await self.cache_manager.acquire_lock(
+            lock_key, ttl=self.config.single_flight_lock_ttl
         )
         
-        return results
+        if token is None:
+            results = await self._wait_for_peer(cache_key, lock_key)
+            if results is not None:
+                return results
+            token = await self.cache_manager.acquire_lock(
+                lock_key, ttl=self.config.single_flight_lock_ttl
+            )
+        
+        try:
+            results = await self.search(query, asset_type, limit, **kwargs)
+            
+            # Cache JSON-safe dicts, kept past the TTL so they can be served stale
+            entry = {
+                "fetched_at": time.time(),
+                "results": [json.loads(item.json()) for item in results],
+            }
+            await self.cache_manager.set(
+                cache_key,
+                entry,
+                ttl=self.config.cache_ttl + max(
+                    self.config.stale_while_revalidate,
+                    self.config.stale_if_error
+                )
+            )
+            return results
+        finally:
+            if token is not None:
+                await self.cache_manager.release_lock(lock_key, token)
+    
+    async def _wait_for_peer(
+        self,
+        cache_key: str,
+        lock_key: str
+    ) -> Optional[List[AssetMetadata]]:
+        """Wait for another process's fetch to land in the cache."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.config.single_flight_lock_ttl
+        
+        while loop.time() < deadline:
+            await asyncio.sleep(self.config.single_flight_poll_interval)
+            
+            entry = self._unpack_cache_entry(await self.cache_manager.get(cache_key))
+            if entry is not None and entry[0] <= self.config.cache_ttl:
+                return [AssetMetadata(**item) for item in entry[1]]
+            
+            if not await self.cache_manager.exists(lock_key):
+                # Holder finished without caching anything (it failed)
+                return None
+        
+        return None
+    
+    def _on_circuit_change(self, previous: CircuitState, state: CircuitState) -> None:
+        """Log circuit breaker transitions and export them to Prometheus"""
+        if state is CircuitState.OPEN:
+            logger.warning(f"{self.source_name} circuit opened for "
+                          f"{self.health_monitor.cooldown:.0f}s")
+        else:
+            logger.info(f"{self.source_name} circuit {previous.value} -> {state.value}")
+        
+        if metrics is not None:
+            metrics.record_scraper_circuit_change(self.source_name, state.value)
     
     def get_health_stats(self) -> Dict[str, Any]:
         """Get scraper health statistics"""
+        if metrics is not None:
+            metrics.update_scraper_health(
+                self.source_name,
+                self.health_monitor.state.value,
+                self.health_monitor.error_rate,
+                self.health_monitor.p90_latency,
+            )
+        
         return {
             "source": self.source_name,
             "health": self.health_monitor.get_stats(),
             "rate_limiter": {
-                "minute_tokens": self.rate_limiter.minute_tokens,
-                "hour_tokens": self.rate_limiter.hour_tokens,
+                "minute_tokens": round(self.rate_limiter.minute_tokens, 2),
+                "hour_tokens": round(self.rate_limiter.hour_tokens, 2),
             }
         }
@@ -0,0 +1,411 @@
+"""
+Faceless YouTube - Asset Downloader
+
+Streams scraped assets to disk:
+- Bounded connection pool shared by all downloads, plus a concurrency
+  limit per source so one slow CDN can't take every slot
+- Chunks are written as they arrive, never whole files in memory
+- Interrupted downloads resume with an HTTP Range request (guarded by
+  If-Range, so a changed file starts over instead of being spliced)
+- Content is hashed while it downloads and stored by its SHA-256, so the
+  same file found through two sources or URLs is kept once
+- Retries with exponential backoff continue from the bytes already on disk
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+from urllib.parse import urlparse
+
+import aiofiles
+import aiohttp
+from pydantic import BaseModel
+
+from .base_scraper import AssetMetadata
+
+logger = logging.getLogger(__name__)
+
+
+class DownloadError(Exception):
+    """Raised when an asset cannot be downloaded after all retries."""
+    pass
+
+
+@dataclass
+class DownloadConfig:
+    """Configuration for the asset downloader"""
+
+    # Storage
+    storage_dir: Path = Path("assets/store")
+
+    # Concurrency
+    max_connections: int = 16  # Shared pool across all sources
+    per_source_limit: int = 4  # Default concurrent downloads per source
+    source_limits: Dict[str, int] = field(default_factory=dict)  # Per-source overrides
+
+    # Streaming
+    chunk_size: int = 256 * 1024
+
+    # Retry configuration
+    max_retries: int = 5
+    retry_delay: float = 1.0  # seconds
+    retry_backoff: float = 2.0  # exponential backoff multiplier
+
+    # Timeout settings
+    connect_timeout: int = 15  # seconds
+    read_timeout: int = 60  # seconds without receiving data
+
+
+class DownloadResult(BaseModel):
+    """A downloaded asset in the content-addressed store"""
+    url: str
+    source: str
+    asset_id: Optional[str] = None
+    path: str
+    sha256: str
+    size: int
+    resumed_bytes: int = 0  # Bytes kept from an earlier partial download
+    attempts: int = 1
+    elapsed: float = 0.0
+    deduplicated: bool = False  # Content was already in the store
+
+
+class AssetDownloader:
+    """
+    Downloads assets into a content-addressed store.
+
+    Example:
+        async with AssetDownloader(DownloadConfig(storage_dir=Path("assets"))) as dl:
+            results = await dl.download_many(assets)
+    """
+
+    def __init__(
+        self,
+        config: Optional[DownloadConfig] = None,
+        session: Optional[aiohttp.ClientSession] = None,
+    ):
+        """
+        Initialize downloader.
+
+        Args:
+            config: Downloader configuration
+            session: Optional HTTP session (the downloader owns one otherwise)
+        """
+        self.config = config or DownloadConfig()
+        self.storage_dir = Path(self.config.storage_dir)
+        self.partial_dir = self.storage_dir / "partial"
+        self.partial_dir.mkdir(parents=True, exist_ok=True)
+
+        self._session = session
+        self._owns_session = session is None
+        self._source_slots: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        # URL -> digest of everything downloaded so far (append-only log)
+        self._index_path = self.storage_dir / "urls.jsonl"
+        self._url_index: Dict[str, Dict[str, Any]] = self._load_index()
+
+        self._stats = {
+            "downloaded": 0,
+            "deduplicated": 0,
+            "cached": 0,
+            "resumed": 0,
+            "failed": 0,
+            "retries": 0,
+            "bytes": 0,
+            "seconds": 0.0,
+        }
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        index: Dict[str, Dict[str, Any]] = {}
+        if not self._index_path.exists():
+            return index
+        with open(self._index_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn final line after a crash
+                index[entry["url"]] = entry
+        return index
+
+    def _append_index(self, entry: Dict[str, Any]) -> None:
+        self._url_index[entry["url"]] = entry
+        with open(self._index_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the pooled HTTP session"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.config.max_connections),
+                timeout=aiohttp.ClientTimeout(
+                    total=None,
+                    connect=self.config.connect_timeout,
+                    sock_read=self.config.read_timeout,
+                ),
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self) -> None:
+        """Close the HTTP session if the downloader created it"""
+        if self._owns_session and self._session and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+
+    def _slot(self, source: str) -> asyncio.Semaphore:
+        if source not in self._source_slots:
+            limit = self.config.source_limits.get(source, self.config.per_source_limit)
+            self._source_slots[source] = asyncio.Semaphore(limit)
+        return self._source_slots[source]
+
+    def path_for(self, digest: str, suffix: str = "") -> Path:
+        """Store location of content with the given SHA-256"""
+        return self.storage_dir / digest[:2] / digest[2:4] / f"{digest}{suffix}"
+
+    @staticmethod
+    def _suffix(url: str, asset: Optional[AssetMetadata]) -> str:
+        suffix = Path(urlparse(url).path).suffix.lower()
+        if not suffix and asset is not None and asset.format:
+            suffix = f".{asset.format.lower().lstrip('.')}"
+        return suffix if len(suffix) <= 6 else ""
+
+    async def download(
+        self,
+        asset: Union[AssetMetadata, str],
+        source: Optional[str] = None,
+    ) -> DownloadResult:
+        """
+        Download one asset, resuming any earlier partial download.
+
+        Args:
+            asset: Scraped asset metadata or a plain URL
+            source: Source name for concurrency limits (default: asset.source)
+
+        Returns:
+            DownloadResult pointing into the content-addressed store
+
+        Raises:
+            DownloadError: If the download fails after all retries
+        """
+        metadata = asset if isinstance(asset, AssetMetadata) else None
+        url = str(metadata.url) if metadata else str(asset)
+        source = source or (metadata.source if metadata else urlparse(url).netloc)
+        asset_id = metadata.asset_id if metadata else None
+
+        known = self._url_index.get(url)
+        if known and Path(known["path"]).exists():
+            self._stats["cached"] += 1
+            return DownloadResult(
+                url=url,
+                source=source,
+                asset_id=asset_id,
+                path=known["path"],
+                sha256=known["sha256"],
+                size=known["size"],
+                attempts=0,
+                deduplicated=True,
+            )
+
+        # Callers asking for a URL that is already downloading share that download
+        task = self._in_flight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._download_limited(url, source, asset_id, metadata))
+            self._in_flight[url] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(url, None))
+        return (await asyncio.shield(task)).copy()
+
+    async def _download_limited(
+        self,
+        url: str,
+        source: str,
+        asset_id: Optional[str],
+        metadata: Optional[AssetMetadata],
+    ) -> DownloadResult:
+        async with self._slot(source):
+            start = time.monotonic()
+            result = await self._download_with_retry(url, source, asset_id, metadata)
+            result.elapsed = time.monotonic() - start
+
+        self._stats["seconds"] += result.elapsed
+        return result
+
+    async def download_many(
+        self,
+        assets: Sequence[Union[AssetMetadata, str]],
+        return_exceptions: bool = True,
+    ) -> List[Union[DownloadResult, BaseException]]:
+        """
+        Download many assets concurrently (within the pool and source limits).
+
+        Args:
+            assets: Asset metadata or URLs
+            return_exceptions: Return failures in place instead of raising
+
+        Returns:
+            Results in input order
+        """
+        return await asyncio.gather(
+            *(self.download(asset) for asset in assets),
+            return_exceptions=return_exceptions,
+        )
+
+    async def _download_with_retry(
+        self,
+        url: str,
+        source: str,
+        asset_id: Optional[str],
+        metadata: Optional[AssetMetadata],
+    ) -> DownloadResult:
+        key = hashlib.sha1(url.encode(), usedforsecurity=False).hexdigest()
+        part_path = self.partial_dir / f"{key}.part"
+        meta_path = self.partial_dir / f"{key}.json"
+        resumed_bytes = part_path.stat().st_size if part_path.exists() else 0
+
+        last_error: Optional[BaseException] = None
+        for attempt in range(1, self.config.max_retries + 1):
+            try:
+                digest, size = await self._fetch(url, part_path, meta_path)
+                break
+            except (aiohttp.ClientError, asyncio.TimeoutError, DownloadError) as e:
+                last_error = e
+                self._stats["retries"] += 1
+                if attempt == self.config.max_retries:
+                    self._stats["failed"] += 1
+                    raise DownloadError(
+                        f"Failed to download {url} after {attempt} attempts: {e}"
+                    ) from e
+
+                delay = self.config.retry_delay * (self.config.retry_backoff ** (attempt - 1))
+                logger.warning(f"Download of {url} interrupted ({e}); "
+                              f"resuming in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+        if last_error is not None or resumed_bytes:
+            self._stats["resumed"] += 1
+
+        final_path = self.path_for(digest, self._suffix(url, metadata))
+        deduplicated = final_path.exists()
+        if deduplicated:
+            part_path.unlink()
+            self._stats["deduplicated"] += 1
+        else:
+            final_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(part_path, final_path)
+            self._stats["downloaded"] += 1
+        meta_path.unlink(missing_ok=True)
+
+        self._append_index({
+            "url": url,
+            "path": str(final_path),
+            "sha256": digest,
+            "size": size,
+        })
+
+        return DownloadResult(
+            url=url,
+            source=source,
+            asset_id=asset_id,
+            path=str(final_path),
+            sha256=digest,
+            size=size,
+            resumed_bytes=resumed_bytes,
+            attempts=attempt,
+            deduplicated=deduplicated,
+        )
+
+    async def _hash_existing(self, part_path: Path):
+        """Hash the bytes already on disk so a resumed download hashes correctly"""
+        def hash_file():
+            hasher = hashlib.sha256()
+            with open(part_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+            return hasher
+
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, hash_file)
+
+    async def _fetch(self, url: str, part_path: Path, meta_path: Path) -> tuple[str, int]:
+        """
+        Stream the rest of a URL into its partial file.
+
+        Returns:
+            (sha256 hex digest, total size)
+        """
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        validator = None
+        if offset and meta_path.exists():
+            validator = json.loads(meta_path.read_text()).get("validator")
+        if offset and not validator:
+            # Can't prove the server still has the same file: start over
+            offset = 0
+
+        headers = {}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = validator
+
+        session = await self._get_session()
+        async with session.get(url, headers=headers) as response:
+            if response.status == 416 and offset:
+                # Everything was already downloaded
+                hasher = await self._hash_existing(part_path)
+                return hasher.hexdigest(), offset
+
+            if response.status not in (200, 206):
+                raise DownloadError(f"HTTP {response.status} for {url}")
+
+            if response.status == 206 and offset:
+                hasher = await self._hash_existing(part_path)
+                mode = "ab"
+            else:
+                # Fresh download, or the server ignored/refused the range
+                hasher = hashlib.sha256()
+                offset = 0
+                mode = "wb"
+
+            validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+            meta_path.write_text(json.dumps({"url": url, "validator": validator}))
+
+            expected = None
+            if response.status == 206:
+                total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                expected = int(total) if total.isdigit() else None
+            elif response.content_length is not None:
+                expected = response.content_length
+
+            size = offset
+            async with aiofiles.open(part_path, mode) as f:
+                async for chunk in response.content.iter_chunked(self.config.chunk_size):
+                    hasher.update(chunk)
+                    await f.write(chunk)
+                    size += len(chunk)
+                    self._stats["bytes"] += len(chunk)
+
+        if expected is not None and size != expected:
+            raise DownloadError(f"Incomplete download of {url}: {size}/{expected} bytes")
+
+        return hasher.hexdigest(), size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get download statistics"""
+        return {
+            **self._stats,
+            "in_flight": len(self._in_flight),
+            "stored_urls": len(self._url_index),
+        }
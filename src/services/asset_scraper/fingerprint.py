@@ -0,0 +1,332 @@
+"""
+Faceless YouTube - Video Fingerprinting
+
+Computes everything ingest needs to know about a downloaded clip from a
+single pass over the file:
+- K frames sampled evenly across the clip by seeking, not decoding
+  everything in between, and downscaled as they are read
+- Per-frame perceptual hashes (DCT pHash, bit-compatible in layout with
+  ``imagehash.phash``) combined into one clip hash by bitwise majority, so
+  a different first frame or a trimmed intro doesn't change the hash
+- Color histogram, brightness, contrast and sharpness, computed for all
+  sampled frames at once in NumPy
+- The resolution/fps/duration quality score used to filter ingest
+- Runs in a ProcessPoolExecutor so decoding never blocks the event loop
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from pydantic import BaseModel
+
+from src.utils.tracing import inject, run_traced
+
+try:
+    import cv2
+    CV2_AVAILABLE = True
+except ImportError:
+    cv2 = None
+    CV2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+# Frames are read at this size (width, height); pHash and metrics use it
+ANALYSIS_SIZE = (128, 128)
+HISTOGRAM_BINS = 4  # Per RGB channel
+
+
+class FingerprintError(Exception):
+    """Raised when a video cannot be opened or has no readable frames."""
+    pass
+
+
+class VideoFingerprint(BaseModel):
+    """Fingerprint and quality metrics of one video"""
+    path: str
+    phash: str  # 16 hex digits, majority of the frame hashes
+    frame_hashes: List[str]
+    color_histogram: List[float]  # HISTOGRAM_BINS ** 3 bins, sums to 1
+    width: int
+    height: int
+    fps: float
+    duration: float
+    brightness: float  # Mean luma, 0-255
+    contrast: float  # Mean per-frame luma standard deviation
+    sharpness: float  # Mean per-frame Laplacian variance
+    quality_score: float  # 0.0 to 1.0
+
+
+# Reader: (path, frame count) -> (RGB frames at ANALYSIS_SIZE, width, height, fps, frame count)
+FrameReader = Callable[[str, int], Tuple[np.ndarray, int, int, float, int]]
+
+
+def read_frames(path: str, count: int) -> Tuple[np.ndarray, int, int, float, int]:
+    """
+    Sample frames evenly across a video with seek-based decoding.
+
+    Args:
+        path: Video file
+        count: Frames to sample
+
+    Returns:
+        (frames as (K, h, w, 3) uint8 RGB, width, height, fps, frame count)
+
+    Raises:
+        FingerprintError: If the file can't be opened or no frame decodes
+    """
+    if not CV2_AVAILABLE:
+        raise FingerprintError("opencv-python is not installed")
+
+    cap = cv2.VideoCapture(path)
+    try:
+        if not cap.isOpened():
+            raise FingerprintError(f"Cannot open video: {path}")
+
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = float(cap.get(cv2.CAP_PROP_FPS) or 0.0)
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+        # Centers of K equal slices, so the first and last frames (often
+        # fades or black) aren't sampled
+        positions = ((np.arange(count) + 0.5) * max(frame_count, 1) / count).astype(int)
+
+        frames = []
+        for position in positions:
+            if frame_count > 0:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, int(position))
+            ok, frame = cap.read()
+            if not ok:
+                continue
+            frame = cv2.resize(frame, ANALYSIS_SIZE, interpolation=cv2.INTER_AREA)
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    finally:
+        cap.release()
+
+    if not frames:
+        raise FingerprintError(f"No decodable frames in {path}")
+
+    return np.stack(frames), width, height, fps, frame_count
+
+
+@lru_cache(maxsize=1)
+def _dct_matrix(n: int = 32) -> np.ndarray:
+    """Unnormalized DCT-II basis (scale doesn't affect a median threshold)."""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    return np.cos(np.pi * k * (2 * i + 1) / (2 * n))
+
+
+def _luma(frames: np.ndarray) -> np.ndarray:
+    """ITU-R 601 luma, as PIL's "L" conversion computes it."""
+    return frames[..., :3].astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def phash_frames(gray: np.ndarray) -> np.ndarray:
+    """
+    64-bit perceptual hashes of grayscale frames.
+
+    Args:
+        gray: (K, H, W) luma with H and W multiples of 32
+
+    Returns:
+        (K,) uint64 hashes, first DCT coefficient in the highest bit
+    """
+    k, h, w = gray.shape
+    small = gray.reshape(k, 32, h // 32, 32, w // 32).mean(axis=(2, 4))
+    dct = _dct_matrix()
+    coefficients = (dct @ small @ dct.T)[:, :8, :8].reshape(k, 64)
+    bits = coefficients > np.median(coefficients, axis=1, keepdims=True)
+    weights = np.uint64(1) << np.arange(63, -1, -1, dtype=np.uint64)
+    return (bits.astype(np.uint64) * weights).sum(axis=1, dtype=np.uint64)
+
+
+def combine_hashes(hashes: np.ndarray) -> int:
+    """Bitwise majority of several 64-bit hashes."""
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    shifts = np.arange(64, dtype=np.uint64)
+    votes = ((hashes[:, None] >> shifts) & np.uint64(1)).sum(axis=0)
+    bits = votes * 2 > len(hashes)
+    return int(sum(1 << int(i) for i in np.flatnonzero(bits)))
+
+
+def color_histogram(frames: np.ndarray, bins: int = HISTOGRAM_BINS) -> np.ndarray:
+    """Normalized joint RGB histogram over all frames."""
+    quantized = (frames[..., :3].astype(np.uint16) * bins) >> 8
+    codes = (quantized[..., 0] * bins + quantized[..., 1]) * bins + quantized[..., 2]
+    counts = np.bincount(codes.ravel(), minlength=bins ** 3).astype(np.float64)
+    return counts / counts.sum()
+
+
+def quality_score(width: int, height: int, fps: float, duration: float) -> float:
+    """
+    Ingest quality score from 0.0 to 1.0.
+
+    Weighs resolution against 1080p (50%), frame rate against 30 fps (30%)
+    and duration against a 10 second ideal (20%).
+    """
+    resolution_score = min((width * height) / (1920 * 1080), 1.0)
+    fps_score = min(fps / 30.0, 1.0)
+    duration_score = min(duration / 10.0, 1.0)
+    return resolution_score * 0.5 + fps_score * 0.3 + duration_score * 0.2
+
+
+def fingerprint_frames(
+    path: str,
+    frames: np.ndarray,
+    width: int,
+    height: int,
+    fps: float,
+    frame_count: int,
+) -> VideoFingerprint:
+    """
+    Fingerprint sampled frames.
+
+    Args:
+        path: Video file the frames came from
+        frames: (K, h, w, 3) uint8 RGB frames at ANALYSIS_SIZE
+        width: Source width
+        height: Source height
+        fps: Source frame rate
+        frame_count: Source frame count
+
+    Returns:
+        VideoFingerprint
+    """
+    gray = _luma(frames)
+    hashes = phash_frames(gray)
+
+    # 4-neighbour Laplacian on the interior of every frame at once
+    laplacian = (
+        gray[:, :-2, 1:-1] + gray[:, 2:, 1:-1] + gray[:, 1:-1, :-2] + gray[:, 1:-1, 2:]
+        - 4 * gray[:, 1:-1, 1:-1]
+    )
+
+    duration = frame_count / fps if fps > 0 else 0.0
+    return VideoFingerprint(
+        path=path,
+        phash=f"{combine_hashes(hashes):016x}",
+        frame_hashes=[f"{int(h):016x}" for h in hashes],
+        color_histogram=color_histogram(frames).tolist(),
+        width=width,
+        height=height,
+        fps=fps,
+        duration=duration,
+        brightness=float(gray.mean()),
+        contrast=float(gray.std(axis=(1, 2)).mean()),
+        sharpness=float(laplacian.var(axis=(1, 2)).mean()),
+        quality_score=quality_score(width, height, fps, duration),
+    )
+
+
+def compute_fingerprint(
+    path: str,
+    frames: int = 8,
+    reader: FrameReader = read_frames,
+) -> VideoFingerprint:
+    """
+    Open a video once and fingerprint it (runs in worker processes).
+
+    Args:
+        path: Video file
+        frames: Frames to sample
+        reader: Frame reader (module-level, so it pickles)
+
+    Returns:
+        VideoFingerprint
+
+    Raises:
+        FingerprintError: If the video can't be read
+    """
+    sampled, width, height, fps, frame_count = reader(path, frames)
+    return fingerprint_frames(path, sampled, width, height, fps, frame_count)
+
+
+class VideoFingerprinter:
+    """
+    Fingerprints videos in a process pool.
+
+    Decoding and hashing are CPU-bound and hold the GIL, so they run in
+    worker processes; awaiting a fingerprint leaves the event loop free
+    for downloads.
+    """
+
+    def __init__(
+        self,
+        frames: int = 8,
+        max_workers: Optional[int] = None,
+        reader: FrameReader = read_frames,
+    ):
+        """
+        Initialize video fingerprinter.
+
+        Args:
+            frames: Frames sampled per video
+            max_workers: Worker processes (default: CPU count)
+            reader: Frame reader, must be a picklable module-level function
+        """
+        self.frames = frames
+        self.max_workers = max_workers
+        self.reader = reader
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    async def fingerprint(self, path: Union[str, Path]) -> VideoFingerprint:
+        """
+        Fingerprint one video.
+
+        Args:
+            path: Video file
+
+        Returns:
+            VideoFingerprint
+
+        Raises:
+            FingerprintError: If the video can't be read
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_pool(),
+            # The worker's span joins the caller's trace
+            partial(
+                run_traced, inject(), "asset.fingerprint",
+                compute_fingerprint, str(path), self.frames, self.reader,
+            ),
+        )
+
+    async def fingerprint_many(
+        self,
+        paths: Sequence[Union[str, Path]],
+    ) -> List[Union[VideoFingerprint, BaseException]]:
+        """
+        Fingerprint videos concurrently across the pool.
+
+        Returns:
+            Fingerprints in input order; failures are returned in place
+        """
+        return await asyncio.gather(
+            *(self.fingerprint(path) for path in paths),
+            return_exceptions=True,
+        )
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,408 @@
+"""
+Faceless YouTube - Local Asset Library
+
+Full-text search over assets we have already downloaded, so searches are
+answered from disk before any remote API is asked:
+- SQLite FTS5 index over titles, descriptions, tags and niche categories
+  (Porter stemming, BM25 ranking weighted by quality score)
+- Registered with ScraperManager as the highest-priority source; remote
+  scrapers only fill whatever the library can't
+- Updated incrementally as downloads finish, plus a bulk import of the
+  manifest written by ``scripts/populate_assets.py``
+
+Usage:
+    library = LocalLibraryScraper(Path("assets/asset_library.sqlite3"))
+    library.import_manifest(Path("assets/asset_manifest.json"))
+    manager.register_scraper(library, ScraperPriority.LOCAL)
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .base_scraper import (
+    BaseScraper,
+    ScraperConfig,
+    AssetType,
+    AssetMetadata,
+)
+from src.utils.cache import CacheManager
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS local_assets (
+    id INTEGER PRIMARY KEY,
+    asset_key TEXT NOT NULL UNIQUE,
+    asset_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    path TEXT NOT NULL,
+    url TEXT NOT NULL,
+    title TEXT,
+    description TEXT,
+    tags TEXT NOT NULL DEFAULT '',
+    category TEXT,
+    duration REAL,
+    width INTEGER,
+    height INTEGER,
+    file_size INTEGER,
+    quality_score REAL NOT NULL DEFAULT 0,
+    sha256 TEXT,
+    license TEXT,
+    attribution_required INTEGER NOT NULL DEFAULT 1,
+    commercial_use INTEGER NOT NULL DEFAULT 0,
+    creator_name TEXT,
+    added_at REAL NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS local_assets_fts USING fts5(
+    title, description, tags, category,
+    content='local_assets', content_rowid='id',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS local_assets_ai AFTER INSERT ON local_assets BEGIN
+    INSERT INTO local_assets_fts (rowid, title, description, tags, category)
+    VALUES (new.id, new.title, new.description, new.tags, new.category);
+END;
+
+CREATE TRIGGER IF NOT EXISTS local_assets_ad AFTER DELETE ON local_assets BEGIN
+    INSERT INTO local_assets_fts (local_assets_fts, rowid, title, description, tags, category)
+    VALUES ('delete', old.id, old.title, old.description, old.tags, old.category);
+END;
+
+CREATE TRIGGER IF NOT EXISTS local_assets_au AFTER UPDATE ON local_assets BEGIN
+    INSERT INTO local_assets_fts (local_assets_fts, rowid, title, description, tags, category)
+    VALUES ('delete', old.id, old.title, old.description, old.tags, old.category);
+    INSERT INTO local_assets_fts (rowid, title, description, tags, category)
+    VALUES (new.id, new.title, new.description, new.tags, new.category);
+END;
+"""
+
+_COLUMNS = [
+    "asset_key", "asset_id", "source", "asset_type", "path", "url", "title",
+    "description", "tags", "category", "duration", "width", "height",
+    "file_size", "quality_score", "sha256", "license",
+    "attribution_required", "commercial_use", "creator_name", "added_at",
+]
+
+# Values for columns missing from rows passed to add_many
+_DEFAULTS = {
+    "tags": "",
+    "quality_score": 0.0,
+    "attribution_required": 1,
+    "commercial_use": 0,
+}
+
+# BM25 column weights: title, description, tags, category
+_BM25_WEIGHTS = (3.0, 1.0, 2.0, 2.0)
+
+# Tags are stored one per line (FTS tokenizes across the newlines)
+_TAG_SEPARATOR = "\n"
+
+
+def _match_expression(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query matching any of its words."""
+    words = re.findall(r"\w+", query.lower())
+    if not words:
+        return None
+    return " OR ".join(f'"{word}"' for word in dict.fromkeys(words))
+
+
+class LocalLibraryScraper(BaseScraper):
+    """
+    Searches the local asset library instead of a remote API.
+
+    Lookups are a single FTS5 query against a local SQLite file and return
+    in milliseconds, so results are not cached and no rate limit applies.
+    Results carry the file's location in ``local_path``.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = Path("assets/asset_library.sqlite3"),
+        config: Optional[ScraperConfig] = None,
+        cache_manager: Optional[CacheManager] = None,
+        quality_weight: float = 1.0,
+    ):
+        """
+        Initialize local library scraper.
+
+        Args:
+            db_path: SQLite database file (":memory:" for a transient library)
+            config: Scraper config (caching is off by default)
+            cache_manager: Optional cache manager instance
+            quality_weight: How strongly quality scores boost text relevance
+        """
+        super().__init__(config or ScraperConfig(cache_enabled=False), cache_manager)
+        self.db_path = db_path
+        self.quality_weight = quality_weight
+
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    @property
+    def source_name(self) -> str:
+        return "local"
+
+    @property
+    def base_url(self) -> str:
+        return Path(self.db_path).as_uri() if str(self.db_path) != ":memory:" else ""
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM local_assets").fetchone()[0]
+
+    async def search(
+        self,
+        query: str,
+        asset_type: AssetType,
+        limit: int = 20,
+        **kwargs
+    ) -> List[AssetMetadata]:
+        """
+        Search the local library.
+
+        Args:
+            query: Search query (any word may match; more matches rank higher)
+            asset_type: Type of assets to search for
+            limit: Max results
+            **kwargs: Additional filters:
+                - category: Niche category (e.g., 'meditation')
+                - min_quality: Minimum quality score (0.0 to 1.0)
+                - min_duration: Minimum duration in seconds
+
+        Returns:
+            List of asset metadata, best match first
+        """
+        expression = _match_expression(query)
+        if expression is None:
+            return []
+
+        sql = (
+            "SELECT a.*, bm25(local_assets_fts, ?, ?, ?, ?) AS rank "
+            "FROM local_assets_fts JOIN local_assets a ON a.id = local_assets_fts.rowid "
+            "WHERE local_assets_fts MATCH ? AND a.asset_type = ?"
+        )
+        params: List[Any] = [*_BM25_WEIGHTS, expression, asset_type.value]
+
+        if kwargs.get("category"):
+            sql += " AND a.category = ?"
+            params.append(kwargs["category"])
+        if kwargs.get("min_quality") is not None:
+            sql += " AND a.quality_score >= ?"
+            params.append(kwargs["min_quality"])
+        if kwargs.get("min_duration") is not None:
+            sql += " AND a.duration >= ?"
+            params.append(kwargs["min_duration"])
+
+        # BM25 scores are negative (lower is better); quality scales them up
+        sql += " ORDER BY rank * (1.0 + ? * a.quality_score) LIMIT ?"
+        params.extend([self.quality_weight, limit])
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        # Files deleted behind the library's back are skipped
+        return [self._row_to_metadata(row) for row in rows if Path(row["path"]).exists()]
+
+    def add(
+        self,
+        path: Path,
+        asset: AssetMetadata,
+        quality_score: float = 0.0,
+        category: Optional[str] = None,
+        sha256: Optional[str] = None,
+    ) -> None:
+        """
+        Add or update one downloaded asset.
+
+        Args:
+            path: Where the file is stored locally
+            asset: Metadata returned by the source that provided it
+            quality_score: Ingest quality score (0.0 to 1.0)
+            category: Niche category
+            sha256: Content hash, if known
+        """
+        self.add_many([self._asset_row(path, asset, quality_score, category, sha256)])
+
+    def add_many(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add or update assets from column dicts in one transaction.
+
+        Args:
+            rows: Dicts keyed by column name (missing columns get defaults)
+
+        Returns:
+            Number of assets written
+        """
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in _COLUMNS if c != "asset_key")
+        now = time.time()
+        values = []
+        for row in rows:
+            row = {**_DEFAULTS, "added_at": now, **row}
+            values.append([row.get(c) for c in _COLUMNS])
+
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT INTO local_assets ({', '.join(_COLUMNS)}) "  # nosec B608
+                f"VALUES ({placeholders}) "
+                f"ON CONFLICT(asset_key) DO UPDATE SET {updates}",
+                values
+            )
+            self._conn.commit()
+
+        return len(values)
+
+    def remove(self, source: str, asset_id: str) -> bool:
+        """Remove an asset from the library."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM local_assets WHERE asset_key = ?",
+                (f"{source}:{asset_id}",)
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def get_path(self, source: str, asset_id: str) -> Optional[Path]:
+        """Local file of an asset, if the library holds it."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT path FROM local_assets WHERE asset_key = ?",
+                (f"{source}:{asset_id}",)
+            ).fetchone()
+        return Path(row["path"]) if row else None
+
+    def import_manifest(self, manifest_path: Path) -> int:
+        """
+        Import the manifest written by ``scripts/populate_assets.py``.
+
+        Args:
+            manifest_path: Path to asset_manifest.json
+
+        Returns:
+            Number of assets imported
+        """
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        count = self.add_manifest_entries(manifest.get("assets", []))
+        logger.info(f"Imported {count} assets from {manifest_path}")
+        return count
+
+    def add_manifest_entries(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """
+        Add assets described by ``populate_assets.py`` manifest entries.
+
+        Args:
+            entries: Manifest asset dicts (url, source, asset_id, category, file_path, ...)
+
+        Returns:
+            Number of assets written
+        """
+        rows = []
+        for entry in entries:
+            width = height = None
+            if entry.get("resolution") and "x" in entry["resolution"]:
+                width, height = (int(v) for v in entry["resolution"].split("x", 1))
+
+            filename = entry.get("filename") or Path(entry["file_path"]).name
+            # Key by the provider's id so remote results for the same clip match
+            asset_id = str(entry.get("asset_id") or filename)
+            rows.append({
+                "asset_key": f"{entry['source']}:{asset_id}",
+                "asset_id": asset_id,
+                "source": entry["source"],
+                "asset_type": entry.get("asset_type", AssetType.VIDEO.value),
+                "path": entry["file_path"],
+                "url": entry["url"],
+                "title": Path(filename).stem.replace("_", " "),
+                "tags": _TAG_SEPARATOR.join(entry.get("tags") or []),
+                "category": entry.get("category"),
+                "duration": entry.get("duration"),
+                "width": width,
+                "height": height,
+                "file_size": entry.get("file_size"),
+                "quality_score": entry.get("quality_score") or 0.0,
+            })
+
+        return self.add_many(rows)
+
+    async def close(self) -> None:
+        """Close the database connection."""
+        await super().close()
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _asset_row(
+        path: Path,
+        asset: AssetMetadata,
+        quality_score: float,
+        category: Optional[str],
+        sha256: Optional[str],
+    ) -> Dict[str, Any]:
+        """Column values for an asset."""
+        return {
+            "asset_key": f"{asset.source}:{asset.asset_id}",
+            "asset_id": asset.asset_id,
+            "source": asset.source,
+            "asset_type": asset.asset_type.value,
+            "path": str(path),
+            "url": str(asset.url),
+            "title": asset.title,
+            "description": asset.description,
+            "tags": _TAG_SEPARATOR.join(asset.tags),
+            "category": category,
+            "duration": asset.duration,
+            "width": asset.width,
+            "height": asset.height,
+            "file_size": asset.file_size,
+            "quality_score": quality_score,
+            "sha256": sha256,
+            "license": asset.license,
+            "attribution_required": int(asset.attribution_required),
+            "commercial_use": int(asset.commercial_use),
+            "creator_name": asset.creator_name,
+            "added_at": time.time(),
+        }
+
+    def _row_to_metadata(self, row: sqlite3.Row) -> AssetMetadata:
+        """Convert a database row into AssetMetadata."""
+        return AssetMetadata(
+            asset_id=row["asset_id"],
+            source=row["source"],
+            asset_type=AssetType(row["asset_type"]),
+            url=row["url"],
+            title=row["title"],
+            description=row["description"],
+            tags=row["tags"].split(_TAG_SEPARATOR) if row["tags"] else [],
+            duration=round(row["duration"]) if row["duration"] is not None else None,
+            width=row["width"],
+            height=row["height"],
+            file_size=row["file_size"],
+            format=Path(row["path"]).suffix.lstrip(".") or None,
+            creator_name=row["creator_name"],
+            license=row["license"] or "unknown",
+            attribution_required=bool(row["attribution_required"]),
+            commercial_use=bool(row["commercial_use"]),
+            local_path=row["path"],
+            sha256=row["sha256"],
+            quality_score=row["quality_score"],
+        )
@@ -108,7 +108,12 @@ class PexelsScraper(BaseScraper):
         
         # Make request
         url = f"{self.base_url}/videos/search?{urlencode(params)}"
-        response = await self._make_request("GET", url, headers=self._get_headers())
+        response = await self._make_request(
+            "GET",
+            url,
+            cost=self._request_cost(AssetType.VIDEO),
+            headers=self._get_headers()
+        )
         
         # Parse results
         results = []
@@ -169,7 +174,12 @@ class PexelsScraper(BaseScraper):
         
         # Make request
         url = f"{self.base_url}/v1/search?{urlencode(params)}"
-        response = await self._make_request("GET", url, headers=self._get_headers())
+        response = await self._make_request(
+            "GET",
+            url,
+            cost=self._request_cost(AssetType.IMAGE),
+            headers=self._get_headers()
+        )
         
         # Parse results
         results = []
@@ -235,7 +245,12 @@ class PexelsScraper(BaseScraper):
             params["max_duration"] = max_duration
         
         url = f"{self.base_url}/videos/popular?{urlencode(params)}"
-        response = await self._make_request("GET", url, headers=self._get_headers())
+        response = await self._make_request(
+            "GET",
+            url,
+            cost=self._request_cost(AssetType.VIDEO),
+            headers=self._get_headers()
+        )
         
         # Parse results (same as search)
         results = []
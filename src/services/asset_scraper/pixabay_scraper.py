@@ -107,7 +107,9 @@ class PixabayScraper(BaseScraper):
         
         # Make request
         url = f"{self.base_url}/videos/?{urlencode(params)}"
-        response = await self._make_request("GET", url)
+        response = await self._make_request(
+            "GET", url, cost=self._request_cost(AssetType.VIDEO)
+        )
         
         # Parse results
         results = []
@@ -198,7 +200,9 @@ class PixabayScraper(BaseScraper):
             params["min_height"] = min_height
         
         url = f"{self.base_url}/?{urlencode(params)}"
-        response = await self._make_request("GET", url)
+        response = await self._make_request(
+            "GET", url, cost=self._request_cost(AssetType.IMAGE)
+        )
         
         results = []
         for image in response.get("hits", []):
@@ -253,7 +257,9 @@ class PixabayScraper(BaseScraper):
         
         # Note: Pixabay music API is at /music/ endpoint
         url = f"https://pixabay.com/api/music/?{urlencode(params)}"
-        response = await self._make_request("GET", url)
+        response = await self._make_request(
+            "GET", url, cost=self._request_cost(AssetType.AUDIO)
+        )
         
         results = []
         for audio in response.get("hits", []):
@@ -5,7 +5,8 @@ Manages multiple asset scrapers with failover and load balancing.
 """
 
 import asyncio
-from typing import Dict, List, Optional, Set, Any
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Any, Union
 from enum import Enum
 
 from .base_scraper import (
@@ -17,16 +18,27 @@ from .base_scraper import (
 from .pexels_scraper import PexelsScraper
 from .pixabay_scraper import PixabayScraper
 from .unsplash_scraper import UnsplashScraper
+from .downloader import AssetDownloader, DownloadConfig, DownloadResult
+from .local_library import LocalLibraryScraper
 from src.utils.cache import CacheManager
 
 
 class ScraperPriority(str, Enum):
     """Priority levels for scrapers"""
+    LOCAL = "local"  # Local library: searched first, remote sources fill gaps
     HIGH = "high"
     MEDIUM = "medium"
     LOW = "low"
 
 
+_PRIORITY_ORDER = {
+    ScraperPriority.LOCAL: 0,
+    ScraperPriority.HIGH: 1,
+    ScraperPriority.MEDIUM: 2,
+    ScraperPriority.LOW: 3,
+}
+
+
 class ScraperManager:
     """
     Manages multiple asset scrapers with:
@@ -34,18 +46,34 @@ class ScraperManager:
     - Load balancing
     - Health monitoring
     - Unified search interface
+    - Hedged search across sources
+    - Streaming, resumable asset downloads
     """
     
-    def __init__(self, cache_manager: Optional[CacheManager] = None):
+    def __init__(
+        self,
+        cache_manager: Optional[CacheManager] = None,
+        downloader: Optional[AssetDownloader] = None,
+        hedge_delay: float = 1.0,
+        asset_matcher=None,
+    ):
         """
         Initialize scraper manager.
         
         Args:
             cache_manager: Optional cache manager instance
+            downloader: Optional asset downloader (created on first download)
+            hedge_delay: Seconds to wait on a source with no latency history
+                before hedging to the next one
+            asset_matcher: Optional AssetMatcher whose persisted index
+                downloads are added to (by title, description and tags)
         """
         self.cache_manager = cache_manager or CacheManager()
         self.scrapers: Dict[str, BaseScraper] = {}
         self.priorities: Dict[str, ScraperPriority] = {}
+        self.downloader = downloader
+        self.hedge_delay = hedge_delay
+        self.asset_matcher = asset_matcher
         self._initialized = False
     
     def register_scraper(
@@ -71,6 +99,9 @@ class ScraperManager:
         """
         Get all healthy scrapers that support the given asset type.
         
+        Scrapers with an open circuit are left out until their cooldown
+        ends; recovering (half-open) scrapers are included last.
+        
         Args:
             asset_type: Type of assets needed
         
@@ -80,21 +111,17 @@ class ScraperManager:
         healthy = []
         
         for source_name, scraper in self.scrapers.items():
-            # Check health
-            if not scraper.health_monitor.is_healthy:
+            # Skip open circuits; half-open ones get probe requests
+            if not scraper.health_monitor.is_available:
                 continue
             
             # Check if scraper supports this asset type
             # (We'll try and let it fail gracefully if not supported)
             healthy.append((scraper, self.priorities.get(source_name, ScraperPriority.MEDIUM)))
         
-        # Sort by priority (HIGH > MEDIUM > LOW)
-        priority_order = {
-            ScraperPriority.HIGH: 0,
-            ScraperPriority.MEDIUM: 1,
-            ScraperPriority.LOW: 2,
-        }
-        healthy.sort(key=lambda x: priority_order[x[1]])
+        # Sort by priority (LOCAL > HIGH > MEDIUM > LOW); half-open scrapers
+        # go after closed ones
+        healthy.sort(key=lambda x: (not x[0].health_monitor.is_healthy, _PRIORITY_ORDER[x[1]]))
         
         return [scraper for scraper, _ in healthy]
     
@@ -110,6 +137,9 @@ class ScraperManager:
         """
         Search for assets across multiple scrapers with automatic failover.
         
+        The local library (if registered) is asked for the full limit first;
+        remote scrapers only fill the remaining gap.
+        
         Args:
             query: Search query
             asset_type: Type of assets to search for
@@ -132,20 +162,36 @@ class ScraperManager:
         
         # Try each scraper until we get results
         all_results = []
-        per_scraper_limit = max(1, limit // len(scrapers))
-        
-        for scraper in scrapers:
+        local = [s for s in scrapers if self.priorities.get(s.source_name) == ScraperPriority.LOCAL]
+        remote = [s for s in scrapers if s not in local]
+        per_scraper_limit = None
+        local_keys: Set[tuple] = set()
+        
+        for scraper in local + remote:
+            if scraper in local:
+                scraper_limit = limit - len(all_results)
+            else:
+                if per_scraper_limit is None:
+                    # Remote scrapers split whatever the local library didn't cover
+                    per_scraper_limit = max(1, (limit - len(all_results)) // len(remote))
+                scraper_limit = per_scraper_limit
+            
             try:
                 if use_cache:
                     results = await scraper.search_with_cache(
-                        query, asset_type, per_scraper_limit, **kwargs
+                        query, asset_type, scraper_limit, **kwargs
                     )
                 else:
                     results = await scraper.search(
-                        query, asset_type, per_scraper_limit, **kwargs
+                        query, asset_type, scraper_limit, **kwargs
                     )
                 
-                all_results.extend(results)
+                # Skip remote copies of assets the library already holds
+                all_results.extend(
+                    r for r in results if (r.source, r.asset_id) not in local_keys
+                )
+                if scraper in local:
+                    local_keys.update((r.source, r.asset_id) for r in results)
                 
                 # If we have enough results, stop
                 if len(all_results) >= limit:
@@ -223,6 +269,113 @@ class ScraperManager:
         
         return all_results[:limit]
     
+    def _hedge_order(self, scrapers: List[BaseScraper], asset_type: AssetType) -> List[BaseScraper]:
+        """
+        Order scrapers for a hedged search.
+        
+        Sources that would have to wait for rate limit capacity go last,
+        then recovering (half-open) sources; the rest are ordered by
+        priority and, within a priority, by their observed p90 latency.
+        """
+        def sort_key(scraper: BaseScraper):
+            quota_wait = scraper.rate_limiter.delay(scraper._request_cost(asset_type))
+            priority = self.priorities.get(scraper.source_name, ScraperPriority.MEDIUM)
+            return (
+                quota_wait > 0,
+                quota_wait,
+                not scraper.health_monitor.is_healthy,
+                _PRIORITY_ORDER[priority],
+                self._hedge_delay_for(scraper),
+            )
+        
+        return sorted(scrapers, key=sort_key)
+    
+    def _hedge_delay_for(self, scraper: BaseScraper) -> float:
+        """Seconds to give a scraper before hedging: its p90 latency"""
+        p90 = scraper.health_monitor.p90_latency
+        return self.hedge_delay if p90 is None else p90
+    
+    async def search_hedged(
+        self,
+        query: str,
+        asset_type: AssetType,
+        limit: int = 20,
+        sources: Optional[List[str]] = None,
+        use_cache: bool = True,
+        **kwargs
+    ) -> List[AssetMetadata]:
+        """
+        Search the preferred source, hedging to the next when it is slow.
+        
+        Only the best source is queried at first. If it hasn't answered
+        within its p90 latency, or it fails, the next source is started
+        too, and so on; results are taken from whichever sources answer
+        first until ``limit`` is met. Sources still running then are
+        abandoned (a cached search still completes and fills the cache).
+        Throttled and slow sources are tried last automatically.
+        
+        Args:
+            query: Search query
+            asset_type: Type of assets to search for
+            limit: Maximum total results
+            sources: Optional list of source names to use
+            use_cache: Whether to use caching
+            **kwargs: Additional search parameters
+        
+        Returns:
+            List of asset metadata in arrival order
+        """
+        if sources:
+            scrapers = [self.scrapers[name] for name in sources if name in self.scrapers]
+        else:
+            scrapers = self.get_healthy_scrapers(asset_type)
+        
+        if not scrapers:
+            raise ValueError(f"No healthy scrapers available for {asset_type}")
+        
+        queue = self._hedge_order(scrapers, asset_type)
+        loop = asyncio.get_running_loop()
+        running: Dict[asyncio.Task, BaseScraper] = {}
+        all_results: List[AssetMetadata] = []
+        hedge_at = 0.0
+        
+        def start_next() -> None:
+            nonlocal hedge_at
+            scraper = queue.pop(0)
+            search = scraper.search_with_cache if use_cache else scraper.search
+            task = asyncio.ensure_future(search(query, asset_type, limit, **kwargs))
+            running[task] = scraper
+            hedge_at = loop.time() + self._hedge_delay_for(scraper)
+        
+        start_next()
+        try:
+            while running:
+                timeout = max(0.0, hedge_at - loop.time()) if queue else None
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                
+                failed = False
+                for task in done:
+                    scraper = running.pop(task)
+                    try:
+                        all_results.extend(task.result())
+                    except Exception as e:
+                        print(f"Scraper {scraper.source_name} failed: {e}")
+                        failed = True
+                
+                if len(all_results) >= limit:
+                    break
+                
+                # Hedge when the newest source is overdue, one failed, or none are left
+                if queue and (not done or failed or not running):
+                    start_next()
+        finally:
+            for task in running:
+                task.cancel()
+        
+        return all_results[:limit]
+    
     async def get_diverse_results(
         self,
         query: str,
@@ -284,6 +437,82 @@ class ScraperManager:
         
         return diverse_results
     
+    async def download(
+        self,
+        assets: List[AssetMetadata],
+        config: Optional[DownloadConfig] = None,
+    ) -> List[Union[DownloadResult, BaseException]]:
+        """
+        Download scraped assets into the content-addressed store.
+        
+        Downloads share one connection pool and are limited per source;
+        interrupted downloads resume where they stopped. Assets served by
+        the local library are not downloaded again, and finished downloads
+        are added to the library so later searches find them locally (and
+        to the asset matcher's index, so scenes can be matched to them).
+        
+        Args:
+            assets: Assets returned by a search
+            config: Downloader config, used if no downloader exists yet
+        
+        Returns:
+            DownloadResult per asset, or the exception that asset failed with
+        """
+        if self.downloader is None:
+            self.downloader = AssetDownloader(config)
+        
+        results: List[Union[DownloadResult, BaseException, None]] = [None] * len(assets)
+        remote = []
+        for i, asset in enumerate(assets):
+            if asset.local_path and Path(asset.local_path).exists():
+                # Files imported from a manifest weren't hashed on ingest
+                sha256 = asset.sha256 or (
+                    await self.downloader._hash_existing(Path(asset.local_path))
+                ).hexdigest()
+                results[i] = DownloadResult(
+                    url=str(asset.url),
+                    source=asset.source,
+                    asset_id=asset.asset_id,
+                    path=asset.local_path,
+                    sha256=sha256,
+                    size=Path(asset.local_path).stat().st_size,
+                    attempts=0,
+                    deduplicated=True,
+                )
+            else:
+                remote.append(i)
+        
+        downloaded = await self.downloader.download_many([assets[i] for i in remote])
+        library = self.local_library
+        descriptions: Dict[Path, str] = {}
+        for i, result in zip(remote, downloaded):
+            results[i] = result
+            if not isinstance(result, DownloadResult):
+                continue
+            if library is not None:
+                library.add(
+                    Path(result.path),
+                    assets[i],
+                    quality_score=assets[i].quality_score or 0.0,
+                    sha256=result.sha256,
+                )
+            description = assets[i].describe()
+            if description:
+                descriptions[Path(result.path)] = description
+        
+        if self.asset_matcher is not None and descriptions:
+            await self.asset_matcher.index_assets(descriptions)
+        
+        return results
+    
+    @property
+    def local_library(self) -> Optional[LocalLibraryScraper]:
+        """The registered local library, if any"""
+        for scraper in self.scrapers.values():
+            if isinstance(scraper, LocalLibraryScraper):
+                return scraper
+        return None
+    
     def get_health_status(self) -> Dict[str, Any]:
         """Get health status of all scrapers"""
         status = {}
@@ -300,6 +529,9 @@ class ScraperManager:
         """Close all scrapers"""
         for scraper in self.scrapers.values():
             await scraper.close()
+        
+        if self.downloader is not None:
+            await self.downloader.close()
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -316,6 +548,7 @@ def create_scraper_manager(
     pixabay_api_key: Optional[str] = None,
     unsplash_api_key: Optional[str] = None,
     cache_manager: Optional[CacheManager] = None,
+    local_library_path: Optional[Path] = None,
 ) -> ScraperManager:
     """
     Create a scraper manager with all available scrapers.
@@ -325,12 +558,20 @@ def create_scraper_manager(
         pixabay_api_key: Pixabay API key
         unsplash_api_key: Unsplash API key
         cache_manager: Optional cache manager
+        local_library_path: SQLite file of the local asset library
     
     Returns:
         Configured ScraperManager instance
     """
     manager = ScraperManager(cache_manager)
     
+    # Register the local library (searched before any remote API)
+    if local_library_path:
+        manager.register_scraper(
+            LocalLibraryScraper(local_library_path, cache_manager=cache_manager),
+            ScraperPriority.LOCAL
+        )
+    
     # Register Pexels (HIGH priority - great videos, no attribution)
     if pexels_api_key:
         pexels_config = ScraperConfig(
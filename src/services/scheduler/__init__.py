@@ -14,6 +14,8 @@ Components:
 - JobExecutor: Executes background jobs with retry logic
 - RecurringScheduler: Handles recurring schedule patterns
 - CalendarManager: Manages content calendar and planning
+- AdmissionController: Packs work into the host's CPU/memory/disk capacity
+- AssetPrefetcher: Downloads assets for upcoming content ahead of time
 
 Usage:
     from services.scheduler import ContentScheduler, ScheduleConfig
@@ -52,6 +54,13 @@ from .job_executor import (
     RetryStrategy
 )
 
+from .resource_scheduler import (
+    AdmissionController,
+    ResourceRequest,
+    detect_capacity,
+    estimate_stage_resources
+)
+
 from .recurring_scheduler import (
     RecurringScheduler,
     RecurringConfig,
@@ -70,6 +79,13 @@ from .calendar_manager import (
     ContentSlotStatus
 )
 
+from .asset_prefetcher import (
+    AssetPrefetcher,
+    PrefetchConfig,
+    PrefetchTarget,
+    PrefetchedAssets
+)
+
 __all__ = [
     # Content Scheduler
     "ContentScheduler",
@@ -86,6 +102,12 @@ __all__ = [
     "ExecutionStatus",
     "RetryStrategy",
     
+    # Resource Scheduler
+    "AdmissionController",
+    "ResourceRequest",
+    "detect_capacity",
+    "estimate_stage_resources",
+    
     # Recurring Scheduler
     "RecurringScheduler",
     "RecurringConfig",
@@ -101,6 +123,12 @@ __all__ = [
     "CalendarView",
     "ContentSlot",
     "ContentSlotStatus",
+    
+    # Asset Prefetcher
+    "AssetPrefetcher",
+    "PrefetchConfig",
+    "PrefetchTarget",
+    "PrefetchedAssets",
 ]
 
 __version__ = "1.0.0"
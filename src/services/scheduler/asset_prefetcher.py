@@ -0,0 +1,382 @@
+"""
+Asset Prefetcher
+
+Moves asset search and download out of the job critical path:
+- Scans upcoming calendar slots and predicted recurring runs for topics
+- Searches and downloads their assets ahead of time, off-peak, and only
+  while each source has rate-limit headroom to spare
+- Pins the results until the job for that topic has run, so the job finds
+  its assets locally without any remote I/O
+
+Usage:
+    prefetcher = AssetPrefetcher(
+        scraper_manager,
+        calendar_manager=calendar,
+        recurring_scheduler=recurring,
+    )
+    await prefetcher.start()
+
+    # In the job
+    pinned = await prefetcher.get_pinned(topic)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from src.services.asset_scraper import AssetType, DownloadResult, ScraperManager, ScraperPriority
+from src.services.scheduler.calendar_manager import CalendarManager, ContentSlotStatus
+from src.services.scheduler.recurring_scheduler import RecurringScheduler
+from src.utils.cache import CacheManager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PrefetchConfig:
+    """Asset prefetch configuration"""
+    # Look-ahead
+    horizon_hours: int = 36
+
+    # What to fetch per topic
+    assets_per_topic: int = 10
+    asset_types: List[AssetType] = field(default_factory=lambda: [AssetType.VIDEO])
+
+    # When and how much
+    off_peak_hours: Optional[List[int]] = field(default_factory=lambda: [0, 1, 2, 3, 4, 5])  # UTC; None = any hour
+    budget_fraction: float = 0.5  # Share of a source's rate capacity prefetch may use
+    check_interval_minutes: int = 30
+
+    # Pins outlive the scheduled time by this much, in case the job runs late
+    pin_grace_hours: int = 6
+
+
+class PrefetchTarget(BaseModel):
+    """Upcoming content that needs assets"""
+    key: str  # "slot:<id>" or "recurring:<job id>:<run time>"
+    topic: str
+    scheduled_at: datetime  # UTC
+
+
+class PrefetchedAssets(BaseModel):
+    """Assets downloaded ahead of a topic's job"""
+    topic: str
+    scheduled_at: datetime  # UTC
+    pinned_until: datetime  # UTC
+    assets: List[DownloadResult] = Field(default_factory=list)
+    complete: bool = False  # Every asset type reached assets_per_topic
+
+
+def _utc(dt: datetime) -> datetime:
+    """Timezone-aware UTC (naive datetimes are taken to be UTC)"""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _topic_key(topic: str) -> str:
+    """Cache key for a topic's pinned assets"""
+    digest = hashlib.sha1(topic.strip().lower().encode(), usedforsecurity=False).hexdigest()
+    return f"asset_prefetch:{digest}"
+
+
+class AssetPrefetcher:
+    """
+    Predictive asset prefetcher
+
+    Features:
+    - Topics from reserved/scheduled calendar slots and recurring schedules
+    - Soonest jobs first
+    - Off-peak window and per-source rate budget
+    - Local library is always searched; remote sources only with headroom
+    - Pins held in memory and mirrored to the shared cache
+
+    Example:
+        prefetcher = AssetPrefetcher(manager, calendar_manager=calendar)
+        results = await prefetcher.prefetch(force=True)
+
+        pinned = await prefetcher.get_pinned("Ocean Sounds for Sleep")
+        ...
+        await prefetcher.release("Ocean Sounds for Sleep")
+    """
+
+    def __init__(
+        self,
+        scraper_manager: ScraperManager,
+        calendar_manager: Optional[CalendarManager] = None,
+        recurring_scheduler: Optional[RecurringScheduler] = None,
+        config: Optional[PrefetchConfig] = None,
+        cache_manager: Optional[CacheManager] = None
+    ):
+        self.scraper_manager = scraper_manager
+        self.calendar_manager = calendar_manager
+        self.recurring_scheduler = recurring_scheduler
+        self.config = config or PrefetchConfig()
+        self.cache_manager = cache_manager or scraper_manager.cache_manager
+
+        # Pinned assets by topic key
+        self._pins: Dict[str, PrefetchedAssets] = {}
+
+        self._running = False
+        self._task: Optional[asyncio.Task] = None
+
+        # Statistics
+        self._stats = {
+            "runs": 0,
+            "topics_prefetched": 0,
+            "assets_downloaded": 0,
+            "deferred_no_budget": 0,
+            "failures": 0
+        }
+
+    def upcoming_targets(self, now: Optional[datetime] = None) -> List[PrefetchTarget]:
+        """
+        Topics scheduled within the horizon, soonest first
+
+        Args:
+            now: Current time (default: now)
+
+        Returns:
+            One target per topic, at its earliest scheduled time
+        """
+        now = _utc(now or datetime.now(timezone.utc))
+        until = now + timedelta(hours=self.config.horizon_hours)
+        targets: Dict[str, PrefetchTarget] = {}
+
+        def add(key: str, topic: str, scheduled_at: datetime):
+            scheduled_at = _utc(scheduled_at)
+            if not topic or not now < scheduled_at <= until:
+                return
+            current = targets.get(_topic_key(topic))
+            if current is None or scheduled_at < current.scheduled_at:
+                targets[_topic_key(topic)] = PrefetchTarget(
+                    key=key, topic=topic, scheduled_at=scheduled_at
+                )
+
+        if self.calendar_manager is not None:
+            for slot in self.calendar_manager.get_all_slots():
+                if slot.status in (ContentSlotStatus.RESERVED, ContentSlotStatus.SCHEDULED):
+                    add(f"slot:{slot.id}", slot.topic, slot.scheduled_at)
+
+        if self.recurring_scheduler is not None:
+            for job, run_at, topic in self.recurring_scheduler.get_upcoming_runs(until, now=now):
+                add(f"recurring:{job.id}:{_utc(run_at).isoformat()}", topic, run_at)
+
+        return sorted(targets.values(), key=lambda t: t.scheduled_at)
+
+    def is_off_peak(self, now: Optional[datetime] = None) -> bool:
+        """Whether prefetching may run at this time"""
+        if self.config.off_peak_hours is None:
+            return True
+        return _utc(now or datetime.now(timezone.utc)).hour in self.config.off_peak_hours
+
+    def budgeted_sources(self, asset_type: AssetType) -> List[str]:
+        """
+        Sources prefetch may search right now
+
+        The local library always qualifies; remote sources only while
+        their free rate capacity is above the share reserved for jobs.
+        """
+        reserve = 1.0 - self.config.budget_fraction
+        sources = []
+
+        for scraper in self.scraper_manager.get_healthy_scrapers(asset_type):
+            priority = self.scraper_manager.priorities.get(scraper.source_name)
+            if priority == ScraperPriority.LOCAL or scraper.rate_limiter.headroom > reserve:
+                sources.append(scraper.source_name)
+
+        return sources
+
+    async def prefetch(
+        self,
+        now: Optional[datetime] = None,
+        force: bool = False
+    ) -> List[PrefetchedAssets]:
+        """
+        Prefetch assets for upcoming topics
+
+        Args:
+            now: Current time (default: now)
+            force: Run outside off-peak hours
+
+        Returns:
+            Pins created or topped up by this run
+        """
+        now = _utc(now or datetime.now(timezone.utc))
+        self._expire_pins(now)
+
+        if not force and not self.is_off_peak(now):
+            return []
+
+        self._stats["runs"] += 1
+        results = []
+
+        for target in self.upcoming_targets(now):
+            pin = self._pins.get(_topic_key(target.topic))
+            if pin is not None and pin.complete:
+                continue
+
+            try:
+                pin = await self._prefetch_target(target, pin)
+            except Exception as e:
+                logger.error(f"Prefetch failed for '{target.topic}': {e}")
+                self._stats["failures"] += 1
+                continue
+
+            if pin is None:
+                # Out of budget: later targets would be too
+                self._stats["deferred_no_budget"] += 1
+                break
+
+            results.append(pin)
+
+        if results:
+            logger.info(f"Prefetched assets for {len(results)} upcoming topics")
+
+        return results
+
+    async def _prefetch_target(
+        self,
+        target: PrefetchTarget,
+        pin: Optional[PrefetchedAssets]
+    ) -> Optional[PrefetchedAssets]:
+        """Search, download and pin one topic's assets (None if out of budget)"""
+        have = {(a.source, a.asset_id) for a in pin.assets} if pin else set()
+        assets = list(pin.assets) if pin else []
+        complete = True
+        searched = False
+
+        for asset_type in self.config.asset_types:
+            sources = self.budgeted_sources(asset_type)
+            if not sources:
+                complete = False
+                continue
+
+            searched = True
+            found = await self.scraper_manager.search(
+                target.topic,
+                asset_type,
+                limit=self.config.assets_per_topic,
+                sources=sources
+            )
+            complete = complete and len(found) >= self.config.assets_per_topic
+
+            new = [a for a in found if (a.source, a.asset_id) not in have]
+            downloads = await self.scraper_manager.download(new)
+            for result in downloads:
+                if isinstance(result, DownloadResult):
+                    assets.append(result)
+                    have.add((result.source, result.asset_id))
+                    if not result.deduplicated:
+                        self._stats["assets_downloaded"] += 1
+                else:
+                    complete = False
+
+        if not searched:
+            return None
+
+        pin = PrefetchedAssets(
+            topic=target.topic,
+            scheduled_at=target.scheduled_at,
+            pinned_until=target.scheduled_at + timedelta(hours=self.config.pin_grace_hours),
+            assets=assets,
+            complete=complete
+        )
+        await self._pin(pin)
+        self._stats["topics_prefetched"] += 1
+
+        logger.info(f"Pinned {len(assets)} assets for '{target.topic}' "
+                   f"(due {target.scheduled_at.isoformat()})")
+        return pin
+
+    async def _pin(self, pin: PrefetchedAssets):
+        """Hold a pin in memory and in the shared cache until it expires"""
+        key = _topic_key(pin.topic)
+        self._pins[key] = pin
+
+        ttl = (pin.pinned_until - datetime.now(timezone.utc)).total_seconds()
+        await self.cache_manager.set(key, json.loads(pin.json()), ttl=max(1, int(ttl)))
+
+    async def get_pinned(self, topic: str) -> Optional[PrefetchedAssets]:
+        """
+        Assets prefetched for a topic
+
+        Args:
+            topic: Job topic
+
+        Returns:
+            Pinned assets, or None if nothing was prefetched
+        """
+        key = _topic_key(topic)
+        pin = self._pins.get(key)
+        if pin is not None:
+            return pin
+
+        # Pinned by another process
+        cached = await self.cache_manager.get(key)
+        return PrefetchedAssets(**cached) if cached else None
+
+    async def release(self, topic: str):
+        """Unpin a topic's assets once its job has run"""
+        key = _topic_key(topic)
+        if self._pins.pop(key, None) is not None:
+            logger.debug(f"Released prefetched assets for '{topic}'")
+        await self.cache_manager.delete(key)
+
+    def _expire_pins(self, now: datetime):
+        """Drop pins whose job should long have run"""
+        for key in [k for k, pin in self._pins.items() if pin.pinned_until <= now]:
+            del self._pins[key]
+
+    async def start(self):
+        """Start the background prefetch loop"""
+        if self._running:
+            logger.warning("Prefetcher already running")
+            return
+
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info("Asset prefetcher started")
+
+    async def stop(self):
+        """Stop the background prefetch loop"""
+        if not self._running:
+            return
+
+        self._running = False
+
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("Asset prefetcher stopped")
+
+    async def _run(self):
+        """Prefetch loop"""
+        while self._running:
+            try:
+                await self.prefetch()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Prefetcher error: {e}")
+
+            await asyncio.sleep(self.config.check_interval_minutes * 60)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get prefetcher statistics"""
+        return {
+            "pinned_topics": len(self._pins),
+            "pinned_assets": sum(len(p.assets) for p in self._pins.values()),
+            "statistics": self._stats,
+            "running": self._running
+        }
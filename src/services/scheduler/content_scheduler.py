@@ -12,8 +12,11 @@ Handles scheduling, retry logic, and status tracking.
 
 import asyncio
 import logging
+import os
+import shutil
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Callable
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Callable, AsyncIterator
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -30,6 +33,15 @@ from src.services.youtube_uploader import (
     PrivacyStatus,
     Category
 )
+from src.utils.tracing import current_span, extract, get_tracer, inject
+from src.services.scheduler.resource_scheduler import (
+    AdmissionController,
+    ResourceRequest,
+    estimate_stage_resources,
+)
+
+if TYPE_CHECKING:
+    from src.services.scheduler.asset_prefetcher import AssetPrefetcher
 
 logger = logging.getLogger(__name__)
 
@@ -79,9 +91,13 @@ class ScheduleConfig:
     retry_delay_minutes: int = 10
     
     # Execution settings
-    max_concurrent_jobs: int = 1  # Videos are heavy, process one at a time
+    max_concurrent_jobs: int = 4  # Upper bound; admission control packs by resources
     check_interval_seconds: int = 60
     
+    # Resource admission (stages wait until their CPU/memory/disk fit)
+    enable_admission_control: bool = True
+    resource_headroom: float = 0.1  # Memory/disk fraction kept for the OS
+    
     # YouTube settings
     youtube_account: str = "main"
     default_privacy: PrivacyStatus = PrivacyStatus.PRIVATE
@@ -132,6 +148,12 @@ class ScheduledJob(BaseModel):
     youtube_video_id: Optional[str] = None
     youtube_url: Optional[str] = None
     
+    # Tracing (W3C traceparent of the request that scheduled the job)
+    trace_context: Optional[str] = None
+    
+    # Per-stage resource overrides (stage value -> request), else estimated
+    resources: Dict[str, ResourceRequest] = Field(default_factory=dict)
+    
     # Error tracking
     error_message: Optional[str] = None
     error_stage: Optional[WorkflowStage] = None
@@ -159,7 +181,7 @@ class ContentScheduler:
     - Retry logic with exponential backoff
     - Progress tracking
     - Error handling and recovery
-    - Concurrent job management
+    - Concurrent job management (resource-aware admission)
     - Job cancellation
     - Status monitoring
     
@@ -189,7 +211,9 @@ class ContentScheduler:
         script_generator: Optional[ScriptGenerator] = None,
         video_assembler: Optional[VideoAssembler] = None,
         youtube_auth: Optional[AuthManager] = None,
-        youtube_uploader: Optional[VideoUploader] = None
+        youtube_uploader: Optional[VideoUploader] = None,
+        admission_controller: Optional[AdmissionController] = None,
+        asset_prefetcher: Optional["AssetPrefetcher"] = None
     ):
         self.config = config
         
@@ -213,6 +237,17 @@ class ContentScheduler:
         self._storage_path = Path(config.jobs_storage_path)
         self._storage_path.mkdir(parents=True, exist_ok=True)
         
+        # Resource admission (shareable with a JobExecutor on the same host)
+        self.admission = admission_controller
+        if self.admission is None and config.enable_admission_control:
+            self.admission = AdmissionController(
+                headroom=config.resource_headroom,
+                work_dir=self._storage_path,
+            )
+        
+        # Assets prefetched ahead of jobs are unpinned once the job has run
+        self.asset_prefetcher = asset_prefetcher
+        
         # Statistics
         self._stats = {
             "total_scheduled": 0,
@@ -257,7 +292,8 @@ class ContentScheduler:
             publish_at=publish_at,
             tags=tags or [],
             category=category,
-            privacy_status=privacy_status
+            privacy_status=privacy_status,
+            trace_context=inject()
         )
         
         self._jobs[job.id] = job
@@ -355,7 +391,39 @@ class ContentScheduler:
         await self._save_job(job)
     
     async def _execute_job(self, job: ScheduledJob):
-        """Execute complete workflow"""
+        """Execute complete workflow, continuing the trace it was scheduled in"""
+        with get_tracer().start_span(
+            "scheduler.job",
+            attributes={
+                "job.id": job.id,
+                "job.topic": job.topic,
+                "job.attempt": job.retry_count + 1,
+            },
+            parent=extract(job.trace_context),
+        ):
+            await self._run_workflow(job)
+    
+    @asynccontextmanager
+    async def _reserve_stage(
+        self,
+        job: ScheduledJob,
+        stage: WorkflowStage
+    ) -> AsyncIterator[None]:
+        """Hold the stage's declared (or estimated) resources while it runs"""
+        if self.admission is None:
+            yield
+            return
+        
+        request = job.resources.get(stage.value) or estimate_stage_resources(
+            stage.value,
+            quality=self.config.default_quality,
+            duration_minutes=job.duration_minutes
+        )
+        async with self.admission.reserve(request, name=f"{job.id}:{stage.value}"):
+            yield
+    
+    async def _run_workflow(self, job: ScheduledJob):
+        """Run script generation, assembly and upload for a job"""
         try:
             # Stage 1: Generate Script
             job.status = JobStatus.GENERATING_SCRIPT
@@ -365,11 +433,12 @@ class ContentScheduler:
             
             logger.info(f"[{job.id}] Generating script...")
             
-            script = await self.script_generator.generate(
-                topic=job.topic,
-                style=job.style,
-                duration_minutes=job.duration_minutes
-            )
+            async with self._reserve_stage(job, WorkflowStage.SCRIPT_GENERATION):
+                script = await self.script_generator.generate(
+                    topic=job.topic,
+                    style=job.style,
+                    duration_minutes=job.duration_minutes
+                )
             
             # Save script
             script_path = self._storage_path / f"{job.id}_script.txt"
@@ -389,11 +458,18 @@ class ContentScheduler:
             
             logger.info(f"[{job.id}] Assembling video...")
             
-            video_result = await self.video_assembler.assemble(
-                script_text=script.content,
-                assets_dir=self.config.assets_dir,
-                output_dir=self.config.output_dir
-            )
+            assets_dir = await self._stage_assets(job)
+            
+            async with self._reserve_stage(job, WorkflowStage.VIDEO_ASSEMBLY):
+                video_result = await self.video_assembler.assemble(
+                    script_text=script.content,
+                    assets_dir=assets_dir,
+                    output_dir=self.config.output_dir
+                )
+            
+            qc = getattr(video_result, "qc", None)
+            if qc is not None and not qc.passed:
+                raise RuntimeError(f"Upload blocked: {qc.summary()}")
             
             job.video_path = video_result.output_path
             job.thumbnail_path = video_result.thumbnail_path
@@ -423,12 +499,13 @@ class ContentScheduler:
                 )
                 
                 # Upload
-                upload_result = await self.youtube_uploader.upload(
-                    account_name=self.config.youtube_account,
-                    video_path=job.video_path,
-                    metadata=metadata,
-                    thumbnail_path=job.thumbnail_path
-                )
+                async with self._reserve_stage(job, WorkflowStage.YOUTUBE_UPLOAD):
+                    upload_result = await self.youtube_uploader.upload(
+                        account_name=self.config.youtube_account,
+                        video_path=job.video_path,
+                        metadata=metadata,
+                        thumbnail_path=job.thumbnail_path
+                    )
                 
                 job.youtube_video_id = upload_result.video_id
                 job.youtube_url = upload_result.url
@@ -444,12 +521,18 @@ class ContentScheduler:
             job.progress_percent = 100
             self._stats["total_completed"] += 1
             await self._save_job(job)
+            await self._release_assets(job)
             
             logger.info(f"[{job.id}] Completed successfully!")
         
         except Exception as e:
             logger.error(f"[{job.id}] Job failed: {e}", exc_info=True)
             
+            span = current_span()
+            if span is not None:
+                span.record_exception(e)
+                span.set_attribute("job.error_stage", str(job.current_stage))
+            
             job.retry_count += 1
             job.error_message = str(e)
             job.error_stage = job.current_stage
@@ -470,9 +553,67 @@ class ContentScheduler:
                 job.completed_at = datetime.utcnow()
                 self._stats["total_failed"] += 1
                 await self._save_job(job)
+                await self._release_assets(job)
                 
                 logger.error(f"[{job.id}] Failed permanently after {job.retry_count} retries")
     
+    async def _stage_assets(self, job: ScheduledJob) -> str:
+        """
+        Assets directory for the job's assembly
+        
+        Assets prefetched for the job's topic are linked into a per-job
+        directory so assembly uses them without any remote I/O; without
+        a pin the shared assets directory is used.
+        """
+        if self.asset_prefetcher is None:
+            return self.config.assets_dir
+        
+        try:
+            pin = await self.asset_prefetcher.get_pinned(job.topic)
+        except Exception as e:
+            logger.warning(f"[{job.id}] Failed to look up prefetched assets: {e}")
+            return self.config.assets_dir
+        
+        paths = [Path(a.path) for a in pin.assets] if pin else []
+        if not paths:
+            return self.config.assets_dir
+        
+        staged = self._storage_path / f"{job.id}_assets"
+        loop = asyncio.get_running_loop()
+        count = await loop.run_in_executor(None, self._link_assets, paths, staged)
+        if not count:
+            return self.config.assets_dir
+        
+        logger.info(f"[{job.id}] Using {count} prefetched assets")
+        return str(staged)
+    
+    @staticmethod
+    def _link_assets(paths: List[Path], staged: Path) -> int:
+        """Hard-link (or copy) asset files into a directory"""
+        staged.mkdir(parents=True, exist_ok=True)
+        count = 0
+        for path in paths:
+            if not path.exists():
+                continue
+            target = staged / path.name
+            if not target.exists():
+                try:
+                    os.link(path, target)
+                except OSError:
+                    shutil.copy2(path, target)
+            count += 1
+        return count
+    
+    async def _release_assets(self, job: ScheduledJob):
+        """Unpin the job's prefetched assets and drop its staged copies"""
+        shutil.rmtree(self._storage_path / f"{job.id}_assets", ignore_errors=True)
+        if self.asset_prefetcher is None:
+            return
+        try:
+            await self.asset_prefetcher.release(job.topic)
+        except Exception as e:
+            logger.warning(f"[{job.id}] Failed to release prefetched assets: {e}")
+    
     async def get_job_status(self, job_id: str) -> Optional[ScheduledJob]:
         """Get job status"""
         return self._jobs.get(job_id)
@@ -552,7 +693,8 @@ class ContentScheduler:
             "active_jobs": len(self._active_jobs),
             "status_counts": status_counts,
             "statistics": self._stats,
-            "running": self._running
+            "running": self._running,
+            "resources": self.admission.get_metrics() if self.admission else None
         }
     
     async def _save_job(self, job: ScheduledJob):
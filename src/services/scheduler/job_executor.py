@@ -11,6 +11,8 @@ Background task execution engine with:
 
 import asyncio
 import logging
+import time
+from contextlib import nullcontext
 from typing import Dict, Any, Optional, Callable, List
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -19,6 +21,9 @@ from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
+from src.utils.tracing import bind_context, get_tracer
+from src.services.scheduler.resource_scheduler import AdmissionController, ResourceRequest
+
 logger = logging.getLogger(__name__)
 
 
@@ -103,9 +108,16 @@ class JobExecutor:
             print(f"Success! Result: {result.result_data}")
     """
     
-    def __init__(self, config: ExecutorConfig):
+    def __init__(
+        self,
+        config: ExecutorConfig,
+        admission_controller: Optional[AdmissionController] = None
+    ):
         self.config = config
         
+        # Optional resource admission for jobs that declare their needs
+        self.admission = admission_controller
+        
         # Execution tracking
         self._active_executions: Dict[str, asyncio.Task] = {}
         self._execution_history: Dict[str, ExecutionResult] = {}
@@ -130,7 +142,8 @@ class JobExecutor:
         max_retries: Optional[int] = None,
         retry_strategy: Optional[RetryStrategy] = None,
         timeout: Optional[int] = None,
-        progress_callback: Optional[Callable[[float, str], None]] = None
+        progress_callback: Optional[Callable[[float, str], None]] = None,
+        resources: Optional[ResourceRequest] = None
     ) -> ExecutionResult:
         """
         Execute job with retry logic
@@ -143,6 +156,7 @@ class JobExecutor:
             retry_strategy: Override default retry strategy
             timeout: Override default timeout
             progress_callback: Progress callback(percent, message)
+            resources: Resources held while the job runs (needs an admission controller)
         
         Returns:
             ExecutionResult with status and data
@@ -170,7 +184,12 @@ class JobExecutor:
         while retry_count <= max_retries:
             try:
                 # Wait for slot
-                async with self._semaphore:
+                queued_at = time.monotonic()
+                reservation = (
+                    self.admission.reserve(resources, name=execution_id)
+                    if self.admission and resources else nullcontext()
+                )
+                async with self._semaphore, reservation:
                     result.status = ExecutionStatus.RUNNING
                     
                     # Create task with timeout
@@ -178,7 +197,12 @@ class JobExecutor:
                         self._execute_with_progress(
                             job_func,
                             job_args,
-                            progress_callback
+                            progress_callback,
+                            span_attributes={
+                                "execution.id": execution_id,
+                                "execution.attempt": retry_count + 1,
+                                "execution.queue_seconds": time.monotonic() - queued_at,
+                            }
                         )
                     )
                     
@@ -279,7 +303,8 @@ class JobExecutor:
         self,
         job_func: Callable,
         job_args: Dict[str, Any],
-        progress_callback: Optional[Callable]
+        progress_callback: Optional[Callable],
+        span_attributes: Optional[Dict[str, Any]] = None
     ) -> Any:
         """Execute job with progress tracking"""
         # Add progress callback to args if enabled
@@ -289,13 +314,18 @@ class JobExecutor:
                 "_progress_callback": progress_callback
             }
         
-        # Execute
-        if asyncio.iscoroutinefunction(job_func):
-            return await job_func(**job_args)
-        else:
-            # Run sync function in executor
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, lambda: job_func(**job_args))
+        span_name = f"executor.{getattr(job_func, '__name__', 'job')}"
+        with get_tracer().start_span(span_name, attributes=span_attributes):
+            # Execute
+            if asyncio.iscoroutinefunction(job_func):
+                return await job_func(**job_args)
+            else:
+                # Run sync function in executor (in this trace context)
+                loop = asyncio.get_event_loop()
+                return await loop.run_in_executor(
+                    None,
+                    bind_context(lambda: job_func(**job_args))
+                )
     
     def _calculate_retry_delay(
         self,
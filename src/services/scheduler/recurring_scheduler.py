@@ -11,7 +11,7 @@ Pattern-based scheduling for recurring video creation:
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Callable
+from typing import Dict, Any, Optional, List, Callable, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta, time
 from enum import Enum
@@ -386,9 +386,31 @@ class RecurringScheduler:
     
     async def _schedule_job(self, job: RecurringJob):
         """Schedule job in APScheduler"""
-        rule = job.schedule_rule
+        trigger = self._build_trigger(job.schedule_rule)
         
-        # Create trigger based on pattern
+        # Add job to scheduler
+        apscheduler_job = self._scheduler.add_job(
+            func=self._execute_recurring_job,
+            trigger=trigger,
+            args=[job.id],
+            id=job.id,
+            name=job.name,
+            coalesce=self.config.coalesce,
+            max_instances=self.config.max_instances,
+            misfire_grace_time=self.config.misfire_grace_time
+        )
+        
+        job.apscheduler_job_id = apscheduler_job.id
+        # Get next_run_time from trigger, not job object
+        job.next_run = trigger.get_next_fire_time(None, datetime.now()) if hasattr(trigger, 'get_next_fire_time') else None
+        
+        if job.enabled:
+            self._stats["active_jobs"] += 1
+        
+        logger.info(f"Scheduled: {job.name} - Next run: {job.next_run}")
+    
+    def _build_trigger(self, rule: ScheduleRule):
+        """Create the APScheduler trigger for a schedule rule"""
         if rule.pattern == RecurringPattern.DAILY:
             trigger = CronTrigger(
                 hour=rule.hour,
@@ -436,26 +458,64 @@ class RecurringScheduler:
         else:
             raise ValueError(f"Unknown pattern: {rule.pattern}")
         
-        # Add job to scheduler
-        apscheduler_job = self._scheduler.add_job(
-            func=self._execute_recurring_job,
-            trigger=trigger,
-            args=[job.id],
-            id=job.id,
-            name=job.name,
-            coalesce=self.config.coalesce,
-            max_instances=self.config.max_instances,
-            misfire_grace_time=self.config.misfire_grace_time
-        )
+        return trigger
+    
+    def get_upcoming_runs(
+        self,
+        until: datetime,
+        now: Optional[datetime] = None,
+        max_runs_per_job: int = 24
+    ) -> List[Tuple[RecurringJob, datetime, str]]:
+        """
+        Predict the runs of enabled jobs before a point in time
         
-        job.apscheduler_job_id = apscheduler_job.id
-        # Get next_run_time from trigger, not job object
-        job.next_run = trigger.get_next_fire_time(None, datetime.now()) if hasattr(trigger, 'get_next_fire_time') else None
+        Args:
+            until: End of the window (timezone-aware)
+            now: Start of the window (default: now, in the scheduler timezone)
+            max_runs_per_job: Cap for frequent interval/cron schedules
         
-        if job.enabled:
-            self._stats["active_jobs"] += 1
+        Returns:
+            (job, run time, topic) tuples ordered by run time
+        """
+        now = now or datetime.now(self._scheduler.timezone)
+        runs = []
         
-        logger.info(f"Scheduled: {job.name} - Next run: {job.next_run}")
+        for job in self._jobs.values():
+            if not job.enabled:
+                continue
+            
+            trigger = self._trigger_for(job)
+            fire_time = trigger.get_next_fire_time(None, now)
+            
+            for _ in range(max_runs_per_job):
+                if fire_time is None or fire_time > until:
+                    break
+                runs.append((job, fire_time, self._format_topic(job.topic_template, fire_time)))
+                fire_time = trigger.get_next_fire_time(fire_time, fire_time + timedelta(seconds=1))
+        
+        return sorted(runs, key=lambda r: r[1])
+    
+    def _trigger_for(self, job: RecurringJob):
+        """Job trigger (the registered one keeps interval schedules on their original phase)"""
+        apscheduler_job = self._scheduler.get_job(job.id)
+        return apscheduler_job.trigger if apscheduler_job else self._build_trigger(job.schedule_rule)
+    
+    def _fire_time(self, job: RecurringJob, now: datetime) -> datetime:
+        """
+        Scheduled time of the run executing now
+        
+        The latest fire time within the misfire grace period, i.e. the
+        run time get_upcoming_runs predicted for it (default: now).
+        """
+        trigger = self._trigger_for(job)
+        fire_time = trigger.get_next_fire_time(
+            None, now - timedelta(seconds=self.config.misfire_grace_time)
+        )
+        scheduled = now
+        while fire_time is not None and fire_time <= now:
+            scheduled = fire_time
+            fire_time = trigger.get_next_fire_time(fire_time, fire_time + timedelta(seconds=1))
+        return scheduled
     
     async def _execute_recurring_job(self, job_id: str):
         """Execute recurring job"""
@@ -467,9 +527,10 @@ class RecurringScheduler:
         try:
             logger.info(f"Executing recurring job: {job.name}")
             
-            # Generate topic from template
+            # Generate topic from template, at the run time predicted for prefetch
             now = datetime.now()
-            topic = self._format_topic(job.topic_template, now)
+            run_at = self._fire_time(job, datetime.now(self._scheduler.timezone))
+            topic = self._format_topic(job.topic_template, run_at)
             
             # Schedule video creation
             scheduled_job_id = await self.content_scheduler.schedule_video(
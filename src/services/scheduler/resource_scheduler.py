@@ -0,0 +1,361 @@
+"""
+Resource-Aware Admission Control
+
+Packs workflow stages into the host's measured capacity instead of
+capping the number of concurrent jobs:
+- Jobs declare estimated CPU, memory and disk needs per stage
+- Capacity is measured at startup and honours cgroup limits on Linux,
+  so a container never admits more than it was given
+- Work that does not fit waits in a queue instead of oversubscribing
+  (and swapping); smaller work may backfill around a large waiting job a
+  bounded number of times, so the large job cannot starve
+- Utilization, queue and wait-time metrics
+
+Usage:
+    controller = AdmissionController()
+    async with controller.reserve(ResourceRequest(cpu=8, memory_bytes=6 * GB)):
+        await render()
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 ** 2
+GB = 1024 ** 3
+
+# cgroup v1 reports "unlimited" memory as a huge page-aligned number
+_CGROUP_V1_UNLIMITED = 1 << 60
+
+
+class ResourceRequest(BaseModel):
+    """Estimated resources held while a stage runs"""
+    cpu: float = Field(0.0, ge=0, description="Cores")
+    memory_bytes: int = Field(0, ge=0)
+    disk_bytes: int = Field(0, ge=0)
+
+    def fits(self, free: "ResourceRequest") -> bool:
+        return (
+            self.cpu <= free.cpu + 1e-9
+            and self.memory_bytes <= free.memory_bytes
+            and self.disk_bytes <= free.disk_bytes
+        )
+
+    def clamp(self, limit: "ResourceRequest") -> "ResourceRequest":
+        return ResourceRequest(
+            cpu=min(self.cpu, limit.cpu),
+            memory_bytes=min(self.memory_bytes, limit.memory_bytes),
+            disk_bytes=min(self.disk_bytes, limit.disk_bytes),
+        )
+
+
+# Render cost per quality preset: (cores, memory, output bitrate in Mbps)
+_RENDER_PROFILES = {
+    "720p": (2, 1.5 * GB, 5),
+    "1080p": (4, 3 * GB, 8),
+    "1080p60": (6, 4 * GB, 12),
+    "4k": (8, 6 * GB, 35),
+}
+
+
+def estimate_stage_resources(
+    stage: str,
+    quality: str = "1080p",
+    duration_minutes: float = 5,
+) -> ResourceRequest:
+    """
+    Default resource estimate for a workflow stage.
+
+    Args:
+        stage: WorkflowStage value
+        quality: Render quality preset value or name (e.g. "4k", "UHD_4K")
+        duration_minutes: Target video length
+
+    Returns:
+        Estimated ResourceRequest
+    """
+    aliases = {"HD_720P": "720p", "HD_1080P": "1080p", "HD_1080P_60": "1080p60", "UHD_4K": "4k"}
+    cores, memory, mbps = _RENDER_PROFILES.get(
+        aliases.get(quality, quality), _RENDER_PROFILES["1080p"]
+    )
+    # Final file plus intermediates of about the same size
+    video_bytes = int(mbps * MB / 8 * 60 * duration_minutes * 2)
+
+    if stage == "script_generation":
+        return ResourceRequest(cpu=0.25, memory_bytes=256 * MB)
+    if stage == "video_assembly":
+        return ResourceRequest(cpu=cores, memory_bytes=int(memory), disk_bytes=video_bytes)
+    if stage == "youtube_upload":
+        return ResourceRequest(cpu=0.25, memory_bytes=256 * MB)
+    return ResourceRequest(cpu=0.5, memory_bytes=512 * MB)
+
+
+def _read(path: Path) -> Optional[str]:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def _cgroup_dir(cgroup_root: Path, proc_cgroup: Path) -> Path:
+    """This process's cgroup v2 directory (falls back to the root)."""
+    content = _read(proc_cgroup) or ""
+    for line in content.splitlines():
+        if line.startswith("0::"):
+            candidate = cgroup_root / line[3:].lstrip("/")
+            if candidate.is_dir():
+                return candidate
+    return cgroup_root
+
+
+def cgroup_cpu_limit(cgroup_dir: Path) -> Optional[float]:
+    """CPU quota in cores from cgroup v2 or v1 files, if limited."""
+    cpu_max = _read(cgroup_dir / "cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+
+    quota = _read(cgroup_dir / "cpu" / "cpu.cfs_quota_us")
+    period = _read(cgroup_dir / "cpu" / "cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def cgroup_memory_limit(cgroup_dir: Path) -> Optional[int]:
+    """Memory limit in bytes from cgroup v2 or v1 files, if limited."""
+    memory_max = _read(cgroup_dir / "memory.max")
+    if memory_max:
+        return None if memory_max == "max" else int(memory_max)
+
+    limit = _read(cgroup_dir / "memory" / "memory.limit_in_bytes")
+    if limit and int(limit) < _CGROUP_V1_UNLIMITED:
+        return int(limit)
+    return None
+
+
+def _physical_memory() -> int:
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (ValueError, OSError, AttributeError):
+        return 4 * GB
+
+
+def detect_capacity(
+    work_dir: Path = Path("."),
+    cgroup_root: Path = Path("/sys/fs/cgroup"),
+    proc_cgroup: Path = Path("/proc/self/cgroup"),
+) -> ResourceRequest:
+    """
+    Measure what this process may use.
+
+    Args:
+        work_dir: Directory whose filesystem holds job outputs
+        cgroup_root: cgroup filesystem mount point
+        proc_cgroup: File naming this process's cgroup
+
+    Returns:
+        Capacity as a ResourceRequest
+    """
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        cpus = float(os.cpu_count() or 1)
+    memory = _physical_memory()
+
+    cgroup_dir = _cgroup_dir(cgroup_root, proc_cgroup)
+    cpu_limit = cgroup_cpu_limit(cgroup_dir)
+    if cpu_limit is not None:
+        cpus = min(cpus, cpu_limit)
+    memory_limit = cgroup_memory_limit(cgroup_dir)
+    if memory_limit is not None:
+        memory = min(memory, memory_limit)
+
+    Path(work_dir).mkdir(parents=True, exist_ok=True)
+    disk = shutil.disk_usage(work_dir).free
+
+    return ResourceRequest(cpu=cpus, memory_bytes=memory, disk_bytes=disk)
+
+
+@dataclass
+class _Waiter:
+    name: str
+    request: ResourceRequest
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+    bypassed: int = 0
+
+
+class AdmissionController:
+    """
+    Admits work only while its declared resources fit the free capacity.
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[ResourceRequest] = None,
+        headroom: float = 0.1,
+        max_bypass: int = 4,
+        work_dir: Path = Path("."),
+    ):
+        """
+        Initialize admission controller.
+
+        Args:
+            capacity: Host capacity (None = measure with detect_capacity)
+            headroom: Fraction of memory and disk kept free for the OS
+            max_bypass: Times smaller work may overtake the queue head
+            work_dir: Directory used to measure free disk space
+        """
+        capacity = capacity or detect_capacity(work_dir)
+        self.capacity = ResourceRequest(
+            cpu=capacity.cpu,
+            memory_bytes=int(capacity.memory_bytes * (1 - headroom)),
+            disk_bytes=int(capacity.disk_bytes * (1 - headroom)),
+        )
+        self.max_bypass = max_bypass
+
+        self._used = ResourceRequest()
+        self._running: Dict[int, ResourceRequest] = {}
+        self._queue: List[_Waiter] = []
+
+        self._admitted = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @property
+    def free(self) -> ResourceRequest:
+        return ResourceRequest(
+            cpu=self.capacity.cpu - self._used.cpu,
+            memory_bytes=self.capacity.memory_bytes - self._used.memory_bytes,
+            disk_bytes=self.capacity.disk_bytes - self._used.disk_bytes,
+        )
+
+    @asynccontextmanager
+    async def reserve(
+        self,
+        request: ResourceRequest,
+        name: str = "job",
+    ) -> AsyncIterator[ResourceRequest]:
+        """
+        Hold resources for the duration of a block, waiting until they fit.
+
+        Requests larger than the whole host are clamped to it, so they run
+        alone rather than never.
+
+        Args:
+            request: Resources the work needs
+            name: Label used in logs
+        """
+        if not request.fits(self.capacity):
+            logger.warning(f"{name} needs more than the host has; running it alone")
+            request = request.clamp(self.capacity)
+
+        loop = asyncio.get_event_loop()
+        waiter = _Waiter(name=name, request=request, future=loop.create_future())
+        self._queue.append(waiter)
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except BaseException:
+            if waiter in self._queue:
+                self._queue.remove(waiter)
+            elif waiter.future.done() and not waiter.future.cancelled():
+                self._release(waiter)
+            self._dispatch()
+            raise
+
+        try:
+            yield request
+        finally:
+            self._release(waiter)
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit queued work in order, letting small work backfill."""
+        admitted: List[_Waiter] = []
+        blocked: List[_Waiter] = []
+        for waiter in list(self._queue):
+            if not waiter.request.fits(self.free):
+                blocked.append(waiter)
+                # Stop overtaking a waiter that has been passed often enough
+                if waiter.bypassed >= self.max_bypass:
+                    break
+                continue
+
+            self._queue.remove(waiter)
+            self._acquire(waiter)
+            admitted.append(waiter)
+            for earlier in blocked:
+                earlier.bypassed += 1
+            if any(earlier.bypassed >= self.max_bypass for earlier in blocked):
+                break
+
+        for waiter in admitted:
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+
+    def _acquire(self, waiter: _Waiter) -> None:
+        request = waiter.request
+        self._used = ResourceRequest(
+            cpu=self._used.cpu + request.cpu,
+            memory_bytes=self._used.memory_bytes + request.memory_bytes,
+            disk_bytes=self._used.disk_bytes + request.disk_bytes,
+        )
+        self._running[id(waiter)] = request
+
+        waited = time.monotonic() - waiter.enqueued_at
+        self._admitted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+        if waited > 1:
+            logger.info(f"Admitted {waiter.name} after waiting {waited:.1f}s")
+
+    def _release(self, waiter: _Waiter) -> None:
+        request = self._running.pop(id(waiter), None)
+        if request is None:
+            return
+        self._used = ResourceRequest(
+            cpu=max(0.0, self._used.cpu - request.cpu),
+            memory_bytes=max(0, self._used.memory_bytes - request.memory_bytes),
+            disk_bytes=max(0, self._used.disk_bytes - request.disk_bytes),
+        )
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get utilization and queue metrics.
+
+        Returns:
+            Capacity, reserved resources, utilization fractions and waits
+        """
+        def fraction(used: float, total: float) -> float:
+            return used / total if total > 0 else 0.0
+
+        return {
+            "capacity": self.capacity.dict(),
+            "reserved": self._used.dict(),
+            "utilization": {
+                "cpu": fraction(self._used.cpu, self.capacity.cpu),
+                "memory": fraction(self._used.memory_bytes, self.capacity.memory_bytes),
+                "disk": fraction(self._used.disk_bytes, self.capacity.disk_bytes),
+            },
+            "running": len(self._running),
+            "queued": len(self._queue),
+            "admitted_total": self._admitted,
+            "avg_wait_seconds": self._total_wait / self._admitted if self._admitted else 0.0,
+            "max_wait_seconds": self._max_wait,
+        }
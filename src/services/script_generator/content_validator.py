@@ -6,7 +6,7 @@ Validates generated scripts for quality, safety, and compliance.
 
 import re
 from dataclasses import dataclass
-from typing import List, Optional, Set
+from typing import Any, List, Optional, Set
 from enum import Enum
 
 
@@ -65,6 +65,8 @@ class ContentValidator:
         min_words: int = 100,
         max_words: int = 3000,
         speaking_pace: int = WPM_NORMAL,
+        duration_estimator: Optional[Any] = None,
+        voice: Optional[str] = None,
     ):
         """
         Initialize validator.
@@ -73,10 +75,15 @@ class ContentValidator:
             min_words: Minimum word count
             max_words: Maximum word count
             speaking_pace: Words per minute for duration estimation
+            duration_estimator: Optional learned duration model (e.g.
+                TTSEngine.duration_estimator); replaces speaking_pace
+            voice: Voice the script will be narrated with
         """
         self.min_words = min_words
         self.max_words = max_words
         self.speaking_pace = speaking_pace
+        self.duration_estimator = duration_estimator
+        self.voice = voice
         
         # Load profanity list (basic - expand as needed)
         self.profanity_list = self._load_profanity_list()
@@ -142,7 +149,7 @@ class ContentValidator:
         word_count = len(words)
         
         # Estimate duration
-        estimated_duration = (word_count / self.speaking_pace) * 60  # in seconds
+        estimated_duration = self.estimate_duration(script_clean)  # in seconds
         
         # Check length
         if word_count < self.min_words:
@@ -304,6 +311,9 @@ class ContentValidator:
         """
         Estimate speaking duration in seconds.
         
+        Uses the learned duration model when one was given, unless an
+        explicit ``wpm`` is requested.
+        
         Args:
             script: Script text
             wpm: Words per minute (uses instance default if None)
@@ -311,6 +321,9 @@ class ContentValidator:
         Returns:
             Estimated duration in seconds
         """
+        if self.duration_estimator is not None and wpm is None:
+            return self.duration_estimator.predict(script, self.voice)
+        
         words = len(re.findall(r'\b\w+\b', script))
         pace = wpm or self.speaking_pace
         return (words / pace) * 60
@@ -16,6 +16,7 @@ from .ollama_client import OllamaClient, OllamaConfig
 from .prompt_templates import PromptTemplateManager, NicheType, PromptTemplate
 from .content_validator import ContentValidator, ValidationResult
 from src.utils.cache import CacheManager, cached
+from src.utils.tracing import traced
 
 
 @dataclass
@@ -111,6 +112,7 @@ class ScriptGenerator:
         self.validator = validator or ContentValidator()
         self.template_manager = PromptTemplateManager()
     
+    @traced("script.generate")
     async def generate(
         self,
         topic: str,
@@ -40,6 +40,19 @@ from .timeline_builder import (
 from .timeline import Scene, Timeline  # Pydantic versions
 from .video_renderer import VideoRenderer, RenderConfig, QualityPreset
 from .video_assembler import VideoAssembler, VideoConfig, AssembledVideo
+from .media_probe import MediaInfo
+from .asset_index import AssetMetadataIndex
+from .timeline_diff import SceneChange, TimelineDiff, diff_segments
+from .batch_pipeline import BatchConfig, BatchPipeline
+from .assembly_cache import AssemblyCache
+from .workspace import JobWorkspace, WorkspaceConfig, WorkspaceManager
+from .audio_cache_index import AudioCacheIndex
+from .duration_model import DurationEstimator
+from .asset_matcher import AssetMatcher, EmbeddingIndex, HashingEmbedder, OllamaEmbedder
+from .timeline_codec import TimelineReader, decode_timeline, encode_timeline
+from .quality_check import QCConfig, QCReport, QualityChecker
+from .language_variants import LanguageVariant, MultiLanguageVideo, VariantMode
+from .near_duplicates import PerceptualHashIndex
 
 # Import additional items that tests might need
 try:
@@ -81,6 +94,45 @@ __all__ = [
     "VideoConfig",
     "AssembledVideo",
     "VideoStatus",
+    # Asset metadata
+    "MediaInfo",
+    "AssetMetadataIndex",
+    # Incremental rebuilds
+    "SceneChange",
+    "TimelineDiff",
+    "diff_segments",
+    # Batch assembly
+    "BatchConfig",
+    "BatchPipeline",
+    # Assembly cache
+    "AssemblyCache",
+    # Job workspaces
+    "JobWorkspace",
+    "WorkspaceConfig",
+    "WorkspaceManager",
+    # TTS audio cache
+    "AudioCacheIndex",
+    # Narration duration model
+    "DurationEstimator",
+    # Semantic asset matching
+    "AssetMatcher",
+    "EmbeddingIndex",
+    "HashingEmbedder",
+    "OllamaEmbedder",
+    # Binary timelines
+    "TimelineReader",
+    "encode_timeline",
+    "decode_timeline",
+    # Post-render QC
+    "QualityChecker",
+    "QCConfig",
+    "QCReport",
+    # Multi-language variants
+    "LanguageVariant",
+    "MultiLanguageVideo",
+    "VariantMode",
+    # Near-duplicate assets
+    "PerceptualHashIndex",
 ]
 
 __version__ = "1.0.0"
@@ -0,0 +1,456 @@
+"""
+Content-Addressed Assembly Cache
+
+This module caches complete video assemblies keyed by a canonical hash of
+everything that determines the output: script, niche, title, the contents
+of every asset and model file (embedding index, duration model) and the
+output-affecting parts of VideoConfig.
+
+Features:
+- Canonical input hashing (asset files hashed by content, memoized by
+  path, size and mtime)
+- Cached files hard-linked (or copied) into the cache directory
+- Integrity verification of cached files before they are served
+- Retention by age and total size budget, evicting least recently used
+
+Usage:
+    cache = AssemblyCache(Path(".cache/assemblies"), max_bytes=50 * 2**30)
+    key = await cache.compute_key(script, niche, assets, config)
+    hit = await cache.get(key)
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import asdict, is_dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+CACHE_FORMAT_VERSION = 1
+
+# VideoConfig fields that don't change the rendered output
+_NON_OUTPUT_FIELDS = {
+    "output_dir",
+    "temp_dir",
+    "tmpfs_dir",
+    "workspace_quota_bytes",
+    "max_retries",
+    "enable_cache",
+    "cache_ttl",
+    "cache_max_bytes",
+    "cache_eviction",
+    "cache_manager",
+    "asset_index_path",
+    "asset_embedding_index_path",
+    "batch_config",
+    "assembly_cache_dir",
+    "assembly_cache_max_bytes",
+    "assembly_cache_max_age",
+    "threads",
+    "use_gpu",
+    "verbose",
+    "logger",
+    "temp_audiofile",
+    "remove_temp",
+    "probe_workers",
+    "duration_model_path",
+}
+
+# Config paths whose file contents change the output (the paths themselves don't):
+# the embedding index picks each scene's asset, the duration model which
+# segments trim_to_target keeps
+_MODEL_FILE_FIELDS = ("asset_embedding_index_path", "duration_model_path")
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def hash_file(path: Path) -> str:
+    """
+    Compute the SHA-256 of a file's contents.
+
+    Args:
+        path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _model_files(config: Any) -> Dict[str, Path]:
+    """Model file paths set anywhere in a (nested) config dataclass."""
+    found: Dict[str, Path] = {}
+    if not is_dataclass(config) or isinstance(config, type):
+        return found
+
+    for name, value in vars(config).items():
+        if name in _MODEL_FILE_FIELDS and value:
+            found[name] = Path(value)
+        elif is_dataclass(value):
+            for nested, path in _model_files(value).items():
+                found.setdefault(nested, path)
+    return found
+
+
+def _canonical(value: Any) -> Any:
+    """Convert config values into a JSON-stable structure."""
+    if is_dataclass(value) and not isinstance(value, type):
+        return {
+            k: _canonical(v)
+            for k, v in sorted(asdict(value).items())
+            if k not in _NON_OUTPUT_FIELDS
+        }
+    if isinstance(value, dict):
+        return {
+            str(k): _canonical(v)
+            for k, v in sorted(value.items())
+            if k not in _NON_OUTPUT_FIELDS
+        }
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Path):
+        return str(value)
+    return value
+
+
+class AssemblyCache:
+    """
+    Cache of finished assemblies keyed by a hash of their inputs.
+
+    Each entry is a directory holding a manifest (the serialized
+    AssembledVideo plus checksums) and its own links to the video and
+    thumbnail files, so entries survive cleanup of the output directory.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = Path(".cache/assemblies"),
+        max_bytes: Optional[int] = None,
+        max_age: Optional[float] = None,
+        verify_checksums: bool = True,
+    ):
+        """
+        Initialize assembly cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Total size budget for cached files (None = unlimited)
+            max_age: Maximum entry age in seconds (None = keep forever)
+            verify_checksums: Re-hash cached files before serving them
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.verify_checksums = verify_checksums
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # (path, size, mtime_ns) -> sha256, so unchanged assets hash once
+        self._file_hashes: Dict[Tuple[str, int, int], str] = {}
+
+    async def compute_key(
+        self,
+        script: str,
+        niche: str,
+        assets: List[Path],
+        config: Any,
+        title: Optional[str] = None,
+    ) -> str:
+        """
+        Compute the cache key for an assembly.
+
+        Args:
+            script: Video script text
+            niche: Content niche
+            assets: Visual asset paths (order matters)
+            config: VideoConfig used for the assembly
+            title: Optional video title
+
+        Returns:
+            Hex digest identifying the assembly inputs
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            self._compute_key_sync,
+            script,
+            niche,
+            list(assets),
+            config,
+            title,
+        )
+
+    def _compute_key_sync(
+        self,
+        script: str,
+        niche: str,
+        assets: List[Path],
+        config: Any,
+        title: Optional[str],
+    ) -> str:
+        """Compute the cache key synchronously."""
+        music = getattr(config, "background_music_path", None)
+
+        payload = {
+            "version": CACHE_FORMAT_VERSION,
+            "script": script,
+            "niche": niche,
+            "title": title,
+            "assets": [self._content_hash(Path(p)) for p in assets],
+            "music": self._content_hash(Path(music)) if music else None,
+            "config": _canonical(config),
+            "models": {
+                name: self._content_hash(path) if path.exists() else None
+                for name, path in sorted(_model_files(config).items())
+            },
+        }
+
+        data = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def _content_hash(self, path: Path) -> str:
+        """Hash a file's contents, memoized by path, size and mtime."""
+        stat = path.stat()
+        memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+
+        digest = self._file_hashes.get(memo_key)
+        if digest is None:
+            digest = hash_file(path)
+            self._file_hashes[memo_key] = digest
+
+        return digest
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached assembly.
+
+        Entries whose files are missing or fail verification are evicted.
+
+        Args:
+            key: Cache key from compute_key
+
+        Returns:
+            Serialized AssembledVideo pointing at the cached files, or None
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._get_sync, key)
+
+    def _get_sync(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached assembly synchronously."""
+        manifest = self._read_manifest(key)
+        if manifest is None:
+            return None
+
+        if self.max_age is not None and time.time() - manifest["created_at"] > self.max_age:
+            self.evict(key)
+            return None
+
+        if not self._verify(key, manifest):
+            logger.warning(f"Assembly cache entry {key[:12]} failed verification")
+            self.evict(key)
+            return None
+
+        manifest["last_access"] = time.time()
+        manifest["hits"] = manifest.get("hits", 0) + 1
+        self._write_manifest(key, manifest)
+
+        return manifest["result"]
+
+    async def checkout(
+        self,
+        key: str,
+        targets: Dict[str, Path],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached assembly and link its files out of the cache.
+
+        The caller gets its own links, so moving or deleting them leaves
+        the cache entry intact.
+
+        Args:
+            key: Cache key from compute_key
+            targets: Result field (e.g. "video_path") -> destination path
+
+        Returns:
+            Serialized AssembledVideo pointing at the destinations, or None
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._checkout_sync, key, targets)
+
+    def _checkout_sync(
+        self,
+        key: str,
+        targets: Dict[str, Path],
+    ) -> Optional[Dict[str, Any]]:
+        """Check out a cached assembly synchronously."""
+        result = self._get_sync(key)
+        if result is None:
+            return None
+
+        result = dict(result)
+        for field_name, target in targets.items():
+            source = result.get(field_name)
+            if not source or not Path(source).exists():
+                continue
+
+            target = Path(target)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            self._link_or_copy(Path(source), target)
+            result[field_name] = str(target)
+
+        return result
+
+    async def put(self, key: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Store a finished assembly.
+
+        Args:
+            key: Cache key from compute_key
+            result: Serialized AssembledVideo
+
+        Returns:
+            The stored result, with paths pointing at the cached files
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._put_sync, key, result)
+
+    def _put_sync(self, key: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """Store a finished assembly synchronously."""
+        entry_dir = self._entry_dir(key)
+        entry_dir.mkdir(parents=True, exist_ok=True)
+
+        stored = dict(result)
+        files = {}
+
+        for field_name in ("video_path", "thumbnail_path", "timeline_path"):
+            source = result.get(field_name)
+            if not source or not Path(source).exists():
+                continue
+
+            target = entry_dir / f"{field_name.split('_')[0]}{Path(source).suffix}"
+            self._link_or_copy(Path(source), target)
+
+            stored[field_name] = str(target)
+            files[field_name] = {
+                "path": str(target),
+                "size": target.stat().st_size,
+                "sha256": hash_file(target),
+            }
+
+        now = time.time()
+        self._write_manifest(key, {
+            "version": CACHE_FORMAT_VERSION,
+            "created_at": now,
+            "last_access": now,
+            "hits": 0,
+            "files": files,
+            "result": stored,
+        })
+
+        self.enforce_budget()
+
+        return stored
+
+    def evict(self, key: str) -> None:
+        """Remove an entry and its files."""
+        shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+
+    def enforce_budget(self) -> int:
+        """
+        Apply the age limit and size budget.
+
+        Evicts expired entries, then least recently used entries until the
+        cached files fit in ``max_bytes``.
+
+        Returns:
+            Number of entries evicted
+        """
+        entries = []
+        for manifest_path in self.cache_dir.glob("*/manifest.json"):
+            key = manifest_path.parent.name
+            manifest = self._read_manifest(key)
+            if manifest is None:
+                continue
+            size = sum(f.get("size", 0) for f in manifest.get("files", {}).values())
+            entries.append((manifest.get("last_access", 0), manifest["created_at"], size, key))
+
+        evicted = 0
+        now = time.time()
+
+        if self.max_age is not None:
+            for _, created_at, _, key in list(entries):
+                if now - created_at > self.max_age:
+                    self.evict(key)
+                    evicted += 1
+            entries = [e for e in entries if now - e[1] <= self.max_age]
+
+        if self.max_bytes is not None:
+            total = sum(e[2] for e in entries)
+            for _, _, size, key in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self.evict(key)
+                total -= size
+                evicted += 1
+
+        if evicted:
+            logger.info(f"Evicted {evicted} assembly cache entries")
+
+        return evicted
+
+    def _verify(self, key: str, manifest: Dict[str, Any]) -> bool:
+        """Check that every cached file exists and matches its checksum."""
+        if manifest.get("version") != CACHE_FORMAT_VERSION:
+            return False
+
+        for info in manifest.get("files", {}).values():
+            path = Path(info["path"])
+            try:
+                if path.stat().st_size != info["size"]:
+                    return False
+            except OSError:
+                return False
+
+            if self.verify_checksums and hash_file(path) != info["sha256"]:
+                return False
+
+        return "video_path" in manifest.get("files", {})
+
+    def _link_or_copy(self, source: Path, target: Path) -> None:
+        """Hard-link a file into or out of the cache, copying across filesystems."""
+        if target.exists():
+            target.unlink()
+        try:
+            os.link(source, target)
+        except OSError:
+            shutil.copy2(source, target)
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def _read_manifest(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._entry_dir(key) / "manifest.json"
+        try:
+            return json.loads(path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _write_manifest(self, key: str, manifest: Dict[str, Any]) -> None:
+        path = self._entry_dir(key) / "manifest.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest, default=str))
+        tmp.replace(path)
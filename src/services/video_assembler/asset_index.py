@@ -0,0 +1,255 @@
+"""
+Persistent Asset Metadata Index
+
+This module keeps a local SQLite index of probed media metadata so the
+timeline builder and renderer don't have to open every asset to learn its
+duration, dimensions or whether it decodes at all.
+
+Features:
+- Entries keyed by path and validated against file size and mtime
+- Duration, dimensions, fps, codec, audio presence, keyframe interval
+- Decodability flag so broken assets are rejected before rendering
+- Concurrent ffprobe scanner for cache misses
+
+Usage:
+    index = AssetMetadataIndex(Path(".cache/asset_metadata.sqlite3"))
+    infos = await index.scan(asset_paths)
+    broken = await index.find_broken(asset_paths)
+"""
+
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .media_probe import PROBE_UNAVAILABLE, MediaInfo, probe_media
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS asset_metadata (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    media_type TEXT,
+    duration REAL,
+    width INTEGER,
+    height INTEGER,
+    fps REAL,
+    codec TEXT,
+    has_audio INTEGER NOT NULL DEFAULT 0,
+    keyframe_interval REAL,
+    decodable INTEGER NOT NULL DEFAULT 1,
+    error TEXT,
+    probed_at REAL NOT NULL
+)
+"""
+
+_COLUMNS = [f.name for f in fields(MediaInfo)]
+
+
+class AssetMetadataIndex:
+    """
+    SQLite-backed index of media metadata.
+
+    Lookups stat the file and only return an entry when size and mtime
+    still match, so edited or replaced files are transparently re-probed.
+    """
+
+    def __init__(
+        self,
+        db_path: Path = Path(".cache/asset_metadata.sqlite3"),
+        max_workers: int = 4,
+        verify_decode: bool = True,
+    ):
+        """
+        Initialize asset metadata index.
+
+        Args:
+            db_path: SQLite database file (":memory:" for a transient index)
+            max_workers: Concurrent probes when scanning
+            verify_decode: Decode one frame of each visual asset when probing
+        """
+        self.db_path = db_path
+        self.max_workers = max_workers
+        self.verify_decode = verify_decode
+
+        if str(db_path) != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    def get(self, path: Path) -> Optional[MediaInfo]:
+        """
+        Get indexed metadata for a file if it is still current.
+
+        Args:
+            path: Media file path
+
+        Returns:
+            MediaInfo, or None if missing, stale or the file is gone
+        """
+        key = self._key(path)
+        try:
+            stat = Path(path).stat()
+        except OSError:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM asset_metadata WHERE path = ?",
+                (key,)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        if row["size"] != stat.st_size or row["mtime_ns"] != stat.st_mtime_ns:
+            return None
+
+        # Written before ffprobe was installed: probe again
+        if row["error"] == PROBE_UNAVAILABLE:
+            return None
+
+        return self._row_to_info(row)
+
+    def put(self, info: MediaInfo) -> None:
+        """
+        Store metadata for a file.
+
+        Args:
+            info: Probed media info
+        """
+        values = asdict(info)
+        values["path"] = self._key(info.path)
+        values["has_audio"] = int(info.has_audio)
+        values["decodable"] = int(info.decodable)
+        values["probed_at"] = time.time()
+
+        columns = _COLUMNS + ["probed_at"]
+        placeholders = ", ".join("?" for _ in columns)
+
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO asset_metadata ({', '.join(columns)}) "  # nosec B608
+                f"VALUES ({placeholders})",
+                [values[c] for c in columns]
+            )
+            self._conn.commit()
+
+    def invalidate(self, path: Path) -> None:
+        """Remove a file from the index."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM asset_metadata WHERE path = ?",
+                (self._key(path),)
+            )
+            self._conn.commit()
+
+    def probe(self, path: Path) -> MediaInfo:
+        """
+        Get metadata for a file, probing and indexing it on a miss.
+
+        Args:
+            path: Media file path
+
+        Returns:
+            MediaInfo (missing files are reported as not decodable)
+        """
+        info = self.get(path)
+        if info is not None:
+            return info
+
+        if not Path(path).exists():
+            return MediaInfo(
+                path=str(path),
+                size=0,
+                mtime_ns=0,
+                decodable=False,
+                error="file not found",
+            )
+
+        info = probe_media(Path(path), verify_decode=self.verify_decode)
+        if info.error != PROBE_UNAVAILABLE:
+            # Without ffprobe the result is a guess; don't pin it to this file
+            self.put(info)
+        return info
+
+    async def scan(self, paths: Iterable[Path]) -> Dict[Path, MediaInfo]:
+        """
+        Get metadata for many files, probing misses concurrently.
+
+        Args:
+            paths: Media file paths
+
+        Returns:
+            Mapping of path to MediaInfo
+        """
+        unique = list(dict.fromkeys(Path(p) for p in paths))
+        results: Dict[Path, MediaInfo] = {}
+        misses: List[Path] = []
+
+        for path in unique:
+            info = self.get(path)
+            if info is not None:
+                results[path] = info
+            else:
+                misses.append(path)
+
+        if misses:
+            logger.info(f"Probing {len(misses)} assets "
+                       f"({len(unique) - len(misses)} indexed)")
+
+            loop = asyncio.get_event_loop()
+            workers = max(1, min(self.max_workers, len(misses)))
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset-probe") as pool:
+                probed = await asyncio.gather(*[
+                    loop.run_in_executor(pool, self.probe, path)
+                    for path in misses
+                ])
+
+            results.update(zip(misses, probed))
+
+        return results
+
+    async def find_broken(self, paths: Iterable[Path]) -> List[Path]:
+        """
+        Find assets that are missing or cannot be decoded.
+
+        Args:
+            paths: Media file paths
+
+        Returns:
+            Paths of broken assets
+        """
+        infos = await self.scan(paths)
+        return [path for path, info in infos.items() if not info.decodable]
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _key(self, path) -> str:
+        """Normalize a path into an index key."""
+        return str(Path(path).resolve())
+
+    def _row_to_info(self, row: sqlite3.Row) -> MediaInfo:
+        """Convert a database row into MediaInfo."""
+        values = {c: row[c] for c in _COLUMNS}
+        values["has_audio"] = bool(values["has_audio"])
+        values["decodable"] = bool(values["decodable"])
+        return MediaInfo(**values)
@@ -0,0 +1,545 @@
+"""
+Semantic Asset Matching
+
+This module picks the visual asset for each scene by meaning rather than
+position: scene narration is embedded and matched against an index of
+asset tag/description embeddings.
+
+Features:
+- Pluggable embedders: Ollama embeddings API or a local hashing embedder
+- NumPy vector index with incremental upserts and .npz persistence,
+  filled at ingest/download time and reloaded when another process saves it
+- Scenes draw on the whole indexed library, not just the video's own assets
+- Inverted-file (IVF) partitioning for large libraries, so a query only
+  scores a few partitions instead of every asset
+- Vectorized cosine top-k (argpartition, no full sort)
+- Penalty for repeating an asset within one video, where near-duplicate
+  copies of a clip (by perceptual hash) count as the same asset
+
+Usage:
+    matcher = AssetMatcher(EmbeddingIndex(Path(".cache/asset_vectors.npz")))
+    await matcher.index_assets({path: "ocean waves sunset calm"})
+    picks = await matcher.match(script_segments, assets)
+"""
+
+import asyncio
+import logging
+import re
+import zlib
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .near_duplicates import PerceptualHashIndex
+
+logger = logging.getLogger(__name__)
+
+
+# Callable turning texts into an (n, dim) array
+Embedder = Callable[[List[str]], Awaitable[np.ndarray]]
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in",
+    "into", "is", "it", "its", "of", "on", "or", "that", "the", "this",
+    "to", "was", "with", "you", "your",
+}
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (zero rows stay zero)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        vectors = vectors[None, :]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def describe_path(path: Path) -> str:
+    """Fallback asset description from its file name."""
+    return " ".join(_TOKEN.findall(Path(path).stem.lower()))
+
+
+class HashingEmbedder:
+    """
+    Local embedder using signed feature hashing of words and word pairs.
+
+    No model download or network; good enough to match scene narration
+    against asset tags that share vocabulary.
+    """
+
+    def __init__(self, dim: int = 512):
+        """
+        Initialize hashing embedder.
+
+        Args:
+            dim: Embedding dimension
+        """
+        self.dim = dim
+
+    def embed_sync(self, texts: List[str]) -> np.ndarray:
+        """Embed texts synchronously."""
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+
+        for row, text in enumerate(texts):
+            tokens = [t for t in _TOKEN.findall(text.lower()) if t not in _STOPWORDS]
+            features = tokens + [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                h = zlib.crc32(feature.encode())
+                sign = 1.0 if h & 0x80000000 else -1.0
+                weight = 0.5 if "_" in feature else 1.0
+                matrix[row, h % self.dim] += sign * weight
+
+        return _normalize_rows(matrix)
+
+    async def __call__(self, texts: List[str]) -> np.ndarray:
+        return self.embed_sync(texts)
+
+
+class OllamaEmbedder:
+    """
+    Embedder backed by OllamaClient.embeddings.
+    """
+
+    def __init__(self, client, model: Optional[str] = None, concurrency: int = 8):
+        """
+        Initialize Ollama embedder.
+
+        Args:
+            client: OllamaClient (anything with ``async embeddings(text, model)``)
+            model: Embedding model (e.g. "nomic-embed-text")
+            concurrency: Maximum concurrent embedding requests
+        """
+        self.client = client
+        self.model = model
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def __call__(self, texts: List[str]) -> np.ndarray:
+        async def embed(text: str) -> List[float]:
+            async with self._semaphore:
+                return await self.client.embeddings(text, model=self.model)
+
+        vectors = await asyncio.gather(*(embed(t) for t in texts))
+        return _normalize_rows(np.array(vectors, dtype=np.float32))
+
+
+class EmbeddingIndex:
+    """
+    Cosine-similarity index of asset embeddings.
+
+    Rows live in one preallocated float32 matrix that grows by doubling.
+    Above ``ivf_threshold`` rows, vectors are partitioned by k-means and a
+    query only scores the ``nprobe`` partitions closest to it.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ivf_threshold: int = 20000,
+        nprobe: int = 8,
+    ):
+        """
+        Initialize embedding index.
+
+        Args:
+            path: .npz file to load from and save to (None = in memory only)
+            ivf_threshold: Row count above which IVF partitioning is used
+            nprobe: Partitions scored per query
+        """
+        self.path = Path(path) if path else None
+        self.ivf_threshold = ivf_threshold
+        self.nprobe = nprobe
+
+        self.keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+
+        # IVF state
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lists: Optional[List[np.ndarray]] = None
+        self._trained_size = 0
+
+        # mtime of the file last loaded or saved, to spot saves by other processes
+        self._version: Optional[int] = None
+
+        if self.path and self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return str(key) in self._rows
+
+    @property
+    def dim(self) -> int:
+        return self._matrix.shape[1]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Active rows of the embedding matrix."""
+        return self._matrix[:len(self.keys)]
+
+    def row(self, key: str) -> Optional[int]:
+        """Row number of a key, if indexed."""
+        return self._rows.get(str(key))
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        Insert or replace embeddings.
+
+        Args:
+            keys: Asset keys (e.g. path strings)
+            vectors: (len(keys), dim) embeddings
+        """
+        vectors = _normalize_rows(vectors)
+        if len(keys) != len(vectors):
+            raise ValueError("Keys and vectors must match")
+        if len(self.keys) and vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dim vectors, got {vectors.shape[1]}")
+
+        for key, vector in zip(keys, vectors):
+            key = str(key)
+            row = self._rows.get(key)
+            if row is None:
+                row = len(self.keys)
+                self._ensure_capacity(row + 1, len(vector))
+                self.keys.append(key)
+                self._rows[key] = row
+            self._matrix[row] = vector
+            self._assign(row)
+
+        if len(self.keys) >= self.ivf_threshold and (
+            self._centroids is None or len(self.keys) >= 2 * self._trained_size
+        ):
+            self.train()
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int = 10,
+        rows: Optional[np.ndarray] = None,
+    ) -> List[List[tuple]]:
+        """
+        Find the most similar assets for each query.
+
+        Args:
+            queries: (n, dim) query embeddings
+            k: Results per query
+            rows: Optional candidate rows to restrict the search to
+
+        Returns:
+            For each query, a list of (row, score) sorted by score
+        """
+        queries = _normalize_rows(queries)
+        if not self.keys:
+            return [[] for _ in queries]
+
+        if rows is not None:
+            return [self._top_k(q, rows, k) for q in queries]
+
+        if self._centroids is None:
+            scores = queries @ self.matrix.T
+            return [self._top_k_scores(s, None, k) for s in scores]
+
+        # IVF: score centroids, then only the closest partitions
+        centroid_scores = queries @ self._centroids.T
+        nprobe = min(self.nprobe, len(self._centroids))
+        probes = np.argpartition(-centroid_scores, nprobe - 1, axis=1)[:, :nprobe]
+
+        lists = self._partition_lists()
+        results = []
+        for query, probe in zip(queries, probes):
+            candidates = np.concatenate([lists[p] for p in probe])
+            results.append(self._top_k(query, candidates, k))
+        return results
+
+    def train(self, n_lists: Optional[int] = None, iterations: int = 10) -> None:
+        """
+        (Re)build IVF partitions with k-means.
+
+        Args:
+            n_lists: Number of partitions (default: sqrt of row count)
+            iterations: Lloyd iterations
+        """
+        data = self.matrix
+        n_lists = n_lists or max(1, int(np.sqrt(len(data))))
+
+        rng = np.random.default_rng(0)
+        sample = data[rng.choice(len(data), min(len(data), n_lists * 64), replace=False)]
+        centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = sample[labels == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+            centroids = _normalize_rows(centroids)
+
+        self._centroids = centroids
+        self._assignments = np.zeros(len(self._matrix), dtype=np.int32)
+        self._assignments[:len(data)] = self._nearest_centroids(data)
+        self._lists = None
+        self._trained_size = len(data)
+
+        logger.info(f"Trained IVF index: {len(data)} vectors in {n_lists} partitions")
+
+    def save(self) -> None:
+        """Persist the index to ``path``."""
+        if self.path is None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            "keys": np.array(self.keys, dtype=str),
+            "matrix": self.matrix,
+            "assignments": self._assignments[:len(self.keys)],
+            "trained_size": np.array(self._trained_size),
+        }
+        if self._centroids is not None:
+            arrays["centroids"] = self._centroids
+
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(f, **arrays)
+        tmp.replace(self.path)
+        self._version = self.path.stat().st_mtime_ns
+
+    def refresh(self) -> bool:
+        """
+        Reload the index if its file was saved elsewhere (e.g. at ingest).
+
+        Returns:
+            True if the index was reloaded
+        """
+        if self.path is None or not self.path.exists():
+            return False
+        if self.path.stat().st_mtime_ns == self._version:
+            return False
+        self.load()
+        return True
+
+    def load(self) -> None:
+        """Load an index saved by ``save``."""
+        version = self.path.stat().st_mtime_ns
+        with np.load(self.path, allow_pickle=False) as data:
+            self.keys = [str(k) for k in data["keys"]]
+            self._matrix = np.array(data["matrix"], dtype=np.float32)
+            self._assignments = np.array(data["assignments"], dtype=np.int32)
+            self._trained_size = int(data["trained_size"])
+            self._centroids = (
+                np.array(data["centroids"], dtype=np.float32)
+                if "centroids" in data else None
+            )
+
+        self._rows = {key: row for row, key in enumerate(self.keys)}
+        self._lists = None
+        self._version = version
+
+    def _ensure_capacity(self, rows: int, dim: int) -> None:
+        if self._matrix.shape[1] == 0:
+            self._matrix = np.zeros((max(rows, 64), dim), dtype=np.float32)
+            self._assignments = np.zeros(len(self._matrix), dtype=np.int32)
+        elif rows > len(self._matrix):
+            capacity = max(rows, 2 * len(self._matrix))
+            grown = np.zeros((capacity, self.dim), dtype=np.float32)
+            grown[:len(self._matrix)] = self._matrix
+            self._matrix = grown
+            assignments = np.zeros(capacity, dtype=np.int32)
+            assignments[:len(self._assignments)] = self._assignments
+            self._assignments = assignments
+
+    def _assign(self, row: int) -> None:
+        """Put a new or updated row into its nearest partition."""
+        if self._centroids is None:
+            return
+        self._assignments[row] = self._nearest_centroids(self._matrix[row:row + 1])[0]
+        self._lists = None
+
+    def _nearest_centroids(self, vectors: np.ndarray) -> np.ndarray:
+        labels = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), 8192):
+            chunk = vectors[start:start + 8192]
+            labels[start:start + len(chunk)] = np.argmax(chunk @ self._centroids.T, axis=1)
+        return labels
+
+    def _partition_lists(self) -> List[np.ndarray]:
+        if self._lists is None:
+            assignments = self._assignments[:len(self.keys)]
+            order = np.argsort(assignments, kind="stable")
+            bounds = np.searchsorted(
+                assignments[order],
+                np.arange(len(self._centroids) + 1)
+            )
+            self._lists = [
+                order[bounds[i]:bounds[i + 1]]
+                for i in range(len(self._centroids))
+            ]
+        return self._lists
+
+    def _top_k(self, query: np.ndarray, rows: np.ndarray, k: int) -> List[tuple]:
+        if len(rows) == 0:
+            return []
+        scores = self._matrix[rows] @ query
+        return self._top_k_scores(scores, rows, k)
+
+    @staticmethod
+    def _top_k_scores(
+        scores: np.ndarray,
+        rows: Optional[np.ndarray],
+        k: int
+    ) -> List[tuple]:
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        ids = rows[top] if rows is not None else top
+        return [(int(i), float(scores[j])) for i, j in zip(ids, top)]
+
+
+class AssetMatcher:
+    """
+    Assigns assets to scenes by semantic similarity.
+    """
+
+    def __init__(
+        self,
+        index: Optional[EmbeddingIndex] = None,
+        embedder: Optional[Embedder] = None,
+        top_k: int = 8,
+        repeat_penalty: float = 0.15,
+        duplicates: Optional[PerceptualHashIndex] = None,
+        search_library: bool = True,
+    ):
+        """
+        Initialize asset matcher.
+
+        Args:
+            index: Embedding index of asset descriptions
+            embedder: Text embedder (defaults to HashingEmbedder)
+            top_k: Candidates considered per scene
+            repeat_penalty: Score subtracted per earlier use in the same video
+            duplicates: Optional perceptual hash index; near-duplicates of
+                an asset share its repeat count
+            search_library: Also consider every indexed asset on disk, not
+                just the assets passed to ``match``
+        """
+        self.index = index if index is not None else EmbeddingIndex()
+        self.embedder = embedder or HashingEmbedder()
+        self.top_k = top_k
+        self.repeat_penalty = repeat_penalty
+        self.duplicates = duplicates
+        self.search_library = search_library
+
+    async def index_assets(
+        self,
+        descriptions: Dict[Path, str],
+        save: bool = True,
+    ) -> int:
+        """
+        Embed and index asset descriptions (tags, titles, descriptions).
+
+        Args:
+            descriptions: Mapping of asset path to descriptive text
+            save: Persist the index afterwards
+
+        Returns:
+            Number of assets indexed
+        """
+        if not descriptions:
+            return 0
+
+        keys = [str(path) for path in descriptions]
+        vectors = await self.embedder([descriptions[path] for path in descriptions])
+        self.index.add(keys, vectors)
+
+        if save:
+            self.index.save()
+
+        return len(keys)
+
+    async def match(
+        self,
+        segments: List[str],
+        assets: Iterable[Path],
+        pinned: Optional[List[Optional[Path]]] = None,
+    ) -> List[Path]:
+        """
+        Choose one asset per scene.
+
+        Each scene is scored against the given assets and, with
+        ``search_library``, against the whole index (IVF-partitioned for
+        large libraries). Assets not yet indexed are indexed from their
+        file names first.
+
+        Args:
+            segments: Scene narration texts
+            assets: Candidate assets for this video
+            pinned: Optional asset already fixed for each scene
+
+        Returns:
+            Asset for each scene (pinned entries are kept)
+        """
+        assets = list(assets)
+        if not segments or not assets:
+            return list(pinned) if pinned else []
+
+        # Pick up assets indexed at ingest by other processes
+        self.index.refresh()
+
+        missing = {p: describe_path(p) for p in assets if str(p) not in self.index}
+        if missing:
+            await self.index_assets(missing, save=False)
+
+        rows = np.array([self.index.row(str(p)) for p in assets])
+        by_row = {int(row): path for row, path in zip(rows, assets)}
+
+        queries = await self.embedder(list(segments))
+        k = min(len(rows), self.top_k)
+        candidates = self.index.search(queries, k=k, rows=rows)
+
+        if self.search_library:
+            library = self.index.search(queries, k=self.top_k)
+            for scored, hits in zip(candidates, library):
+                for row, score in hits:
+                    if row not in by_row:
+                        path = Path(self.index.keys[row])
+                        if not path.exists():
+                            continue
+                        by_row[row] = path
+                    if all(row != seen for seen, _ in scored):
+                        scored.append((row, score))
+
+        # Near-duplicate copies of one clip count as the same asset
+        groups = self.duplicates.groups(str(p) for p in by_row.values()) if self.duplicates else {}
+        group_of = {
+            row: groups.get(str(path), str(path))
+            for row, path in by_row.items()
+        }
+
+        uses: Dict[str, int] = {}
+        for path in (pinned or []):
+            if path is not None:
+                group = groups.get(str(path), str(path))
+                uses[group] = uses.get(group, 0) + 1
+
+        choices: List[Path] = []
+        for i, scored in enumerate(candidates):
+            if pinned and pinned[i] is not None:
+                choices.append(Path(pinned[i]))
+                continue
+
+            best_row, _ = max(
+                scored,
+                key=lambda item: item[1] - self.repeat_penalty * uses.get(group_of[item[0]], 0)
+            )
+            group = group_of[best_row]
+            uses[group] = uses.get(group, 0) + 1
+            choices.append(by_row[best_row])
+
+        return choices
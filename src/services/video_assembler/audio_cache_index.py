@@ -0,0 +1,301 @@
+"""
+Disk-Backed Index for the TTS Audio Cache
+
+This module keeps a SQLite index of the audio files written by TTSEngine so
+cache maintenance never has to list or stat the audio directory.
+
+Features:
+- O(1) lookups by file name (derived from the TTS cache key)
+- Size, creation time, last access and hit count per file
+- LRU or LFU eviction under a byte budget
+- Age-based expiry answered from the index
+- One-time adoption of files written before the index existed
+
+Usage:
+    index = AudioCacheIndex(Path("output_audio"), max_bytes=2 * 2**30)
+    index.record(path)
+    if index.touch(path.name):
+        ...  # file is still cached
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audio_cache (
+    name TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+_ORDER_BY = {
+    "lru": "last_access ASC",
+    "lfu": "hits ASC, last_access ASC",
+}
+
+INDEX_FILENAME = ".audio_cache.sqlite3"
+
+
+class AudioCacheIndex:
+    """
+    SQLite index of cached TTS audio files.
+
+    The index is the source of truth for what is cached: files are only
+    deleted through it, so a lookup never needs to touch the directory.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        db_path: Optional[Path] = None,
+        max_bytes: Optional[int] = None,
+        policy: str = "lru",
+        in_use: Optional[Callable[[], Set[Path]]] = None,
+    ):
+        """
+        Initialize audio cache index.
+
+        Args:
+            directory: Directory holding the cached audio files
+            db_path: SQLite database file (defaults to a hidden file in directory)
+            max_bytes: Total size budget (None = unlimited)
+            policy: Eviction policy, "lru" or "lfu"
+            in_use: Returns resolved paths running jobs still need; these
+                are never evicted, whoever triggers the eviction
+        """
+        if policy not in _ORDER_BY:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+
+        self.directory = Path(directory)
+        self.db_path = db_path or self.directory / INDEX_FILENAME
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.in_use = in_use
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+            empty = self._conn.execute(
+                "SELECT COUNT(*) FROM audio_cache"
+            ).fetchone()[0] == 0
+
+        if empty:
+            adopted = self.adopt_existing()
+            if adopted:
+                logger.info(f"Indexed {adopted} existing audio cache files")
+
+    def record(self, path: Path, size: Optional[int] = None) -> None:
+        """
+        Register a newly written audio file, then apply the size budget.
+
+        Args:
+            path: Audio file inside the cache directory
+            size: File size in bytes (stat'ed if omitted)
+        """
+        path = Path(path)
+        if size is None:
+            size = path.stat().st_size
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO audio_cache (name, size, created_at, last_access, hits)
+                VALUES (?, ?, ?, ?, 0)
+                ON CONFLICT(name) DO UPDATE SET
+                    size = excluded.size,
+                    last_access = excluded.last_access
+                """,
+                (path.name, size, now, now)
+            )
+            self._conn.commit()
+
+        if self.max_bytes is not None:
+            self.enforce_budget(exclude={path.resolve()})
+
+    def touch(self, name: str) -> bool:
+        """
+        Record a cache hit.
+
+        Args:
+            name: File name of the cached audio
+
+        Returns:
+            True if the file is indexed (and therefore still on disk)
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                """
+                UPDATE audio_cache
+                SET last_access = ?, hits = hits + 1
+                WHERE name = ?
+                """,
+                (time.time(), name)
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def contains(self, name: str) -> bool:
+        """Check whether a file is indexed, without counting a hit."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM audio_cache WHERE name = ?",
+                (name,)
+            ).fetchone()
+        return row is not None
+
+    def names(self) -> List[str]:
+        """File names of all indexed audio."""
+        with self._lock:
+            return [name for (name,) in self._conn.execute("SELECT name FROM audio_cache")]
+
+    def total_bytes(self) -> int:
+        """Total size of all indexed files."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM audio_cache"
+            ).fetchone()[0]
+
+    def evict(self, names: Iterable[str]) -> int:
+        """
+        Delete files and their index entries.
+
+        Args:
+            names: File names to evict
+
+        Returns:
+            Number of entries removed
+        """
+        names = list(names)
+        for name in names:
+            (self.directory / name).unlink(missing_ok=True)
+
+        with self._lock:
+            self._conn.executemany(
+                "DELETE FROM audio_cache WHERE name = ?",
+                [(name,) for name in names]
+            )
+            self._conn.commit()
+
+        return len(names)
+
+    def enforce_budget(self, exclude: Optional[Set[Path]] = None) -> List[str]:
+        """
+        Evict files by the configured policy until under ``max_bytes``.
+
+        Args:
+            exclude: Resolved paths still in use (never evicted)
+
+        Returns:
+            Names of evicted files
+        """
+        if self.max_bytes is None:
+            return []
+
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return []
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT name, size FROM audio_cache ORDER BY {_ORDER_BY[self.policy]}"
+            ).fetchall()
+
+        exclude = self._protected(exclude)
+        victims = []
+        for name, size in rows:
+            if excess <= 0:
+                break
+            if exclude and (self.directory / name).resolve() in exclude:
+                continue
+            victims.append(name)
+            excess -= size
+
+        self.evict(victims)
+        return victims
+
+    def expire(
+        self,
+        max_age_seconds: float,
+        exclude: Optional[Set[Path]] = None
+    ) -> List[str]:
+        """
+        Evict files not used within ``max_age_seconds``.
+
+        Args:
+            max_age_seconds: Maximum time since last access
+            exclude: Resolved paths still in use (never evicted)
+
+        Returns:
+            Names of evicted files
+        """
+        cutoff = time.time() - max_age_seconds
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name FROM audio_cache WHERE last_access < ?",
+                (cutoff,)
+            ).fetchall()
+
+        exclude = self._protected(exclude)
+        victims = [
+            name for (name,) in rows
+            if not exclude or (self.directory / name).resolve() not in exclude
+        ]
+        self.evict(victims)
+        return victims
+
+    def _protected(self, exclude: Optional[Set[Path]]) -> Set[Path]:
+        """Explicit exclusions plus the paths reported in use."""
+        protected = set(exclude or ())
+        if self.in_use is not None:
+            protected |= self.in_use()
+        return protected
+
+    def adopt_existing(self) -> int:
+        """
+        Index audio files already in the directory.
+
+        This is the only operation that lists the directory; it runs once
+        when the index is first created.
+
+        Returns:
+            Number of files adopted
+        """
+        rows = []
+        for file in self.directory.iterdir():
+            if not file.is_file() or file.name.startswith(INDEX_FILENAME):
+                continue
+            stat = file.stat()
+            rows.append((file.name, stat.st_size, stat.st_mtime, stat.st_mtime))
+
+        with self._lock:
+            self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO audio_cache (name, size, created_at, last_access, hits)
+                VALUES (?, ?, ?, ?, 0)
+                """,
+                rows
+            )
+            self._conn.commit()
+
+        return len(rows)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
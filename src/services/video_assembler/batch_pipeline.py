@@ -0,0 +1,277 @@
+"""
+Stage-Pipelined Batch Assembly
+
+This module runs many video assemblies as a staged pipeline so that
+different videos occupy different stages at the same time: video N+1 is
+being narrated while video N is rendering.
+
+Features:
+- Separate bounded worker pools for TTS, timeline building and rendering
+- Bounded queues between stages for backpressure
+- Total CPU budget split between the CPU-bound stages
+- Per-stage queue depth, utilization and throughput metrics
+
+Usage:
+    pipeline = BatchPipeline(assembler, BatchConfig(cpu_budget=16))
+    results = await pipeline.run(jobs)
+    print(pipeline.get_metrics())
+"""
+
+import asyncio
+import copy
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatchConfig:
+    """Configuration for batch assembly."""
+
+    # Total cores the batch may keep busy (None = all cores)
+    cpu_budget: Optional[int] = None
+
+    # Workers per stage (None = derive from the CPU budget)
+    tts_workers: int = 1  # TTS models are large; one per process by default
+    timeline_workers: int = 4  # I/O bound
+    render_workers: Optional[int] = None
+
+    # Encoder threads used by each render (None = RenderConfig.threads)
+    render_threads: Optional[int] = None
+
+    # Maximum jobs waiting in front of each stage
+    queue_size: int = 2
+
+
+@dataclass
+class StageMetrics:
+    """Runtime metrics for one pipeline stage."""
+    name: str
+    workers: int
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    active: int = 0
+    completed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of available worker time spent busy."""
+        capacity = self.wall_seconds * self.workers
+        return self.busy_seconds / capacity if capacity > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        """Export metrics as a plain dictionary."""
+        data = asdict(self)
+        data["utilization"] = self.utilization
+        return data
+
+
+class BatchPipeline:
+    """
+    Staged batch assembly engine.
+
+    Drives a VideoAssembler's stage methods (narrate, build timeline,
+    render) with an independent worker pool per stage.
+    """
+
+    def __init__(self, assembler, config: Optional[BatchConfig] = None):
+        """
+        Initialize batch pipeline.
+
+        Args:
+            assembler: VideoAssembler whose stages to run
+            config: Batch configuration
+        """
+        self.assembler = assembler
+        self.config = config or BatchConfig()
+
+        self.render_threads = self.resolve_render_threads()
+        workers = self.resolve_workers()
+        self.metrics: Dict[str, StageMetrics] = {
+            name: StageMetrics(name=name, workers=count)
+            for name, count in workers.items()
+        }
+
+    def resolve_render_threads(self) -> int:
+        """
+        Work out the encoder threads each batch render may use.
+
+        Returns:
+            ``render_threads`` (default: the renderer's own setting),
+            capped at the CPU budget
+        """
+        budget = max(1, self.config.cpu_budget or os.cpu_count() or 1)
+
+        render_threads = self.config.render_threads
+        if render_threads is None:
+            renderer_config = getattr(self.assembler.video_renderer, "config", None)
+            render_threads = getattr(renderer_config, "threads", None)
+        if not isinstance(render_threads, int) or render_threads < 1:
+            render_threads = 1
+        return min(render_threads, budget)
+
+    def resolve_workers(self) -> Dict[str, int]:
+        """
+        Work out worker counts per stage from the CPU budget.
+
+        Rendering gets ``(budget - tts_workers) // render_threads`` workers
+        so that concurrent encodes don't oversubscribe the cores.
+
+        Returns:
+            Mapping of stage name to worker count
+        """
+        budget = max(1, self.config.cpu_budget or os.cpu_count() or 1)
+        tts_workers = max(1, min(self.config.tts_workers, budget))
+
+        render_workers = self.config.render_workers
+        if render_workers is None:
+            render_workers = (budget - tts_workers) // self.resolve_render_threads()
+        render_workers = max(1, render_workers)
+
+        return {
+            "tts": tts_workers,
+            "timeline": max(1, self.config.timeline_workers),
+            "render": render_workers,
+        }
+
+    def get_metrics(self) -> Dict[str, dict]:
+        """
+        Get per-stage metrics.
+
+        Returns:
+            Mapping of stage name to metrics dictionary
+        """
+        return {name: m.to_dict() for name, m in self.metrics.items()}
+
+    async def run(self, jobs: List) -> List:
+        """
+        Run assembly jobs through the staged pipeline.
+
+        Args:
+            jobs: AssemblyJob objects to process
+
+        Returns:
+            AssembledVideo results in the same order as ``jobs``
+        """
+        if not jobs:
+            return []
+
+        stages: List[Tuple[str, Callable[..., Awaitable]]] = [
+            ("tts", self.assembler._stage_narrate),
+            ("timeline", self.assembler._stage_build_timeline),
+            ("render", self.assembler._stage_render),
+        ]
+
+        queues = [
+            asyncio.Queue(maxsize=max(1, self.config.queue_size))
+            for _ in stages
+        ]
+        results: Dict[int, object] = {}
+        started = time.monotonic()
+
+        logger.info(
+            "Starting batch of %d videos (workers: %s)",
+            len(jobs),
+            ", ".join(f"{m.name}={m.workers}" for m in self.metrics.values()),
+        )
+
+        async def worker(stage_index: int) -> None:
+            name, stage_fn = stages[stage_index]
+            metrics = self.metrics[name]
+            queue = queues[stage_index]
+            is_last = stage_index == len(stages) - 1
+
+            while True:
+                item = await queue.get()
+                metrics.queue_depth = queue.qsize()
+
+                if item is None:
+                    queue.task_done()
+                    return
+
+                index, job = item
+                metrics.active += 1
+                stage_start = time.monotonic()
+
+                try:
+                    try:
+                        output = await stage_fn(job)
+                    finally:
+                        # Time blocked on a full downstream queue is not busy time
+                        metrics.active -= 1
+                        metrics.busy_seconds += time.monotonic() - stage_start
+                except Exception as e:
+                    metrics.failed += 1
+                    results[index] = self.assembler._failed_result(job, e)
+                else:
+                    metrics.completed += 1
+                    if is_last:
+                        results[index] = output
+                    else:
+                        await self._enqueue(stage_index + 1, queues, (index, job))
+                finally:
+                    queue.task_done()
+
+        workers = [
+            [
+                asyncio.create_task(worker(stage_index))
+                for _ in range(self.metrics[name].workers)
+            ]
+            for stage_index, (name, _) in enumerate(stages)
+        ]
+
+        # Batch renders encode with the threads the worker count was sized for
+        renderer = self.assembler.video_renderer
+        renderer_config = getattr(renderer, "config", None)
+        if renderer_config is not None:
+            renderer.config = copy.copy(renderer_config)
+            renderer.config.threads = self.render_threads
+
+        try:
+            for index, job in enumerate(jobs):
+                await self._enqueue(0, queues, (index, job))
+
+            # Drain stages in order; once a stage's queue is empty and its
+            # workers are idle, everything upstream has been handed on
+            for stage_index, (name, _) in enumerate(stages):
+                await queues[stage_index].join()
+                for _ in workers[stage_index]:
+                    await queues[stage_index].put(None)
+                await asyncio.gather(*workers[stage_index])
+                self.metrics[name].wall_seconds = time.monotonic() - started
+        finally:
+            for task in (t for stage in workers for t in stage):
+                if not task.done():
+                    task.cancel()
+            if renderer_config is not None:
+                renderer.config = renderer_config
+
+        logger.info(
+            "Batch complete: %d videos in %.1fs",
+            len(jobs),
+            time.monotonic() - started,
+        )
+
+        return [results[i] for i in range(len(jobs))]
+
+    async def _enqueue(
+        self,
+        stage_index: int,
+        queues: List[asyncio.Queue],
+        item: tuple,
+    ) -> None:
+        """Put an item on a stage queue and record its depth."""
+        name = list(self.metrics)[stage_index]
+        metrics = self.metrics[name]
+
+        await queues[stage_index].put(item)
+
+        metrics.queue_depth = queues[stage_index].qsize()
+        metrics.max_queue_depth = max(metrics.max_queue_depth, metrics.queue_depth)
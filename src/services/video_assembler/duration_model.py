@@ -0,0 +1,324 @@
+"""
+Learned Narration Duration Model
+
+This module predicts how long a voice will take to speak a piece of text,
+so scenes can be planned and fitted to a target duration before any audio
+is synthesized.
+
+Features:
+- Text features: characters, syllables, words, clause and sentence
+  punctuation, explicit <pause> SSML seconds
+- One least-squares model per voice, updated incrementally from every
+  synthesized segment (sufficient statistics only, no sample storage)
+- Words-per-minute fallback until a voice has enough observations
+- Running absolute percentage error per voice
+- Optional JSON persistence
+
+Usage:
+    estimator = DurationEstimator(Path(".cache/duration_model.json"))
+    estimator.observe(text, "female_calm", duration=12.3)
+    seconds = estimator.predict(text, "female_calm", speaking_rate=0.9)
+"""
+
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .ssml import parse_ssml, plain_text
+
+logger = logging.getLogger(__name__)
+
+
+FALLBACK_WPM = 150
+
+_WORD_PATTERN = re.compile(r"[A-Za-z0-9']+")
+_VOWEL_GROUPS = re.compile(r"[aeiouy]+")
+
+FEATURE_NAMES = [
+    "bias",
+    "characters",
+    "syllables",
+    "words",
+    "clause_breaks",
+    "sentence_breaks",
+    "pause_seconds",
+]
+
+
+def count_syllables(word: str) -> int:
+    """Approximate the syllable count of an English word."""
+    word = word.lower().strip("'")
+    if not word:
+        return 0
+    if word.isdigit():
+        return 2 * len(word)  # Spoken digits average about two syllables
+
+    syllables = len(_VOWEL_GROUPS.findall(word))
+    if word.endswith("e") and not word.endswith(("le", "ee")) and syllables > 1:
+        syllables -= 1
+    return max(1, syllables)
+
+
+def extract_features(text: str) -> np.ndarray:
+    """
+    Extract duration features from (possibly SSML-tagged) text.
+
+    Args:
+        text: Narration text
+
+    Returns:
+        Feature vector ordered as FEATURE_NAMES
+    """
+    spans = parse_ssml(text)
+    pause_seconds = sum(span.pause for span in spans)
+    plain = plain_text(spans)
+    words = _WORD_PATTERN.findall(plain)
+
+    return np.array([
+        1.0,
+        float(sum(len(w) for w in words)),
+        float(sum(count_syllables(w) for w in words)),
+        float(len(words)),
+        float(len(re.findall(r"[,;:—-]", plain))),
+        float(len(re.findall(r"[.!?]+", plain))),
+        pause_seconds,
+    ])
+
+
+class _VoiceModel:
+    """Incremental ridge regression for one voice."""
+
+    def __init__(self, n_features: int):
+        self.xtx = np.zeros((n_features, n_features))
+        self.xty = np.zeros(n_features)
+        self.samples = 0
+        self.abs_pct_error = 0.0  # Sum of |error| / actual over scored samples
+        self.scored = 0
+        self._coef: Optional[np.ndarray] = None
+
+    def add(self, features: np.ndarray, duration: float) -> None:
+        self.xtx += np.outer(features, features)
+        self.xty += features * duration
+        self.samples += 1
+        self._coef = None
+
+    def coef(self, ridge: float) -> np.ndarray:
+        if self._coef is None:
+            penalty = ridge * np.eye(len(self.xty))
+            penalty[0, 0] = 0.0  # Don't shrink the intercept
+            self._coef = np.linalg.lstsq(self.xtx + penalty, self.xty, rcond=None)[0]
+        return self._coef
+
+    def to_dict(self) -> dict:
+        return {
+            "xtx": self.xtx.tolist(),
+            "xty": self.xty.tolist(),
+            "samples": self.samples,
+            "abs_pct_error": self.abs_pct_error,
+            "scored": self.scored,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "_VoiceModel":
+        model = cls(len(data["xty"]))
+        model.xtx = np.array(data["xtx"], dtype=float)
+        model.xty = np.array(data["xty"], dtype=float)
+        model.samples = data["samples"]
+        model.abs_pct_error = data.get("abs_pct_error", 0.0)
+        model.scored = data.get("scored", 0)
+        return model
+
+
+class DurationEstimator:
+    """
+    Per-voice narration duration predictor.
+
+    Durations are modelled at speaking rate 1.0; predictions for other
+    rates are scaled by ``1 / speaking_rate`` (speech only, not pauses).
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        min_samples: int = 8,
+        ridge: float = 1e-3,
+        fallback_wpm: float = FALLBACK_WPM,
+    ):
+        """
+        Initialize duration estimator.
+
+        Args:
+            path: JSON file to load from and save to (None = in memory only)
+            min_samples: Observations needed before a voice's model is used
+            ridge: L2 regularization strength
+            fallback_wpm: Words per minute used until a model is ready
+        """
+        self.path = Path(path) if path else None
+        self.min_samples = min_samples
+        self.ridge = ridge
+        self.fallback_wpm = fallback_wpm
+
+        self._models: Dict[str, _VoiceModel] = {}
+
+        if self.path and self.path.exists():
+            self.load()
+
+    def predict(
+        self,
+        text: str,
+        voice: Optional[str] = None,
+        speaking_rate: float = 1.0,
+    ) -> float:
+        """
+        Predict narration duration.
+
+        Args:
+            text: Narration text (SSML allowed)
+            voice: Voice identifier (None = any voice)
+            speaking_rate: Speaking rate multiplier
+
+        Returns:
+            Predicted duration in seconds
+        """
+        features = extract_features(text)
+        pauses = features[FEATURE_NAMES.index("pause_seconds")]
+
+        model = self._model_for(voice)
+        if model is None:
+            words = features[FEATURE_NAMES.index("words")]
+            speech = words / self.fallback_wpm * 60
+        else:
+            speech = float(features @ model.coef(self.ridge)) - pauses
+
+        return max(0.0, speech) / speaking_rate + pauses
+
+    def observe(
+        self,
+        text: str,
+        voice: str,
+        duration: float,
+        speaking_rate: float = 1.0,
+    ) -> None:
+        """
+        Learn from a synthesized segment.
+
+        The prediction made before this observation is scored first, so
+        ``error(voice)`` reflects genuine out-of-sample accuracy.
+
+        Args:
+            text: Text that was synthesized (SSML allowed)
+            voice: Voice identifier
+            duration: Actual audio duration in seconds
+            speaking_rate: Speaking rate used for synthesis
+        """
+        if duration <= 0:
+            return
+
+        features = extract_features(text)
+        pauses = features[FEATURE_NAMES.index("pause_seconds")]
+
+        model = self._models.setdefault(voice, _VoiceModel(len(FEATURE_NAMES)))
+        if model.samples >= self.min_samples:
+            predicted = self.predict(text, voice, speaking_rate)
+            model.abs_pct_error += abs(predicted - duration) / duration
+            model.scored += 1
+
+        # Normalize to rate 1.0; pauses are not affected by speaking rate
+        normalized = (duration - pauses) * speaking_rate + pauses
+        model.add(features, normalized)
+
+    def fit(self, samples: Iterable[tuple]) -> int:
+        """
+        Learn from many (text, voice, duration[, speaking_rate]) samples.
+
+        Args:
+            samples: Observations, e.g. built from cached TTSResults
+
+        Returns:
+            Number of samples used
+        """
+        count = 0
+        for sample in samples:
+            self.observe(*sample)
+            count += 1
+        return count
+
+    def error(self, voice: str) -> Optional[float]:
+        """
+        Mean absolute percentage error of predictions for a voice.
+
+        Args:
+            voice: Voice identifier
+
+        Returns:
+            Error as a fraction (0.05 = 5%), or None if nothing was scored
+        """
+        model = self._models.get(voice)
+        if model is None or model.scored == 0:
+            return None
+        return model.abs_pct_error / model.scored
+
+    def voices(self) -> List[str]:
+        """Voices with at least one observation."""
+        return list(self._models)
+
+    def dumps(self) -> str:
+        """Serialize the model to JSON."""
+        return json.dumps({
+            "features": FEATURE_NAMES,
+            "voices": {v: m.to_dict() for v, m in self._models.items()},
+        })
+
+    def save(self, snapshot: Optional[str] = None) -> None:
+        """
+        Persist the model to ``path``.
+
+        Args:
+            snapshot: Output of ``dumps`` taken earlier (e.g. so the write
+                can run in another thread); defaults to the current model
+        """
+        if self.path is None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(snapshot if snapshot is not None else self.dumps())
+        tmp.replace(self.path)
+
+    def load(self) -> None:
+        """Load a model saved by ``save``; ignored if incompatible."""
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Could not load duration model {self.path}: {e}")
+            return
+
+        if data.get("features") != FEATURE_NAMES:
+            logger.info("Duration model features changed; starting fresh")
+            return
+
+        self._models = {
+            voice: _VoiceModel.from_dict(model)
+            for voice, model in data.get("voices", {}).items()
+        }
+
+    def _model_for(self, voice: Optional[str]) -> Optional[_VoiceModel]:
+        """Pick the voice's model, else a pooled one, once trained."""
+        model = self._models.get(voice) if voice else None
+        if model is not None and model.samples >= self.min_samples:
+            return model
+
+        trained = [m for m in self._models.values() if m.samples >= self.min_samples]
+        if not trained:
+            return None
+
+        pooled = _VoiceModel(len(FEATURE_NAMES))
+        for m in trained:
+            pooled.xtx += m.xtx
+            pooled.xty += m.xty
+            pooled.samples += m.samples
+        return pooled
@@ -0,0 +1,295 @@
+"""
+Multi-Language Variants
+
+Builds language versions of a video that share one rendered visual track:
+- Scene timing is planned from every language's narration, and a scene is
+  lengthened only where a translation needs more time than it has
+- The visual track is rendered once, without audio or burned-in captions
+- Each language gets its own audio track (narration placed at the scene
+  start times, mixed with the background music) encoded by ffmpeg
+- Tracks are muxed with stream copy, either as several audio tracks in one
+  file or as one file per language; the video is never re-encoded
+
+Usage:
+    result = await assembler.assemble_variants(
+        scripts={"en": english_script, "es": spanish_script},
+        niche="meditation",
+        assets=asset_paths,
+    )
+    print(result.variants["es"].video_path)
+"""
+
+import logging
+import uuid
+from dataclasses import replace
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+from .quality_check import QCReport
+from .timeline_builder import BackgroundMusic, Scene, Timeline, TimelineConfig
+from .tts_engine import TTSResult
+
+logger = logging.getLogger(__name__)
+
+# ISO 639-1 -> ISO 639-2 codes, which MP4/MKV language tags use
+_LANGUAGE_TAGS = {
+    "ar": "ara", "de": "deu", "en": "eng", "es": "spa", "fr": "fra",
+    "hi": "hin", "id": "ind", "it": "ita", "ja": "jpn", "ko": "kor",
+    "nl": "nld", "pl": "pol", "pt": "por", "ru": "rus", "sv": "swe",
+    "tr": "tur", "uk": "ukr", "vi": "vie", "zh": "zho",
+}
+
+
+class VariantMode(str, Enum):
+    """How language variants are delivered."""
+    TRACKS = "tracks"  # One file with an audio track per language
+    FILES = "files"  # One file per language
+
+
+class LanguageVariant(BaseModel):
+    """One language version of a multi-language video."""
+    language: str
+    voice: str
+    video_path: str  # Shared file in TRACKS mode
+    track_index: Optional[int] = None  # Audio stream index in TRACKS mode
+    segments: List[str] = Field(default_factory=list)
+    narration: List[TTSResult] = Field(default_factory=list)
+    audio_duration: float = 0.0
+
+
+class MultiLanguageVideo(BaseModel):
+    """Result of a multi-language assembly."""
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    mode: VariantMode
+    primary_language: str
+    video_path: str  # Combined file (TRACKS) or the primary language's file
+    variants: Dict[str, LanguageVariant] = Field(default_factory=dict)
+    thumbnail_path: Optional[str] = None
+    timeline_path: Optional[str] = None
+    qc: Optional[QCReport] = None  # Checked on the primary language
+
+    # Metadata
+    niche: str
+    title: Optional[str] = None
+    duration: float
+    resolution: tuple[int, int]
+    fps: int
+    scene_count: int
+    retimed_scenes: List[int] = Field(default_factory=list)
+
+    # Timing
+    render_time: float  # Visual track, rendered once
+    mux_time: float  # Audio mixing and stream-copy muxing, all languages
+    assembly_time: float
+    assembled_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+def language_tag(language: str) -> str:
+    """ISO 639-2 tag for a language code (passed through if unknown)."""
+    code = language.lower().split("-")[0].split("_")[0]
+    return _LANGUAGE_TAGS.get(code, code)
+
+
+def retime_scenes(
+    timeline: Timeline,
+    narration_durations: Sequence[Sequence[float]],
+    config: TimelineConfig,
+    padding: float = 0.25,
+) -> Tuple[Timeline, List[int]]:
+    """
+    Lengthen scenes whose translated narration overruns them.
+
+    The timeline was planned from the primary narration, so only the
+    other languages can overrun it. Scenes that already fit every
+    language keep their duration; start times are recomputed so the
+    timeline stays contiguous.
+
+    Args:
+        timeline: Timeline planned from the primary language
+        narration_durations: Per translation, narration seconds per scene
+        config: Timeline config (resolution, fps)
+        padding: Seconds of breathing room after an overrunning narration
+
+    Returns:
+        (retimed timeline, indices of lengthened scenes)
+    """
+    retimed: List[int] = []
+    scenes: List[Scene] = []
+    start = 0.0
+
+    for i, scene in enumerate(timeline.scenes):
+        longest = max(
+            (durations[i] for durations in narration_durations if i < len(durations)),
+            default=0.0,
+        )
+
+        duration = scene.duration
+        assets = scene.assets
+        if longest > scene.duration + 1e-6:
+            duration = longest + padding
+            retimed.append(i)
+            # Stills sized to the scene grow with it; clips loop or hold
+            assets = [
+                replace(asset, duration=duration)
+                if asset.duration is not None and abs(asset.duration - scene.duration) < 1e-6
+                else asset
+                for asset in scene.assets
+            ]
+
+        scenes.append(replace(scene, assets=assets, start_time=start, duration=duration))
+        start += duration
+
+    if not retimed:
+        return timeline, []
+
+    retimed_timeline = Timeline.from_scenes(
+        scenes,
+        replace(config, resolution=timeline.resolution, fps=timeline.fps),
+        background_music=timeline.background_music,
+    )
+    return retimed_timeline, retimed
+
+
+def _is_caption(overlay, scene: Scene) -> bool:
+    """Whether an overlay is a caption generated from the scene's script."""
+    segment = scene.script_segment
+    return bool(segment) and segment.startswith(overlay.text.removesuffix("..."))
+
+
+def visual_timeline(timeline: Timeline, config: TimelineConfig) -> Timeline:
+    """
+    Strip a timeline down to what all languages share.
+
+    Narration, background music and script captions are removed; every
+    other overlay is kept.
+
+    Args:
+        timeline: Full timeline
+        config: Timeline config (resolution, fps)
+
+    Returns:
+        Silent, caption-free timeline with identical scene timing
+    """
+    scenes = [
+        replace(
+            scene,
+            narration_path=None,
+            text_overlays=[o for o in scene.text_overlays if not _is_caption(o, scene)],
+        )
+        for scene in timeline.scenes
+    ]
+    return Timeline.from_scenes(
+        scenes,
+        replace(config, resolution=timeline.resolution, fps=timeline.fps),
+    )
+
+
+def build_audio_track_command(
+    narration: Sequence[Tuple[Path, float, float]],
+    duration: float,
+    output_path: Path,
+    music: Optional[BackgroundMusic] = None,
+    codec: str = "aac",
+    bitrate: str = "192k",
+    sample_rate: int = 48000,
+) -> List[str]:
+    """
+    ffmpeg command that mixes one language's audio track.
+
+    Args:
+        narration: (audio path, start seconds, volume) per narrated scene
+        duration: Track length in seconds (the visual track's duration)
+        output_path: Encoded track to write
+        music: Optional background music
+        codec: Audio codec
+        bitrate: Audio bitrate
+        sample_rate: Output sample rate
+
+    Returns:
+        Argument list
+    """
+    cmd = ["ffmpeg", "-y", "-v", "error"]
+    filters = []
+    labels = []
+
+    for i, (path, start, volume) in enumerate(narration):
+        cmd += ["-i", str(path)]
+        delay = int(round(start * 1000))
+        filters.append(f"[{i}:a]adelay={delay}:all=1,volume={volume}[n{i}]")
+        labels.append(f"[n{i}]")
+
+    if music is not None:
+        if music.loop:
+            cmd += ["-stream_loop", "-1"]
+        cmd += ["-i", str(music.path)]
+        index = len(narration)
+        music_end = min(duration, music.start_time + music.duration) if music.duration else duration
+        length = max(0.0, music_end - music.start_time)
+        chain = [f"atrim=0:{length:.3f}", f"volume={music.volume}"]
+        if music.fade_in:
+            chain.append(f"afade=t=in:d={music.fade_in}")
+        if music.fade_out and length > music.fade_out:
+            chain.append(f"afade=t=out:st={length - music.fade_out:.3f}:d={music.fade_out}")
+        chain.append(f"adelay={int(round(music.start_time * 1000))}:all=1")
+        filters.append(f"[{index}:a]" + ",".join(chain) + "[m]")
+        labels.append("[m]")
+
+    if not labels:
+        # No narration or music: a silent track keeps players consistent
+        cmd += ["-f", "lavfi", "-i", f"anullsrc=r={sample_rate}:cl=stereo"]
+        labels.append("[0:a]")
+
+    filters.append(
+        "".join(labels)
+        + f"amix=inputs={len(labels)}:normalize=0:duration=longest,"
+        + f"apad,atrim=0:{duration:.3f}[out]"
+    )
+
+    cmd += [
+        "-filter_complex", ";".join(filters),
+        "-map", "[out]",
+        "-c:a", codec,
+        "-b:a", bitrate,
+        "-ar", str(sample_rate),
+        str(output_path),
+    ]
+    return cmd
+
+
+def build_mux_command(
+    video_path: Path,
+    tracks: Sequence[Tuple[str, Path]],
+    output_path: Path,
+) -> List[str]:
+    """
+    ffmpeg command that muxes audio tracks onto a video by stream copy.
+
+    Args:
+        video_path: Silent visual track
+        tracks: (language, audio path) per track; the first is the default
+        output_path: File to write
+
+    Returns:
+        Argument list
+    """
+    cmd = ["ffmpeg", "-y", "-v", "error", "-i", str(video_path)]
+    for _, path in tracks:
+        cmd += ["-i", str(path)]
+
+    cmd += ["-map", "0:v:0"]
+    for i in range(len(tracks)):
+        cmd += ["-map", f"{i + 1}:a:0"]
+
+    cmd += ["-c", "copy"]
+    for i, (language, _) in enumerate(tracks):
+        cmd += [
+            f"-metadata:s:a:{i}", f"language={language_tag(language)}",
+            f"-disposition:a:{i}", "default" if i == 0 else "0",
+        ]
+
+    cmd += ["-movflags", "+faststart", str(output_path)]
+    return cmd
@@ -0,0 +1,469 @@
+"""
+Lightweight Media Probing
+
+This module reads media durations and stream properties from file headers
+instead of decoding the whole file.
+
+Features:
+- RIFF/WAV header parsing (PCM and IEEE float) with no decoding
+- ffprobe fallback for compressed containers (mp3, ogg, mp4, ...)
+- pydub fallback as a last resort when ffprobe is not on PATH
+- Concurrent probing of many files with a small thread pool
+- Full stream metadata (dimensions, fps, codec, audio, keyframe interval)
+  and a cheap single-frame decodability check for visual assets
+
+Usage:
+    duration = probe_audio_duration(Path("narration.wav"))
+    durations = await probe_audio_durations(paths, max_workers=4)
+    info = probe_media(Path("clip.mp4"))
+"""
+
+import asyncio
+import json
+import shutil
+import struct
+import subprocess  # nosec B404 - ffprobe is invoked with a fixed argument list
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv", ".webm"}
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".ogg", ".flac", ".m4a", ".aac"}
+
+# Codecs ffprobe reports for still images wrapped as a single video frame
+IMAGE_CODECS = {"mjpeg", "png", "bmp", "gif", "webp", "tiff"}
+
+# MediaInfo.error for best-effort results from a host without ffprobe
+PROBE_UNAVAILABLE = "ffprobe unavailable"
+
+
+class MediaProbeError(Exception):
+    """Raised when a media file cannot be probed."""
+    pass
+
+
+def read_wav_duration(path: Path) -> Optional[float]:
+    """
+    Read duration of a RIFF/WAVE file from its header.
+
+    Only the ``fmt `` and ``data`` chunk headers are read, so the cost is
+    independent of the file length.
+
+    Args:
+        path: Path to WAV file
+
+    Returns:
+        Duration in seconds, or None if the file is not a RIFF/WAVE file
+    """
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return None
+
+        byte_rate = None
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                return None
+
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                if len(fmt) < 12:
+                    return None
+                byte_rate = struct.unpack("<I", fmt[8:12])[0]
+                # Chunks are word aligned
+                if chunk_size % 2:
+                    f.seek(1, 1)
+            elif chunk_id == b"data":
+                if not byte_rate:
+                    return None
+                # Streaming writers leave 0 or 0xFFFFFFFF as data size;
+                # fall back to the actual bytes on disk
+                if chunk_size in (0, 0xFFFFFFFF):
+                    remaining = path.stat().st_size - f.tell()
+                    chunk_size = max(0, remaining)
+                return chunk_size / byte_rate
+            else:
+                f.seek(chunk_size + (chunk_size % 2), 1)
+
+
+def ffprobe_available() -> bool:
+    """Check whether ffprobe is available on PATH."""
+    return shutil.which("ffprobe") is not None
+
+
+def run_ffprobe(path: Path, timeout: float = 30.0) -> dict:
+    """
+    Run ffprobe and return its parsed JSON output.
+
+    Args:
+        path: Media file path
+        timeout: Maximum seconds to wait for ffprobe
+
+    Returns:
+        Dictionary with ``format`` and ``streams`` entries
+    """
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-print_format", "json",
+        "-show_format",
+        "-show_streams",
+        str(path),
+    ]
+
+    try:
+        proc = subprocess.run(  # nosec B603 - fixed argv, no shell
+            cmd,
+            capture_output=True,
+            timeout=timeout,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise MediaProbeError(f"ffprobe failed for {path}: {e}") from e
+
+    if proc.returncode != 0:
+        raise MediaProbeError(
+            f"ffprobe failed for {path}: {proc.stderr.decode(errors='replace').strip()}"
+        )
+
+    try:
+        return json.loads(proc.stdout or b"{}")
+    except json.JSONDecodeError as e:
+        raise MediaProbeError(f"Invalid ffprobe output for {path}: {e}") from e
+
+
+def run_ffmpeg(cmd: List[str], timeout: float = 300.0) -> subprocess.CompletedProcess:
+    """
+    Run an ffmpeg command and return the finished process.
+
+    Args:
+        cmd: Full argument list, starting with "ffmpeg"
+        timeout: Maximum seconds to wait for ffmpeg
+
+    Returns:
+        CompletedProcess with captured stdout and stderr
+    """
+    try:
+        proc = subprocess.run(  # nosec B603 - fixed argv, no shell
+            cmd,
+            capture_output=True,
+            timeout=timeout,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise MediaProbeError(f"ffmpeg failed: {e}") from e
+
+    if proc.returncode != 0:
+        raise MediaProbeError(
+            f"ffmpeg failed: {proc.stderr.decode(errors='replace').strip()[-500:]}"
+        )
+
+    return proc
+
+
+def probe_audio_duration(path: Path) -> float:
+    """
+    Get audio duration without decoding the file when possible.
+
+    Tries, in order: RIFF header parsing, ffprobe container metadata,
+    and finally a full pydub decode.
+
+    Args:
+        path: Audio file path
+
+    Returns:
+        Duration in seconds
+    """
+    path = Path(path)
+
+    if path.suffix.lower() in (".wav", ".wave", ""):
+        try:
+            duration = read_wav_duration(path)
+        except (OSError, struct.error):
+            duration = None
+        if duration is not None:
+            return duration
+
+    if ffprobe_available():
+        try:
+            info = run_ffprobe(path)
+            duration = info.get("format", {}).get("duration")
+            if duration is not None:
+                return float(duration)
+        except (MediaProbeError, ValueError):
+            pass
+
+    # Last resort: decode the file
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(str(path))
+    return len(audio) / 1000.0  # Convert ms to seconds
+
+
+async def probe_audio_durations(
+    paths: List[Path],
+    max_workers: int = 4,
+) -> List[float]:
+    """
+    Probe durations of many audio files concurrently.
+
+    Args:
+        paths: Audio file paths
+        max_workers: Size of the probing thread pool
+
+    Returns:
+        Durations in seconds, in the same order as ``paths``
+    """
+    if not paths:
+        return []
+
+    loop = asyncio.get_event_loop()
+    workers = max(1, min(max_workers, len(paths)))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="probe") as pool:
+        tasks = [
+            loop.run_in_executor(pool, probe_audio_duration, path)
+            for path in paths
+        ]
+        return list(await asyncio.gather(*tasks))
+
+
+@dataclass
+class MediaInfo:
+    """Stream metadata for a media file, keyed by path, size and mtime."""
+    path: str
+    size: int
+    mtime_ns: int
+    media_type: Optional[str] = None  # video, image, audio
+    duration: Optional[float] = None  # seconds
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[float] = None
+    codec: Optional[str] = None
+    has_audio: bool = False
+    keyframe_interval: Optional[float] = None  # seconds between keyframes
+    decodable: bool = True
+    error: Optional[str] = None
+
+
+def media_type_from_extension(path: Path) -> Optional[str]:
+    """Guess media type from file extension."""
+    ext = Path(path).suffix.lower()
+    if ext in VIDEO_EXTENSIONS:
+        return "video"
+    if ext in IMAGE_EXTENSIONS:
+        return "image"
+    if ext in AUDIO_EXTENSIONS:
+        return "audio"
+    return None
+
+
+def _parse_rate(rate: Optional[str]) -> Optional[float]:
+    """Parse an ffprobe frame rate such as ``30000/1001``."""
+    if not rate:
+        return None
+    try:
+        if "/" in rate:
+            num, den = rate.split("/", 1)
+            den_f = float(den)
+            return float(num) / den_f if den_f else None
+        return float(rate)
+    except ValueError:
+        return None
+
+
+def probe_keyframe_interval(
+    path: Path,
+    window: float = 30.0,
+    timeout: float = 30.0,
+) -> Optional[float]:
+    """
+    Estimate the average keyframe interval of a video.
+
+    Only keyframes within the first ``window`` seconds are read
+    (``-skip_frame nokey``), so this does not decode the whole file.
+
+    Args:
+        path: Video file path
+        window: Seconds of video to inspect
+        timeout: Maximum seconds to wait for ffprobe
+
+    Returns:
+        Average seconds between keyframes, or None if unknown
+    """
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-skip_frame", "nokey",
+        "-read_intervals", f"%+{window}",
+        "-show_entries", "frame=best_effort_timestamp_time",
+        "-of", "csv=p=0",
+        str(path),
+    ]
+
+    try:
+        proc = subprocess.run(  # nosec B603 - fixed argv, no shell
+            cmd,
+            capture_output=True,
+            timeout=timeout,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+    if proc.returncode != 0:
+        return None
+
+    times = []
+    for line in proc.stdout.decode(errors="replace").splitlines():
+        value = line.strip().rstrip(",")
+        try:
+            times.append(float(value))
+        except ValueError:
+            continue
+
+    if len(times) < 2:
+        return None
+
+    return (times[-1] - times[0]) / (len(times) - 1)
+
+
+def check_decodable(path: Path, timeout: float = 30.0) -> Optional[str]:
+    """
+    Decode a single frame to verify a visual asset is usable.
+
+    Args:
+        path: Media file path
+        timeout: Maximum seconds to wait for ffmpeg
+
+    Returns:
+        None if the first frame decodes cleanly, otherwise an error message
+    """
+    if shutil.which("ffmpeg") is None:
+        return None
+
+    cmd = [
+        "ffmpeg",
+        "-v", "error",
+        "-i", str(path),
+        "-frames:v", "1",
+        "-f", "null",
+        "-",
+    ]
+
+    try:
+        proc = subprocess.run(  # nosec B603 - fixed argv, no shell
+            cmd,
+            capture_output=True,
+            timeout=timeout,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return str(e)
+
+    if proc.returncode != 0:
+        return proc.stderr.decode(errors="replace").strip() or "decode failed"
+
+    return None
+
+
+def probe_media(path: Path, verify_decode: bool = True) -> MediaInfo:
+    """
+    Probe stream metadata of a media file.
+
+    Never raises for unreadable media: failures are reported through
+    ``MediaInfo.decodable`` and ``MediaInfo.error``.
+
+    Args:
+        path: Media file path
+        verify_decode: Also decode one frame of visual assets
+
+    Returns:
+        MediaInfo for the file
+    """
+    path = Path(path)
+    stat = path.stat()
+    info = MediaInfo(
+        path=str(path),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        media_type=media_type_from_extension(path),
+    )
+
+    if stat.st_size == 0:
+        info.decodable = False
+        info.error = "empty file"
+        return info
+
+    if not ffprobe_available():
+        # Without ffprobe we can only vouch for WAV audio; everything else
+        # is assumed usable and left for the renderer to discover
+        if info.media_type == "audio":
+            try:
+                info.duration = read_wav_duration(path)
+            except (OSError, struct.error):
+                pass
+        info.error = PROBE_UNAVAILABLE
+        return info
+
+    try:
+        data = run_ffprobe(path)
+    except MediaProbeError as e:
+        info.decodable = False
+        info.error = str(e)
+        return info
+
+    streams = data.get("streams", [])
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    audio = next((s for s in streams if s.get("codec_type") == "audio"), None)
+
+    info.has_audio = audio is not None
+
+    duration = data.get("format", {}).get("duration")
+    if duration is None and video is not None:
+        duration = video.get("duration")
+    try:
+        info.duration = float(duration) if duration is not None else None
+    except ValueError:
+        info.duration = None
+
+    if video is not None:
+        info.codec = video.get("codec_name")
+        info.width = video.get("width")
+        info.height = video.get("height")
+        info.fps = _parse_rate(video.get("avg_frame_rate")) or _parse_rate(
+            video.get("r_frame_rate")
+        )
+        if info.codec in IMAGE_CODECS and (info.duration or 0) < 0.1:
+            info.media_type = "image"
+        elif info.media_type != "image":
+            info.media_type = "video"
+    elif audio is not None:
+        info.codec = audio.get("codec_name")
+        info.media_type = "audio"
+    else:
+        info.decodable = False
+        info.error = "no audio or video streams"
+        return info
+
+    if info.media_type == "video":
+        info.keyframe_interval = probe_keyframe_interval(path)
+        if not info.duration:
+            info.decodable = False
+            info.error = "video has no duration"
+            return info
+
+    if verify_decode and info.media_type in ("video", "image"):
+        error = check_decodable(path)
+        if error:
+            info.decodable = False
+            info.error = error
+
+    return info
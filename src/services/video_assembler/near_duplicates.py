@@ -0,0 +1,357 @@
+"""
+Near-Duplicate Asset Index
+
+This module answers "which assets look like this one?" over 64-bit
+perceptual hashes, so re-encoded, resized or slightly cropped copies of the
+same stock clip are caught at ingest and not used twice in one video.
+
+Features:
+- Hamming-distance <= k queries using multi-index hashing: each hash is
+  split into four 16-bit chunks with one bucket table per chunk, and by the
+  pigeonhole principle every match agrees with the query to within k // 4
+  bits on at least one chunk
+- Candidates are verified with a vectorized NumPy popcount
+- Incremental inserts: new rows are scanned linearly until the tail is
+  large enough to be worth folding into the bucket tables
+- .npz persistence, compacting removed entries
+
+Usage:
+    index = PerceptualHashIndex(Path(".cache/phash_index.npz"))
+    duplicate = index.find_duplicate(str(imagehash.phash(frame)))
+    if duplicate is None:
+        index.add(str(path), phash)
+        index.save()
+"""
+
+import logging
+from functools import lru_cache
+from itertools import combinations
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+HashLike = Union[int, str, np.integer]
+
+_CHUNKS = 4
+_CHUNK_BITS = 16
+_CHUNK_MASK = (1 << _CHUNK_BITS) - 1
+_BYTE_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def parse_hash(value: HashLike) -> int:
+    """
+    Convert a perceptual hash to a 64-bit integer.
+
+    Args:
+        value: Integer, or hex string as produced by ``str(imagehash.phash(...))``
+
+    Returns:
+        Unsigned 64-bit integer
+
+    Raises:
+        ValueError: If the hash is wider than 64 bits
+    """
+    number = int(value, 16) if isinstance(value, str) else int(value)
+    if number < 0 or number >> 64:
+        raise ValueError(f"Not a 64-bit perceptual hash: {value!r}")
+    return number
+
+
+def popcount(values: np.ndarray) -> np.ndarray:
+    """Number of set bits in each element of a uint64 array."""
+    values = np.ascontiguousarray(values, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values)
+    return _BYTE_POPCOUNT[values.view(np.uint8).reshape(-1, 8)].sum(axis=1)
+
+
+def hamming(a: HashLike, b: HashLike) -> int:
+    """Hamming distance between two perceptual hashes."""
+    return bin(parse_hash(a) ^ parse_hash(b)).count("1")
+
+
+@lru_cache(maxsize=8)
+def _flip_masks(radius: int) -> np.ndarray:
+    """All 16-bit masks with at most ``radius`` bits set."""
+    masks = [0]
+    for r in range(1, radius + 1):
+        for bits in combinations(range(_CHUNK_BITS), r):
+            masks.append(sum(1 << b for b in bits))
+    return np.array(masks, dtype=np.int64)
+
+
+class PerceptualHashIndex:
+    """
+    Index of 64-bit perceptual hashes for Hamming-radius search.
+
+    Hashes live in one preallocated uint64 array that grows by doubling.
+    Rows below ``_indexed`` are reachable through the chunk bucket tables;
+    rows added since the last rebuild form a tail that every query scans.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_distance: int = 8,
+        rebuild_threshold: int = 4096,
+    ):
+        """
+        Initialize perceptual hash index.
+
+        Args:
+            path: .npz file to load from and save to (None = in memory only)
+            max_distance: Default Hamming radius for queries
+            rebuild_threshold: Minimum unindexed tail before tables are rebuilt
+        """
+        self.path = Path(path) if path else None
+        self.max_distance = max_distance
+        self.rebuild_threshold = rebuild_threshold
+
+        self.keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        self._alive = np.zeros(0, dtype=bool)
+
+        # Per chunk: (rows sorted by chunk value, bucket start offsets)
+        self._tables: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._indexed = 0
+
+        if self.path and self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return str(key) in self._rows
+
+    def get(self, key: str) -> Optional[int]:
+        """Stored hash for a key, if indexed."""
+        row = self._rows.get(str(key))
+        return None if row is None else int(self._hashes[row])
+
+    def add(self, key: str, phash: HashLike) -> None:
+        """
+        Insert or replace one hash.
+
+        Args:
+            key: Asset key (e.g. path string)
+            phash: Perceptual hash
+        """
+        self.add_many([key], [phash])
+
+    def add_many(self, keys: Sequence[str], hashes: Sequence[HashLike]) -> None:
+        """
+        Insert or replace hashes.
+
+        Args:
+            keys: Asset keys
+            hashes: Perceptual hash per key
+        """
+        if len(keys) != len(hashes):
+            raise ValueError("Keys and hashes must match")
+
+        for key, phash in zip(keys, hashes):
+            key = str(key)
+            value = parse_hash(phash)
+            row = self._rows.get(key)
+            if row is not None:
+                if int(self._hashes[row]) == value:
+                    continue
+                # Tables still point at the old row; retire it instead
+                self._alive[row] = False
+
+            row = len(self.keys)
+            self._ensure_capacity(row + 1)
+            self.keys.append(key)
+            self._rows[key] = row
+            self._hashes[row] = value
+            self._alive[row] = True
+
+        tail = len(self.keys) - self._indexed
+        if tail >= max(self.rebuild_threshold, self._indexed // 16):
+            self.rebuild()
+
+    def remove(self, key: str) -> bool:
+        """
+        Remove a key.
+
+        Returns:
+            True if the key was indexed
+        """
+        row = self._rows.pop(str(key), None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        return True
+
+    def query(
+        self,
+        phash: HashLike,
+        max_distance: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, int]]:
+        """
+        Find indexed hashes within a Hamming radius.
+
+        Args:
+            phash: Query hash
+            max_distance: Hamming radius (default: ``max_distance``)
+            limit: Maximum results
+
+        Returns:
+            (key, distance) pairs, nearest first
+        """
+        k = self.max_distance if max_distance is None else max_distance
+        if not self._rows:
+            return []
+
+        query = np.uint64(parse_hash(phash))
+        rows = self._candidates(int(query), k)
+
+        distances = popcount(self._hashes[rows] ^ query)
+        keep = (distances <= k) & self._alive[rows]
+        # A row can hit on several chunks; dedupe the few survivors only
+        rows, first = np.unique(rows[keep], return_index=True)
+        distances = distances[keep][first]
+
+        order = np.lexsort((rows, distances))
+        if limit is not None:
+            order = order[:limit]
+        return [(self.keys[rows[i]], int(distances[i])) for i in order]
+
+    def find_duplicate(
+        self,
+        phash: HashLike,
+        max_distance: Optional[int] = None,
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Nearest indexed hash within the radius.
+
+        Returns:
+            (key, distance), or None if nothing is close enough
+        """
+        matches = self.query(phash, max_distance, limit=1)
+        return matches[0] if matches else None
+
+    def groups(
+        self,
+        keys: Iterable[str],
+        max_distance: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """
+        Cluster keys into near-duplicate groups.
+
+        Args:
+            keys: Keys to cluster (keys without a hash are their own group)
+            max_distance: Hamming radius linking two keys
+
+        Returns:
+            Mapping of each key to its group's first key
+        """
+        keys = [str(k) for k in keys]
+        parent = {key: key for key in keys}
+        position = {key: i for i, key in reversed(list(enumerate(keys)))}
+
+        def find(key: str) -> str:
+            while parent[key] != key:
+                parent[key] = parent[parent[key]]
+                key = parent[key]
+            return key
+
+        for key in keys:
+            phash = self.get(key)
+            if phash is None:
+                continue
+            for other, _ in self.query(phash, max_distance):
+                if other in parent:
+                    a, b = find(key), find(other)
+                    if a != b:
+                        # Keep the earliest key as the representative
+                        first, second = sorted((a, b), key=position.get)
+                        parent[second] = first
+
+        return {key: find(key) for key in keys}
+
+    def rebuild(self) -> None:
+        """Compact removed rows and rebuild the chunk bucket tables."""
+        live = np.flatnonzero(self._alive[:len(self.keys)])
+        if len(live) < len(self.keys):
+            self.keys = [self.keys[i] for i in live]
+            self._hashes = self._hashes[live].copy()
+            self._alive = np.ones(len(live), dtype=bool)
+            self._rows = {key: row for row, key in enumerate(self.keys)}
+
+        hashes = self._hashes[:len(self.keys)]
+        self._tables = []
+        for chunk in range(_CHUNKS):
+            values = ((hashes >> np.uint64(chunk * _CHUNK_BITS)) & np.uint64(_CHUNK_MASK)).astype(np.int64)
+            order = np.argsort(values, kind="stable")
+            starts = np.zeros(_CHUNK_MASK + 2, dtype=np.int64)
+            np.cumsum(np.bincount(values, minlength=_CHUNK_MASK + 1), out=starts[1:])
+            self._tables.append((order, starts))
+
+        self._indexed = len(self.keys)
+        logger.debug(f"Rebuilt perceptual hash index: {self._indexed} hashes")
+
+    def save(self) -> None:
+        """Persist the index to ``path`` (removed entries are dropped)."""
+        if self.path is None:
+            return
+
+        live = np.flatnonzero(self._alive[:len(self.keys)])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                keys=np.array([self.keys[i] for i in live], dtype=str),
+                hashes=self._hashes[live],
+            )
+        tmp.replace(self.path)
+
+    def load(self) -> None:
+        """Load an index saved by ``save``."""
+        with np.load(self.path, allow_pickle=False) as data:
+            self.keys = [str(k) for k in data["keys"]]
+            self._hashes = np.array(data["hashes"], dtype=np.uint64)
+
+        self._alive = np.ones(len(self.keys), dtype=bool)
+        self._rows = {key: row for row, key in enumerate(self.keys)}
+        self.rebuild()
+
+    def _candidates(self, query: int, k: int) -> np.ndarray:
+        """Rows that may be within distance k (with repeats): bucket hits plus the tail."""
+        parts = []
+        if self._indexed:
+            masks = _flip_masks(min(k // _CHUNKS, _CHUNK_BITS))
+            for chunk, (order, starts) in enumerate(self._tables):
+                value = (query >> (chunk * _CHUNK_BITS)) & _CHUNK_MASK
+                buckets = value ^ masks
+                lo, hi = starts[buckets], starts[buckets + 1]
+                lengths = hi - lo
+                total = int(lengths.sum())
+                if total:
+                    # Gather all bucket slices without a Python loop
+                    offsets = np.repeat(lo - np.cumsum(lengths) + lengths, lengths)
+                    parts.append(order[offsets + np.arange(total)])
+
+        if self._indexed < len(self.keys):
+            parts.append(np.arange(self._indexed, len(self.keys)))
+
+        if not parts:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(parts)
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows > len(self._hashes):
+            capacity = max(rows, 2 * len(self._hashes), 1024)
+            hashes = np.zeros(capacity, dtype=np.uint64)
+            hashes[:len(self._hashes)] = self._hashes
+            alive = np.zeros(capacity, dtype=bool)
+            alive[:len(self._alive)] = self._alive
+            self._hashes, self._alive = hashes, alive
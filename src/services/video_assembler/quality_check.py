@@ -0,0 +1,415 @@
+"""
+Post-Render Quality Control
+
+Checks a rendered video before it is uploaded, without a full decode:
+- Frames are sampled sparsely (keyframes only, downscaled to grayscale by
+  ffmpeg) and scored in NumPy for black and frozen stretches
+- The final audio track is decoded to low-rate mono PCM and scanned for
+  silence and clipping
+- Output that runs far past the narration (e.g. music left playing over
+  an empty tail) is flagged
+
+The encoder places keyframes at scene cuts, so keyframe sampling sees every
+scene while decoding a small fraction of the frames; QC typically costs a
+few percent of the render.
+
+Usage:
+    checker = QualityChecker()
+    report = await checker.check(Path("video.mp4"), narration_duration=312.0)
+    if not report.passed:
+        print(report.summary())
+"""
+
+import asyncio
+import logging
+import re
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from .media_probe import MediaProbeError, run_ffmpeg
+
+logger = logging.getLogger(__name__)
+
+_PTS_TIME = re.compile(r"pts_time:\s*([0-9.]+)")
+
+
+@dataclass
+class QCConfig:
+    """Thresholds for post-render quality control."""
+
+    # Frame sampling (keyframes, downscaled grayscale)
+    frame_width: int = 64
+    frame_height: int = 36
+
+    # Black frames: nearly all pixels darker than black_luma (0-255)
+    black_luma: int = 24
+    black_pixel_fraction: float = 0.98
+    max_black_seconds: float = 2.0
+
+    # Frozen frames: consecutive samples differing by less than this (0-255)
+    frozen_difference: float = 0.5
+    max_frozen_seconds: float = 20.0
+
+    # Audio (mono PCM at audio_sample_rate)
+    audio_sample_rate: int = 16000
+    window_seconds: float = 0.05
+    silence_dbfs: float = -50.0
+    max_silence_seconds: float = 3.0
+    clip_level: float = 0.999
+    max_clipped_fraction: float = 0.001
+
+    # Video running past the narration
+    max_tail_seconds: Optional[float] = 8.0
+
+    # ffmpeg
+    timeout: float = 300.0
+
+
+class QCIssue(BaseModel):
+    """A single quality problem found in the output."""
+    kind: str  # black, frozen, silence, clipping, tail
+    start: float = 0.0
+    end: float = 0.0
+    message: str
+
+
+class QCReport(BaseModel):
+    """Result of post-render quality control."""
+    passed: bool = True
+    issues: List[QCIssue] = Field(default_factory=list)
+    skipped: Optional[str] = None  # Why QC could not run, if it didn't
+
+    # Measurements
+    frames_sampled: int = 0
+    black_seconds: float = 0.0
+    frozen_seconds: float = 0.0
+    silence_seconds: float = 0.0
+    clipped_fraction: float = 0.0
+    qc_time: float = 0.0
+
+    def summary(self) -> str:
+        """One-line description of the outcome."""
+        if self.skipped:
+            return f"QC skipped: {self.skipped}"
+        if self.passed:
+            return "QC passed"
+        return "QC failed: " + "; ".join(issue.message for issue in self.issues)
+
+
+def _runs(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """Half-open index ranges where a boolean mask is True."""
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+def analyze_frames(
+    frames: np.ndarray,
+    timestamps: np.ndarray,
+    duration: float,
+    config: Optional[QCConfig] = None,
+) -> Tuple[List[QCIssue], float, float]:
+    """
+    Find black and frozen stretches in sampled frames.
+
+    Each sample is taken to represent the video until the next sample.
+
+    Args:
+        frames: Grayscale samples, shape (n, height, width), uint8
+        timestamps: Sample times in seconds, shape (n,)
+        duration: Video duration in seconds
+        config: QC thresholds
+
+    Returns:
+        (issues, black seconds, frozen seconds)
+    """
+    config = config or QCConfig()
+    if len(frames) == 0:
+        return [], 0.0, 0.0
+
+    ends = np.append(timestamps[1:], max(duration, float(timestamps[-1])))
+    flat = frames.reshape(len(frames), -1)
+
+    dark = (flat < config.black_luma).mean(axis=1)
+    black = dark >= config.black_pixel_fraction
+
+    # Sample i is frozen when it matches sample i - 1 (black runs aren't frozen)
+    difference = np.abs(np.diff(flat.astype(np.int16), axis=0)).mean(axis=1)
+    frozen = np.concatenate(([False], difference < config.frozen_difference)) & ~black
+
+    issues: List[QCIssue] = []
+    black_seconds = 0.0
+    for start, stop in _runs(black):
+        begin, end = float(timestamps[start]), float(ends[stop - 1])
+        black_seconds += end - begin
+        if end - begin > config.max_black_seconds:
+            issues.append(QCIssue(
+                kind="black",
+                start=begin,
+                end=end,
+                message=f"black video {begin:.1f}s-{end:.1f}s",
+            ))
+
+    frozen_seconds = 0.0
+    for start, stop in _runs(frozen):
+        # The run begins at the sample it repeats
+        begin, end = float(timestamps[start - 1]), float(ends[stop - 1])
+        frozen_seconds += end - begin
+        if end - begin > config.max_frozen_seconds:
+            issues.append(QCIssue(
+                kind="frozen",
+                start=begin,
+                end=end,
+                message=f"frozen video {begin:.1f}s-{end:.1f}s",
+            ))
+
+    return issues, black_seconds, frozen_seconds
+
+
+def analyze_audio(
+    samples: np.ndarray,
+    sample_rate: int,
+    config: Optional[QCConfig] = None,
+) -> Tuple[List[QCIssue], float, float]:
+    """
+    Find silent stretches and clipping in mono PCM.
+
+    Args:
+        samples: Mono samples as int16 or float in [-1, 1]
+        sample_rate: Samples per second
+        config: QC thresholds
+
+    Returns:
+        (issues, silent seconds, clipped sample fraction)
+    """
+    config = config or QCConfig()
+    if samples.dtype == np.int16:
+        samples = samples.astype(np.float32) / 32768.0
+    if len(samples) == 0:
+        return [], 0.0, 0.0
+
+    issues: List[QCIssue] = []
+
+    clipped_fraction = float(np.mean(np.abs(samples) >= config.clip_level))
+    if clipped_fraction > config.max_clipped_fraction:
+        issues.append(QCIssue(
+            kind="clipping",
+            message=f"{clipped_fraction:.2%} of audio samples clipped",
+        ))
+
+    window = max(1, int(sample_rate * config.window_seconds))
+    count = len(samples) // window
+    if count == 0:
+        return issues, 0.0, clipped_fraction
+
+    windows = samples[:count * window].reshape(count, window)
+    rms = np.sqrt(np.mean(np.square(windows, dtype=np.float64), axis=1))
+    dbfs = 20 * np.log10(np.maximum(rms, 1e-10))
+    silent = dbfs < config.silence_dbfs
+
+    silence_seconds = 0.0
+    for start, stop in _runs(silent):
+        begin, end = start * window / sample_rate, stop * window / sample_rate
+        silence_seconds += end - begin
+        if end - begin > config.max_silence_seconds:
+            issues.append(QCIssue(
+                kind="silence",
+                start=begin,
+                end=end,
+                message=f"silent audio {begin:.1f}s-{end:.1f}s",
+            ))
+
+    return issues, silence_seconds, clipped_fraction
+
+
+def sample_keyframes(
+    path: Path,
+    config: Optional[QCConfig] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decode only the keyframes of a video as small grayscale images.
+
+    Args:
+        path: Video file path
+        config: QC settings (frame size, timeout)
+
+    Returns:
+        (frames of shape (n, height, width), timestamps in seconds)
+    """
+    config = config or QCConfig()
+    width, height = config.frame_width, config.frame_height
+    cmd = [
+        "ffmpeg",
+        "-v", "info",
+        "-nostats",
+        "-skip_frame", "nokey",
+        "-i", str(path),
+        "-an",
+        "-vf", f"scale={width}:{height},format=gray,showinfo",
+        "-vsync", "passthrough",
+        "-f", "rawvideo",
+        "-",
+    ]
+    proc = run_ffmpeg(cmd, config.timeout)
+
+    frames = np.frombuffer(proc.stdout, dtype=np.uint8)
+    count = len(frames) // (width * height)
+    frames = frames[:count * width * height].reshape(count, height, width)
+
+    timestamps = np.array([
+        float(match.group(1))
+        for line in proc.stderr.decode(errors="replace").splitlines()
+        if "showinfo" in line
+        for match in [_PTS_TIME.search(line)]
+        if match
+    ])
+    if len(timestamps) != count:
+        # Fall back to evenly spread samples if showinfo output was unexpected
+        timestamps = np.arange(count, dtype=np.float64)
+
+    return frames, timestamps
+
+
+def extract_audio(path: Path, config: Optional[QCConfig] = None) -> np.ndarray:
+    """
+    Decode a file's audio track to mono int16 PCM.
+
+    Args:
+        path: Media file path
+        config: QC settings (sample rate, timeout)
+
+    Returns:
+        Samples (empty if the file has no audio)
+    """
+    config = config or QCConfig()
+    cmd = [
+        "ffmpeg",
+        "-v", "error",
+        "-i", str(path),
+        "-vn",
+        "-ac", "1",
+        "-ar", str(config.audio_sample_rate),
+        "-f", "s16le",
+        "-",
+    ]
+    proc = run_ffmpeg(cmd, config.timeout)
+    return np.frombuffer(proc.stdout, dtype=np.int16)
+
+
+class QualityChecker:
+    """
+    Runs black/frozen-frame and silence/clipping checks on rendered videos.
+    """
+
+    def __init__(self, config: Optional[QCConfig] = None):
+        """
+        Initialize quality checker.
+
+        Args:
+            config: QC thresholds
+        """
+        self.config = config or QCConfig()
+
+    async def check(
+        self,
+        video_path: Path,
+        duration: Optional[float] = None,
+        narration_duration: Optional[float] = None,
+    ) -> QCReport:
+        """
+        Check a rendered video.
+
+        Never raises: if ffmpeg is missing or fails, the report is marked
+        skipped and passes, leaving the decision to the caller.
+
+        Args:
+            video_path: Rendered video
+            duration: Video duration in seconds (default: from the audio)
+            narration_duration: Total narration length, for the tail check
+
+        Returns:
+            QCReport
+        """
+        start = time.time()
+
+        if shutil.which("ffmpeg") is None:
+            return QCReport(skipped="ffmpeg unavailable")
+
+        loop = asyncio.get_event_loop()
+        try:
+            (frames, timestamps), samples = await asyncio.gather(
+                loop.run_in_executor(None, sample_keyframes, video_path, self.config),
+                loop.run_in_executor(None, extract_audio, video_path, self.config),
+            )
+        except MediaProbeError as e:
+            logger.warning(f"QC could not read {video_path}: {e}")
+            return QCReport(skipped=str(e), qc_time=time.time() - start)
+
+        report = self.evaluate(
+            frames,
+            timestamps,
+            samples,
+            duration if duration is not None else len(samples) / self.config.audio_sample_rate,
+            narration_duration,
+        )
+        report.qc_time = time.time() - start
+        return report
+
+    def evaluate(
+        self,
+        frames: np.ndarray,
+        timestamps: np.ndarray,
+        samples: np.ndarray,
+        duration: float,
+        narration_duration: Optional[float] = None,
+    ) -> QCReport:
+        """
+        Score already-decoded frames and audio.
+
+        Args:
+            frames: Grayscale samples, shape (n, height, width)
+            timestamps: Sample times in seconds
+            samples: Mono PCM
+            duration: Video duration in seconds
+            narration_duration: Total narration length, for the tail check
+
+        Returns:
+            QCReport
+        """
+        frame_issues, black_seconds, frozen_seconds = analyze_frames(
+            frames, timestamps, duration, self.config
+        )
+        audio_issues, silence_seconds, clipped_fraction = analyze_audio(
+            samples, self.config.audio_sample_rate, self.config
+        )
+        issues = frame_issues + audio_issues
+
+        if len(samples) == 0:
+            issues.append(QCIssue(kind="silence", end=duration, message="no audio track"))
+
+        max_tail = self.config.max_tail_seconds
+        if max_tail is not None and narration_duration:
+            tail = duration - narration_duration
+            if tail > max_tail:
+                issues.append(QCIssue(
+                    kind="tail",
+                    start=narration_duration,
+                    end=duration,
+                    message=f"video runs {tail:.1f}s past the narration",
+                ))
+
+        return QCReport(
+            passed=not issues,
+            issues=issues,
+            frames_sampled=len(frames),
+            black_seconds=black_seconds,
+            frozen_seconds=frozen_seconds,
+            silence_seconds=silence_seconds,
+            clipped_fraction=clipped_fraction,
+        )
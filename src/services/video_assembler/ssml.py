@@ -0,0 +1,166 @@
+"""
+SSML Span Parsing for TTS
+
+This module splits the SSML subset used in our scripts into spans that the
+TTS engine can render one by one: speech at a given rate, or silence.
+
+Supported tags:
+- <pause duration="500ms"/> (also "2s" or plain seconds)
+- <emphasis>...</emphasis> (spoken slightly slower and louder)
+- <rate speed="0.8">...</rate> (also "80%", "slow", "x-fast", ...)
+
+Tags may be nested; unknown tags are dropped and their text kept.
+
+Usage:
+    spans = parse_ssml('Breathe in. <pause duration="2s"/> And out.')
+    text = plain_text(spans)
+"""
+
+import re
+from dataclasses import dataclass
+from typing import List
+
+EMPHASIS_RATE = 0.9
+EMPHASIS_GAIN = 1.2
+
+_NAMED_RATES = {
+    "x-slow": 0.6,
+    "slow": 0.8,
+    "medium": 1.0,
+    "default": 1.0,
+    "fast": 1.2,
+    "x-fast": 1.4,
+}
+
+_TAG = re.compile(r"<\s*(/?)\s*([a-zA-Z]+)([^>]*?)(/?)\s*>")
+_ATTR = re.compile(r'(\w+)\s*=\s*"([^"]*)"')
+
+
+@dataclass
+class SSMLSpan:
+    """A run of speech at one rate, or a pause."""
+    text: str = ""
+    rate: float = 1.0
+    gain: float = 1.0
+    pause: float = 0.0  # Seconds of silence (pause spans have no text)
+
+    @property
+    def is_pause(self) -> bool:
+        return not self.text and self.pause > 0
+
+
+def parse_pause(value: str) -> float:
+    """
+    Parse an SSML pause duration ("500ms", "2s", "1.5").
+
+    Args:
+        value: Duration attribute value
+
+    Returns:
+        Duration in seconds (0 if unparseable)
+    """
+    value = value.strip().lower()
+    try:
+        if value.endswith("ms"):
+            return float(value[:-2]) / 1000
+        if value.endswith("s"):
+            return float(value[:-1])
+        return float(value)
+    except ValueError:
+        return 0.0
+
+
+def parse_rate(value: str) -> float:
+    """
+    Parse an SSML rate ("0.8", "80%", "slow").
+
+    Args:
+        value: Speed attribute value
+
+    Returns:
+        Rate multiplier (1.0 if unparseable)
+    """
+    value = value.strip().lower()
+    if value in _NAMED_RATES:
+        return _NAMED_RATES[value]
+    try:
+        if value.endswith("%"):
+            return float(value[:-1]) / 100
+        return float(value)
+    except ValueError:
+        return 1.0
+
+
+def parse_ssml(text: str) -> List[SSMLSpan]:
+    """
+    Split SSML text into speech and pause spans.
+
+    Adjacent text with identical rate and gain is merged into one span, and
+    consecutive pauses are merged into one.
+
+    Args:
+        text: Text with SSML tags
+
+    Returns:
+        Spans in playback order
+    """
+    spans: List[SSMLSpan] = []
+    stack: List[tuple] = []  # (tag, rate, gain) of open tags
+    rate, gain = 1.0, 1.0
+
+    def add_text(chunk: str) -> None:
+        chunk = " ".join(chunk.split())
+        if not chunk:
+            return
+        last = spans[-1] if spans else None
+        if last and not last.is_pause and last.rate == rate and last.gain == gain:
+            last.text = f"{last.text} {chunk}"
+        else:
+            spans.append(SSMLSpan(text=chunk, rate=rate, gain=gain))
+
+    def add_pause(seconds: float) -> None:
+        if seconds <= 0:
+            return
+        if spans and spans[-1].is_pause:
+            spans[-1].pause += seconds
+        else:
+            spans.append(SSMLSpan(pause=seconds))
+
+    position = 0
+    for match in _TAG.finditer(text):
+        add_text(text[position:match.start()])
+        position = match.end()
+
+        closing, name, attrs, self_closing = match.groups()
+        name = name.lower()
+        attributes = dict(_ATTR.findall(attrs))
+
+        if name in ("pause", "break"):
+            add_pause(parse_pause(attributes.get("duration", attributes.get("time", "0"))))
+        elif closing:
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i][0] == name:
+                    _, rate, gain = stack[i]
+                    del stack[i:]
+                    break
+        elif not self_closing and name == "rate":
+            stack.append((name, rate, gain))
+            rate *= parse_rate(attributes.get("speed", "1"))
+        elif not self_closing and name == "emphasis":
+            stack.append((name, rate, gain))
+            rate *= EMPHASIS_RATE
+            gain *= EMPHASIS_GAIN
+
+    add_text(text[position:])
+
+    return spans
+
+
+def plain_text(spans: List[SSMLSpan]) -> str:
+    """Spoken text of a list of spans, without markup."""
+    return " ".join(span.text for span in spans if span.text)
+
+
+def has_markup(text: str) -> bool:
+    """Check whether text contains any tags."""
+    return _TAG.search(text) is not None
@@ -23,6 +23,7 @@ Usage:
 """
 
 import asyncio
+import logging
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -33,6 +34,10 @@ import uuid
 from pydantic import BaseModel, Field
 import numpy as np
 
+from .media_probe import MediaInfo, probe_audio_duration, probe_audio_durations
+
+logger = logging.getLogger(__name__)
+
 
 class TransitionType(str, Enum):
     """Types of transitions between scenes."""
@@ -211,6 +216,9 @@ class TimelineConfig:
     # Quality
     resolution: Tuple[int, int] = (1920, 1080)  # (width, height)
     fps: int = 30
+    
+    # Performance
+    probe_workers: int = 4  # Threads used to probe narration durations
 
 
 class Timeline(BaseModel):
@@ -280,14 +288,25 @@ class TimelineBuilder:
     and synchronization of narration with visual content.
     """
     
-    def __init__(self, config: Optional[TimelineConfig] = None):
+    def __init__(
+        self,
+        config: Optional[TimelineConfig] = None,
+        asset_index=None,
+        asset_matcher=None,
+    ):
         """
         Initialize timeline builder.
         
         Args:
             config: Timeline configuration
+            asset_index: Optional AssetMetadataIndex used to type assets and
+                reject undecodable ones without opening them
+            asset_matcher: Optional AssetMatcher used to pick each scene's
+                asset by its narration instead of round-robin
         """
         self.config = config or TimelineConfig()
+        self.asset_index = asset_index
+        self.asset_matcher = asset_matcher
     
     async def build(
         self,
@@ -295,6 +314,8 @@ class TimelineBuilder:
         narration_paths: List[Path],
         assets: List[Path],
         background_music: Optional[Path] = None,
+        narration_durations: Optional[List[Optional[float]]] = None,
+        scene_assets: Optional[List[Optional[Path]]] = None,
     ) -> Timeline:
         """
         Build complete timeline from components.
@@ -304,6 +325,10 @@ class TimelineBuilder:
             narration_paths: List of narration audio files (one per segment)
             assets: List of visual asset paths
             background_music: Optional background music path
+            narration_durations: Optional known narration durations (e.g.
+                from TTSResult.duration); None entries are probed
+            scene_assets: Optional asset pinned to each scene (e.g. kept from
+                a previous build); None entries are assigned automatically
         
         Returns:
             Complete Timeline object
@@ -311,15 +336,69 @@ class TimelineBuilder:
         if len(script_segments) != len(narration_paths):
             raise ValueError("Script segments and narration paths must match")
         
-        # Get narration durations
-        narration_durations = await self._get_audio_durations(narration_paths)
+        if narration_durations is not None and (
+            len(narration_durations) != len(narration_paths)
+        ):
+            raise ValueError("Narration durations and narration paths must match")
+        
+        if scene_assets is not None and len(scene_assets) != len(script_segments):
+            raise ValueError("Scene assets and script segments must match")
+        
+        # Get narration durations (only probe files without a known duration)
+        narration_durations = await self._resolve_audio_durations(
+            narration_paths,
+            narration_durations
+        )
+        
+        # Look up asset metadata and drop broken assets up front
+        asset_info = None
+        if self.asset_index is not None:
+            pinned = [p for p in (scene_assets or []) if p is not None]
+            asset_info = await self.asset_index.scan(list(assets) + pinned)
+            usable = [
+                path for path in assets
+                if asset_info[Path(path)].decodable
+            ]
+            if len(usable) < len(assets):
+                rejected = [str(p) for p in assets if p not in usable]
+                logger.warning(f"Rejected {len(rejected)} undecodable assets: "
+                              f"{', '.join(rejected)}")
+            if assets and not usable:
+                raise ValueError("No decodable assets available")
+            assets = usable
+            
+            if scene_assets is not None:
+                scene_assets = [
+                    p if p is not None and asset_info[Path(p)].decodable else None
+                    for p in scene_assets
+                ]
+        
+        # Match remaining scenes to assets by meaning
+        if self.asset_matcher is not None and assets:
+            scene_assets = await self.asset_matcher.match(
+                script_segments,
+                assets,
+                pinned=scene_assets
+            )
+            
+            # Assets picked from the wider library haven't been checked yet
+            if asset_info is not None:
+                picked = [p for p in scene_assets if p is not None and Path(p) not in asset_info]
+                if picked:
+                    asset_info.update(await self.asset_index.scan(picked))
+                    scene_assets = [
+                        p if p is None or asset_info[Path(p)].decodable else None
+                        for p in scene_assets
+                    ]
         
         # Create scenes
         scenes = await self._create_scenes(
             script_segments,
             narration_paths,
             narration_durations,
-            assets
+            assets,
+            asset_info,
+            scene_assets
         )
         
         # Add background music if provided
@@ -346,6 +425,8 @@ class TimelineBuilder:
         narration_paths: List[Path],
         narration_durations: List[float],
         assets: List[Path],
+        asset_info: Optional[Dict[Path, MediaInfo]] = None,
+        scene_assets: Optional[List[Optional[Path]]] = None,
     ) -> List[Scene]:
         """
         Create scenes from script segments and assets.
@@ -355,6 +436,8 @@ class TimelineBuilder:
             narration_paths: Audio files for narration
             narration_durations: Duration of each narration
             assets: Available visual assets
+            asset_info: Optional indexed metadata for the assets
+            scene_assets: Optional asset pinned to each scene
         
         Returns:
             List of Scene objects
@@ -368,18 +451,24 @@ class TimelineBuilder:
         for i, (segment, narration_path, duration) in enumerate(
             zip(script_segments, narration_paths, narration_durations)
         ):
-            # Get asset for this scene
-            asset_path = assets[asset_index % len(assets)]
+            # Get asset for this scene (pinned assets keep their slot)
+            if scene_assets and scene_assets[i] is not None:
+                asset_path = Path(scene_assets[i])
+            else:
+                asset_path = assets[asset_index % len(assets)]
             asset_index += 1
             
             # Detect asset type
-            asset_type = self._detect_asset_type(asset_path)
+            info = asset_info.get(Path(asset_path)) if asset_info else None
+            asset_type = self._detect_asset_type(asset_path, info)
             
             # Create asset
             asset = Asset(
                 path=asset_path,
                 type=asset_type,
-                duration=duration if asset_type == AssetType.IMAGE else None
+                duration=duration if asset_type == AssetType.IMAGE else (
+                    info.duration if info else None
+                )
             )
             
             # Create scene
@@ -410,16 +499,26 @@ class TimelineBuilder:
         
         return scenes
     
-    def _detect_asset_type(self, path: Path) -> AssetType:
+    def _detect_asset_type(
+        self,
+        path: Path,
+        info: Optional[MediaInfo] = None
+    ) -> AssetType:
         """
-        Detect asset type from file extension.
+        Detect asset type from probed metadata or file extension.
         
         Args:
             path: Asset file path
+            info: Optional indexed metadata for the asset
         
         Returns:
             AssetType enum value
         """
+        if info is not None and info.media_type == "video":
+            return AssetType.VIDEO
+        if info is not None and info.media_type == "image":
+            return AssetType.IMAGE
+        
         ext = path.suffix.lower()
         
         video_exts = {".mp4", ".avi", ".mov", ".mkv", ".webm"}
@@ -432,37 +531,60 @@ class TimelineBuilder:
         else:
             raise ValueError(f"Unsupported asset type: {ext}")
     
-    async def _get_audio_durations(self, paths: List[Path]) -> List[float]:
+    async def _resolve_audio_durations(
+        self,
+        paths: List[Path],
+        known: Optional[List[Optional[float]]] = None,
+    ) -> List[float]:
         """
-        Get durations of audio files.
+        Combine known narration durations with probed ones.
         
         Args:
             paths: List of audio file paths
+            known: Optional known durations aligned with ``paths``
         
         Returns:
             List of durations in seconds
         """
-        from pydub import AudioSegment
+        if known is None:
+            return await self._get_audio_durations(paths)
         
-        durations = []
-        loop = asyncio.get_event_loop()
+        missing = [
+            i for i, duration in enumerate(known)
+            if duration is None or duration <= 0
+        ]
+        if not missing:
+            return [float(d) for d in known]
         
-        for path in paths:
-            duration = await loop.run_in_executor(
-                None,
-                self._get_audio_duration_sync,
-                path
-            )
-            durations.append(duration)
+        probed = await self._get_audio_durations([paths[i] for i in missing])
+        
+        durations = list(known)
+        for i, duration in zip(missing, probed):
+            durations[i] = duration
+        
+        return [float(d) for d in durations]
+    
+    async def _get_audio_durations(self, paths: List[Path]) -> List[float]:
+        """
+        Get durations of audio files.
+        
+        Reads container headers only (see media_probe) and probes files
+        concurrently on a small thread pool.
+        
+        Args:
+            paths: List of audio file paths
         
-        return durations
+        Returns:
+            List of durations in seconds
+        """
+        return await probe_audio_durations(
+            paths,
+            max_workers=self.config.probe_workers
+        )
     
     def _get_audio_duration_sync(self, path: Path) -> float:
         """Get audio duration synchronously."""
-        from pydub import AudioSegment
-        
-        audio = AudioSegment.from_file(str(path))
-        return len(audio) / 1000.0  # Convert ms to seconds
+        return probe_audio_duration(path)
     
     async def optimize_timeline(self, timeline: Timeline) -> Timeline:
         """
@@ -496,6 +618,44 @@ class TimelineBuilder:
             background_music=timeline.background_music
         )
     
+    def plan_segments(
+        self,
+        predicted_durations: List[float],
+        target: Optional[float] = None,
+        tolerance: float = 0.05
+    ) -> int:
+        """
+        Decide how many segments fit the target duration, before synthesis.
+        
+        Segments starting after the target (plus tolerance) would only be
+        squeezed away by _adjust_to_target_duration, so there is no point
+        synthesizing them.
+        
+        Args:
+            predicted_durations: Predicted narration duration per segment
+            target: Target duration (uses config target if None)
+            tolerance: Allowed overshoot as a fraction of the target
+        
+        Returns:
+            Number of leading segments to keep (at least 1)
+        """
+        target = target or self.config.target_duration
+        if not target or not predicted_durations:
+            return len(predicted_durations)
+        
+        limit = target * (1 + tolerance)
+        total = 0.0
+        
+        for i, duration in enumerate(predicted_durations):
+            duration = max(self.config.min_scene_duration, duration)
+            total += duration
+            if total > limit:
+                # Keep a segment that mostly fits; scaling absorbs the rest
+                keep = i + 1 if total - limit < duration / 2 else i
+                return max(1, keep)
+        
+        return len(predicted_durations)
+    
     async def _adjust_to_target_duration(
         self,
         scenes: List[Scene],
@@ -591,6 +751,60 @@ class TimelineBuilder:
         
         return issues
     
+    async def export_timeline(
+        self,
+        timeline: Timeline,
+        output_path: Path
+    ) -> Path:
+        """
+        Export timeline in the compact binary format.
+        
+        Much smaller and faster to write and read than the JSON export;
+        load it back with ``load_timeline``.
+        
+        Args:
+            timeline: Timeline to export
+            output_path: Path to save the binary file
+        
+        Returns:
+            The output path
+        """
+        from .timeline_codec import save_timeline
+        
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            save_timeline,
+            timeline,
+            output_path
+        )
+    
+    async def load_timeline(
+        self,
+        path: Path,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> Timeline:
+        """
+        Load a timeline saved by ``export_timeline``.
+        
+        Args:
+            path: Binary timeline file
+            start: First scene to load
+            stop: End scene (exclusive, None = all remaining scenes)
+        
+        Returns:
+            Timeline with the requested scenes
+        """
+        from .timeline_codec import TimelineReader
+        
+        def read() -> Timeline:
+            with TimelineReader(path) as reader:
+                return reader.timeline(start, stop)
+        
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, read)
+    
     async def export_timeline_json(
         self,
         timeline: Timeline,
@@ -0,0 +1,537 @@
+"""
+Compact Binary Timeline Format
+
+This module serializes Timeline objects to a versioned binary format that is
+much smaller and faster than the JSON export, and lets readers decode only
+the scenes they need.
+
+Layout (little endian):
+    header    magic, version, scene count, string count, section offsets
+    scenes    one fixed-layout record per scene, followed by its assets,
+              text overlays and tags
+    index     offset of every scene record (plus the end offset)
+    meta      timeline-level fields and optional background music
+    strings   interned string table (paths, ids, texts, enum values)
+
+Every string (asset paths repeat a lot) is stored once and referenced by
+number. Missing optional floats are stored as NaN, missing strings as
+NO_STRING.
+
+Usage:
+    data = encode_timeline(timeline)
+    timeline = decode_timeline(data)
+
+    with TimelineReader(Path("video.timeline")) as reader:
+        first_ten = reader.scenes(0, 10)
+"""
+
+import math
+import mmap
+import struct
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from .timeline_builder import (
+    Asset,
+    AssetType,
+    BackgroundMusic,
+    Scene,
+    TextOverlay,
+    TextPosition,
+    Timeline,
+    Transition,
+    TransitionType,
+)
+
+MAGIC = b"FYTL"
+VERSION = 1
+NO_STRING = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<4sHHIIQQQ")
+_META = struct.Struct("<IIdIIHIIIB")
+_MUSIC = struct.Struct("<IdddddB")
+_SCENE = struct.Struct("<IIIdddHHH IdI IdI")  # Scene fields, transition in/out
+_ASSET = struct.Struct("<IIddddd2iddddd")
+_OVERLAY = struct.Struct("<IIddiIIIidd")
+
+_NAN = float("nan")
+
+_ASSET_TYPES = {t.value: t for t in AssetType}
+_TEXT_POSITIONS = {p.value: p for p in TextPosition}
+_TRANSITION_TYPES = {t.value: t for t in TransitionType}
+
+
+class TimelineFormatError(Exception):
+    """Raised when binary timeline data is malformed or unsupported."""
+    pass
+
+
+def _opt(value: Optional[float]) -> float:
+    return _NAN if value is None else value
+
+
+def _unopt(value: float) -> Optional[float]:
+    return None if math.isnan(value) else value
+
+
+def _restore(cls, values: dict):
+    """Rebuild a validated dataclass without re-running __post_init__."""
+    obj = object.__new__(cls)
+    obj.__dict__ = values
+    return obj
+
+
+class _StringTable:
+    """Interns strings while encoding."""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def ref(self, value) -> int:
+        if value is None:
+            return NO_STRING
+        value = str(value)
+        ref = self.ids.get(value)
+        if ref is None:
+            ref = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return ref
+
+    def encode(self) -> bytes:
+        blobs = [value.encode("utf-8") for value in self.values]
+        offsets = [0]
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        return struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(blobs)
+
+
+def _transition_fields(strings: _StringTable, transition: Optional[Transition]) -> tuple:
+    if transition is None:
+        return (NO_STRING, 0.0, NO_STRING)
+    return (
+        strings.ref(transition.type.value),
+        transition.duration,
+        strings.ref(transition.easing),
+    )
+
+
+def _encode_scene(strings: _StringTable, scene: Scene) -> bytes:
+    ref = strings.ref
+    parts = [
+        _SCENE.pack(
+            ref(scene.id),
+            ref(scene.narration_path),
+            ref(scene.script_segment),
+            scene.start_time,
+            scene.duration,
+            scene.narration_volume,
+            len(scene.assets),
+            len(scene.text_overlays),
+            len(scene.tags),
+            *_transition_fields(strings, scene.transition_in),
+            *_transition_fields(strings, scene.transition_out),
+        ),
+    ]
+
+    for asset in scene.assets:
+        parts.append(_ASSET.pack(
+            ref(asset.path),
+            ref(asset.type.value),
+            asset.start_time,
+            _opt(asset.duration),
+            asset.video_start,
+            _opt(asset.video_end),
+            asset.scale,
+            asset.position[0],
+            asset.position[1],
+            asset.rotation,
+            asset.opacity,
+            asset.blur,
+            asset.brightness,
+            asset.contrast,
+        ))
+
+    for overlay in scene.text_overlays:
+        parts.append(_OVERLAY.pack(
+            ref(overlay.text),
+            ref(overlay.position.value),
+            overlay.start_time,
+            _opt(overlay.duration),
+            overlay.font_size,
+            ref(overlay.font_family),
+            ref(overlay.font_color),
+            ref(overlay.background_color),
+            overlay.padding,
+            overlay.fade_in,
+            overlay.fade_out,
+        ))
+
+    if scene.tags:
+        parts.append(struct.pack(f"<{len(scene.tags)}I", *map(ref, scene.tags)))
+
+    return b"".join(parts)
+
+
+def encode_timeline(timeline: Timeline) -> bytes:
+    """
+    Serialize a timeline to the binary format.
+
+    Args:
+        timeline: Timeline to encode
+
+    Returns:
+        Encoded bytes
+    """
+    strings = _StringTable()
+
+    body = []
+    offsets = []
+    position = _HEADER.size
+    for scene in timeline.scenes:
+        record = _encode_scene(strings, scene)
+        offsets.append(position)
+        body.append(record)
+        position += len(record)
+    offsets.append(position)
+
+    index = struct.pack(f"<{len(offsets)}Q", *offsets)
+
+    music = timeline.background_music
+    meta = _META.pack(
+        strings.ref(timeline.id),
+        strings.ref(timeline.created_at.isoformat()),
+        timeline.total_duration,
+        timeline.resolution[0],
+        timeline.resolution[1],
+        timeline.fps,
+        timeline.total_assets,
+        timeline.video_assets,
+        timeline.image_assets,
+        (timeline.has_narration << 1) | (music is not None),
+    )
+    if music is not None:
+        meta += _MUSIC.pack(
+            strings.ref(music.path),
+            music.start_time,
+            _opt(music.duration),
+            music.volume,
+            music.fade_in,
+            music.fade_out,
+            music.loop,
+        )
+
+    index_offset = position
+    meta_offset = index_offset + len(index)
+    strings_offset = meta_offset + len(meta)
+
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        0,
+        len(timeline.scenes),
+        len(strings.values),
+        index_offset,
+        meta_offset,
+        strings_offset,
+    )
+
+    return b"".join([header, *body, index, meta, strings.encode()])
+
+
+def decode_timeline(data: bytes) -> Timeline:
+    """
+    Deserialize a timeline encoded by ``encode_timeline``.
+
+    Args:
+        data: Encoded bytes
+
+    Returns:
+        Decoded Timeline
+    """
+    return TimelineReader(data).timeline()
+
+
+def save_timeline(timeline: Timeline, path: Path) -> Path:
+    """
+    Write a timeline to a binary file atomically.
+
+    Args:
+        timeline: Timeline to save
+        path: Destination file
+
+    Returns:
+        The destination path
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(encode_timeline(timeline))
+    tmp.replace(path)
+    return path
+
+
+class TimelineReader:
+    """
+    Random-access reader for binary timelines.
+
+    Files are memory-mapped; scenes and strings are decoded on first use,
+    so reading a range of scenes never touches the rest of the file.
+    """
+
+    def __init__(self, source: Union[Path, bytes]):
+        """
+        Open a binary timeline.
+
+        Args:
+            source: File path or encoded bytes
+
+        Raises:
+            TimelineFormatError: If the data is not a supported timeline
+        """
+        self._file = None
+        self._mmap = None
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            self._data = memoryview(source)
+        else:
+            self._file = open(source, "rb")
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._data = memoryview(self._mmap)
+
+        if len(self._data) < _HEADER.size:
+            self.close()
+            raise TimelineFormatError("Truncated timeline header")
+
+        (
+            magic,
+            version,
+            _,
+            self.scene_count,
+            string_count,
+            index_offset,
+            self._meta_offset,
+            strings_offset,
+        ) = _HEADER.unpack_from(self._data, 0)
+
+        if magic != MAGIC:
+            self.close()
+            raise TimelineFormatError("Not a binary timeline")
+        if version > VERSION:
+            self.close()
+            raise TimelineFormatError(f"Unsupported timeline version {version}")
+
+        self._index_offset = index_offset
+        self._string_offsets = struct.unpack_from(
+            f"<{string_count + 1}I", self._data, strings_offset
+        )
+        self._string_base = strings_offset + 4 * (string_count + 1)
+        self._strings: List[Optional[str]] = [None] * string_count
+        self._paths: Dict[int, Path] = {}
+
+    def __enter__(self) -> "TimelineReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.scene_count
+
+    def __getitem__(self, index: int) -> Scene:
+        if index < 0:
+            index += self.scene_count
+        if not 0 <= index < self.scene_count:
+            raise IndexError("Scene index out of range")
+        return self.scenes(index, index + 1)[0]
+
+    def close(self) -> None:
+        """Release the memory map and file handle."""
+        self._data.release()
+        self._data = memoryview(b"")
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def scenes(self, start: int = 0, stop: Optional[int] = None) -> List[Scene]:
+        """
+        Decode a range of scenes.
+
+        Args:
+            start: First scene index
+            stop: End index (exclusive, None = last scene)
+
+        Returns:
+            Decoded scenes
+        """
+        start, stop, _ = slice(start, stop).indices(self.scene_count)
+        if start >= stop:
+            return []
+
+        offsets = struct.unpack_from(
+            f"<{stop - start}Q", self._data, self._index_offset + 8 * start
+        )
+        return [self._decode_scene(offset) for offset in offsets]
+
+    def timeline(self, start: int = 0, stop: Optional[int] = None) -> Timeline:
+        """
+        Decode the timeline, optionally with only a range of its scenes.
+
+        Timeline-level fields (durations, counts) always describe the
+        full timeline.
+
+        Args:
+            start: First scene index
+            stop: End index (exclusive, None = last scene)
+
+        Returns:
+            Decoded Timeline
+        """
+        (
+            timeline_id,
+            created_at,
+            total_duration,
+            width,
+            height,
+            fps,
+            total_assets,
+            video_assets,
+            image_assets,
+            flags,
+        ) = _META.unpack_from(self._data, self._meta_offset)
+
+        music = None
+        if flags & 1:
+            path, start_time, duration, volume, fade_in, fade_out, loop = (
+                _MUSIC.unpack_from(self._data, self._meta_offset + _META.size)
+            )
+            music = _restore(BackgroundMusic, {
+                "path": self._path(path),
+                "start_time": start_time,
+                "duration": _unopt(duration),
+                "volume": volume,
+                "fade_in": fade_in,
+                "fade_out": fade_out,
+                "loop": bool(loop),
+            })
+
+        return Timeline.model_construct(
+            id=self._string(timeline_id),
+            scenes=self.scenes(start, stop),
+            background_music=music,
+            total_duration=total_duration,
+            scene_count=self.scene_count,
+            resolution=(width, height),
+            fps=fps,
+            created_at=datetime.fromisoformat(self._string(created_at)),
+            total_assets=total_assets,
+            video_assets=video_assets,
+            image_assets=image_assets,
+            has_narration=bool(flags & 2),
+        )
+
+    def _string(self, ref: int) -> Optional[str]:
+        if ref == NO_STRING:
+            return None
+        value = self._strings[ref]
+        if value is None:
+            start = self._string_base + self._string_offsets[ref]
+            end = self._string_base + self._string_offsets[ref + 1]
+            value = self._strings[ref] = str(self._data[start:end], "utf-8")
+        return value
+
+    def _path(self, ref: int) -> Optional[Path]:
+        if ref == NO_STRING:
+            return None
+        path = self._paths.get(ref)
+        if path is None:
+            path = self._paths[ref] = Path(self._string(ref))
+        return path
+
+    def _transition(self, kind: int, duration: float, easing: int) -> Optional[Transition]:
+        if kind == NO_STRING:
+            return None
+        return _restore(Transition, {
+            "type": _TRANSITION_TYPES[self._string(kind)],
+            "duration": duration,
+            "easing": self._string(easing),
+        })
+
+    def _decode_scene(self, offset: int) -> Scene:
+        data = self._data
+        string = self._string
+        path_of = self._path
+
+        (
+            scene_id, narration, segment, start_time, duration, narration_volume,
+            n_assets, n_overlays, n_tags,
+            in_kind, in_duration, in_easing,
+            out_kind, out_duration, out_easing,
+        ) = _SCENE.unpack_from(data, offset)
+        offset += _SCENE.size
+
+        assets = []
+        for _ in range(n_assets):
+            (
+                path, kind, a_start, a_duration, video_start, video_end,
+                scale, x, y, rotation, opacity, blur, brightness, contrast,
+            ) = _ASSET.unpack_from(data, offset)
+            offset += _ASSET.size
+            assets.append(_restore(Asset, {
+                "path": path_of(path),
+                "type": _ASSET_TYPES[string(kind)],
+                "start_time": a_start,
+                "duration": None if a_duration != a_duration else a_duration,
+                "video_start": video_start,
+                "video_end": None if video_end != video_end else video_end,
+                "scale": scale,
+                "position": (x, y),
+                "rotation": rotation,
+                "opacity": opacity,
+                "blur": blur,
+                "brightness": brightness,
+                "contrast": contrast,
+            }))
+
+        overlays = []
+        for _ in range(n_overlays):
+            (
+                text, position, o_start, o_duration, font_size, font_family,
+                font_color, background, padding, fade_in, fade_out,
+            ) = _OVERLAY.unpack_from(data, offset)
+            offset += _OVERLAY.size
+            overlays.append(_restore(TextOverlay, {
+                "text": string(text),
+                "position": _TEXT_POSITIONS[string(position)],
+                "start_time": o_start,
+                "duration": None if o_duration != o_duration else o_duration,
+                "font_size": font_size,
+                "font_family": string(font_family),
+                "font_color": string(font_color),
+                "background_color": string(background),
+                "padding": padding,
+                "fade_in": fade_in,
+                "fade_out": fade_out,
+            }))
+
+        tags = [
+            string(ref) for ref in struct.unpack_from(f"<{n_tags}I", data, offset)
+        ] if n_tags else []
+
+        return _restore(Scene, {
+            "id": string(scene_id),
+            "assets": assets,
+            "narration_path": path_of(narration),
+            "text_overlays": overlays,
+            "start_time": start_time,
+            "duration": duration,
+            "transition_in": self._transition(in_kind, in_duration, in_easing),
+            "transition_out": self._transition(out_kind, out_duration, out_easing),
+            "narration_volume": narration_volume,
+            "script_segment": string(segment),
+            "tags": tags,
+        })
@@ -0,0 +1,136 @@
+"""
+Script Segment Diffing for Incremental Timeline Rebuilds
+
+This module compares the script segments of a previous assembly with a new
+version of the script and works out which scenes can be reused as-is.
+
+Features:
+- Whitespace-insensitive segment comparison
+- Added / removed / changed / unchanged classification per scene
+- Mapping from new scene index to reusable old scene index
+
+Usage:
+    diff = diff_segments(previous.segments, new_segments)
+    for new_index, old_index in diff.unchanged.items():
+        ...  # reuse narration and asset of old_index
+"""
+
+import difflib
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Dict, List, Optional
+
+
+class SceneChange(str, Enum):
+    """How a scene differs between two versions of a script."""
+    UNCHANGED = "unchanged"
+    CHANGED = "changed"
+    ADDED = "added"
+    REMOVED = "removed"
+
+
+@dataclass
+class SceneDiff:
+    """Diff entry for a single scene."""
+    change: SceneChange
+    old_index: Optional[int] = None
+    new_index: Optional[int] = None
+
+
+@dataclass
+class TimelineDiff:
+    """Scene-level diff between two lists of script segments."""
+    scenes: List[SceneDiff] = field(default_factory=list)
+
+    @property
+    def unchanged(self) -> Dict[int, int]:
+        """Map of new scene index to the identical old scene index."""
+        return {
+            s.new_index: s.old_index
+            for s in self.scenes
+            if s.change == SceneChange.UNCHANGED
+        }
+
+    @property
+    def changed(self) -> List[int]:
+        """New scene indices whose text was edited."""
+        return [s.new_index for s in self.scenes if s.change == SceneChange.CHANGED]
+
+    @property
+    def added(self) -> List[int]:
+        """New scene indices with no counterpart in the old script."""
+        return [s.new_index for s in self.scenes if s.change == SceneChange.ADDED]
+
+    @property
+    def removed(self) -> List[int]:
+        """Old scene indices that no longer exist."""
+        return [s.old_index for s in self.scenes if s.change == SceneChange.REMOVED]
+
+    @property
+    def is_identical(self) -> bool:
+        """True if every scene is unchanged."""
+        return all(s.change == SceneChange.UNCHANGED for s in self.scenes)
+
+    def summary(self) -> str:
+        """Human-readable summary of the diff."""
+        return (
+            f"{len(self.unchanged)} unchanged, {len(self.changed)} changed, "
+            f"{len(self.added)} added, {len(self.removed)} removed"
+        )
+
+
+def _normalize(segment: str) -> str:
+    """Normalize whitespace so reflowed text compares equal."""
+    return " ".join(segment.split())
+
+
+def diff_segments(old: List[str], new: List[str]) -> TimelineDiff:
+    """
+    Diff two lists of script segments scene by scene.
+
+    Replaced runs are paired up positionally as CHANGED scenes (they keep
+    their old asset slot); any surplus becomes ADDED or REMOVED.
+
+    Args:
+        old: Segments of the previous script
+        new: Segments of the new script
+
+    Returns:
+        TimelineDiff describing every old and new scene
+    """
+    matcher = difflib.SequenceMatcher(
+        a=[_normalize(s) for s in old],
+        b=[_normalize(s) for s in new],
+        autojunk=False,
+    )
+
+    diff = TimelineDiff()
+
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            for offset in range(i2 - i1):
+                diff.scenes.append(SceneDiff(
+                    change=SceneChange.UNCHANGED,
+                    old_index=i1 + offset,
+                    new_index=j1 + offset,
+                ))
+        elif tag == "delete":
+            for i in range(i1, i2):
+                diff.scenes.append(SceneDiff(change=SceneChange.REMOVED, old_index=i))
+        elif tag == "insert":
+            for j in range(j1, j2):
+                diff.scenes.append(SceneDiff(change=SceneChange.ADDED, new_index=j))
+        else:  # replace
+            paired = min(i2 - i1, j2 - j1)
+            for offset in range(paired):
+                diff.scenes.append(SceneDiff(
+                    change=SceneChange.CHANGED,
+                    old_index=i1 + offset,
+                    new_index=j1 + offset,
+                ))
+            for i in range(i1 + paired, i2):
+                diff.scenes.append(SceneDiff(change=SceneChange.REMOVED, old_index=i))
+            for j in range(j1 + paired, j2):
+                diff.scenes.append(SceneDiff(change=SceneChange.ADDED, new_index=j))
+
+    return diff
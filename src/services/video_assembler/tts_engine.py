@@ -6,8 +6,10 @@ It supports multiple voices, languages, SSML processing, and automatic caching.
 
 Features:
 - Multiple pre-trained voices (male, female, various accents)
-- SSML support for fine control (pauses, emphasis, rate)
+- SSML rendering: per-span rates, emphasis and real silence for pauses
 - Automatic audio caching to avoid regeneration
+- Indexed audio cache with LRU/LFU eviction under a size budget
+- Per-voice duration model learned from synthesized segments
 - Batch processing for multiple segments
 - Audio format conversion (wav, mp3, ogg)
 - Speaking rate and pitch control
@@ -26,11 +28,10 @@ Usage:
 import asyncio
 import hashlib
 import os
-import re
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 import uuid
 
@@ -45,6 +46,11 @@ import numpy as np
 from pydantic import BaseModel, Field
 
 from src.utils.cache import CacheManager
+from src.utils.tracing import traced
+
+from .audio_cache_index import AudioCacheIndex
+from .duration_model import DurationEstimator
+from .ssml import SSMLSpan, has_markup, parse_ssml, plain_text
 
 
 class Voice(str, Enum):
@@ -78,6 +84,7 @@ class TTSConfig:
     # Voice settings
     voice: Voice = Voice.FEMALE_CALM
     language: str = "en"
+    speaker: Optional[str] = None  # Multi-speaker models (None = first speaker)
     
     # Speech characteristics
     speaking_rate: float = 1.0  # 0.5-2.0 (slower/faster)
@@ -91,6 +98,8 @@ class TTSConfig:
     # Processing
     enable_cache: bool = True
     cache_ttl: int = 86400  # 24 hours
+    cache_max_bytes: Optional[int] = None  # Audio file budget (None = unlimited)
+    cache_eviction: str = "lru"  # "lru" or "lfu"
     use_gpu: bool = False  # Use GPU if available
     
     # SSML support
@@ -99,13 +108,19 @@ class TTSConfig:
     # Output
     output_dir: Path = Path("output_audio")
     normalize_audio: bool = True  # Normalize volume levels
+    
+    # Duration model (None = learn in memory only)
+    duration_model_path: Optional[Path] = None
+    duration_save_interval: int = 25  # Observations between background saves
 
 
 class TTSResult(BaseModel):
     """Result of TTS generation."""
     
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    text: str
+    text: str  # Spoken text (SSML removed)
+    source_text: Optional[str] = None  # Text as requested, SSML included
+    speaking_rate: float = 1.0
     audio_path: Optional[str] = None
     audio_data: Optional[bytes] = None
     duration: float  # seconds
@@ -130,7 +145,8 @@ class TTSEngine:
     def __init__(
         self,
         config: Optional[TTSConfig] = None,
-        cache_manager: Optional[CacheManager] = None
+        cache_manager: Optional[CacheManager] = None,
+        in_use: Optional[Callable[[], Set[Path]]] = None
     ):
         """
         Initialize TTS engine.
@@ -138,21 +154,34 @@ class TTSEngine:
         Args:
             config: TTS configuration
             cache_manager: Optional cache manager for audio caching
+            in_use: Returns resolved audio paths running jobs still need
+                (protected from cache eviction)
         """
         self.config = config or TTSConfig()
         self.cache = cache_manager or CacheManager() if self.config.enable_cache else None
         self.tts_model: Optional[TTS] = None
         self._model_cache: Dict[str, TTS] = {}
+        self._cache_index: Optional[AudioCacheIndex] = None
+        self._in_use = in_use
+        self.duration_estimator = DurationEstimator(self.config.duration_model_path)
+        self._duration_model_loaded = False
+        self._unsaved_durations = 0
+        self._duration_save_lock = asyncio.Lock()
         
         # Ensure output directory exists
         self.config.output_dir.mkdir(parents=True, exist_ok=True)
-        
-        # SSML pattern matchers
-        self.ssml_patterns = {
-            "pause": re.compile(r'<pause\s+duration="([^"]+)"\s*/?>'),
-            "emphasis": re.compile(r'<emphasis>([^<]+)</emphasis>'),
-            "rate": re.compile(r'<rate\s+speed="([^"]+)">([^<]+)</rate>'),
-        }
+    
+    @property
+    def cache_index(self) -> AudioCacheIndex:
+        """Index of audio files in the output directory (opened on first use)."""
+        if self._cache_index is None:
+            self._cache_index = AudioCacheIndex(
+                self.config.output_dir,
+                max_bytes=self.config.cache_max_bytes,
+                policy=self.config.cache_eviction,
+                in_use=self._in_use,
+            )
+        return self._cache_index
     
     async def initialize(self, voice: Optional[Voice] = None) -> None:
         """
@@ -194,12 +223,14 @@ class TTSEngine:
         except ImportError:
             return False
     
+    @traced("tts.generate")
     async def generate(
         self,
         text: str,
         voice: Optional[Voice] = None,
         speaking_rate: Optional[float] = None,
         save_to_file: bool = True,
+        language: Optional[str] = None,
     ) -> TTSResult:
         """
         Generate speech audio from text.
@@ -209,38 +240,54 @@ class TTSEngine:
             voice: Voice to use (uses config default if None)
             speaking_rate: Speaking rate multiplier (uses config default if None)
             save_to_file: Save audio to file
+            language: Language code for multilingual voices (uses config
+                default if None)
         
         Returns:
             TTSResult with audio data and metadata
         """
         voice = voice or self.config.voice
         speaking_rate = speaking_rate or self.config.speaking_rate
+        language = language or self.config.language
+        
+        await self.load_duration_model()
         
         # Check cache
-        cache_key = self._get_cache_key(text, voice, speaking_rate)
+        cache_key = self._get_cache_key(text, voice, speaking_rate, language)
         if self.cache:
             cached = await self.cache.get(cache_key)
             if cached:
-                return TTSResult(**cached, from_cache=True)
+                if self._cached_audio_present(cached):
+                    return TTSResult(**cached, from_cache=True)
+                # Audio file was evicted; the metadata entry is stale
+                await self.cache.delete(cache_key)
         
         # Initialize model if needed
         if not self.tts_model or self.tts_model.model_name != voice.value:
             await self.initialize(voice)
         
-        # Process SSML if enabled
-        if self.config.enable_ssml:
-            text, ssml_metadata = self._process_ssml(text)
-        else:
-            ssml_metadata = {}
-        
-        # Generate audio
+        source_text = text
         loop = asyncio.get_event_loop()
-        audio_data = await loop.run_in_executor(
-            None,
-            self._generate_audio_sync,
-            text,
-            speaking_rate,
-        )
+        
+        # Generate audio (SSML is rendered span by span)
+        if self.config.enable_ssml and has_markup(text):
+            spans = parse_ssml(text)
+            text = plain_text(spans)
+            audio_data = await loop.run_in_executor(
+                None,
+                self._render_spans_sync,
+                spans,
+                speaking_rate,
+                language,
+            )
+        else:
+            audio_data = await loop.run_in_executor(
+                None,
+                self._generate_audio_sync,
+                text,
+                speaking_rate,
+                language,
+            )
         
         # Apply audio processing
         if self.config.normalize_audio:
@@ -249,6 +296,16 @@ class TTSEngine:
         # Calculate duration
         duration = len(audio_data) / self.config.sample_rate
         
+        self.duration_estimator.observe(
+            source_text,
+            voice.value,
+            duration,
+            speaking_rate=speaking_rate
+        )
+        self._unsaved_durations += 1
+        if self._unsaved_durations >= self.config.duration_save_interval:
+            await self.save_duration_model()
+        
         # Save to file if requested
         audio_path = None
         if save_to_file:
@@ -257,6 +314,8 @@ class TTSEngine:
         # Create result
         result = TTSResult(
             text=text,
+            source_text=source_text,
+            speaking_rate=speaking_rate,
             audio_path=str(audio_path) if audio_path else None,
             audio_data=audio_data.tobytes(),
             duration=duration,
@@ -275,10 +334,29 @@ class TTSEngine:
         
         return result
     
+    def _cached_audio_present(self, cached: Dict) -> bool:
+        """
+        Check that the audio file behind a cache entry still exists.
+        
+        Answered from the audio cache index, without touching the
+        directory; also counts the hit for LRU/LFU eviction.
+        
+        Args:
+            cached: Cached TTSResult fields
+        
+        Returns:
+            True if the entry is usable
+        """
+        audio_path = cached.get("audio_path")
+        if not audio_path:
+            return True
+        return self.cache_index.touch(Path(audio_path).name)
+    
     def _generate_audio_sync(
         self,
         text: str,
         speaking_rate: float,
+        language: Optional[str] = None,
     ) -> np.ndarray:
         """
         Generate audio synchronously (runs in thread pool).
@@ -286,12 +364,13 @@ class TTSEngine:
         Args:
             text: Text to synthesize
             speaking_rate: Speaking rate multiplier
+            language: Language code (used by multilingual models)
         
         Returns:
             Audio data as numpy array
         """
         # Generate with Coqui TTS
-        wav = self.tts_model.tts(text=text)
+        wav = self.tts_model.tts(text=text, **self._model_options(language))
         
         # Convert to numpy array
         audio_array = np.array(wav)
@@ -302,6 +381,95 @@ class TTSEngine:
         
         return audio_array
     
+    def _model_options(self, language: Optional[str]) -> Dict[str, str]:
+        """
+        Speaker and language arguments the loaded model requires.
+        
+        Multilingual and multi-speaker Coqui models reject calls without
+        them. Language codes are matched to the model's own list, so "fr"
+        selects YourTTS's "fr-fr".
+        
+        Args:
+            language: Requested language code
+        
+        Returns:
+            Keyword arguments for ``TTS.tts``
+        """
+        options = {}
+        model = self.tts_model
+        
+        if getattr(model, "is_multi_lingual", False) is True:
+            language = language or self.config.language
+            available = list(getattr(model, "languages", None) or [])
+            if available and language not in available:
+                base = language.split("-")[0].lower()
+                language = next(
+                    (code for code in available if code.split("-")[0].lower() == base),
+                    language
+                )
+            options["language"] = language
+        
+        if getattr(model, "is_multi_speaker", False) is True:
+            speakers = list(getattr(model, "speakers", None) or [])
+            speaker = self.config.speaker or (speakers[0] if speakers else None)
+            if speaker:
+                options["speaker"] = speaker
+        
+        return options
+    
+    def _render_spans_sync(
+        self,
+        spans: List[SSMLSpan],
+        speaking_rate: float,
+        language: Optional[str] = None,
+    ) -> np.ndarray:
+        """
+        Render SSML spans into one waveform (runs in thread pool).
+        
+        Speech spans are synthesized at their own rate (identical spans
+        only once); pauses cost no model call and are left as zeros in a
+        buffer preallocated for the whole segment.
+        
+        Args:
+            spans: Parsed SSML spans
+            speaking_rate: Base speaking rate multiplier
+            language: Language code (used by multilingual models)
+        
+        Returns:
+            Audio data as numpy array
+        """
+        rendered: Dict[Tuple[str, float], np.ndarray] = {}
+        pieces: List[Tuple[int, Optional[np.ndarray], float]] = []
+        
+        for span in spans:
+            if span.is_pause:
+                pieces.append((int(round(span.pause * self.config.sample_rate)), None, 1.0))
+                continue
+            
+            key = (span.text, span.rate)
+            if key not in rendered:
+                rendered[key] = self._generate_audio_sync(
+                    span.text,
+                    speaking_rate * span.rate,
+                    language
+                )
+            audio = rendered[key]
+            pieces.append((len(audio), audio, span.gain))
+        
+        buffer = np.zeros(sum(length for length, _, _ in pieces), dtype=np.float32)
+        
+        position = 0
+        for length, audio, gain in pieces:
+            if audio is not None:
+                segment = buffer[position:position + length]
+                segment[:] = audio
+                if gain != 1.0:
+                    segment *= gain
+                    np.clip(segment, -1.0, 1.0, out=segment)
+            position += length
+        
+        return buffer
+    
     def _adjust_speaking_rate(
         self,
         audio: np.ndarray,
@@ -369,8 +537,8 @@ class TTSEngine:
         Returns:
             Path to saved file
         """
-        # Generate filename
-        filename = f"{cache_key[:16]}.{self.config.audio_format.value}"
+        # Named by the full cache key, so the cache entry can be found from the file
+        filename = f"{cache_key}.{self.config.audio_format.value}"
         filepath = self.config.output_dir / filename
         
         # Save based on format
@@ -381,6 +549,8 @@ class TTSEngine:
         elif self.config.audio_format == AudioFormat.OGG:
             await self._save_ogg(audio_data, filepath)
         
+        self.cache_index.record(filepath)
+        
         return filepath
     
     async def _save_wav(self, audio: np.ndarray, path: Path) -> None:
@@ -437,55 +607,6 @@ class TTSEngine:
         
         temp_wav.unlink()
     
-    def _process_ssml(self, text: str) -> Tuple[str, Dict]:
-        """
-        Process SSML tags in text.
-        
-        Args:
-            text: Text with SSML tags
-        
-        Returns:
-            Tuple of (clean_text, ssml_metadata)
-        """
-        metadata = {
-            "pauses": [],
-            "emphasis": [],
-            "rate_changes": []
-        }
-        
-        # Extract pauses
-        for match in self.ssml_patterns["pause"].finditer(text):
-            duration = match.group(1)
-            metadata["pauses"].append({
-                "position": match.start(),
-                "duration": duration
-            })
-        
-        # Extract emphasis
-        for match in self.ssml_patterns["emphasis"].finditer(text):
-            content = match.group(1)
-            metadata["emphasis"].append({
-                "text": content,
-                "position": match.start()
-            })
-        
-        # Extract rate changes
-        for match in self.ssml_patterns["rate"].finditer(text):
-            speed = match.group(1)
-            content = match.group(2)
-            metadata["rate_changes"].append({
-                "text": content,
-                "speed": speed,
-                "position": match.start()
-            })
-        
-        # Remove SSML tags
-        clean_text = text
-        for pattern in self.ssml_patterns.values():
-            clean_text = pattern.sub(r"\1", clean_text)
-        
-        return clean_text, metadata
-    
     async def generate_batch(
         self,
         texts: List[str],
@@ -514,7 +635,8 @@ class TTSEngine:
         self,
         text: str,
         voice: Voice,
-        speaking_rate: float
+        speaking_rate: float,
+        language: Optional[str] = None
     ) -> str:
         """
         Generate cache key for TTS generation.
@@ -523,11 +645,13 @@ class TTSEngine:
             text: Text content
             voice: Voice model
             speaking_rate: Speaking rate
+            language: Language code (uses config default if None)
         
         Returns:
             Cache key hash
         """
-        content = f"{text}:{voice.value}:{speaking_rate}:{self.config.sample_rate}"
+        language = language or self.config.language
+        content = f"{text}:{voice.value}:{speaking_rate}:{language}:{self.config.sample_rate}"
         # MD5 used for cache key only, not security (nosec: B324)
         return hashlib.md5(content.encode(), usedforsecurity=False).hexdigest()
     
@@ -552,48 +676,106 @@ class TTSEngine:
     async def estimate_duration(
         self,
         text: str,
-        speaking_rate: float = 1.0
+        speaking_rate: float = 1.0,
+        voice: Optional[Voice] = None
     ) -> float:
         """
         Estimate audio duration without generating.
         
+        Uses the per-voice model learned from earlier syntheses (see
+        duration_model); falls back to 150 words per minute until the
+        voice has enough observations.
+        
         Args:
-            text: Text to estimate
+            text: Text to estimate (SSML allowed)
             speaking_rate: Speaking rate multiplier
+            voice: Voice to estimate for (uses config default if None)
         
         Returns:
             Estimated duration in seconds
         """
-        # Average speaking rate: 150 words per minute
-        word_count = len(text.split())
-        base_duration = (word_count / 150) * 60
+        voice = voice or self.config.voice
+        await self.load_duration_model()
+        return self.duration_estimator.predict(text, voice.value, speaking_rate)
+    
+    def fit_duration_model(self, results: List[TTSResult]) -> int:
+        """
+        Train the duration model from existing TTS results.
         
-        # Adjust for speaking rate
-        adjusted_duration = base_duration / speaking_rate
+        Args:
+            results: Results of earlier syntheses (e.g. from the cache)
         
-        return adjusted_duration
+        Returns:
+            Number of results used
+        """
+        used = self.duration_estimator.fit(
+            (r.source_text or r.text, r.voice_used, r.duration, r.speaking_rate)
+            for r in results
+            if r.duration > 0
+        )
+        self._unsaved_durations += used
+        return used
     
-    async def cleanup_cache(self, max_age_days: int = 7) -> int:
+    async def load_duration_model(self) -> int:
+        """
+        Seed an untrained duration model from the audio cache (once).
+        
+        A model already loaded from ``duration_model_path`` has seen these
+        results, so it is left alone.
+        
+        Returns:
+            Number of cached results learned from
+        """
+        if self._duration_model_loaded:
+            return 0
+        self._duration_model_loaded = True
+        
+        if not self.cache or self.duration_estimator.voices():
+            return 0
+        
+        # Audio files are named by their TTS cache key
+        results = []
+        for name in self.cache_index.names():
+            cached = await self.cache.get(Path(name).stem)
+            if cached:
+                results.append(TTSResult(**cached))
+        
+        used = self.fit_duration_model(results)
+        await self.save_duration_model()
+        return used
+    
+    async def save_duration_model(self) -> None:
+        """Persist new duration observations without blocking the event loop."""
+        async with self._duration_save_lock:
+            if not self._unsaved_durations:
+                return
+            self._unsaved_durations = 0
+            snapshot = self.duration_estimator.dumps()
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self.duration_estimator.save, snapshot)
+    
+    async def cleanup_cache(
+        self,
+        max_age_days: int = 7,
+        exclude: Optional[Set[Path]] = None
+    ) -> int:
         """
         Clean up old cached audio files.
         
+        Files unused for ``max_age_days`` are removed, then the size budget
+        is applied. Both are answered from the cache index, so the output
+        directory is never listed.
+        
         Args:
-            max_age_days: Maximum age of files to keep
+            max_age_days: Maximum days since a file was last used
+            exclude: Resolved paths still in use (never deleted)
         
         Returns:
             Number of files deleted
         """
-        import time
-        
-        deleted = 0
-        max_age_seconds = max_age_days * 86400
-        current_time = time.time()
+        await self.save_duration_model()
         
-        for file in self.config.output_dir.glob("*"):
-            if file.is_file():
-                age = current_time - file.stat().st_mtime
-                if age > max_age_seconds:
-                    file.unlink()
-                    deleted += 1
+        expired = self.cache_index.expire(max_age_days * 86400, exclude=exclude)
+        evicted = self.cache_index.enforce_budget(exclude=exclude)
         
-        return deleted
+        return len(expired) + len(evicted)
@@ -26,12 +26,14 @@ Usage:
 """
 
 import asyncio
+import json
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional
 import uuid
 
 from pydantic import BaseModel, Field
@@ -44,7 +46,27 @@ from .timeline_builder import (
     BackgroundMusic,
 )
 from .video_renderer import VideoRenderer, RenderConfig, QualityPreset, RenderResult
+from .asset_index import AssetMetadataIndex
+from .asset_matcher import AssetMatcher, EmbeddingIndex
+from .near_duplicates import PerceptualHashIndex
+from .timeline_diff import TimelineDiff, diff_segments
+from .timeline_codec import save_timeline
+from .quality_check import QCConfig, QCReport, QualityChecker
+from .media_probe import run_ffmpeg
+from .language_variants import (
+    LanguageVariant,
+    MultiLanguageVideo,
+    VariantMode,
+    build_audio_track_command,
+    build_mux_command,
+    retime_scenes,
+    visual_timeline,
+)
+from .batch_pipeline import BatchConfig, BatchPipeline
+from .assembly_cache import AssemblyCache
+from .workspace import JobWorkspace, WorkspaceConfig, WorkspaceManager
 from src.utils.cache import CacheManager
+from src.utils.tracing import current_span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -70,6 +92,7 @@ class VideoConfig:
     
     # Timeline settings
     target_duration: Optional[float] = None  # Target video duration
+    trim_to_target: bool = False  # Skip segments predicted to fall past the target
     add_captions: bool = False
     timeline_config: Optional[TimelineConfig] = None
     
@@ -89,10 +112,35 @@ class VideoConfig:
     output_dir: Path = Path("output_videos")
     temp_dir: Path = Path("temp")
     
+    # Per-job workspaces for intermediates
+    tmpfs_dir: Optional[Path] = None  # e.g. Path("/dev/shm"); None = temp_dir only
+    workspace_quota_bytes: Optional[int] = None
+    
     # Performance
     max_retries: int = 3
     enable_cache: bool = True
     cache_ttl: int = 3600
+    
+    # Post-render QC (black/frozen video, silence, clipping)
+    quality_check: bool = True
+    qc_config: Optional[QCConfig] = None
+    
+    # Asset metadata index (None = probe nothing, trust file extensions)
+    asset_index_path: Optional[Path] = None
+    
+    # Semantic asset matching (scene text vs. asset tags/descriptions)
+    semantic_asset_matching: bool = False
+    asset_embedding_index_path: Optional[Path] = None  # Built at ingest; None = in memory only
+    near_duplicate_index_path: Optional[Path] = None  # pHash index built at ingest
+    near_duplicate_distance: int = 8  # Hamming bits; copies count as one asset
+    
+    # Batch assembly (worker pools and CPU budget)
+    batch_config: Optional[BatchConfig] = None
+    
+    # Whole-assembly result cache (None = disabled)
+    assembly_cache_dir: Optional[Path] = None
+    assembly_cache_max_bytes: Optional[int] = None  # Size budget for cached videos
+    assembly_cache_max_age: Optional[float] = None  # Seconds to keep entries
 
 
 class AssembledVideo(BaseModel):
@@ -103,6 +151,10 @@ class AssembledVideo(BaseModel):
     # Paths
     video_path: str
     thumbnail_path: Optional[str] = None
+    timeline_path: Optional[str] = None  # Binary timeline (see timeline_codec)
+    
+    # Post-render QC (None = not checked)
+    qc: Optional[QCReport] = None
     
     # Content
     script: str
@@ -123,6 +175,11 @@ class AssembledVideo(BaseModel):
     scene_count: int
     asset_count: int
     
+    # Per-scene state kept for incremental rebuilds
+    segments: List[str] = Field(default_factory=list)
+    narration: List[TTSResult] = Field(default_factory=list)
+    scene_assets: List[str] = Field(default_factory=list)
+    
     # Timing
     assembly_time: float  # Total time to assemble
     render_time: float  # Just render time
@@ -136,6 +193,28 @@ class AssembledVideo(BaseModel):
         arbitrary_types_allowed = True
 
 
+@dataclass
+class AssemblyJob:
+    """In-flight state of one video as it moves through the assembly stages."""
+    script: str
+    niche: str
+    assets: List[Path]
+    title: Optional[str] = None
+    progress_callback: Optional[Callable[[str, float], None]] = None
+    previous: Optional[AssembledVideo] = None
+    
+    video_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    start_time: float = field(default_factory=time.time)
+    
+    # Filled in by the stages
+    segments: List[str] = field(default_factory=list)
+    narration: List[TTSResult] = field(default_factory=list)
+    reused_assets: Dict[int, Path] = field(default_factory=dict)
+    timeline: Optional[Timeline] = None
+    cache_key: Optional[str] = None
+    workspace: Optional[JobWorkspace] = None
+
+
 class VideoAssembler:
     """
     Complete video assembly orchestrator.
@@ -148,6 +227,7 @@ class VideoAssembler:
         self,
         config: Optional[VideoConfig] = None,
         cache_manager: Optional[CacheManager] = None,
+        asset_matcher: Optional[AssetMatcher] = None,
     ):
         """
         Initialize video assembler.
@@ -155,10 +235,20 @@ class VideoAssembler:
         Args:
             config: Video assembly configuration
             cache_manager: Optional cache manager
+            asset_matcher: Optional semantic asset matcher (e.g. with an
+                OllamaEmbedder); built from config when semantic matching
+                is enabled
         """
         self.config = config or VideoConfig()
         self.cache = cache_manager or CacheManager() if self.config.enable_cache else None
         
+        # Per-job scratch space; narration the jobs hold is never evicted
+        self.workspaces = WorkspaceManager(WorkspaceConfig(
+            root=self.config.temp_dir,
+            tmpfs_root=self.config.tmpfs_dir,
+            quota_bytes=self.config.workspace_quota_bytes,
+        ))
+        
         # Initialize components
         self.tts_engine = TTSEngine(
             config=self.config.tts_config or TTSConfig(
@@ -166,14 +256,36 @@ class VideoAssembler:
                 speaking_rate=self.config.speaking_rate,
                 enable_cache=self.config.enable_cache,
             ),
-            cache_manager=self.cache
+            cache_manager=self.cache,
+            in_use=self.workspaces.referenced
+        )
+        
+        self.asset_index = (
+            AssetMetadataIndex(self.config.asset_index_path)
+            if self.config.asset_index_path else None
         )
         
+        if asset_matcher is None and self.config.semantic_asset_matching:
+            duplicates = (
+                PerceptualHashIndex(
+                    self.config.near_duplicate_index_path,
+                    max_distance=self.config.near_duplicate_distance,
+                )
+                if self.config.near_duplicate_index_path else None
+            )
+            asset_matcher = AssetMatcher(
+                EmbeddingIndex(self.config.asset_embedding_index_path),
+                duplicates=duplicates,
+            )
+        self.asset_matcher = asset_matcher
+        
         self.timeline_builder = TimelineBuilder(
             config=self.config.timeline_config or TimelineConfig(
                 target_duration=self.config.target_duration,
                 add_captions=self.config.add_captions,
-            )
+            ),
+            asset_index=self.asset_index,
+            asset_matcher=self.asset_matcher,
         )
         
         self.video_renderer = VideoRenderer(
@@ -181,13 +293,33 @@ class VideoAssembler:
                 quality=self.config.quality,
                 add_watermark=self.config.add_watermark,
                 watermark_text=self.config.watermark_text,
+            ),
+            asset_index=self.asset_index,
+        )
+        
+        self.assembly_cache = (
+            AssemblyCache(
+                self.config.assembly_cache_dir,
+                max_bytes=self.config.assembly_cache_max_bytes,
+                max_age=self.config.assembly_cache_max_age,
             )
+            if self.config.assembly_cache_dir else None
+        )
+        
+        self.quality_checker = (
+            QualityChecker(self.config.qc_config)
+            if self.config.quality_check else None
         )
         
+        # Per-stage metrics of the most recent assemble_batch call
+        self.batch_metrics: Dict[str, dict] = {}
+        
         # Ensure output directories exist
         self.config.output_dir.mkdir(parents=True, exist_ok=True)
         self.config.temp_dir.mkdir(parents=True, exist_ok=True)
+
     
+    @traced("assembly")
     async def assemble(
         self,
         script: str,
@@ -195,132 +327,458 @@ class VideoAssembler:
         assets: List[Path],
         title: Optional[str] = None,
         progress_callback: Optional[Callable[[str, float], None]] = None,
+        previous: Optional[AssembledVideo] = None,
     ) -> AssembledVideo:
         """
         Assemble complete video from script and assets.
         
+        When ``previous`` is given (e.g. after regenerate_with_feedback or
+        a manual edit), the new script is diffed against it and narration
+        and asset assignments of unchanged scenes are reused.
+        
         Args:
             script: Video script text
             niche: Content niche (meditation, motivation, etc.)
             assets: List of visual asset paths
             title: Optional video title
             progress_callback: Optional progress callback (status, progress)
+            previous: Optional earlier assembly of a version of this script
         
         Returns:
             AssembledVideo with all metadata
         """
-        import time
+        job = AssemblyJob(
+            script=script,
+            niche=niche,
+            assets=assets,
+            title=title,
+            progress_callback=progress_callback,
+            previous=previous,
+        )
+        
+        logger.info(f"Starting video assembly [{job.video_id}]: {niche}")
         
-        start_time = time.time()
-        video_id = str(uuid.uuid4())[:8]
+        span = current_span()
+        if span is not None:
+            span.set_attribute("video.id", job.video_id)
+            span.set_attribute("video.niche", niche)
         
-        logger.info(f"Starting video assembly [{video_id}]: {niche}")
+        cached = await self._lookup_cached(job)
+        if cached is not None:
+            return cached
         
         try:
-            # Step 1: Split script into segments
-            if progress_callback:
-                progress_callback("Preparing script", 0.1)
-            
-            script_segments = self._split_script(script)
-            logger.info(f"Split script into {len(script_segments)} segments")
-            
-            # Step 2: Generate TTS for each segment
-            if progress_callback:
-                progress_callback("Generating audio", 0.2)
-            
-            narration_results = await self._generate_narration(
-                script_segments,
-                progress_callback
+            await self._stage_narrate(job)
+            await self._stage_build_timeline(job)
+            result = await self._stage_render(job)
+        
+        except Exception as e:
+            return self._failed_result(job, e)
+        
+        finally:
+            self._release_job(job)
+        
+        return await self._store_cached(job, result)
+    
+    async def _lookup_cached(self, job: AssemblyJob) -> Optional[AssembledVideo]:
+        """
+        Return a cached assembly with identical inputs, if any.
+        
+        Also computes and records the job's cache key for _store_cached.
+        
+        Args:
+            job: Assembly job about to run
+        
+        Returns:
+            Cached AssembledVideo, or None on a miss or when caching is off
+        """
+        if self.assembly_cache is None:
+            return None
+        
+        try:
+            job.cache_key = await self.assembly_cache.compute_key(
+                job.script,
+                job.niche,
+                job.assets,
+                self.config,
+                title=job.title,
             )
-            logger.info(f"Generated {len(narration_results)} audio segments")
-            
-            # Step 3: Build timeline
-            if progress_callback:
-                progress_callback("Building timeline", 0.5)
-            
-            timeline = await self._build_timeline(
-                script_segments,
-                narration_results,
-                assets
+            # Each hit gets its own files under this job's id
+            output_dir = self.config.output_dir
+            data = await self.assembly_cache.checkout(job.cache_key, {
+                "video_path": output_dir / f"video_{job.video_id}.mp4",
+                "thumbnail_path": output_dir / f"thumb_{job.video_id}.jpg",
+                "timeline_path": output_dir / f"video_{job.video_id}.timeline",
+            })
+        except Exception as e:
+            logger.warning(f"Assembly cache lookup failed [{job.video_id}]: {e}")
+            return None
+        
+        if data is None:
+            return None
+        
+        logger.info(f"Assembly cache hit [{job.video_id}]: "
+                   f"{job.cache_key[:12]} -> {data.get('video_path')}")
+        
+        if job.progress_callback:
+            job.progress_callback("Complete", 1.0)
+        
+        data["id"] = job.video_id
+        return AssembledVideo(**data)
+    
+    async def _store_cached(
+        self,
+        job: AssemblyJob,
+        result: AssembledVideo,
+    ) -> AssembledVideo:
+        """
+        Store a completed assembly in the cache.
+        
+        Args:
+            job: Finished assembly job
+            result: Its result
+        
+        Returns:
+            The result, unchanged
+        """
+        if (
+            self.assembly_cache is None
+            or job.cache_key is None
+            or result.status != VideoStatus.COMPLETED
+            or (result.qc is not None and not result.qc.passed)
+        ):
+            return result
+        
+        try:
+            await self.assembly_cache.put(
+                job.cache_key,
+                json.loads(result.json())
             )
-            logger.info(f"Built timeline: {timeline.scene_count} scenes, "
-                       f"{timeline.total_duration:.1f}s")
+        except Exception as e:
+            logger.warning(f"Failed to cache assembly [{job.video_id}]: {e}")
+        
+        return result
+    
+    @traced("assembly.narrate")
+    async def _stage_narrate(self, job: AssemblyJob) -> None:
+        """
+        Split the script and synthesize narration (TTS stage).
+        
+        Args:
+            job: Assembly job to advance
+        """
+        progress_callback = job.progress_callback
+        
+        # Step 1: Split script into segments
+        if progress_callback:
+            progress_callback("Preparing script", 0.1)
+        
+        job.segments = self._split_script(job.script)
+        logger.info(f"Split script into {len(job.segments)} segments")
+        
+        if self.config.trim_to_target and self.config.target_duration:
+            job.segments = await self._plan_segments(job.segments)
+        
+        reused_narration: Dict[int, TTSResult] = {}
+        if job.previous is not None:
+            diff = diff_segments(job.previous.segments, job.segments)
+            reused_narration, job.reused_assets = self._reusable_scene_state(
+                job.previous,
+                diff
+            )
+            logger.info(f"Script diff [{job.video_id}]: {diff.summary()}")
+        
+        # Don't spend TTS time on a job whose render can't fit
+        self._check_workspace_quota(job, self.config.target_duration)
+        
+        # Step 2: Generate TTS for each segment
+        if progress_callback:
+            progress_callback("Generating audio", 0.2)
+        
+        job.narration = await self._generate_narration(
+            job.segments,
+            progress_callback,
+            reuse=reused_narration
+        )
+        
+        # Keep shared TTS cache files alive for the rest of the job
+        workspace = self._job_workspace(job)
+        for result in job.narration:
+            if result.audio_path:
+                workspace.retain(Path(result.audio_path))
+        logger.info(f"Generated {len(job.narration)} audio segments "
+                   f"({len(reused_narration)} reused)")
+    
+    @traced("assembly.timeline")
+    async def _stage_build_timeline(self, job: AssemblyJob) -> None:
+        """
+        Build the timeline from narrated segments (timeline stage).
+        
+        Args:
+            job: Assembly job to advance
+        """
+        # Step 3: Build timeline
+        if job.progress_callback:
+            job.progress_callback("Building timeline", 0.5)
+        
+        job.timeline = await self._build_timeline(
+            job.segments,
+            job.narration,
+            job.assets,
+            scene_assets=[
+                job.reused_assets.get(i) for i in range(len(job.segments))
+            ] if job.reused_assets else None
+        )
+        logger.info(f"Built timeline: {job.timeline.scene_count} scenes, "
+                   f"{job.timeline.total_duration:.1f}s")
+    
+    @traced("assembly.render")
+    async def _stage_render(self, job: AssemblyJob) -> AssembledVideo:
+        """
+        Render the video and thumbnail (render stage).
+        
+        Args:
+            job: Assembly job to finish
+        
+        Returns:
+            Completed AssembledVideo
+        """
+        progress_callback = job.progress_callback
+        video_id = job.video_id
+        timeline = job.timeline
+        narration_results = job.narration
+        
+        workspace = self._job_workspace(job)
+        
+        try:
+            self._check_workspace_quota(job, timeline.total_duration)
             
-            # Step 4: Render video
+            # Step 4: Render video (intermediates stay in the workspace)
             if progress_callback:
                 progress_callback("Rendering video", 0.6)
             
-            output_path = self.config.output_dir / f"video_{video_id}.mp4"
-            
             render_result = await self.video_renderer.render(
                 timeline=timeline,
-                output_path=output_path,
+                output_path=workspace.path(f"video_{video_id}.mp4"),
                 progress_callback=lambda p: progress_callback(
                     "Rendering video",
                     0.6 + (p * 0.35)
                 ) if progress_callback else None
             )
             
-            # Step 5: Create thumbnail
-            if progress_callback:
-                progress_callback("Creating thumbnail", 0.95)
-            
-            thumbnail_path = await self._create_thumbnail(output_path, video_id)
+            output_path = Path(render_result.output_path)
+            timeline_path = None
+            if workspace.owns(output_path):
+                output_path = workspace.promote(
+                    output_path,
+                    self.config.output_dir / f"video_{video_id}.mp4"
+                )
+                
+                # Keep the timeline next to the video for re-renders
+                timeline_path = workspace.promote(
+                    save_timeline(timeline, workspace.path(f"video_{video_id}.timeline")),
+                    self.config.output_dir / f"video_{video_id}.timeline"
+                )
             
-            # Calculate total time
-            assembly_time = time.time() - start_time
-            
-            # Create result
-            result = AssembledVideo(
-                id=video_id,
-                video_path=str(output_path),
-                thumbnail_path=str(thumbnail_path) if thumbnail_path else None,
-                script=script,
-                niche=niche,
-                title=title or f"{niche.title()} Video",
-                duration=render_result.duration,
-                file_size=render_result.file_size,
-                resolution=render_result.resolution,
-                fps=render_result.fps,
-                voice_used=self.config.voice.value,
-                audio_duration=sum(r.duration for r in narration_results),
-                scene_count=timeline.scene_count,
-                asset_count=timeline.total_assets,
-                assembly_time=assembly_time,
-                render_time=render_result.render_time,
-                status=VideoStatus.COMPLETED,
+            # Step 5: Check the output before anything uploads it
+            qc_report = await self._check_quality(
+                output_path,
+                render_result,
+                narration_duration=sum(r.duration for r in narration_results)
             )
             
+            # Step 6: Create thumbnail
             if progress_callback:
-                progress_callback("Complete", 1.0)
-            
-            logger.info(f"Assembly complete [{video_id}]: {assembly_time:.1f}s, "
-                       f"{result.file_size / 1024 / 1024:.1f} MB")
+                progress_callback("Creating thumbnail", 0.95)
             
-            return result
+            thumbnail_path = await self._create_thumbnail(output_path, video_id)
         
-        except Exception as e:
-            logger.error(f"Assembly failed [{video_id}]: {e}", exc_info=True)
-            
-            return AssembledVideo(
-                id=video_id,
-                video_path="",
-                script=script,
-                niche=niche,
-                title=title or "",
-                duration=0,
-                file_size=0,
-                resolution=(0, 0),
-                fps=0,
-                voice_used=self.config.voice.value,
-                audio_duration=0,
-                scene_count=0,
-                asset_count=0,
-                assembly_time=time.time() - start_time,
-                render_time=0,
-                status=VideoStatus.FAILED,
-                errors=[str(e)],
+        finally:
+            self._release_job(job)
+        
+        # Calculate total time
+        assembly_time = time.time() - job.start_time
+        
+        # Create result
+        result = AssembledVideo(
+            id=video_id,
+            video_path=str(output_path),
+            thumbnail_path=str(thumbnail_path) if thumbnail_path else None,
+            timeline_path=str(timeline_path) if timeline_path else None,
+            script=job.script,
+            niche=job.niche,
+            title=job.title or f"{job.niche.title()} Video",
+            duration=render_result.duration,
+            file_size=render_result.file_size,
+            resolution=render_result.resolution,
+            fps=render_result.fps,
+            voice_used=self.config.voice.value,
+            audio_duration=sum(r.duration for r in narration_results),
+            scene_count=timeline.scene_count,
+            asset_count=timeline.total_assets,
+            segments=job.segments,
+            narration=[
+                r.copy(update={"audio_data": None}) for r in narration_results
+            ],
+            scene_assets=[
+                str(scene.assets[0].path) if scene.assets else ""
+                for scene in timeline.scenes
+            ],
+            assembly_time=assembly_time,
+            render_time=render_result.render_time,
+            qc=qc_report,
+            status=VideoStatus.COMPLETED,
+        )
+        
+        if progress_callback:
+            progress_callback("Complete", 1.0)
+        
+        logger.info(f"Assembly complete [{video_id}]: {assembly_time:.1f}s, "
+                   f"{result.file_size / 1024 / 1024:.1f} MB")
+        
+        return result
+    
+    @traced("assembly.qc")
+    async def _check_quality(
+        self,
+        video_path: Path,
+        render_result: RenderResult,
+        narration_duration: float,
+    ) -> Optional[QCReport]:
+        """
+        Run post-render QC on a rendered video.
+        
+        Args:
+            video_path: Rendered video
+            render_result: Its render result (duration, render time)
+            narration_duration: Total narration length
+        
+        Returns:
+            QCReport, or None when QC is disabled
+        """
+        if self.quality_checker is None:
+            return None
+        
+        report = await self.quality_checker.check(
+            video_path,
+            duration=render_result.duration,
+            narration_duration=narration_duration,
+        )
+        
+        share = report.qc_time / render_result.render_time if render_result.render_time else 0
+        logger.info(f"{report.summary()} for {video_path.name} "
+                   f"({report.qc_time:.1f}s, {share:.1%} of render)")
+        
+        span = current_span()
+        if span is not None:
+            span.set_attribute("qc.passed", report.passed)
+            span.set_attribute("qc.issues", len(report.issues))
+        
+        return report
+    
+    def _failed_result(self, job: AssemblyJob, error: Exception) -> AssembledVideo:
+        """
+        Build the result returned for a failed assembly.
+        
+        Args:
+            job: Assembly job that failed
+            error: Exception raised by a stage
+        
+        Returns:
+            AssembledVideo with FAILED status
+        """
+        logger.error(f"Assembly failed [{job.video_id}]: {error}", exc_info=True)
+        self._release_job(job)
+        
+        return AssembledVideo(
+            id=job.video_id,
+            video_path="",
+            script=job.script,
+            niche=job.niche,
+            title=job.title or "",
+            duration=0,
+            file_size=0,
+            resolution=(0, 0),
+            fps=0,
+            voice_used=self.config.voice.value,
+            audio_duration=0,
+            scene_count=0,
+            asset_count=0,
+            assembly_time=time.time() - job.start_time,
+            render_time=0,
+            status=VideoStatus.FAILED,
+            errors=[str(error)],
+        )
+    
+    async def _plan_segments(self, segments: List[str]) -> List[str]:
+        """
+        Drop segments predicted to fall past the target duration.
+        
+        Runs before synthesis using the TTS duration model, so no audio is
+        generated for narration that would be trimmed anyway.
+        
+        Args:
+            segments: Script segments
+        
+        Returns:
+            Leading segments that fit the target
+        """
+        predicted = [
+            await self.tts_engine.estimate_duration(
+                segment,
+                speaking_rate=self.config.speaking_rate,
+                voice=self.config.voice
             )
+            for segment in segments
+        ]
+        
+        keep = self.timeline_builder.plan_segments(
+            predicted,
+            self.config.target_duration
+        )
+        
+        if keep < len(segments):
+            logger.info(f"Skipping {len(segments) - keep} of {len(segments)} "
+                       f"segments predicted past the "
+                       f"{self.config.target_duration:.0f}s target")
+        
+        return segments[:keep]
+    
+    def _job_workspace(self, job: AssemblyJob) -> JobWorkspace:
+        """Get the job's workspace, creating it on first use."""
+        if job.workspace is None or job.workspace.closed:
+            job.workspace = self.workspaces.create(job.video_id)
+        return job.workspace
+    
+    def _check_workspace_quota(self, job: AssemblyJob, duration: Optional[float]) -> None:
+        """
+        Fail a job before it writes more than its workspace may hold.
+        
+        Args:
+            job: Assembly job about to write intermediates
+            duration: Expected video length in seconds (None = unknown)
+        
+        Raises:
+            WorkspaceQuotaError: If the estimated render output won't fit
+        """
+        if self.config.workspace_quota_bytes is None or not duration:
+            return
+        
+        # Imported here: the scheduler package imports this module
+        from src.services.scheduler.resource_scheduler import estimate_stage_resources
+        
+        estimate = estimate_stage_resources(
+            "video_assembly",
+            quality=self.config.quality.value,
+            duration_minutes=duration / 60,
+        )
+        self._job_workspace(job).check_quota(estimate.disk_bytes)
+    
+    def _release_job(self, job: AssemblyJob) -> None:
+        """Tear down the job's workspace (safe to call repeatedly)."""
+        if job.workspace is not None:
+            job.workspace.close()
+            job.workspace = None
     
     def _split_script(self, script: str) -> List[str]:
         """
@@ -365,10 +823,51 @@ class VideoAssembler:
         
         return segments
     
+    def _reusable_scene_state(
+        self,
+        previous: AssembledVideo,
+        diff: TimelineDiff,
+    ) -> tuple[Dict[int, TTSResult], Dict[int, Path]]:
+        """
+        Collect narration and asset assignments reusable from a previous assembly.
+        
+        Narration is reused only for unchanged scenes whose audio file still
+        exists; asset assignments are kept for unchanged and edited scenes.
+        
+        Args:
+            previous: Earlier assembly result
+            diff: Diff of previous segments against the new ones
+        
+        Returns:
+            Tuple of (new index -> TTSResult, new index -> asset path)
+        """
+        narration: Dict[int, TTSResult] = {}
+        for new_index, old_index in diff.unchanged.items():
+            if old_index >= len(previous.narration):
+                continue
+            result = previous.narration[old_index]
+            if result.audio_path and Path(result.audio_path).exists():
+                narration[new_index] = result.copy(update={"from_cache": True})
+        
+        assets: Dict[int, Path] = {}
+        for scene in diff.scenes:
+            if scene.old_index is None or scene.new_index is None:
+                continue
+            if scene.old_index >= len(previous.scene_assets):
+                continue
+            asset_path = previous.scene_assets[scene.old_index]
+            if asset_path and Path(asset_path).exists():
+                assets[scene.new_index] = Path(asset_path)
+        
+        return narration, assets
+    
     async def _generate_narration(
         self,
         script_segments: List[str],
         progress_callback: Optional[Callable[[str, float], None]] = None,
+        reuse: Optional[Dict[int, TTSResult]] = None,
+        voice: Optional[Voice] = None,
+        language: Optional[str] = None,
     ) -> List[TTSResult]:
         """
         Generate TTS audio for all script segments.
@@ -376,21 +875,29 @@ class VideoAssembler:
         Args:
             script_segments: List of script text segments
             progress_callback: Optional progress callback
+            reuse: Optional already-synthesized results by segment index
+            voice: Voice override (defaults to config.voice)
+            language: Language code override (defaults to the TTS config)
         
         Returns:
             List of TTSResult objects
         """
         results = []
         total = len(script_segments)
+        reuse = reuse or {}
         
         for i, segment in enumerate(script_segments):
-            # Generate audio
-            result = await self.tts_engine.generate(
-                text=segment,
-                voice=self.config.voice,
-                speaking_rate=self.config.speaking_rate,
-                save_to_file=True
-            )
+            # Reuse narration of unchanged scenes, otherwise generate audio
+            if i in reuse:
+                result = reuse[i]
+            else:
+                result = await self.tts_engine.generate(
+                    text=segment,
+                    voice=voice or self.config.voice,
+                    speaking_rate=self.config.speaking_rate,
+                    save_to_file=True,
+                    language=language
+                )
             
             results.append(result)
             
@@ -406,6 +913,7 @@ class VideoAssembler:
         script_segments: List[str],
         narration_results: List[TTSResult],
         assets: List[Path],
+        scene_assets: Optional[List[Optional[Path]]] = None,
     ) -> Timeline:
         """
         Build timeline from script and narration.
@@ -414,16 +922,16 @@ class VideoAssembler:
             script_segments: Script text segments
             narration_results: TTS results
             assets: Visual assets
+            scene_assets: Optional pinned asset per scene (None = auto-assign)
         
         Returns:
             Complete Timeline
         """
-        # Extract narration paths
-        narration_paths = [
-            Path(result.audio_path)
-            for result in narration_results
-            if result.audio_path
-        ]
+        # Extract narration paths, passing known durations through so the
+        # builder does not need to re-read the audio files
+        narrated = [result for result in narration_results if result.audio_path]
+        narration_paths = [Path(result.audio_path) for result in narrated]
+        narration_durations = [result.duration or None for result in narrated]
         
         # Build timeline
         timeline = await self.timeline_builder.build(
@@ -431,6 +939,8 @@ class VideoAssembler:
             narration_paths=narration_paths,
             assets=assets,
             background_music=self.config.background_music_path,
+            narration_durations=narration_durations,
+            scene_assets=scene_assets,
         )
         
         # Optimize timeline
@@ -468,44 +978,288 @@ class VideoAssembler:
             logger.warning(f"Failed to create thumbnail: {e}")
             return None
     
+    @traced("assembly.batch")
     async def assemble_batch(
         self,
         scripts: List[tuple[str, str, List[Path]]],  # (script, niche, assets)
         progress_callback: Optional[Callable[[int, int, str, float], None]] = None,
+        batch_config: Optional[BatchConfig] = None,
     ) -> List[AssembledVideo]:
         """
         Assemble multiple videos in parallel.
         
+        Videos flow through a staged pipeline (TTS -> timeline -> render)
+        with a separate worker pool per stage, so one video is narrated
+        while another renders. Per-stage metrics of the last batch are
+        available from ``batch_metrics``.
+        
         Args:
             scripts: List of (script, niche, assets) tuples
             progress_callback: Optional callback (current, total, status, progress)
+            batch_config: Optional batch settings (defaults to config.batch_config)
         
         Returns:
-            List of AssembledVideo results
+            List of AssembledVideo results, in input order
         """
-        results = []
         total = len(scripts)
         
-        for i, (script, niche, assets) in enumerate(scripts):
-            logger.info(f"Assembling video {i+1}/{total}")
-            
-            # Callback wrapper
+        def make_callback(position: int) -> Callable[[str, float], None]:
             def callback(status: str, progress: float):
                 if progress_callback:
-                    progress_callback(i + 1, total, status, progress)
-            
-            # Assemble video
-            result = await self.assemble(
+                    progress_callback(position, total, status, progress)
+            return callback
+        
+        jobs = [
+            AssemblyJob(
                 script=script,
                 niche=niche,
                 assets=assets,
-                progress_callback=callback
+                progress_callback=make_callback(i + 1),
             )
-            
-            results.append(result)
+            for i, (script, niche, assets) in enumerate(scripts)
+        ]
+        
+        # Serve repeated inputs from the assembly cache; pipeline the rest
+        results: List[Optional[AssembledVideo]] = [
+            await self._lookup_cached(job) for job in jobs
+        ]
+        pending = [i for i, result in enumerate(results) if result is None]
+        
+        pipeline = BatchPipeline(
+            self,
+            batch_config or self.config.batch_config or BatchConfig()
+        )
+        try:
+            rendered = await pipeline.run([jobs[i] for i in pending])
+        finally:
+            for job in jobs:
+                self._release_job(job)
+        self.batch_metrics = pipeline.get_metrics()
+        
+        for i, result in zip(pending, rendered):
+            results[i] = await self._store_cached(jobs[i], result)
         
         return results
     
+    @traced("assembly.variants")
+    async def assemble_variants(
+        self,
+        scripts: Dict[str, str],
+        niche: str,
+        assets: List[Path],
+        title: Optional[str] = None,
+        mode: VariantMode = VariantMode.TRACKS,
+        voices: Optional[Dict[str, Voice]] = None,
+        progress_callback: Optional[Callable[[str, float], None]] = None,
+    ) -> MultiLanguageVideo:
+        """
+        Assemble several language versions that share one visual track.
+        
+        The first script is the primary language: its segments drive asset
+        selection and scene timing. Each translation must split into the
+        same segments. Visuals are rendered once; every language then gets
+        its own mixed audio track, muxed by stream copy.
+        
+        Args:
+            scripts: Language code -> script text, primary language first
+            niche: Content niche
+            assets: List of visual asset paths
+            title: Optional video title
+            mode: One file with a track per language, or one file each
+            voices: Voice per translation (default Voice.MULTILINGUAL);
+                the primary language uses config.voice
+            progress_callback: Optional progress callback (status, progress)
+        
+        Returns:
+            MultiLanguageVideo with one LanguageVariant per language
+        
+        Raises:
+            ValueError: If no scripts are given or a translation's segments
+                don't line up with the primary script
+        """
+        if not scripts:
+            raise ValueError("At least one script is required")
+        
+        languages = list(scripts)
+        primary = languages[0]
+        voices = voices or {}
+        
+        job = AssemblyJob(
+            script=scripts[primary],
+            niche=niche,
+            assets=assets,
+            title=title,
+            progress_callback=progress_callback,
+        )
+        logger.info(f"Starting multi-language assembly [{job.video_id}]: "
+                   f"{', '.join(languages)}")
+        
+        try:
+            # Narrate every language before timing, so one plan fits all
+            await self._stage_narrate(job)
+            planned = len(self._split_script(job.script))
+            
+            segments = {primary: job.segments}
+            narration = {primary: job.narration}
+            used_voices = {primary: self.config.voice}
+            workspace = self._job_workspace(job)
+            
+            for language in languages[1:]:
+                translated = self._split_script(scripts[language])
+                if len(translated) != planned:
+                    raise ValueError(
+                        f"{language} script has {len(translated)} segments, "
+                        f"expected {planned} to match {primary}"
+                    )
+                
+                used_voices[language] = voices.get(language, Voice.MULTILINGUAL)
+                segments[language] = translated[:len(job.segments)]
+                narration[language] = await self._generate_narration(
+                    segments[language],
+                    voice=used_voices[language],
+                    language=language
+                )
+                for result in narration[language]:
+                    if result.audio_path:
+                        workspace.retain(Path(result.audio_path))
+            
+            await self._stage_build_timeline(job)
+            timeline, retimed = retime_scenes(
+                job.timeline,
+                [
+                    [r.duration or 0.0 for r in results]
+                    for language, results in narration.items()
+                    if language != primary
+                ],
+                self.timeline_builder.config
+            )
+            if retimed:
+                logger.info(f"Lengthened {len(retimed)} scenes for longer translations")
+            
+            # Render the shared visual track once
+            self._check_workspace_quota(job, timeline.total_duration)
+            if progress_callback:
+                progress_callback("Rendering video", 0.6)
+            
+            render_result = await self.video_renderer.render(
+                timeline=visual_timeline(timeline, self.timeline_builder.config),
+                output_path=workspace.path(f"visual_{job.video_id}.mp4"),
+                progress_callback=lambda p: progress_callback(
+                    "Rendering video",
+                    0.6 + (p * 0.3)
+                ) if progress_callback else None
+            )
+            visual_path = Path(render_result.output_path)
+            
+            # Mix each language's audio, then mux without re-encoding video
+            if progress_callback:
+                progress_callback("Muxing languages", 0.9)
+            
+            mux_start = time.time()
+            loop = asyncio.get_event_loop()
+            quality = self.video_renderer.config.get_quality_settings()
+            
+            tracks = []
+            for language in languages:
+                track_path = workspace.path(f"audio_{job.video_id}_{language}.m4a")
+                cmd = build_audio_track_command(
+                    [
+                        (Path(result.audio_path), scene.start_time, scene.narration_volume)
+                        for scene, result in zip(timeline.scenes, narration[language])
+                        if result.audio_path
+                    ],
+                    render_result.duration,
+                    track_path,
+                    music=timeline.background_music,
+                    codec=quality.audio_codec,
+                    bitrate=quality.audio_bitrate,
+                )
+                await loop.run_in_executor(None, run_ffmpeg, cmd)
+                tracks.append((language, track_path))
+            
+            outputs: Dict[str, Path] = {}
+            if mode == VariantMode.TRACKS:
+                combined = workspace.path(f"video_{job.video_id}.mp4")
+                await loop.run_in_executor(
+                    None, run_ffmpeg, build_mux_command(visual_path, tracks, combined)
+                )
+                combined = workspace.promote(
+                    combined,
+                    self.config.output_dir / combined.name
+                )
+                outputs = {language: combined for language in languages}
+            else:
+                for language, track_path in tracks:
+                    output = workspace.path(f"video_{job.video_id}_{language}.mp4")
+                    await loop.run_in_executor(
+                        None,
+                        run_ffmpeg,
+                        build_mux_command(visual_path, [(language, track_path)], output)
+                    )
+                    outputs[language] = workspace.promote(
+                        output,
+                        self.config.output_dir / output.name
+                    )
+            mux_time = time.time() - mux_start
+            
+            timeline_path = workspace.promote(
+                save_timeline(timeline, workspace.path(f"video_{job.video_id}.timeline")),
+                self.config.output_dir / f"video_{job.video_id}.timeline"
+            )
+            
+            qc_report = await self._check_quality(
+                outputs[primary],
+                render_result,
+                narration_duration=sum(r.duration for r in narration[primary])
+            )
+            thumbnail_path = await self._create_thumbnail(outputs[primary], job.video_id)
+        
+        finally:
+            self._release_job(job)
+        
+        result = MultiLanguageVideo(
+            id=job.video_id,
+            mode=mode,
+            primary_language=primary,
+            video_path=str(outputs[primary]),
+            variants={
+                language: LanguageVariant(
+                    language=language,
+                    voice=used_voices[language].value,
+                    video_path=str(outputs[language]),
+                    track_index=index if mode == VariantMode.TRACKS else None,
+                    segments=segments[language],
+                    narration=[
+                        r.copy(update={"audio_data": None}) for r in narration[language]
+                    ],
+                    audio_duration=sum(r.duration for r in narration[language]),
+                )
+                for index, language in enumerate(languages)
+            },
+            thumbnail_path=str(thumbnail_path) if thumbnail_path else None,
+            timeline_path=str(timeline_path),
+            qc=qc_report,
+            niche=niche,
+            title=title or f"{niche.title()} Video",
+            duration=render_result.duration,
+            resolution=render_result.resolution,
+            fps=render_result.fps,
+            scene_count=timeline.scene_count,
+            retimed_scenes=retimed,
+            render_time=render_result.render_time,
+            mux_time=mux_time,
+            assembly_time=time.time() - job.start_time,
+        )
+        
+        if progress_callback:
+            progress_callback("Complete", 1.0)
+        
+        logger.info(f"Multi-language assembly complete [{job.video_id}]: "
+                   f"{len(languages)} languages, render {result.render_time:.1f}s, "
+                   f"mux {mux_time:.1f}s")
+        
+        return result
+    
     async def cleanup_temp_files(self, max_age_hours: int = 24) -> int:
         """
         Clean up old temporary files.
@@ -514,15 +1268,16 @@ class VideoAssembler:
             max_age_hours: Maximum age of files to keep
         
         Returns:
-            Number of files deleted
+            Number of files and orphaned workspaces deleted
         """
-        import time
-        
         deleted = 0
         max_age_seconds = max_age_hours * 3600
         current_time = time.time()
         
-        # Clean temp directory
+        # Workspaces orphaned by crashed runs (one stat per job directory)
+        deleted += self.workspaces.cleanup_orphans(max_age_seconds)
+        
+        # Loose files from before per-job workspaces
         for file in self.config.temp_dir.glob("*"):
             if file.is_file():
                 age = current_time - file.stat().st_mtime
@@ -532,7 +1287,8 @@ class VideoAssembler:
         
         # Clean TTS cache
         deleted += await self.tts_engine.cleanup_cache(
-            max_age_days=max_age_hours // 24
+            max_age_days=max_age_hours // 24,
+            exclude=self.workspaces.referenced()
         )
         
         logger.info(f"Cleaned up {deleted} temporary files")
@@ -555,7 +1311,11 @@ class VideoAssembler:
             Estimated time in seconds
         """
         # TTS time (rough estimate: 0.5x real-time)
-        tts_duration = await self.tts_engine.estimate_duration(script)
+        tts_duration = await self.tts_engine.estimate_duration(
+            script,
+            speaking_rate=self.config.speaking_rate,
+            voice=self.config.voice
+        )
         tts_time = tts_duration * 0.5
         
         # Timeline building (fast)
@@ -53,6 +53,7 @@ except ImportError as e:
     warnings.warn(f"MoviePy not fully available: {e}")
 
 from .timeline_builder import Timeline, Scene, TransitionType, AssetType
+from src.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -210,12 +211,18 @@ class VideoRenderer:
     and export with quality optimization.
     """
     
-    def __init__(self, config: Optional[RenderConfig] = None):
+    def __init__(
+        self,
+        config: Optional[RenderConfig] = None,
+        asset_index=None,
+    ):
         """
         Initialize video renderer.
         
         Args:
             config: Render configuration
+            asset_index: Optional AssetMetadataIndex used to reject broken
+                assets before rendering starts
         """
         if VideoFileClip is None:
             raise ImportError(
@@ -223,8 +230,10 @@ class VideoRenderer:
             )
         
         self.config = config or RenderConfig()
+        self.asset_index = asset_index
         self._progress_callback: Optional[Callable[[float], None]] = None
     
+    @traced("render")
     async def render(
         self,
         timeline: Timeline,
@@ -244,6 +253,8 @@ class VideoRenderer:
         """
         import time
         
+        # Kept for backwards compatibility; render() itself uses the local
+        # callback so concurrent renders on one renderer don't cross-report
         self._progress_callback = progress_callback
         start_time = time.time()
         
@@ -253,12 +264,16 @@ class VideoRenderer:
         # Get quality settings
         quality = self.config.get_quality_settings()
         
+        # Reject broken assets before doing any expensive work
+        if self.asset_index is not None:
+            await self._preflight_assets(timeline)
+        
         # Build video composition
         logger.info("Building video composition...")
         video_clips = await self._build_video_clips(timeline, quality)
         
-        if self._progress_callback:
-            self._progress_callback(0.3)
+        if progress_callback:
+            progress_callback(0.3)
         
         # Composite video
         logger.info("Compositing video...")
@@ -272,8 +287,8 @@ class VideoRenderer:
                 timeline.background_music
             )
         
-        if self._progress_callback:
-            self._progress_callback(0.5)
+        if progress_callback:
+            progress_callback(0.5)
         
         # Add watermark if enabled
         if self.config.add_watermark and self.config.watermark_text:
@@ -296,8 +311,8 @@ class VideoRenderer:
         for clip in video_clips:
             clip.close()
         
-        if self._progress_callback:
-            self._progress_callback(1.0)
+        if progress_callback:
+            progress_callback(1.0)
         
         # Calculate metrics
         render_time = time.time() - start_time
@@ -321,6 +336,31 @@ class VideoRenderer:
         
         return result
     
+    @traced("render.preflight")
+    async def _preflight_assets(self, timeline: Timeline) -> None:
+        """
+        Check every scene asset against the asset metadata index.
+        
+        Args:
+            timeline: Timeline to render
+        
+        Raises:
+            ValueError: If any asset is missing or undecodable
+        """
+        paths = [
+            asset.path
+            for scene in timeline.scenes
+            for asset in scene.assets
+        ]
+        
+        broken = await self.asset_index.find_broken(paths)
+        if broken:
+            raise ValueError(
+                "Timeline contains undecodable assets: "
+                + ", ".join(str(p) for p in broken)
+            )
+    
+    @traced("render.clips")
     async def _build_video_clips(
         self,
         timeline: Timeline,
@@ -561,6 +601,7 @@ class VideoRenderer:
         
         return clip
     
+    @traced("render.music")
     async def _add_background_music(
         self,
         video_clip,
@@ -733,6 +774,7 @@ class VideoRenderer:
         
         return CompositeVideoClip([video_clip, watermark])
     
+    @traced("render.encode")
     async def _write_video_file(
         self,
         clip,
@@ -0,0 +1,330 @@
+"""
+Per-Job Workspaces for Video Assembly
+
+This module gives every assembly job its own scratch directory, optionally
+on tmpfs, so intermediates never pile up in a shared temp directory.
+
+Features:
+- One directory per job, on tmpfs when available and large enough
+- Byte quota per workspace, checked before large intermediates are written
+- Promotion of final artifacts to durable storage
+- Reference counting of durable artifacts in use by running jobs, so
+  age-based cleanup never deletes files a job still needs
+- Deterministic teardown on success, failure or cancellation
+
+Usage:
+    manager = WorkspaceManager(WorkspaceConfig(root=Path("temp")))
+    async with manager.workspace(job_id) as ws:
+        render_to(ws.path("video.mp4"))
+        final = ws.promote(ws.path("video.mp4"), output_dir / "video.mp4")
+"""
+
+import logging
+import os
+import shutil
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class WorkspaceQuotaError(Exception):
+    """Raised when a job workspace exceeds its byte quota."""
+    pass
+
+
+@dataclass
+class WorkspaceConfig:
+    """Configuration for job workspaces."""
+
+    # Durable scratch root (used when tmpfs is disabled or too small)
+    root: Path = Path("temp")
+
+    # RAM-backed scratch root, e.g. /dev/shm (None = disk only)
+    tmpfs_root: Optional[Path] = None
+
+    # Maximum bytes per workspace (None = unlimited)
+    quota_bytes: Optional[int] = None
+
+
+def _tree_size(path: Path) -> int:
+    """Total size of the files below a directory."""
+    total = 0
+    stack = [path]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except FileNotFoundError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(Path(entry.path))
+            elif entry.is_file(follow_symlinks=False):
+                total += entry.stat(follow_symlinks=False).st_size
+    return total
+
+
+class JobWorkspace:
+    """
+    Scratch directory owned by a single assembly job.
+
+    Created through WorkspaceManager; removed, together with every
+    reference the job holds, by close().
+    """
+
+    def __init__(
+        self,
+        manager: "WorkspaceManager",
+        job_id: str,
+        directory: Path,
+        quota_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize workspace.
+
+        Args:
+            manager: Owning workspace manager
+            job_id: Job identifier
+            directory: Workspace directory (created if missing)
+            quota_bytes: Maximum bytes the workspace may hold
+        """
+        self.manager = manager
+        self.job_id = job_id
+        self.dir = directory
+        self.quota_bytes = quota_bytes
+        self.closed = False
+
+        self._retained: List[Path] = []
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+    def path(self, name: str) -> Path:
+        """
+        Get a path inside the workspace.
+
+        Args:
+            name: Relative file name
+
+        Returns:
+            Absolute path inside the workspace directory
+        """
+        target = self.dir / name
+        target.parent.mkdir(parents=True, exist_ok=True)
+        return target
+
+    def owns(self, path: Path) -> bool:
+        """Check whether a path lies inside the workspace."""
+        try:
+            Path(path).resolve().relative_to(self.dir.resolve())
+            return True
+        except ValueError:
+            return False
+
+    def usage(self) -> int:
+        """Bytes currently held by the workspace."""
+        return _tree_size(self.dir)
+
+    def check_quota(self, additional: int = 0) -> None:
+        """
+        Ensure the workspace is within its quota.
+
+        Args:
+            additional: Bytes about to be written
+
+        Raises:
+            WorkspaceQuotaError: If the quota is (or would be) exceeded
+        """
+        if self.quota_bytes is None:
+            return
+
+        used = self.usage()
+        if used + additional > self.quota_bytes:
+            raise WorkspaceQuotaError(
+                f"Workspace {self.job_id} over quota: "
+                f"{used + additional} > {self.quota_bytes} bytes"
+            )
+
+    def retain(self, path: Path) -> None:
+        """
+        Hold a reference to a durable artifact until the workspace closes.
+
+        Args:
+            path: Artifact the job depends on
+        """
+        self.manager.acquire(path)
+        self._retained.append(Path(path))
+
+    def promote(self, source: Path, destination: Path) -> Path:
+        """
+        Move a finished artifact to durable storage.
+
+        Moves are renames on the same filesystem and copies from tmpfs.
+        The promoted file stays referenced until the workspace closes.
+
+        Args:
+            source: Artifact to promote (usually inside the workspace)
+            destination: Durable target path
+
+        Returns:
+            The destination path
+        """
+        source = Path(source)
+        destination = Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+
+        if source.resolve() != destination.resolve():
+            shutil.move(str(source), str(destination))
+
+        self.retain(destination)
+        logger.debug(f"Promoted {source.name} -> {destination}")
+
+        return destination
+
+    def close(self) -> None:
+        """Release all references and delete the workspace directory."""
+        if self.closed:
+            return
+        self.closed = True
+
+        for path in self._retained:
+            self.manager.release(path)
+        self._retained.clear()
+
+        shutil.rmtree(self.dir, ignore_errors=True)
+        self.manager._forget(self)
+
+
+class WorkspaceManager:
+    """
+    Creates job workspaces and tracks durable artifacts in use.
+    """
+
+    def __init__(self, config: Optional[WorkspaceConfig] = None):
+        """
+        Initialize workspace manager.
+
+        Args:
+            config: Workspace configuration
+        """
+        self.config = config or WorkspaceConfig()
+        self.config.root.mkdir(parents=True, exist_ok=True)
+
+        self._active: Dict[str, JobWorkspace] = {}
+        self._refs: Dict[Path, int] = {}
+
+    def create(self, job_id: str) -> JobWorkspace:
+        """
+        Create a workspace for a job.
+
+        Args:
+            job_id: Job identifier (must be unique among active jobs)
+
+        Returns:
+            New JobWorkspace
+        """
+        if job_id in self._active:
+            raise ValueError(f"Workspace already active for job {job_id}")
+
+        workspace = JobWorkspace(
+            self,
+            job_id,
+            self._scratch_root() / f"job_{job_id}",
+            quota_bytes=self.config.quota_bytes,
+        )
+        self._active[job_id] = workspace
+
+        return workspace
+
+    @asynccontextmanager
+    async def workspace(self, job_id: str) -> AsyncIterator[JobWorkspace]:
+        """
+        Workspace for the duration of a block, torn down on any exit.
+
+        Args:
+            job_id: Job identifier
+        """
+        workspace = self.create(job_id)
+        try:
+            yield workspace
+        finally:
+            workspace.close()
+
+    def get(self, job_id: str) -> Optional[JobWorkspace]:
+        """Get the active workspace of a job, if any."""
+        return self._active.get(job_id)
+
+    def close_all(self) -> None:
+        """Tear down every active workspace."""
+        for workspace in list(self._active.values()):
+            workspace.close()
+
+    def acquire(self, path: Path) -> None:
+        """Add a reference to a durable artifact."""
+        key = Path(path).resolve()
+        self._refs[key] = self._refs.get(key, 0) + 1
+
+    def release(self, path: Path) -> None:
+        """Drop a reference to a durable artifact."""
+        key = Path(path).resolve()
+        count = self._refs.get(key, 0) - 1
+        if count > 0:
+            self._refs[key] = count
+        else:
+            self._refs.pop(key, None)
+
+    def is_referenced(self, path: Path) -> bool:
+        """Check whether a running job still depends on an artifact."""
+        return Path(path).resolve() in self._refs
+
+    def referenced(self) -> Set[Path]:
+        """All artifacts currently referenced by running jobs."""
+        return set(self._refs)
+
+    def cleanup_orphans(self, max_age_seconds: float) -> int:
+        """
+        Remove workspaces left behind by crashed processes.
+
+        Only the workspace directories themselves are stat'ed, not the
+        files inside them.
+
+        Args:
+            max_age_seconds: Minimum age of a directory before removal
+
+        Returns:
+            Number of workspaces removed
+        """
+        active = {w.dir.resolve() for w in self._active.values()}
+        now = time.time()
+        removed = 0
+
+        for root in {self.config.root, self._scratch_root()}:
+            for entry in root.glob("job_*"):
+                if not entry.is_dir() or entry.resolve() in active:
+                    continue
+                if now - entry.stat().st_mtime > max_age_seconds:
+                    shutil.rmtree(entry, ignore_errors=True)
+                    removed += 1
+
+        return removed
+
+    def _scratch_root(self) -> Path:
+        """Pick tmpfs when configured, present and roomy enough."""
+        tmpfs = self.config.tmpfs_root
+        if tmpfs is not None and tmpfs.is_dir():
+            needed = self.config.quota_bytes or 0
+            try:
+                if shutil.disk_usage(tmpfs).free > needed:
+                    scratch = tmpfs / "faceless-youtube"
+                    scratch.mkdir(parents=True, exist_ok=True)
+                    return scratch
+            except OSError as e:
+                logger.warning(f"tmpfs {tmpfs} unusable, using disk: {e}")
+
+        return self.config.root
+
+    def _forget(self, workspace: JobWorkspace) -> None:
+        if self._active.get(workspace.job_id) is workspace:
+            del self._active[workspace.job_id]
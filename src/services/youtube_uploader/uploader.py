@@ -36,6 +36,7 @@ from tenacity import (
 )
 
 from .auth_manager import AuthManager
+from src.utils.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -197,6 +198,7 @@ class VideoUploader:
         self.config = config or UploadConfig()
         self._upload_tasks: Dict[str, asyncio.Task] = {}
     
+    @traced("upload")
     async def upload(
         self,
         account_name: str,
@@ -12,6 +12,7 @@ Features:
 - Graceful fallback to in-memory cache
 - Cache statistics and monitoring
 - Pattern-based invalidation
+- Short-lived locks (SET NX PX) for cross-process single-flight work
 """
 
 import os
@@ -19,6 +20,7 @@ import json
 import logging
 import hashlib
 import functools
+import uuid
 from typing import Any, Optional, Callable, Union, List
 from datetime import timedelta
 import asyncio
@@ -103,6 +105,12 @@ class InMemoryCache:
         value = await self.get(key)
         return value is not None
     
+    async def set_if_absent(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Set value only if the key is missing (or expired)."""
+        if await self.get(key) is not None:
+            return False
+        return await self.set(key, value, ttl)
+    
     async def clear(self) -> bool:
         """Clear all cache."""
         self.cache.clear()
@@ -119,6 +127,15 @@ class InMemoryCache:
 # CACHE MANAGER
 # ============================================
 
+# Delete a lock only if it still holds the caller's token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
 class CacheManager:
     """
     Redis-based cache manager with fallback to in-memory cache.
@@ -354,6 +371,62 @@ class CacheManager:
             self.stats["errors"] += 1
             return False
     
+    async def acquire_lock(self, key: str, ttl: float = 10.0) -> Optional[str]:
+        """
+        Try to take a short-lived lock shared by every process using this cache.
+        
+        The lock expires on its own after ``ttl`` so a crashed holder can't
+        block others. If the cache backend errors, the lock is granted
+        (fail open) so callers fall back to doing the work themselves.
+        
+        Args:
+            key: Lock key
+            ttl: Seconds until the lock expires
+        
+        Returns:
+            Token to release the lock with, or None if someone else holds it
+        """
+        token = uuid.uuid4().hex
+        try:
+            if self._using_redis and self._redis_client:
+                acquired = await self._redis_client.set(
+                    key, token, nx=True, px=max(1, int(ttl * 1000))
+                )
+            else:
+                acquired = await self._fallback_cache.set_if_absent(key, token, ttl)
+            return token if acquired else None
+        
+        except Exception as e:
+            logger.error(f"Cache lock error for key '{key}': {e}")
+            self.stats["errors"] += 1
+            return token
+    
+    async def release_lock(self, key: str, token: str) -> bool:
+        """
+        Release a lock taken with ``acquire_lock``.
+        
+        Only the holder's token releases it, so a lock that expired and was
+        taken by another process is left alone.
+        
+        Args:
+            key: Lock key
+            token: Token returned by ``acquire_lock``
+        
+        Returns:
+            True if the lock was released
+        """
+        try:
+            if self._using_redis and self._redis_client:
+                return bool(await self._redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, key, token))
+            if await self._fallback_cache.get(key) == token:
+                return await self._fallback_cache.delete(key)
+            return False
+        
+        except Exception as e:
+            logger.error(f"Cache unlock error for key '{key}': {e}")
+            self.stats["errors"] += 1
+            return False
+    
     async def clear(self, pattern: str = "*") -> int:
         """
         Clear cache keys matching pattern.
@@ -0,0 +1,484 @@
+"""
+Lightweight pipeline tracing
+
+Records where the wall-clock time of a job goes, from the API request that
+created it through scheduling, script generation, assembly, rendering and
+upload.
+
+Design:
+- OpenTelemetry span model (trace/span IDs, parent, attributes, status,
+  events), without the OpenTelemetry SDK dependency
+- Current span kept in a ContextVar, so it follows asyncio tasks
+- W3C ``traceparent`` strings to carry context through persisted jobs,
+  threads and worker processes
+- Trace IDs derived from the API's X-Request-ID, so logs and traces
+  correlate
+- Exporters: in-memory ring buffer (default) and JSON lines file with
+  OTLP/JSON field names, safe to append to from several processes
+
+Usage:
+    tracer = get_tracer()
+    with tracer.start_span("assembly", attributes={"niche": niche}):
+        ...
+
+    @traced("script.generate")
+    async def generate(...):
+        ...
+
+    carrier = inject()                      # "00-<trace>-<span>-01"
+    with tracer.start_span("worker", parent=extract(carrier)):
+        ...
+"""
+
+import asyncio
+import contextvars
+import functools
+import hashlib
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SpanStatus(str, Enum):
+    """Span status codes (as in OpenTelemetry)."""
+    UNSET = "STATUS_CODE_UNSET"
+    OK = "STATUS_CODE_OK"
+    ERROR = "STATUS_CODE_ERROR"
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifiers needed to continue a trace elsewhere."""
+    trace_id: str  # 32 hex chars
+    span_id: str  # 16 hex chars
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+    name: str
+    context: SpanContext
+    parent_span_id: Optional[str] = None
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    status: SpanStatus = SpanStatus.UNSET
+    status_message: Optional[str] = None
+
+    @property
+    def trace_id(self) -> str:
+        return self.context.trace_id
+
+    @property
+    def span_id(self) -> str:
+        return self.context.span_id
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Duration in seconds (None while running)."""
+        if self.end_time_ns is None:
+            return None
+        return (self.end_time_ns - self.start_time_ns) / 1e9
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append({
+            "name": name,
+            "timeUnixNano": time.time_ns(),
+            "attributes": attributes or {},
+        })
+
+    def record_exception(self, error: BaseException) -> None:
+        self.add_event("exception", {
+            "exception.type": type(error).__name__,
+            "exception.message": str(error),
+        })
+        self.status = SpanStatus.ERROR
+        self.status_message = str(error)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Span in OTLP/JSON field naming."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id or "",
+            "name": self.name,
+            "startTimeUnixNano": self.start_time_ns,
+            "endTimeUnixNano": self.end_time_ns,
+            "attributes": self.attributes,
+            "events": self.events,
+            "status": {"code": self.status.value, "message": self.status_message or ""},
+        }
+
+
+class InMemorySpanExporter:
+    """Keeps the most recent finished spans in memory."""
+
+    def __init__(self, max_spans: int = 10000):
+        """
+        Initialize exporter.
+
+        Args:
+            max_spans: Spans kept before the oldest are dropped
+        """
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        """Finished spans, optionally of one trace."""
+        with self._lock:
+            return [s for s in self._spans if trace_id is None or s.trace_id == trace_id]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._spans.clear()
+
+
+class JsonLinesSpanExporter:
+    """
+    Appends finished spans to a JSON lines file.
+
+    Each span is written with a single O_APPEND write, so worker
+    processes can share one file.
+    """
+
+    def __init__(self, path: Path, service_name: str = "faceless-youtube"):
+        """
+        Initialize exporter.
+
+        Args:
+            path: Trace file
+            service_name: Recorded as resource attribute on every span
+        """
+        self.path = Path(path)
+        self.service_name = service_name
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def export(self, span: Span) -> None:
+        record = span.to_dict()
+        record["resource"] = {"service.name": self.service_name, "process.pid": os.getpid()}
+        line = (json.dumps(record, default=str) + "\n").encode()
+
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Read spans back from the file, optionally of one trace."""
+        if not self.path.exists():
+            return []
+        records = []
+        with open(self.path) as f:
+            for line in f:
+                record = json.loads(line)
+                if trace_id is None or record["traceId"] == trace_id:
+                    records.append(record)
+        return records
+
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def _new_span_id() -> str:
+    return secrets.token_hex(8)
+
+
+def trace_id_from_request_id(request_id: str) -> str:
+    """
+    Derive a trace ID from an X-Request-ID.
+
+    UUID request IDs map directly onto the 128-bit trace ID; anything
+    else is hashed.
+
+    Args:
+        request_id: Request correlation ID
+
+    Returns:
+        32-character hex trace ID
+    """
+    try:
+        return uuid.UUID(request_id).hex
+    except (ValueError, AttributeError, TypeError):
+        return hashlib.sha256(str(request_id).encode()).hexdigest()[:32]
+
+
+class Tracer:
+    """
+    Creates spans and hands finished ones to exporters.
+    """
+
+    def __init__(self, exporters: Optional[List[Any]] = None, enabled: bool = True):
+        """
+        Initialize tracer.
+
+        Args:
+            exporters: Objects with an ``export(span)`` method
+            enabled: Set False to make spans no-ops apart from context
+        """
+        self.exporters = exporters if exporters is not None else [InMemorySpanExporter()]
+        self.enabled = enabled
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None,
+        trace_id: Optional[str] = None,
+    ) -> Iterator[Span]:
+        """
+        Run a block inside a new span.
+
+        The parent is, in order: ``parent``, the current span, or a new
+        trace (with ``trace_id`` if given). Exceptions mark the span as
+        failed and are re-raised.
+
+        Args:
+            name: Span name, e.g. "assembly.render"
+            attributes: Initial attributes
+            parent: Explicit parent (e.g. from ``extract``)
+            trace_id: Trace ID for a new root span
+        """
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+
+        span = Span(
+            name=name,
+            context=SpanContext(
+                trace_id=parent.trace_id if parent else (trace_id or secrets.token_hex(16)),
+                span_id=_new_span_id(),
+            ),
+            parent_span_id=parent.span_id if parent else None,
+            attributes=dict(attributes or {}),
+        )
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                span.add_event("cancelled")
+                span.status_message = "cancelled"
+            else:
+                span.record_exception(e)
+            raise
+        else:
+            if span.status == SpanStatus.UNSET:
+                span.status = SpanStatus.OK
+        finally:
+            _current_span.reset(token)
+            span.end_time_ns = time.time_ns()
+            self._export(span)
+
+    def _export(self, span: Span) -> None:
+        if not self.enabled:
+            return
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f"Span export failed ({type(exporter).__name__}): {e}")
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        """Finished spans held by the in-memory exporter, if any."""
+        for exporter in self.exporters:
+            if isinstance(exporter, InMemorySpanExporter):
+                return exporter.spans(trace_id)
+        return []
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer."""
+    return _tracer
+
+
+def configure_tracing(
+    path: Optional[Path] = None,
+    service_name: str = "faceless-youtube",
+    keep_in_memory: int = 10000,
+    enabled: bool = True,
+) -> Tracer:
+    """
+    Configure the process-wide tracer.
+
+    Args:
+        path: JSON lines trace file (None = memory only)
+        service_name: Service name recorded with file-exported spans
+        keep_in_memory: Finished spans kept in memory (0 = none)
+        enabled: Disable to stop exporting spans
+
+    Returns:
+        The configured tracer
+    """
+    exporters: List[Any] = []
+    if keep_in_memory:
+        exporters.append(InMemorySpanExporter(keep_in_memory))
+    if path is not None:
+        exporters.append(JsonLinesSpanExporter(path, service_name))
+
+    _tracer.exporters = exporters
+    _tracer.enabled = enabled
+    return _tracer
+
+
+def current_span() -> Optional[Span]:
+    """The span active in the current context, if any."""
+    return _current_span.get()
+
+
+def inject(span: Optional[Span] = None) -> Optional[str]:
+    """
+    Serialize a span's context as a W3C traceparent string.
+
+    Args:
+        span: Span to propagate (default: current span)
+
+    Returns:
+        traceparent string, or None outside any span
+    """
+    span = span or _current_span.get()
+    if span is None:
+        return None
+    return f"00-{span.trace_id}-{span.span_id}-01"
+
+
+def extract(traceparent: Optional[str]) -> Optional[SpanContext]:
+    """
+    Parse a W3C traceparent string.
+
+    Args:
+        traceparent: Value produced by ``inject``
+
+    Returns:
+        SpanContext, or None if missing or malformed
+    """
+    if not traceparent:
+        return None
+    parts = traceparent.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    try:
+        int(parts[1], 16)
+        int(parts[2], 16)
+    except ValueError:
+        return None
+    return SpanContext(trace_id=parts[1], span_id=parts[2])
+
+
+def traced(name: Optional[str] = None, **attributes: Any) -> Callable:
+    """
+    Decorator running a function (sync or async) inside a span.
+
+    Args:
+        name: Span name (default: function's qualified name)
+        **attributes: Static span attributes
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with _tracer.start_span(span_name, attributes=attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _tracer.start_span(span_name, attributes=attributes):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def bind_context(func: Callable) -> Callable:
+    """
+    Bind a callable to the current context, e.g. for run_in_executor,
+    which does not copy context variables into pool threads.
+
+    Args:
+        func: Callable to run later in another thread
+
+    Returns:
+        Callable that runs ``func`` in a copy of the current context
+    """
+    context = contextvars.copy_context()
+    return functools.partial(context.run, func)
+
+
+def run_traced(traceparent: Optional[str], name: str, func: Callable, *args, **kwargs) -> Any:
+    """
+    Run ``func`` in a span continuing a trace from another process.
+
+    Top-level and picklable, so it can be submitted to a process pool
+    together with ``inject()`` from the submitting side.
+
+    Args:
+        traceparent: Context from ``inject`` in the parent process
+        name: Span name
+        func: Function to run
+        *args, **kwargs: Arguments for ``func``
+
+    Returns:
+        Result of ``func``
+    """
+    with _tracer.start_span(name, parent=extract(traceparent)):
+        return func(*args, **kwargs)
+
+
+def breakdown(spans: List[Span]) -> Dict[str, Dict[str, float]]:
+    """
+    Summarize where a trace's wall-clock time went.
+
+    Self time is a span's duration minus the time covered by its direct
+    children (children running concurrently may exceed their parent).
+
+    Args:
+        spans: Finished spans of one trace
+
+    Returns:
+        Per span name: count, total seconds and self seconds
+    """
+    children: Dict[str, float] = {}
+    for span in spans:
+        if span.parent_span_id and span.duration is not None:
+            children[span.parent_span_id] = children.get(span.parent_span_id, 0.0) + span.duration
+
+    summary: Dict[str, Dict[str, float]] = {}
+    for span in spans:
+        if span.duration is None:
+            continue
+        entry = summary.setdefault(span.name, {"count": 0, "total": 0.0, "self": 0.0})
+        entry["count"] += 1
+        entry["total"] += span.duration
+        entry["self"] += max(0.0, span.duration - children.get(span.span_id, 0.0))
+
+    return summary
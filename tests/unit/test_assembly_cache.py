@@ -0,0 +1,149 @@
+"""
+Tests for the content-addressed assembly cache.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from src.services.video_assembler import AssemblyCache, TTSConfig, VideoConfig
+from src.services.video_assembler.video_renderer import QualityPreset
+
+
+@pytest.fixture
+def assets(tmp_path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"clip contents")
+    return [clip]
+
+
+@pytest.fixture
+def rendered(tmp_path):
+    video = tmp_path / "out" / "video_abc.mp4"
+    video.parent.mkdir()
+    video.write_bytes(b"rendered video bytes")
+    return {
+        "id": "abc",
+        "video_path": str(video),
+        "thumbnail_path": None,
+        "script": "Script",
+        "niche": "meditation",
+        "duration": 10.0,
+    }
+
+
+async def test_key_is_stable_and_input_sensitive(tmp_path, assets):
+    cache = AssemblyCache(tmp_path / "cache")
+    config = VideoConfig(output_dir=tmp_path / "o1", temp_dir=tmp_path / "t1")
+
+    key = await cache.compute_key("Script", "meditation", assets, config)
+
+    # Output location does not affect the key
+    same = await cache.compute_key(
+        "Script", "meditation", assets,
+        VideoConfig(output_dir=tmp_path / "o2", temp_dir=tmp_path / "t2"),
+    )
+    assert key == same
+
+    other_script = await cache.compute_key("Script!", "meditation", assets, config)
+    other_quality = await cache.compute_key(
+        "Script", "meditation", assets,
+        VideoConfig(quality=QualityPreset.HD_720P, output_dir=tmp_path / "o1"),
+    )
+    assert key != other_script
+    assert key != other_quality
+
+    assets[0].write_bytes(b"re-encoded clip contents")
+    assert await cache.compute_key("Script", "meditation", assets, config) != key
+
+
+async def test_key_tracks_model_file_contents(tmp_path, assets):
+    cache = AssemblyCache(tmp_path / "cache")
+    vectors = tmp_path / "asset_vectors.npz"
+    durations = tmp_path / "duration_model.json"
+    vectors.write_bytes(b"index v1")
+    durations.write_text("{}")
+    config = VideoConfig(
+        asset_embedding_index_path=vectors,
+        tts_config=TTSConfig(duration_model_path=durations),
+    )
+
+    key = await cache.compute_key("Script", "meditation", assets, config)
+    assert await cache.compute_key("Script", "meditation", assets, config) == key
+
+    vectors.write_bytes(b"index v2 with new assets")
+    reindexed = await cache.compute_key("Script", "meditation", assets, config)
+    assert reindexed != key
+
+    durations.write_text('{"voice": {}}')
+    assert await cache.compute_key("Script", "meditation", assets, config) != reindexed
+
+
+async def test_put_then_get_serves_cached_copy(tmp_path, rendered):
+    cache = AssemblyCache(tmp_path / "cache")
+
+    await cache.put("k1", rendered)
+    Path(rendered["video_path"]).unlink()  # Output dir cleaned up
+
+    hit = await cache.get("k1")
+
+    assert hit is not None
+    assert Path(hit["video_path"]).read_bytes() == b"rendered video bytes"
+    assert Path(hit["video_path"]).parent == tmp_path / "cache" / "k1"
+
+
+async def test_checkout_links_files_out_of_the_cache(tmp_path, rendered):
+    cache = AssemblyCache(tmp_path / "cache")
+    await cache.put("k1", rendered)
+
+    targets = {
+        "video_path": tmp_path / "jobs" / "video_job1.mp4",
+        "thumbnail_path": tmp_path / "jobs" / "thumb_job1.jpg",
+    }
+    hit = await cache.checkout("k1", targets)
+
+    assert hit["video_path"] == str(targets["video_path"])
+    assert hit["thumbnail_path"] is None  # Nothing cached to link
+
+    # The caller's copy can be moved away without touching the entry
+    Path(hit["video_path"]).unlink()
+    again = await cache.checkout("k1", {"video_path": tmp_path / "jobs" / "video_job2.mp4"})
+    assert Path(again["video_path"]).read_bytes() == b"rendered video bytes"
+
+
+async def test_corrupted_entry_is_evicted(tmp_path, rendered):
+    cache = AssemblyCache(tmp_path / "cache")
+    stored = await cache.put("k1", rendered)
+
+    Path(rendered["video_path"]).unlink()
+    Path(stored["video_path"]).write_bytes(b"rendered video BYTES")  # Same size
+
+    assert await cache.get("k1") is None
+    assert not (tmp_path / "cache" / "k1").exists()
+
+
+async def test_size_budget_evicts_least_recently_used(tmp_path):
+    cache = AssemblyCache(tmp_path / "cache", max_bytes=25)
+
+    for key in ("a", "b"):
+        video = tmp_path / f"{key}.mp4"
+        video.write_bytes(b"x" * 10)
+        await cache.put(key, {"video_path": str(video)})
+
+    await cache.get("a")  # "b" is now least recently used
+
+    video = tmp_path / "c.mp4"
+    video.write_bytes(b"x" * 10)
+    await cache.put("c", {"video_path": str(video)})
+
+    assert await cache.get("a") is not None
+    assert await cache.get("b") is None
+    assert await cache.get("c") is not None
+
+
+async def test_expired_entries_are_dropped(tmp_path, rendered):
+    cache = AssemblyCache(tmp_path / "cache", max_age=0)
+
+    await cache.put("k1", rendered)
+
+    assert await cache.get("k1") is None
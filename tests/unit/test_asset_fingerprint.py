@@ -0,0 +1,127 @@
+"""
+Tests for multi-frame video fingerprints.
+
+Frames are synthesized in NumPy; a module-level fake reader stands in for
+OpenCV decoding so the process pool path runs without video files.
+"""
+
+import numpy as np
+import pytest
+
+from src.services.asset_scraper import FingerprintError, VideoFingerprinter
+from src.services.asset_scraper import fingerprint as fp
+from src.services.video_assembler.near_duplicates import hamming
+from src.utils.tracing import JsonLinesSpanExporter, configure_tracing
+
+
+def _scene(seed: int, count: int = 6) -> np.ndarray:
+    """Smooth random RGB frames at the analysis size, drifting slowly."""
+    rng = np.random.default_rng(seed)
+    base = rng.integers(0, 256, (count, 8, 8, 3)).astype(np.float32)
+    base = base.mean(axis=0, keepdims=True) * 0.8 + base * 0.2
+    frames = base.repeat(16, axis=1).repeat(16, axis=2)
+    return frames.clip(0, 255).astype(np.uint8)
+
+
+def fake_reader(path, count):
+    if path.endswith("broken.mp4"):
+        raise FingerprintError(f"No decodable frames in {path}")
+    seed = int(path.rsplit("_", 1)[1].split(".")[0])
+    return _scene(seed, count), 1280, 720, 30.0, 300
+
+
+def test_phash_matches_dct_reference():
+    fftpack = pytest.importorskip("scipy.fftpack")
+    gray = fp._luma(_scene(1))
+
+    hashes = fp.phash_frames(gray)
+
+    for frame, value in zip(gray, hashes):
+        small = frame.reshape(32, 4, 32, 4).mean(axis=(1, 3))
+        low = fftpack.dct(fftpack.dct(small, axis=0), axis=1)[:8, :8]
+        bits = (low > np.median(low)).flatten()
+        expected = int("".join("1" if b else "0" for b in bits), 2)
+        assert int(value) == expected
+
+
+def test_phash_survives_reencoding_but_separates_scenes():
+    frames = _scene(2)
+    rng = np.random.default_rng(3)
+    reencoded = (frames * 0.9 + 12 + rng.normal(0, 4, frames.shape)).clip(0, 255).astype(np.uint8)
+
+    original = fp.fingerprint_frames("a.mp4", frames, 1280, 720, 30.0, 300)
+    copy = fp.fingerprint_frames("b.mp4", reencoded, 640, 360, 30.0, 300)
+    other = fp.fingerprint_frames("c.mp4", _scene(4), 1280, 720, 30.0, 300)
+
+    assert hamming(original.phash, copy.phash) <= 6
+    assert hamming(original.phash, other.phash) > 16
+    assert len(original.frame_hashes) == 6
+
+
+def test_combine_hashes_is_bitwise_majority():
+    assert fp.combine_hashes(np.array([0b1100, 0b1010, 0b1001])) == 0b1000
+    assert fp.combine_hashes(np.array([2**63 + 1])) == 2**63 + 1
+
+
+def test_metrics():
+    red = np.zeros((3, 128, 128, 3), dtype=np.uint8)
+    red[..., 0] = 255
+
+    result = fp.fingerprint_frames("red.mp4", red, 1920, 1080, 30.0, 150)
+
+    assert result.color_histogram[48] == pytest.approx(1.0)  # r=3, g=0, b=0
+    assert result.sharpness == 0.0 and result.contrast == 0.0
+    assert result.brightness == pytest.approx(0.299 * 255, rel=1e-3)
+    assert result.duration == 5.0
+    assert result.quality_score == pytest.approx(0.5 + 0.3 + 0.1)
+
+
+def test_read_frames_seeks_evenly(tmp_path):
+    cv2 = pytest.importorskip("cv2")
+    path = tmp_path / "clip.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10.0, (160, 90))
+    for i in range(40):
+        # Brightness encodes the frame number
+        writer.write(np.full((90, 160, 3), i * 6, dtype=np.uint8))
+    writer.release()
+
+    frames, width, height, fps, frame_count = fp.read_frames(str(path), 4)
+
+    assert frames.shape == (4, 128, 128, 3)
+    assert (width, height, fps, frame_count) == (160, 90, 10.0, 40)
+    # Centers of four equal slices: frames 5, 15, 25, 35
+    np.testing.assert_allclose(frames.mean(axis=(1, 2, 3)), [30, 90, 150, 210], atol=4)
+
+    with pytest.raises(FingerprintError):
+        fp.read_frames(str(tmp_path / "missing.avi"), 4)
+
+
+@pytest.mark.asyncio
+async def test_fingerprinter_runs_in_process_pool():
+    async with VideoFingerprinter(frames=4, max_workers=2, reader=fake_reader) as fingerprinter:
+        results = await fingerprinter.fingerprint_many(
+            ["clip_5.mp4", "clip_6.mp4", "broken.mp4"]
+        )
+
+    assert [r.path for r in results[:2]] == ["clip_5.mp4", "clip_6.mp4"]
+    assert results[0].width == 1280 and len(results[0].frame_hashes) == 4
+    assert results[0].phash != results[1].phash
+    assert isinstance(results[2], FingerprintError)
+
+
+@pytest.mark.asyncio
+async def test_fingerprint_spans_join_the_callers_trace(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracer = configure_tracing(path)
+    try:
+        with tracer.start_span("asset.ingest") as parent:
+            async with VideoFingerprinter(frames=4, max_workers=1, reader=fake_reader) as fingerprinter:
+                await fingerprinter.fingerprint("clip_5.mp4")
+    finally:
+        configure_tracing()
+
+    span, = [
+        r for r in JsonLinesSpanExporter(path).spans(parent.trace_id)
+        if r["name"] == "asset.fingerprint"
+    ]
+    assert span["parentSpanId"] == parent.span_id
@@ -0,0 +1,177 @@
+"""
+Tests for the persistent asset metadata index.
+
+Probing is patched out so these tests don't need ffprobe/ffmpeg.
+"""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.services.video_assembler import (
+    AssetMetadataIndex,
+    AssetType,
+    MediaInfo,
+    TimelineBuilder,
+)
+from src.services.video_assembler import asset_index as asset_index_module
+
+
+def _fake_probe(path, verify_decode=True):
+    """Probe stand-in: files containing 'broken' are undecodable."""
+    path = Path(path)
+    stat = path.stat()
+    broken = b"broken" in path.read_bytes()
+    return MediaInfo(
+        path=str(path),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        media_type="video",
+        duration=12.5,
+        width=1920,
+        height=1080,
+        fps=30.0,
+        codec="h264",
+        has_audio=True,
+        keyframe_interval=2.0,
+        decodable=not broken,
+        error="decode failed" if broken else None,
+    )
+
+
+@pytest.fixture
+def index(tmp_path):
+    idx = AssetMetadataIndex(tmp_path / "index.sqlite3")
+    yield idx
+    idx.close()
+
+
+def test_put_and_get_roundtrip(index, tmp_path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"video data")
+
+    index.put(_fake_probe(clip))
+    info = index.get(clip)
+
+    assert info is not None
+    assert info.duration == 12.5
+    assert (info.width, info.height) == (1920, 1080)
+    assert info.has_audio is True
+    assert info.decodable is True
+
+
+def test_entry_is_stale_after_file_changes(index, tmp_path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"video data")
+    index.put(_fake_probe(clip))
+
+    clip.write_bytes(b"different, longer video data")
+    stat = clip.stat()
+    os.utime(clip, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert index.get(clip) is None
+
+
+def test_index_persists_across_instances(tmp_path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"video data")
+
+    first = AssetMetadataIndex(tmp_path / "index.sqlite3")
+    first.put(_fake_probe(clip))
+    first.close()
+
+    second = AssetMetadataIndex(tmp_path / "index.sqlite3")
+    try:
+        assert second.get(clip) is not None
+    finally:
+        second.close()
+
+
+def test_results_without_ffprobe_are_not_indexed(index, tmp_path):
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"video data")
+
+    # Host without ffprobe: the best-effort result is returned but not kept
+    with patch("src.services.video_assembler.media_probe.ffprobe_available", return_value=False):
+        info = index.probe(clip)
+    assert info.decodable and info.duration is None
+    assert index.get(clip) is None
+
+    # Rows written before the fix are misses too
+    index.put(info)
+    assert index.get(clip) is None
+
+    # Once ffprobe is installed the file gets real metadata
+    with patch.object(asset_index_module, "probe_media", side_effect=_fake_probe):
+        assert index.probe(clip).duration == 12.5
+    assert index.get(clip).duration == 12.5
+
+
+async def test_scan_only_probes_misses(index, tmp_path):
+    cached = tmp_path / "cached.mp4"
+    fresh = tmp_path / "fresh.mp4"
+    cached.write_bytes(b"video data")
+    fresh.write_bytes(b"video data")
+    index.put(_fake_probe(cached))
+
+    with patch.object(asset_index_module, "probe_media", side_effect=_fake_probe) as probe:
+        infos = await index.scan([cached, fresh])
+
+    assert set(infos) == {cached, fresh}
+    probe.assert_called_once()
+    assert Path(probe.call_args[0][0]) == fresh
+
+
+async def test_find_broken_reports_missing_and_undecodable(index, tmp_path):
+    good = tmp_path / "good.mp4"
+    bad = tmp_path / "bad.mp4"
+    missing = tmp_path / "missing.mp4"
+    good.write_bytes(b"video data")
+    bad.write_bytes(b"broken video data")
+
+    with patch.object(asset_index_module, "probe_media", side_effect=_fake_probe):
+        broken = await index.find_broken([good, bad, missing])
+
+    assert set(broken) == {bad, missing}
+
+
+async def test_timeline_builder_rejects_broken_assets(index, tmp_path):
+    good = tmp_path / "good.dat"  # Extension alone would be rejected
+    bad = tmp_path / "bad.mp4"
+    good.write_bytes(b"video data")
+    bad.write_bytes(b"broken video data")
+
+    builder = TimelineBuilder(asset_index=index)
+
+    with patch.object(asset_index_module, "probe_media", side_effect=_fake_probe):
+        timeline = await builder.build(
+            script_segments=["One", "Two"],
+            narration_paths=[tmp_path / "a.wav", tmp_path / "b.wav"],
+            assets=[good, bad],
+            narration_durations=[4.0, 5.0],
+        )
+
+    used = {asset.path for scene in timeline.scenes for asset in scene.assets}
+    assert used == {good}
+    assert all(
+        asset.type == AssetType.VIDEO and asset.duration == 12.5
+        for scene in timeline.scenes for asset in scene.assets
+    )
+
+
+async def test_timeline_builder_fails_without_decodable_assets(index, tmp_path):
+    bad = tmp_path / "bad.mp4"
+    bad.write_bytes(b"broken video data")
+
+    builder = TimelineBuilder(asset_index=index)
+
+    with patch.object(asset_index_module, "probe_media", side_effect=_fake_probe):
+        with pytest.raises(ValueError):
+            await builder.build(
+                script_segments=["One"],
+                narration_paths=[tmp_path / "a.wav"],
+                assets=[bad],
+                narration_durations=[4.0],
+            )
@@ -0,0 +1,216 @@
+"""
+Tests for semantic asset matching.
+"""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from src.services.asset_scraper import AssetMetadata, AssetType, DownloadResult, ScraperManager
+from src.services.video_assembler import (
+    AssetMatcher,
+    EmbeddingIndex,
+    HashingEmbedder,
+    OllamaEmbedder,
+    TimelineBuilder,
+)
+
+
+ASSETS = {
+    Path("ocean.mp4"): "ocean waves beach sunset water",
+    Path("forest.mp4"): "forest trees green moss woodland",
+    Path("city.mp4"): "city skyline night traffic lights",
+}
+
+
+def _random_unit(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    vectors = np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestEmbeddingIndex:
+    def test_search_returns_sorted_top_k(self):
+        index = EmbeddingIndex()
+        vectors = _random_unit(50, 16)
+        index.add([f"a{i}" for i in range(50)], vectors)
+
+        results = index.search(vectors[7], k=3)[0]
+
+        assert results[0][0] == 7
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert [s for _, s in results] == sorted((s for _, s in results), reverse=True)
+
+    def test_upsert_replaces_existing_row(self):
+        index = EmbeddingIndex()
+        index.add(["a", "b"], np.eye(2))
+        index.add(["a"], np.array([[0.0, 1.0]]))
+
+        assert len(index) == 2
+        assert index.search(np.array([0.0, 1.0]), k=2)[0][0][1] == pytest.approx(1.0)
+        assert index.search(np.array([1.0, 0.0]), k=1)[0][0][1] == pytest.approx(0.0)
+
+    def test_search_restricted_to_rows(self):
+        index = EmbeddingIndex()
+        vectors = _random_unit(20, 8)
+        index.add([str(i) for i in range(20)], vectors)
+
+        results = index.search(vectors[3], k=5, rows=np.array([1, 2, 4]))[0]
+
+        assert {row for row, _ in results} == {1, 2, 4}
+
+    def test_save_and_load(self, tmp_path):
+        path = tmp_path / "vectors.npz"
+        index = EmbeddingIndex(path)
+        index.add(["a", "b"], _random_unit(2, 8))
+        index.save()
+
+        loaded = EmbeddingIndex(path)
+
+        assert loaded.keys == ["a", "b"]
+        np.testing.assert_allclose(loaded.matrix, index.matrix)
+
+    def test_ivf_finds_nearest_neighbours(self, tmp_path):
+        vectors = _random_unit(5000, 32, seed=1)
+        index = EmbeddingIndex(tmp_path / "ivf.npz", ivf_threshold=1000, nprobe=16)
+        index.add([str(i) for i in range(5000)], vectors)
+
+        queries = vectors[:50] + 0.05 * _random_unit(50, 32, seed=2)
+        results = index.search(queries, k=1)
+
+        assert index._centroids is not None
+        hits = sum(r[0][0] == i for i, r in enumerate(results))
+        assert hits >= 45
+
+        # Partitions survive a reload and keep absorbing new vectors
+        index.save()
+        loaded = EmbeddingIndex(tmp_path / "ivf.npz", ivf_threshold=1000, nprobe=16)
+        loaded.add(["new"], queries[:1])
+        assert loaded.search(queries[:1], k=1)[0][0][0] == loaded.row("new")
+
+
+class TestAssetMatcher:
+    @pytest.mark.asyncio
+    async def test_matches_scene_text_to_descriptions(self):
+        matcher = AssetMatcher()
+        await matcher.index_assets(ASSETS)
+
+        picks = await matcher.match(
+            ["Waves roll onto the beach at sunset.",
+             "Walk between tall trees in the forest.",
+             "The city lights glow at night."],
+            list(ASSETS),
+        )
+
+        assert picks == [Path("ocean.mp4"), Path("forest.mp4"), Path("city.mp4")]
+
+    @pytest.mark.asyncio
+    async def test_repeat_penalty_spreads_assets(self):
+        matcher = AssetMatcher(repeat_penalty=1.0)
+        await matcher.index_assets(ASSETS)
+
+        picks = await matcher.match(["ocean waves"] * 3, list(ASSETS))
+
+        assert picks[0] == Path("ocean.mp4")
+        assert len(set(picks)) == 3
+
+    @pytest.mark.asyncio
+    async def test_pinned_scenes_are_kept(self):
+        matcher = AssetMatcher()
+        await matcher.index_assets(ASSETS)
+
+        picks = await matcher.match(
+            ["ocean waves", "forest trees"],
+            list(ASSETS),
+            pinned=[Path("city.mp4"), None],
+        )
+
+        assert picks == [Path("city.mp4"), Path("forest.mp4")]
+
+    @pytest.mark.asyncio
+    async def test_unindexed_assets_use_file_names(self):
+        matcher = AssetMatcher()
+
+        picks = await matcher.match(
+            ["Snow covered mountain peaks"],
+            [Path("desert_dunes.mp4"), Path("snowy-mountain-peaks.mp4")],
+        )
+
+        assert picks == [Path("snowy-mountain-peaks.mp4")]
+
+    @pytest.mark.asyncio
+    async def test_ollama_embedder(self):
+        class FakeClient:
+            async def embeddings(self, text, model=None):
+                return HashingEmbedder(dim=32).embed_sync([text])[0].tolist()
+
+        vectors = await OllamaEmbedder(FakeClient())(["calm ocean", "dark forest"])
+
+        assert vectors.shape == (2, 32)
+        np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+
+
+@pytest.mark.asyncio
+async def test_downloads_are_indexed_for_the_assembler(tmp_path):
+    index_path = tmp_path / "asset_vectors.npz"
+    assembler_matcher = AssetMatcher(EmbeddingIndex(index_path, ivf_threshold=4))
+
+    # Ingest in another process: downloads go into the persisted index
+    clips = []
+    for i, (name, description) in enumerate(ASSETS.items()):
+        path = tmp_path / f"pexels_{i}.mp4"
+        path.write_bytes(b"video")
+        clips.append((path, AssetMetadata(
+            asset_id=str(i), source="pexels", asset_type=AssetType.VIDEO,
+            url=f"https://pexels.example.com/{i}.mp4", tags=description.split(),
+        )))
+    filler = {tmp_path / f"filler_{i}.mp4": f"filler clip {i}" for i in range(8)}
+
+    downloader = MagicMock()
+    downloader.download_many = AsyncMock(return_value=[
+        DownloadResult(url=str(a.url), source="pexels", asset_id=a.asset_id,
+                       path=str(path), sha256="ab" * 32, size=5)
+        for path, a in clips
+    ])
+    ingest_matcher = AssetMatcher(EmbeddingIndex(index_path, ivf_threshold=4))
+    await ingest_matcher.index_assets(filler)
+    manager = ScraperManager(downloader=downloader, asset_matcher=ingest_matcher)
+    await manager.download([a for _, a in clips])
+
+    assert len(EmbeddingIndex(index_path)) == 11
+
+    # The assembler picks up the saved index and searches all of it
+    fallback = tmp_path / "unrelated.mp4"
+    picks = await assembler_matcher.match(
+        ["Walk between tall trees in the forest.", "The city lights glow at night."],
+        [fallback],
+    )
+
+    assert assembler_matcher.index._centroids is not None  # IVF partitions
+    assert picks == [tmp_path / "pexels_1.mp4", tmp_path / "pexels_2.mp4"]
+
+
+@pytest.mark.asyncio
+async def test_timeline_builder_uses_matcher(tmp_path):
+    assets = {}
+    for name, description in ASSETS.items():
+        path = tmp_path / name
+        path.write_bytes(b"")
+        assets[path] = description
+
+    matcher = AssetMatcher()
+    await matcher.index_assets(assets)
+    builder = TimelineBuilder(asset_matcher=matcher)
+
+    timeline = await builder.build(
+        script_segments=["Neon city lights at night.", "Gentle ocean waves."],
+        narration_paths=[tmp_path / "n0.mp3", tmp_path / "n1.mp3"],
+        assets=list(assets),
+        narration_durations=[3.0, 3.0],
+    )
+
+    assert [s.assets[0].path for s in timeline.scenes] == [
+        tmp_path / "city.mp4",
+        tmp_path / "ocean.mp4",
+    ]
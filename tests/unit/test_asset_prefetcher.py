@@ -0,0 +1,240 @@
+"""
+Tests for predictive asset prefetching from the content calendar.
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+import pytest
+
+from src.services.asset_scraper import (
+    AssetMetadata,
+    AssetType,
+    DownloadResult,
+    ScraperConfig,
+    ScraperManager,
+    ScraperPriority,
+)
+from src.services.asset_scraper.base_scraper import BaseScraper
+from src.services.scheduler import (
+    AssetPrefetcher,
+    CalendarManager,
+    ContentScheduler,
+    JobStatus,
+    PrefetchConfig,
+    RecurringScheduler,
+    ScheduleConfig,
+)
+from src.services.scheduler import recurring_scheduler
+
+# 02:00 UTC: inside the default off-peak window
+NOW = datetime(2026, 10, 20, 2, 0, tzinfo=timezone.utc)
+
+
+class RemoteScraper(BaseScraper):
+    """Remote source stand-in that records its queries"""
+
+    def __init__(self, name: str = "remote"):
+        super().__init__(ScraperConfig(cache_enabled=False, requests_per_minute=10))
+        self.name = name
+        self.queries: List[str] = []
+
+    @property
+    def source_name(self) -> str:
+        return self.name
+
+    @property
+    def base_url(self) -> str:
+        return f"https://{self.name}.example.com"
+
+    async def search(self, query, asset_type, limit=20, **kwargs):
+        self.queries.append(query)
+        return [
+            AssetMetadata(
+                asset_id=f"{query}_{i}",
+                source=self.name,
+                asset_type=asset_type,
+                url=f"https://{self.name}.example.com/{i}.mp4",
+            )
+            for i in range(limit)
+        ]
+
+
+def _downloader():
+    async def download_many(assets):
+        return [
+            DownloadResult(
+                url=str(a.url), source=a.source, asset_id=a.asset_id,
+                path=f"/store/{a.asset_id}.mp4", sha256="ab" * 32, size=1,
+            )
+            for a in assets
+        ]
+
+    downloader = MagicMock()
+    downloader.download_many = AsyncMock(side_effect=download_many)
+    return downloader
+
+
+@pytest.fixture
+def remote():
+    return RemoteScraper()
+
+
+@pytest.fixture
+def manager(remote):
+    manager = ScraperManager(downloader=_downloader())
+    manager.register_scraper(remote, ScraperPriority.HIGH)
+    return manager
+
+
+@pytest.fixture
+def calendar():
+    return CalendarManager()
+
+
+def _prefetcher(manager, calendar, **config) -> AssetPrefetcher:
+    config.setdefault("assets_per_topic", 3)
+    return AssetPrefetcher(manager, calendar_manager=calendar, config=PrefetchConfig(**config))
+
+
+@pytest.mark.asyncio
+async def test_upcoming_targets_from_calendar_and_recurring(manager, calendar):
+    await calendar.reserve_slot(NOW.replace(tzinfo=None) + timedelta(hours=3), "Ocean Sounds")
+    await calendar.reserve_slot(NOW.replace(tzinfo=None) + timedelta(hours=48), "Too Far Out")
+    await calendar.reserve_slot(NOW.replace(tzinfo=None) - timedelta(hours=1), "Already Ran")
+
+    recurring = RecurringScheduler(Mock())
+    await recurring.create_daily_schedule("Tips", "Python Tip - {date}", hour=10)
+
+    prefetcher = AssetPrefetcher(manager, calendar_manager=calendar, recurring_scheduler=recurring)
+    targets = prefetcher.upcoming_targets(NOW)
+
+    assert [(t.topic, t.scheduled_at) for t in targets] == [
+        ("Ocean Sounds", NOW + timedelta(hours=3)),
+        ("Python Tip - 2026-10-20", NOW + timedelta(hours=8)),
+        ("Python Tip - 2026-10-21", NOW + timedelta(hours=32)),
+    ]
+    assert targets[0].key.startswith("slot:")
+    assert targets[1].key.startswith("recurring:")
+
+
+@pytest.mark.asyncio
+async def test_prefetch_pins_assets_until_released(manager, calendar, remote):
+    await calendar.reserve_slot(NOW.replace(tzinfo=None) + timedelta(hours=3), "Ocean Sounds")
+    prefetcher = _prefetcher(manager, calendar)
+
+    # Peak hours: nothing happens unless forced
+    assert await prefetcher.prefetch(now=NOW.replace(hour=14)) == []
+    assert remote.queries == []
+
+    pin, = await prefetcher.prefetch(now=NOW)
+
+    assert pin.complete and len(pin.assets) == 3
+    assert pin.pinned_until == NOW + timedelta(hours=9)
+    assert (await prefetcher.get_pinned("ocean sounds")).assets == pin.assets
+
+    # Fully pinned topics aren't fetched again
+    assert await prefetcher.prefetch(now=NOW) == []
+    assert remote.queries == ["Ocean Sounds"]
+
+    await prefetcher.release("Ocean Sounds")
+    assert await prefetcher.get_pinned("Ocean Sounds") is None
+
+
+@pytest.mark.asyncio
+async def test_pins_are_shared_through_the_cache(manager, calendar):
+    await calendar.reserve_slot(datetime.utcnow() + timedelta(hours=3), "Ocean Sounds")
+    await _prefetcher(manager, calendar).prefetch(force=True)
+
+    # Another process sharing the cache sees the pin
+    other = AssetPrefetcher(manager)
+    pinned = await other.get_pinned("Ocean Sounds")
+
+    assert pinned is not None and len(pinned.assets) == 3
+    assert all(isinstance(a, DownloadResult) for a in pinned.assets)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_stays_within_rate_budget(manager, calendar, remote):
+    throttled = RemoteScraper("throttled")
+    throttled.rate_limiter.pause(30)
+    manager.register_scraper(throttled, ScraperPriority.HIGH)
+    await calendar.reserve_slot(NOW.replace(tzinfo=None) + timedelta(hours=3), "Ocean Sounds")
+    prefetcher = _prefetcher(manager, calendar)
+
+    assert prefetcher.budgeted_sources(AssetType.VIDEO) == ["remote"]
+    await prefetcher.prefetch(now=NOW)
+    assert throttled.queries == []
+
+    # Once prefetch has spent its share, the rest is left for jobs
+    for _ in range(6):
+        await remote.rate_limiter.acquire()
+    assert prefetcher.budgeted_sources(AssetType.VIDEO) == []
+
+    await calendar.reserve_slot(NOW.replace(tzinfo=None) + timedelta(hours=12), "Forest Rain")
+    assert await prefetcher.prefetch(now=NOW) == []
+    assert prefetcher.get_statistics()["statistics"]["deferred_no_budget"] == 1
+
+
+@pytest.mark.asyncio
+async def test_job_assembles_from_pinned_assets(manager, calendar, tmp_path):
+    await calendar.reserve_slot(datetime.utcnow() + timedelta(hours=3), "Ocean Sounds")
+    prefetcher = _prefetcher(manager, calendar)
+    pin, = await prefetcher.prefetch(force=True)
+    for asset in pin.assets:
+        asset.path = str(tmp_path / Path(asset.path).name)
+        Path(asset.path).write_bytes(b"video")
+
+    assembler = AsyncMock()
+    staged = []
+
+    async def assemble(**kwargs):
+        staged.extend(sorted(p.name for p in Path(kwargs["assets_dir"]).iterdir()))
+        return Mock(output_path="video.mp4", thumbnail_path="thumb.jpg", qc=None)
+
+    assembler.assemble = AsyncMock(side_effect=assemble)
+    generator = AsyncMock()
+    generator.generate = AsyncMock(return_value=Mock(content="Script", title="T", description="D", tags=[]))
+    scheduler = ContentScheduler(
+        ScheduleConfig(jobs_storage_path=str(tmp_path / "jobs"), enable_admission_control=False),
+        script_generator=generator,
+        video_assembler=assembler,
+        asset_prefetcher=prefetcher,
+    )
+
+    job = await scheduler.get_job_status(
+        await scheduler.schedule_video(topic="Ocean Sounds", scheduled_at=datetime.utcnow())
+    )
+    await scheduler._execute_job(job)
+
+    assert job.status == JobStatus.COMPLETED
+    assert staged == sorted(Path(a.path).name for a in pin.assets)
+    assert assembler.assemble.await_args.kwargs["assets_dir"] != scheduler.config.assets_dir
+    assert not (tmp_path / "jobs" / f"{job.id}_assets").exists()
+    assert await prefetcher.get_pinned("Ocean Sounds") is None
+
+
+@pytest.mark.asyncio
+async def test_recurring_run_uses_the_predicted_topic(monkeypatch):
+    content_scheduler = Mock()
+    content_scheduler.schedule_video = AsyncMock(return_value="job-1")
+    recurring = RecurringScheduler(content_scheduler)
+    job_id = await recurring.create_daily_schedule("Tips", "Python Tip - {date}", hour=23, minute=59)
+
+    (_, run_at, predicted), = recurring.get_upcoming_runs(NOW + timedelta(hours=23), now=NOW)
+
+    # The 23:59 run starts just after midnight
+    late = run_at + timedelta(seconds=90)
+
+    class Clock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return late.astimezone(tz) if tz else late.replace(tzinfo=None)
+
+    monkeypatch.setattr(recurring_scheduler, "datetime", Clock)
+    await recurring._execute_recurring_job(job_id)
+
+    assert predicted == "Python Tip - 2026-10-20"
+    assert content_scheduler.schedule_video.await_args.kwargs["topic"] == predicted
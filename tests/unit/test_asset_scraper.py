@@ -6,8 +6,10 @@ Test suite for asset scraper functionality.
 
 import pytest
 import asyncio
+import time
+import uuid
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from unittest.mock import AsyncMock
 
 from src.services.asset_scraper import (
@@ -19,7 +21,9 @@ from src.services.asset_scraper import (
     PixabayScraper,
     UnsplashScraper,
     ScraperManager,
+    ScraperPriority,
 )
+from src.services.asset_scraper.base_scraper import CircuitOpenError, CircuitState, HealthMonitor
 
 
 # ============================================
@@ -477,6 +481,384 @@ async def test_unsplash_integration(mocker):
     assert all(r.attribution_required is True for r in results)
 
 
+# ============================================
+# CIRCUIT BREAKER TESTS
+# ============================================
+
+def test_circuit_breaker_half_open_recovery():
+    """Open circuits cool down, probe, and back off harder on failed probes"""
+    transitions = []
+    monitor = HealthMonitor(
+        max_consecutive_failures=2, cooldown=0.05, max_cooldown=0.15,
+        on_state_change=lambda old, new: transitions.append(new),
+    )
+    
+    monitor.record_failure()
+    monitor.record_failure()
+    assert monitor.state is CircuitState.OPEN
+    assert not monitor.allow_request()
+    
+    time.sleep(0.06)
+    assert monitor.state is CircuitState.HALF_OPEN
+    assert monitor.allow_request()
+    assert not monitor.allow_request()  # One probe at a time
+    
+    monitor.record_failure()
+    assert monitor.state is CircuitState.OPEN
+    assert monitor.cooldown == pytest.approx(0.1)
+    
+    time.sleep(0.11)
+    assert monitor.allow_request()
+    monitor.record_success()
+    
+    assert monitor.is_healthy and monitor.cooldown == pytest.approx(0.05)
+    assert transitions == [
+        CircuitState.OPEN, CircuitState.HALF_OPEN, CircuitState.OPEN,
+        CircuitState.HALF_OPEN, CircuitState.CLOSED,
+    ]
+
+
+def test_circuit_breaker_opens_on_error_rate():
+    """A high error rate opens the circuit without consecutive failures"""
+    monitor = HealthMonitor(
+        max_consecutive_failures=5, error_rate_threshold=0.5, error_rate_min_requests=10
+    )
+    
+    for _ in range(4):
+        monitor.record_success()
+        monitor.record_failure()
+    assert monitor.is_healthy  # Only 8 requests in the window
+    
+    monitor.record_success()
+    monitor.record_failure()
+    
+    assert monitor.state is CircuitState.OPEN
+    assert monitor.get_stats()["error_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_refuses_requests():
+    """Requests fail fast while the circuit is open"""
+    scraper = MockScraper(ScraperConfig(circuit_cooldown=60))
+    scraper.health_monitor.is_healthy = False
+    scraper._get_session = AsyncMock()
+    
+    with pytest.raises(CircuitOpenError):
+        await scraper._make_request("GET", "https://mock.example.com/search")
+    
+    scraper._get_session.return_value.request.assert_not_called()
+    await scraper.close()
+
+
+@pytest.mark.asyncio
+async def test_manager_brings_scrapers_back_after_cooldown():
+    """Tripped scrapers are skipped, then probed once their cooldown ends"""
+    manager = ScraperManager()
+    pexels = MockScraper(ScraperConfig(circuit_cooldown=0.05), "pexels")
+    backup = MockScraper(ScraperConfig(), "backup")
+    manager.register_scraper(pexels, ScraperPriority.HIGH)
+    manager.register_scraper(backup, ScraperPriority.LOW)
+    
+    pexels.health_monitor.is_healthy = False
+    assert manager.get_healthy_scrapers(AssetType.VIDEO) == [backup]
+    assert manager.get_health_status()["pexels"]["health"]["circuit_state"] == "open"
+    
+    await asyncio.sleep(0.06)
+    assert manager.get_healthy_scrapers(AssetType.VIDEO) == [backup, pexels]
+    assert manager.get_health_status()["pexels"]["health"]["circuit_state"] == "half_open"
+    
+    pexels.health_monitor.record_success()
+    assert manager.get_healthy_scrapers(AssetType.VIDEO) == [pexels, backup]
+    
+    await manager.close_all()
+
+
+# ============================================
+# HEDGED SEARCH TESTS
+# ============================================
+
+class DelayedScraper(MockScraper):
+    """Mock scraper with a fixed response time"""
+    
+    def __init__(self, source_name: str, delay: float, p90: Optional[float] = None):
+        super().__init__(ScraperConfig(), source_name)
+        self.delay = delay
+        self.calls = 0
+        if p90 is not None:
+            self.health_monitor.record_success(p90)
+    
+    async def search(self, query, asset_type, limit=20, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return await super().search(query, asset_type, limit, **kwargs)
+
+
+def test_health_monitor_tracks_latency_percentiles():
+    """p90 latency comes from the recent request window"""
+    monitor = HealthMonitor(latency_window=10)
+    assert monitor.p90_latency is None
+    
+    for i in range(20):
+        monitor.record_success(latency=i / 10)
+    monitor.record_failure()
+    
+    assert monitor.p90_latency == pytest.approx(1.9)  # Only the last 10 count
+    assert monitor.latency_percentile(0) == pytest.approx(1.0)
+    assert monitor.get_stats()["p90_latency"] == 1.9
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_waits_for_fast_preferred_source():
+    """A source answering within its p90 is the only one queried"""
+    manager = ScraperManager()
+    first = DelayedScraper("first", delay=0.01, p90=0.2)
+    second = DelayedScraper("second", delay=0.01, p90=0.2)
+    manager.register_scraper(first, ScraperPriority.HIGH)
+    manager.register_scraper(second, ScraperPriority.MEDIUM)
+    
+    results = await manager.search_hedged("sky", AssetType.VIDEO, limit=5, use_cache=False)
+    
+    assert {r.source for r in results} == {"first"}
+    assert second.calls == 0
+    
+    await manager.close_all()
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_fires_next_source_after_p90():
+    """A slow preferred source is hedged and the faster answer wins"""
+    manager = ScraperManager()
+    slow = DelayedScraper("slow", delay=1.0, p90=0.05)
+    fast = DelayedScraper("fast", delay=0.01, p90=0.05)
+    manager.register_scraper(slow, ScraperPriority.HIGH)
+    manager.register_scraper(fast, ScraperPriority.HIGH)
+    
+    start = time.monotonic()
+    results = await manager.search_hedged("sea", AssetType.VIDEO, limit=5, use_cache=False)
+    
+    assert time.monotonic() - start < 0.5
+    assert {r.source for r in results} == {"fast"}
+    assert slow.calls == fast.calls == 1
+    
+    await manager.close_all()
+
+
+@pytest.mark.asyncio
+async def test_hedged_search_deprioritizes_slow_and_throttled_sources():
+    """Within a priority, faster sources go first; throttled ones go last"""
+    manager = ScraperManager()
+    throttled = DelayedScraper("throttled", delay=0.01, p90=0.01)
+    throttled.rate_limiter.pause(30)
+    slow = DelayedScraper("slow", delay=0.01, p90=2.0)
+    quick = DelayedScraper("quick", delay=0.01, p90=0.1)
+    for scraper in (throttled, slow, quick):
+        manager.register_scraper(scraper, ScraperPriority.HIGH)
+    
+    order = manager._hedge_order([throttled, slow, quick], AssetType.VIDEO)
+    assert [s.source_name for s in order] == ["quick", "slow", "throttled"]
+    
+    # A failure moves on immediately rather than waiting out the p90
+    quick._should_fail = True
+    results = await manager.search_hedged("hill", AssetType.VIDEO, limit=5, use_cache=False)
+    
+    assert {r.source for r in results} == {"slow"}
+    assert throttled.calls == 0
+    
+    await manager.close_all()
+
+
+# ============================================
+# SINGLE-FLIGHT TESTS
+# ============================================
+
+class SlowScraper(MockScraper):
+    """Mock scraper whose searches take a while and are counted"""
+    
+    def __init__(self, config: ScraperConfig, source_name: str = "slow"):
+        super().__init__(config, source_name)
+        self.calls = 0
+    
+    async def search(self, query, asset_type, limit=20, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return await super().search(query, asset_type, limit, **kwargs)
+
+
+def _single_flight_config() -> ScraperConfig:
+    return ScraperConfig(single_flight_lock_ttl=2.0, single_flight_poll_interval=0.01)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_share_one_request():
+    """Identical concurrent cache misses send one upstream query"""
+    scraper = SlowScraper(_single_flight_config())
+    query = f"ocean {uuid.uuid4()}"
+    
+    results = await asyncio.gather(*(
+        scraper.search_with_cache(query, AssetType.VIDEO, limit=3) for _ in range(20)
+    ))
+    
+    assert scraper.calls == 1
+    assert all(r == results[0] for r in results)
+    assert results[0][0] is not results[1][0]  # Callers get their own copies
+    assert not scraper._in_flight
+    
+    await scraper.close()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_across_processes():
+    """A second scraper (another process) waits on the shared lock"""
+    first = SlowScraper(_single_flight_config())
+    second = SlowScraper(_single_flight_config())
+    query = f"forest {uuid.uuid4()}"
+    
+    a, b = await asyncio.gather(
+        first.search_with_cache(query, AssetType.IMAGE),
+        second.search_with_cache(query, AssetType.IMAGE),
+    )
+    
+    assert first.calls + second.calls == 1
+    assert [x.asset_id for x in a] == [x.asset_id for x in b]
+    
+    await first.close()
+    await second.close()
+
+
+@pytest.mark.asyncio
+async def test_single_flight_waiter_takes_over_after_failure():
+    """If the lock holder fails, a waiting process fetches itself"""
+    failing = SlowScraper(_single_flight_config())
+    failing._should_fail = True
+    healthy = SlowScraper(_single_flight_config())
+    query = f"desert {uuid.uuid4()}"
+    
+    failed, results = await asyncio.gather(
+        failing.search_with_cache(query, AssetType.VIDEO),
+        healthy.search_with_cache(query, AssetType.VIDEO),
+        return_exceptions=True,
+    )
+    
+    assert isinstance(failed, Exception)
+    assert healthy.calls == 1 and len(results) == 5
+    
+    await failing.close()
+    await healthy.close()
+
+
+@pytest.mark.asyncio
+async def test_cache_lock_stand_in():
+    """The in-memory cache provides the same lock semantics as Redis"""
+    from src.utils.cache import CacheManager
+    
+    cache = CacheManager()
+    key = f"lock:{uuid.uuid4()}"
+    
+    token = await cache.acquire_lock(key, ttl=0.1)
+    assert token is not None
+    assert await cache.acquire_lock(key, ttl=0.1) is None
+    assert not await cache.release_lock(key, "someone-else")
+    
+    await asyncio.sleep(0.15)  # Expired locks can be taken again
+    assert await cache.acquire_lock(key, ttl=1.0) is not None
+    assert not await cache.release_lock(key, token)
+
+
+# ============================================
+# STALE-WHILE-REVALIDATE TESTS
+# ============================================
+
+async def _age_cached_search(scraper, query, asset_type, limit, seconds):
+    """Backdate a cached search result by some seconds"""
+    key = scraper._generate_cache_key(query, asset_type=asset_type.value, limit=limit)
+    entry = await scraper.cache_manager.get(key)
+    entry["fetched_at"] -= seconds
+    await scraper.cache_manager.set(key, entry, ttl=3600)
+
+
+@pytest.mark.asyncio
+async def test_fresh_results_report_their_age():
+    """Cache hits carry their age and are not stale"""
+    scraper = SlowScraper(ScraperConfig(cache_ttl=60))
+    query = f"lake {uuid.uuid4()}"
+    
+    await scraper.search_with_cache(query, AssetType.VIDEO, limit=3)
+    await _age_cached_search(scraper, query, AssetType.VIDEO, 3, 30)
+    results = await scraper.search_with_cache(query, AssetType.VIDEO, limit=3)
+    
+    assert scraper.calls == 1
+    assert not results[0].stale
+    assert 30 <= results[0].cache_age < 31
+    
+    await scraper.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_results_are_served_and_refreshed():
+    """Within the grace window stale results return at once and refresh in the background"""
+    scraper = SlowScraper(ScraperConfig(cache_ttl=60, stale_while_revalidate=60))
+    query = f"river {uuid.uuid4()}"
+    
+    await scraper.search_with_cache(query, AssetType.VIDEO, limit=3)
+    await _age_cached_search(scraper, query, AssetType.VIDEO, 3, 90)
+    
+    stale = await scraper.search_with_cache(query, AssetType.VIDEO, limit=3)
+    assert stale[0].stale and stale[0].cache_age >= 90
+    assert scraper.calls == 1  # Returned without waiting on the refresh
+    
+    await asyncio.sleep(0.1)
+    fresh = await scraper.search_with_cache(query, AssetType.VIDEO, limit=3)
+    assert scraper.calls == 2
+    assert not fresh[0].stale and fresh[0].cache_age < 1
+    
+    await scraper.close()
+
+
+@pytest.mark.asyncio
+async def test_stale_results_cover_source_failures():
+    """Past the grace window, stale results are used when the source fails"""
+    scraper = SlowScraper(ScraperConfig(
+        cache_ttl=60, stale_while_revalidate=10, stale_if_error=600
+    ))
+    query = f"canyon {uuid.uuid4()}"
+    
+    await scraper.search_with_cache(query, AssetType.IMAGE, limit=3)
+    await _age_cached_search(scraper, query, AssetType.IMAGE, 3, 300)
+    scraper._should_fail = True
+    
+    results = await scraper.search_with_cache(query, AssetType.IMAGE, limit=3)
+    assert scraper.calls == 2
+    assert results[0].stale and len(results) == 3
+    
+    # Too old even for stale-if-error
+    await _age_cached_search(scraper, query, AssetType.IMAGE, 3, 600)
+    with pytest.raises(Exception, match="Mock scraper failure"):
+        await scraper.search_with_cache(query, AssetType.IMAGE, limit=3)
+    
+    await scraper.close()
+
+
+@pytest.mark.asyncio
+async def test_unhealthy_source_serves_stale_without_waiting():
+    """An unhealthy source doesn't block callers that have stale results"""
+    scraper = SlowScraper(ScraperConfig(
+        cache_ttl=60, stale_while_revalidate=10, stale_if_error=600
+    ))
+    query = f"glacier {uuid.uuid4()}"
+    
+    await scraper.search_with_cache(query, AssetType.VIDEO, limit=3)
+    await _age_cached_search(scraper, query, AssetType.VIDEO, 3, 300)
+    scraper.health_monitor.is_healthy = False
+    
+    results = await scraper.search_with_cache(query, AssetType.VIDEO, limit=3)
+    
+    assert results[0].stale
+    await asyncio.sleep(0.1)
+    assert scraper.calls == 2  # Still retried in the background
+    
+    await scraper.close()
+
+
 # ============================================
 # RATE LIMITING TESTS
 # ============================================
@@ -501,6 +883,95 @@ async def test_rate_limiter():
     # await limiter.acquire()  # Would wait ~60 seconds
 
 
+def test_rate_limiter_refills_continuously():
+    """Capacity comes back one token at a time, not at the window boundary"""
+    from src.services.asset_scraper.base_scraper import RateLimiter
+    
+    limiter = RateLimiter(requests_per_minute=60, requests_per_hour=3600, burst=2)
+    
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(1.0, abs=0.01)
+    assert limiter.reserve() == pytest.approx(2.0, abs=0.01)
+    
+    # Weighted requests wait for all of their tokens
+    assert limiter.reserve(cost=2) == pytest.approx(4.0, abs=0.01)
+    assert limiter.minute_tokens == 0
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_is_fifo_and_does_not_hold_lock():
+    """Waiting callers sleep outside the lock and finish in arrival order"""
+    from src.services.asset_scraper.base_scraper import RateLimiter
+    
+    limiter = RateLimiter(requests_per_minute=1200, requests_per_hour=72000, burst=1)
+    finished = []
+    
+    async def request(i):
+        await limiter.acquire()
+        finished.append(i)
+    
+    start = asyncio.get_event_loop().time()
+    tasks = [asyncio.create_task(request(i)) for i in range(6)]
+    await asyncio.sleep(0.01)
+    assert not limiter.lock.locked()
+    await asyncio.gather(*tasks)
+    elapsed = asyncio.get_event_loop().time() - start
+    
+    assert finished == list(range(6))
+    assert 0.2 <= elapsed < 0.5  # 5 waits of 50ms
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_honors_provider_headers():
+    """Retry-After and exhausted X-RateLimit quotas pause the limiter"""
+    from src.services.asset_scraper.base_scraper import RateLimiter
+    
+    limiter = RateLimiter(requests_per_minute=600, requests_per_hour=36000)
+    
+    assert limiter.update_from_headers({"X-Ratelimit-Remaining": "12"}) is None
+    assert limiter.update_from_headers({"Retry-After": "0.2"}) == pytest.approx(0.2)
+    
+    start = asyncio.get_event_loop().time()
+    await limiter.acquire()
+    assert asyncio.get_event_loop().time() - start >= 0.19
+    
+    delay = limiter.update_from_headers({
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset": str(time.time() + 30),
+    })
+    assert delay == pytest.approx(30, abs=1)
+    assert limiter.reserve() == pytest.approx(30, abs=1)
+    
+    # Reset given in seconds from now (Pixabay style)
+    assert RateLimiter._parse_delay("45") == 45
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_pause_keeps_queued_callers_spaced():
+    """A Retry-After pause delays queued slots without bunching them up"""
+    from src.services.asset_scraper.base_scraper import RateLimiter
+    
+    limiter = RateLimiter(requests_per_minute=600, requests_per_hour=36000, burst=1)
+    loop = asyncio.get_event_loop()
+    finished = []
+    
+    async def request():
+        await limiter.acquire()
+        finished.append(loop.time())
+    
+    start = loop.time()
+    tasks = [asyncio.create_task(request()) for _ in range(4)]  # Slots 0, 0.1, 0.2, 0.3s
+    await asyncio.sleep(0.01)
+    limiter.update_from_headers({"Retry-After": "0.3"})
+    await asyncio.gather(*tasks)
+    
+    # The first caller already went; the rest moved back by the pause
+    gaps = [b - a for a, b in zip(finished[1:], finished[2:])]
+    assert finished[1] - start >= 0.39
+    assert all(gap >= 0.08 for gap in gaps)
+
+
 # ============================================
 # RUN TESTS
 # ============================================
@@ -0,0 +1,138 @@
+"""
+Tests for the TTS audio cache index.
+"""
+
+import time
+
+import pytest
+
+from src.services.video_assembler import (
+    AudioCacheIndex,
+    TTSConfig,
+    TTSEngine,
+    WorkspaceConfig,
+    WorkspaceManager,
+)
+
+
+def _write(directory, name, size):
+    path = directory / name
+    path.write_bytes(b"x" * size)
+    return path
+
+
+@pytest.fixture
+def audio_dir(tmp_path):
+    directory = tmp_path / "audio"
+    directory.mkdir()
+    return directory
+
+
+def test_adopts_existing_files_once(audio_dir):
+    _write(audio_dir, "a.wav", 10)
+    _write(audio_dir, "b.wav", 20)
+
+    index = AudioCacheIndex(audio_dir)
+    try:
+        assert index.contains("a.wav") and index.contains("b.wav")
+        assert index.total_bytes() == 30
+    finally:
+        index.close()
+
+
+def test_lru_eviction_under_budget(audio_dir):
+    index = AudioCacheIndex(audio_dir, max_bytes=25)
+    try:
+        index.record(_write(audio_dir, "a.wav", 10))
+        index.record(_write(audio_dir, "b.wav", 10))
+        time.sleep(0.01)
+        index.touch("a.wav")
+
+        index.record(_write(audio_dir, "c.wav", 10))
+
+        assert index.contains("a.wav")
+        assert not index.contains("b.wav")
+        assert not (audio_dir / "b.wav").exists()
+        assert index.total_bytes() == 20
+    finally:
+        index.close()
+
+
+def test_lfu_eviction_keeps_popular_files(audio_dir):
+    index = AudioCacheIndex(audio_dir, max_bytes=25, policy="lfu")
+    try:
+        index.record(_write(audio_dir, "popular.wav", 10))
+        index.record(_write(audio_dir, "rare.wav", 10))
+        for _ in range(3):
+            index.touch("popular.wav")
+        index.touch("rare.wav")
+
+        index.record(_write(audio_dir, "new.wav", 10))
+
+        assert index.contains("popular.wav")
+        assert not index.contains("rare.wav")
+    finally:
+        index.close()
+
+
+def test_write_time_eviction_skips_files_held_by_jobs(audio_dir, tmp_path):
+    workspaces = WorkspaceManager(WorkspaceConfig(root=tmp_path / "temp"))
+    index = AudioCacheIndex(audio_dir, max_bytes=25, in_use=workspaces.referenced)
+    try:
+        held = _write(audio_dir, "held.wav", 10)
+        index.record(held)
+        index.record(_write(audio_dir, "free.wav", 10))
+
+        # Another job still needs the least recently used file
+        job = workspaces.create("job1")
+        job.retain(held)
+
+        index.record(_write(audio_dir, "new.wav", 10))
+
+        assert held.exists() and index.contains("held.wav")
+        assert not index.contains("free.wav")
+
+        job.close()
+        index.record(_write(audio_dir, "newer.wav", 10))
+        assert not held.exists()
+    finally:
+        index.close()
+
+
+def test_expire_respects_exclusions(audio_dir):
+    index = AudioCacheIndex(audio_dir)
+    try:
+        old = _write(audio_dir, "old.wav", 10)
+        in_use = _write(audio_dir, "in_use.wav", 10)
+        index.record(old)
+        index.record(in_use)
+        time.sleep(0.01)
+
+        expired = index.expire(0, exclude={in_use.resolve()})
+
+        assert expired == ["old.wav"]
+        assert not old.exists()
+        assert in_use.exists()
+    finally:
+        index.close()
+
+
+async def test_stale_cache_manager_entry_is_dropped(audio_dir):
+    class DictCache:
+        def __init__(self):
+            self.data = {}
+
+        async def get(self, key):
+            return self.data.get(key)
+
+        async def delete(self, key):
+            return self.data.pop(key, None) is not None
+
+    cache = DictCache()
+    engine = TTSEngine(TTSConfig(output_dir=audio_dir), cache_manager=cache)
+    cache.data["key"] = {"audio_path": str(audio_dir / "gone.wav")}
+
+    assert engine._cached_audio_present(cache.data["key"]) is False
+
+    engine.cache_index.record(_write(audio_dir, "kept.wav", 10))
+    assert engine._cached_audio_present({"audio_path": str(audio_dir / "kept.wav")})
@@ -0,0 +1,118 @@
+"""
+Tests for the stage-pipelined batch assembly engine.
+
+A fake assembler stands in for VideoAssembler so the stage scheduling can
+be tested without TTS models or MoviePy.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+from src.services.video_assembler import BatchConfig, BatchPipeline
+
+
+class FakeAssembler:
+    """Records stage activity; each stage just sleeps."""
+
+    def __init__(self, fail_on=None, delay=0.01):
+        self.video_renderer = SimpleNamespace(config=SimpleNamespace(threads=2))
+        self.fail_on = fail_on
+        self.delay = delay
+        self.events = []
+        self.active = {"tts": 0, "timeline": 0, "render": 0}
+        self.peak = {"tts": 0, "timeline": 0, "render": 0}
+        self.render_threads = []
+
+    async def _run(self, stage, job):
+        self.active[stage] += 1
+        self.peak[stage] = max(self.peak[stage], self.active[stage])
+        self.events.append((stage, job.name, "start"))
+        await asyncio.sleep(self.delay)
+        self.events.append((stage, job.name, "end"))
+        self.active[stage] -= 1
+        if (stage, job.name) == self.fail_on:
+            raise RuntimeError(f"{stage} failed for {job.name}")
+
+    async def _stage_narrate(self, job):
+        await self._run("tts", job)
+
+    async def _stage_build_timeline(self, job):
+        await self._run("timeline", job)
+
+    async def _stage_render(self, job):
+        self.render_threads.append(self.video_renderer.config.threads)
+        await self._run("render", job)
+        return f"video:{job.name}"
+
+    def _failed_result(self, job, error):
+        return f"failed:{job.name}:{error}"
+
+
+def _jobs(count):
+    return [SimpleNamespace(name=f"v{i}") for i in range(count)]
+
+
+def test_workers_derived_from_cpu_budget():
+    pipeline = BatchPipeline(FakeAssembler(), BatchConfig(cpu_budget=9, tts_workers=1))
+
+    workers = pipeline.resolve_workers()
+
+    assert workers["tts"] == 1
+    assert workers["render"] == 4  # (9 - 1) // 2 threads per render
+    assert workers["timeline"] == 4
+
+
+def test_workers_never_drop_below_one():
+    pipeline = BatchPipeline(FakeAssembler(), BatchConfig(cpu_budget=1, render_threads=8))
+
+    assert pipeline.resolve_workers()["render"] == 1
+
+
+async def test_renders_use_the_batch_render_threads():
+    assembler = FakeAssembler()
+    pipeline = BatchPipeline(assembler, BatchConfig(cpu_budget=8, render_threads=1))
+
+    assert pipeline.resolve_workers()["render"] == 7
+    await pipeline.run(_jobs(3))
+
+    assert assembler.render_threads == [1, 1, 1]
+    assert assembler.video_renderer.config.threads == 2  # Restored afterwards
+
+
+async def test_results_keep_input_order():
+    pipeline = BatchPipeline(FakeAssembler(), BatchConfig(cpu_budget=8))
+
+    results = await pipeline.run(_jobs(5))
+
+    assert results == [f"video:v{i}" for i in range(5)]
+
+
+async def test_stages_overlap_across_videos():
+    assembler = FakeAssembler(delay=0.02)
+    pipeline = BatchPipeline(assembler, BatchConfig(cpu_budget=8))
+
+    await pipeline.run(_jobs(4))
+
+    # Narration of a later video starts before an earlier video finishes rendering
+    render_end_v0 = assembler.events.index(("render", "v0", "end"))
+    tts_start_v2 = assembler.events.index(("tts", "v2", "start"))
+    assert tts_start_v2 < render_end_v0
+    assert assembler.peak["tts"] == 1
+
+
+async def test_failure_is_isolated_to_one_video():
+    assembler = FakeAssembler(fail_on=("timeline", "v1"))
+    pipeline = BatchPipeline(assembler, BatchConfig(cpu_budget=4))
+
+    results = await pipeline.run(_jobs(3))
+
+    assert results[0] == "video:v0"
+    assert results[1].startswith("failed:v1")
+    assert results[2] == "video:v2"
+    assert ("render", "v1", "start") not in assembler.events
+
+    metrics = pipeline.get_metrics()
+    assert metrics["timeline"]["failed"] == 1
+    assert metrics["render"]["completed"] == 2
+    assert metrics["tts"]["max_queue_depth"] >= 1
+    assert 0.0 <= metrics["render"]["utilization"] <= 1.0
@@ -0,0 +1,203 @@
+"""
+Tests for the learned narration duration model.
+"""
+
+import random
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.services.script_generator.content_validator import ContentValidator
+from src.services.video_assembler import (
+    DurationEstimator,
+    TimelineBuilder,
+    TimelineConfig,
+    TTSConfig,
+    TTSEngine,
+)
+from src.services.video_assembler.duration_model import extract_features
+from src.services.video_assembler.ssml import parse_pause
+
+
+WORDS = (
+    "breathe slowly and notice the gentle rhythm of your body as relaxation "
+    "spreads through every muscle while awareness settles into this moment"
+).split()
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 30))]
+    for i in range(3, len(words) - 1, rng.randint(4, 8)):
+        words[i] += ","
+    text = " ".join(words) + "."
+    if rng.random() < 0.3:
+        text += ' <pause duration="1.5s"/> Hold it there.'
+    return text
+
+
+def _spoken(text: str, syllables_per_second: float) -> float:
+    """Synthetic voice: syllable rate plus punctuation and pause time."""
+    _, _, syllables, _, clauses, sentences, pauses = extract_features(text)
+    return syllables / syllables_per_second + clauses * 0.25 + sentences * 0.4 + pauses
+
+
+def test_parse_pause():
+    assert parse_pause("500ms") == 0.5
+    assert parse_pause("2s") == 2.0
+    assert parse_pause("1.5") == 1.5
+    assert parse_pause("soon") == 0.0
+
+
+def test_falls_back_to_words_per_minute():
+    estimator = DurationEstimator()
+
+    # 10 words at 150 wpm
+    assert estimator.predict("one two three four five six seven eight nine ten") == pytest.approx(4.0)
+
+
+@pytest.mark.parametrize("syllables_per_second", [3.1, 4.7])  # ~125 and ~185 wpm
+def test_learned_model_within_five_percent(syllables_per_second):
+    rng = random.Random(7)
+    estimator = DurationEstimator()
+
+    for _ in range(40):
+        text = _sentence(rng)
+        estimator.observe(text, "voice", _spoken(text, syllables_per_second))
+
+    for _ in range(20):
+        text = _sentence(rng)
+        actual = _spoken(text, syllables_per_second)
+        assert estimator.predict(text, "voice") == pytest.approx(actual, rel=0.05)
+
+    assert estimator.error("voice") < 0.05
+
+
+def test_speaking_rate_scales_speech_but_not_pauses():
+    rng = random.Random(3)
+    estimator = DurationEstimator()
+    for _ in range(20):
+        text = _sentence(rng)
+        estimator.observe(text, "voice", _spoken(text, 4.0))
+
+    text = 'Rest here. <pause duration="2s"/> And continue.'
+    normal = estimator.predict(text, "voice")
+    slow = estimator.predict(text, "voice", speaking_rate=0.5)
+
+    assert slow - 2.0 == pytest.approx((normal - 2.0) * 2)
+
+
+def test_model_persists(tmp_path):
+    rng = random.Random(5)
+    path = tmp_path / "duration_model.json"
+
+    estimator = DurationEstimator(path)
+    for _ in range(20):
+        text = _sentence(rng)
+        estimator.observe(text, "voice", _spoken(text, 4.0))
+    estimator.save()
+
+    text = _sentence(rng)
+    assert DurationEstimator(path).predict(text, "voice") == pytest.approx(
+        estimator.predict(text, "voice")
+    )
+
+
+def test_validator_uses_estimator():
+    class FixedEstimator:
+        def predict(self, text, voice=None, speaking_rate=1.0):
+            return 42.0
+
+    validator = ContentValidator(duration_estimator=FixedEstimator(), voice="voice")
+
+    assert validator.estimate_duration("Some script.") == 42.0
+    assert validator.estimate_duration("one two three", wpm=60) == 3.0
+
+
+def test_plan_segments_drops_segments_past_target():
+    builder = TimelineBuilder(TimelineConfig(min_scene_duration=1.0))
+
+    assert builder.plan_segments([10, 10, 10, 10], target=20) == 2
+    assert builder.plan_segments([10, 9, 3], target=20) == 3  # Mostly fits
+    assert builder.plan_segments([30, 10], target=20) == 1
+    assert builder.plan_segments([10, 10], target=None) == 2
+
+
+async def test_engine_fits_cached_results_with_ssml_and_rate(tmp_path):
+    class DictCache:
+        def __init__(self):
+            self.data = {}
+
+        async def get(self, key):
+            return self.data.get(key)
+
+        async def set(self, key, value, ttl=None):
+            self.data[key] = value
+
+        async def delete(self, key):
+            self.data.pop(key, None)
+
+    def engine(model_path):
+        engine = TTSEngine(
+            TTSConfig(
+                output_dir=tmp_path / "audio",
+                duration_model_path=model_path,
+                duration_save_interval=1000,
+                sample_rate=8000,
+                normalize_audio=False,
+            ),
+            cache_manager=cache,
+        )
+        engine.tts_model = MagicMock(model_name=engine.config.voice.value)
+        engine.tts_model.tts.side_effect = lambda text, **kwargs: [0.0] * int(
+            _spoken(text, 4.0) * engine.config.sample_rate
+        )
+        return engine
+
+    rng = random.Random(9)
+    cache = DictCache()
+    first = engine(None)
+    for _ in range(12):
+        text = _sentence(rng) + ' <pause duration="2s"/> Rest.'
+        await first.generate(text, speaking_rate=0.8)
+
+    # A fresh engine finds the results through the audio files they left
+    path = tmp_path / "duration_model.json"
+    fresh = engine(path)
+
+    assert await fresh.load_duration_model() == 12
+    assert await fresh.load_duration_model() == 0  # Only once
+    assert path.exists()
+
+    # Pauses and the 0.8 rate were learned from the SSML source text
+    text = _sentence(rng) + ' <pause duration="2s"/> Rest.'
+    voice = fresh.config.voice.value
+    assert fresh.duration_estimator.voices() == [voice]
+    for rate in (0.8, 1.0):
+        assert fresh.duration_estimator.predict(text, voice, rate) == pytest.approx(
+            first.duration_estimator.predict(text, voice, rate)
+        )
+
+
+async def test_engine_batches_duration_model_saves(tmp_path):
+    path = tmp_path / "duration_model.json"
+    engine = TTSEngine(TTSConfig(
+        output_dir=tmp_path / "audio",
+        duration_model_path=path,
+        duration_save_interval=3,
+        enable_cache=False,
+        normalize_audio=False,
+    ))
+    engine.tts_model = MagicMock(model_name=engine.config.voice.value)
+    engine.tts_model.tts.return_value = [0.1] * 22050
+
+    for _ in range(2):
+        await engine.generate("Breathe slowly.", save_to_file=False)
+    assert not path.exists()
+
+    await engine.generate("Breathe slowly.", save_to_file=False)
+    assert path.exists()
+
+    await engine.generate("Breathe slowly.", save_to_file=False)
+    before = path.read_text()
+    await engine.cleanup_cache()  # Flushes the rest
+    assert path.read_text() != before
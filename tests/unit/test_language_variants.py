@@ -0,0 +1,294 @@
+"""
+Tests for multi-language variants sharing one visual track.
+
+ffmpeg is patched out; the commands it would run are inspected instead.
+"""
+
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.services.video_assembler import (
+    MultiLanguageVideo,
+    TTSConfig,
+    TTSEngine,
+    TTSResult,
+    VariantMode,
+    VideoAssembler,
+    VideoConfig,
+)
+from src.services.video_assembler.language_variants import (
+    build_audio_track_command,
+    build_mux_command,
+    language_tag,
+    retime_scenes,
+    visual_timeline,
+)
+from src.services.video_assembler.timeline_builder import (
+    Asset,
+    AssetType,
+    BackgroundMusic,
+    Scene,
+    TextOverlay,
+    Timeline,
+    TimelineConfig,
+)
+from src.services.video_assembler.tts_engine import AudioFormat, Voice
+from src.services.video_assembler.video_renderer import RenderConfig, RenderResult
+
+
+@pytest.fixture
+def timeline(tmp_path):
+    image = tmp_path / "still.jpg"
+    image.write_bytes(b"")
+    narration = tmp_path / "n.wav"
+    narration.write_bytes(b"")
+    scenes = [
+        Scene(
+            assets=[Asset(path=image, type=AssetType.IMAGE, duration=4.0)],
+            narration_path=narration,
+            text_overlays=[
+                TextOverlay(text=f"Segment {i}."),
+                TextOverlay(text="Subscribe"),
+            ],
+            start_time=i * 4.0,
+            duration=4.0,
+            script_segment=f"Segment {i}.",
+        )
+        for i in range(3)
+    ]
+    return Timeline.from_scenes(scenes, TimelineConfig())
+
+
+def test_retime_only_overrunning_scenes(timeline):
+    retimed, indices = retime_scenes(
+        timeline,
+        [[3.0, 3.5, 2.0], [3.2, 5.0, 3.0]],
+        TimelineConfig(),
+        padding=0.25,
+    )
+
+    assert indices == [1]
+    assert [s.duration for s in retimed.scenes] == [4.0, 5.25, 4.0]
+    assert [s.start_time for s in retimed.scenes] == [0.0, 4.0, 9.25]
+    assert retimed.scenes[1].assets[0].duration == 5.25
+    assert retimed.total_duration == 13.25
+    # The original is untouched
+    assert timeline.scenes[1].duration == 4.0
+
+
+def test_retime_keeps_timeline_that_fits(timeline):
+    retimed, indices = retime_scenes(timeline, [[3.0] * 3], TimelineConfig())
+    assert retimed is timeline
+    assert indices == []
+
+
+def test_retime_ignores_shorter_translations(timeline):
+    # Scenes are as long as the primary narration; translations are shorter
+    retimed, indices = retime_scenes(timeline, [[3.9, 4.0, 2.5]], TimelineConfig())
+    assert retimed is timeline
+    assert indices == []
+
+
+def test_visual_timeline_drops_audio_and_captions(timeline):
+    visual = visual_timeline(timeline, TimelineConfig())
+
+    assert not visual.has_narration
+    assert visual.background_music is None
+    assert [o.text for o in visual.scenes[0].text_overlays] == ["Subscribe"]
+    assert [s.duration for s in visual.scenes] == [4.0, 4.0, 4.0]
+
+
+def test_audio_track_command(tmp_path):
+    music = BackgroundMusic(path=tmp_path / "music.mp3", volume=0.2)
+    cmd = build_audio_track_command(
+        [(tmp_path / "a.wav", 0.0, 1.0), (tmp_path / "b.wav", 4.5, 0.8)],
+        duration=12.0,
+        output_path=tmp_path / "es.m4a",
+        music=music,
+    )
+
+    graph = cmd[cmd.index("-filter_complex") + 1]
+    assert "[1:a]adelay=4500:all=1,volume=0.8[n1]" in graph
+    assert "volume=0.2" in graph and "afade=t=out:st=9.000" in graph
+    assert "[n0][n1][m]amix=inputs=3" in graph
+    assert "atrim=0:12.000[out]" in graph
+    assert cmd[cmd.index("-stream_loop") + 1] == "-1"
+    assert cmd[-1] == str(tmp_path / "es.m4a")
+
+
+def test_mux_command_copies_streams(tmp_path):
+    cmd = build_mux_command(
+        tmp_path / "visual.mp4",
+        [("en", tmp_path / "en.m4a"), ("pt-BR", tmp_path / "pt.m4a")],
+        tmp_path / "out.mp4",
+    )
+
+    assert cmd[cmd.index("-c") + 1] == "copy"
+    assert cmd.count("-map") == 3
+    assert "language=eng" in cmd and "language=por" in cmd
+    assert cmd[cmd.index("-disposition:a:1") + 1] == "0"
+    assert language_tag("xx") == "xx"
+
+
+class TestAssembleVariants:
+    """Tests for VideoAssembler.assemble_variants."""
+
+    @pytest.fixture
+    def assembler(self, tmp_path):
+        clip = tmp_path / "clip.jpg"
+        clip.write_bytes(b"img")
+        self.durations = {"en": 3.0, "es": 4.5}
+
+        async def generate(text, voice=None, speaking_rate=None, save_to_file=True, language=None):
+            language = language or "en"
+            self.languages.append(language)
+            path = tmp_path / f"{language}_{abs(hash(text))}.wav"
+            path.write_bytes(b"audio")
+            return TTSResult(
+                text=text,
+                audio_path=str(path),
+                duration=self.durations[language],
+                sample_rate=22050,
+                voice_used=str(voice),
+                format=AudioFormat.WAV,
+            )
+
+        async def render(timeline, output_path, progress_callback=None):
+            output_path.write_bytes(b"visual")
+            self.rendered.append(timeline)
+            return RenderResult(
+                output_path=str(output_path),
+                file_size=6,
+                duration=timeline.total_duration,
+                resolution=(1920, 1080),
+                fps=30,
+                bitrate="8000k",
+                render_time=2.0,
+                scene_count=timeline.scene_count,
+                has_audio=timeline.has_narration,
+                has_background_music=False,
+            )
+
+        self.rendered = []
+        self.commands = []
+        self.languages = []
+
+        def run(cmd, timeout=300.0):
+            self.commands.append(cmd)
+            Path(cmd[-1]).write_bytes(b"media")
+
+        with patch('src.services.video_assembler.video_assembler.TTSEngine') as mock_tts, \
+             patch('src.services.video_assembler.video_assembler.VideoRenderer') as mock_renderer, \
+             patch('src.services.video_assembler.video_assembler.run_ffmpeg', side_effect=run):
+            tts = Mock()
+            tts.generate = AsyncMock(side_effect=generate)
+            mock_tts.return_value = tts
+
+            renderer = Mock()
+            renderer.config = RenderConfig()
+            renderer.render = AsyncMock(side_effect=render)
+            mock_renderer.return_value = renderer
+
+            assembler = VideoAssembler(VideoConfig(
+                output_dir=tmp_path / "output",
+                temp_dir=tmp_path / "temp",
+                enable_cache=False,
+                quality_check=False,
+            ))
+            assembler.clip = clip
+            with patch.object(assembler, '_create_thumbnail', return_value=None):
+                yield assembler
+
+    async def test_renders_once_and_muxes_tracks(self, assembler):
+        result = await assembler.assemble_variants(
+            scripts={
+                "en": "One.\n\nTwo.\n\nThree.",
+                "es": "Uno.\n\nDos.\n\nTres.",
+            },
+            niche="meditation",
+            assets=[assembler.clip],
+        )
+
+        assert isinstance(result, MultiLanguageVideo)
+        assert len(self.rendered) == 1
+        assert not self.rendered[0].has_narration
+
+        # Spanish narration (4.5s) outgrows the 3s minimum scenes
+        assert result.retimed_scenes == [0, 1, 2]
+        assert result.duration == pytest.approx(3 * 4.75)
+
+        audio_commands, mux_commands = self.commands[:2], self.commands[2:]
+        assert len(audio_commands) == 2 and len(mux_commands) == 1
+        assert mux_commands[0][mux_commands[0].index("-c") + 1] == "copy"
+
+        es = result.variants["es"]
+        assert es.voice == Voice.MULTILINGUAL.value
+        assert self.languages == ["en"] * 3 + ["es"] * 3
+        assert es.track_index == 1
+        assert es.video_path == result.video_path
+        assert Path(result.video_path).exists()
+        assert Path(result.timeline_path).exists()
+
+    async def test_shorter_translation_keeps_primary_timing(self, assembler):
+        self.durations = {"en": 6.0, "es": 5.0}
+        result = await assembler.assemble_variants(
+            scripts={"en": "One.\n\nTwo.\n\nThree.", "es": "Uno.\n\nDos.\n\nTres."},
+            niche="meditation",
+            assets=[assembler.clip],
+        )
+
+        assert result.retimed_scenes == []
+        assert [s.duration for s in self.rendered[0].scenes] == [6.0, 6.0, 6.0]
+        assert result.duration == pytest.approx(18.0)
+
+    async def test_separate_files(self, assembler):
+        result = await assembler.assemble_variants(
+            scripts={"en": "One.\n\nTwo.\n\nThree.", "es": "Uno.\n\nDos.\n\nTres."},
+            niche="meditation",
+            assets=[assembler.clip],
+            mode=VariantMode.FILES,
+        )
+
+        for language, variant in result.variants.items():
+            assert variant.video_path.endswith(f"_{language}.mp4")
+            assert Path(variant.video_path).exists()
+        assert len(self.rendered) == 1
+
+    async def test_misaligned_translation_rejected(self, assembler):
+        with pytest.raises(ValueError, match="segments"):
+            await assembler.assemble_variants(
+                scripts={"en": "One.\n\nTwo.\n\nThree.", "es": "Uno.\n\nDos."},
+                niche="meditation",
+                assets=[assembler.clip],
+            )
+
+
+async def test_translation_language_reaches_the_model(tmp_path):
+    engine = TTSEngine(TTSConfig(output_dir=tmp_path, enable_cache=False))
+    engine.tts_model = SimpleNamespace(
+        model_name=Voice.MULTILINGUAL.value,
+        is_multi_lingual=True,
+        languages=["en", "fr-fr", "pt-br"],
+        is_multi_speaker=True,
+        speakers=["female-en-5", "male-en-2"],
+        tts=Mock(return_value=[0.1] * 2205),
+    )
+
+    await engine.generate("Bonjour.", voice=Voice.MULTILINGUAL, language="fr", save_to_file=False)
+    await engine.generate(
+        'Respire. <pause duration="1s"/> Devagar.',
+        voice=Voice.MULTILINGUAL,
+        language="pt-br",
+        save_to_file=False,
+    )
+
+    calls = engine.tts_model.tts.call_args_list
+    assert calls[0].kwargs == {"text": "Bonjour.", "language": "fr-fr", "speaker": "female-en-5"}
+    assert {c.kwargs["language"] for c in calls[1:]} == {"pt-br"}
+
+    # Same text in another language is a different cache entry
+    assert engine._get_cache_key("Hola.", Voice.MULTILINGUAL, 1.0, "es") != \
+        engine._get_cache_key("Hola.", Voice.MULTILINGUAL, 1.0, "pt-br")
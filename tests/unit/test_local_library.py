@@ -0,0 +1,219 @@
+"""
+Tests for the local asset library search source.
+"""
+
+import json
+import time
+from typing import List
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.services.asset_scraper import (
+    AssetMetadata,
+    AssetType,
+    DownloadResult,
+    LocalLibraryScraper,
+    ScraperConfig,
+    ScraperManager,
+    ScraperPriority,
+)
+from src.services.asset_scraper.base_scraper import BaseScraper
+
+
+class RemoteScraper(BaseScraper):
+    """Remote source stand-in that counts its searches"""
+
+    def __init__(self, name: str = "remote"):
+        super().__init__(ScraperConfig(cache_enabled=False))
+        self.name = name
+        self.limits: List[int] = []
+
+    @property
+    def source_name(self) -> str:
+        return self.name
+
+    @property
+    def base_url(self) -> str:
+        return "https://remote.example.com"
+
+    async def search(self, query, asset_type, limit=20, **kwargs):
+        self.limits.append(limit)
+        return [_asset(f"{self.name}_{i}", source=self.name) for i in range(limit)]
+
+
+def _asset(asset_id: str, title: str = "clip", tags=(), source: str = "pexels", **kwargs) -> AssetMetadata:
+    return AssetMetadata(
+        asset_id=asset_id,
+        source=source,
+        asset_type=kwargs.pop("asset_type", AssetType.VIDEO),
+        url=f"https://{source}.example.com/{asset_id}.mp4",
+        title=title,
+        tags=list(tags),
+        **kwargs
+    )
+
+
+@pytest.fixture
+def library(tmp_path):
+    library = LocalLibraryScraper(tmp_path / "library.sqlite3")
+    yield library
+    library._conn.close()
+
+
+def _add(library, tmp_path, asset, **kwargs):
+    path = tmp_path / f"{asset.asset_id}.mp4"
+    path.write_bytes(asset.asset_id.encode())
+    library.add(path, asset, **kwargs)
+    return path
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_by_text_and_quality(library, tmp_path):
+    _add(library, tmp_path, _asset("1", "Ocean waves at sunset", ["ocean", "beach"]), quality_score=0.2)
+    _add(library, tmp_path, _asset("2", "Calm ocean wave", ["sea"]), quality_score=0.9)
+    _add(library, tmp_path, _asset("3", "Forest trail", ["trees"]), quality_score=1.0)
+    _add(library, tmp_path, _asset("4", "Ocean photo", asset_type=AssetType.IMAGE))
+
+    results = await library.search("ocean waves", AssetType.VIDEO)
+
+    # Stemming matches "wave"/"waves"; quality breaks near-ties
+    assert [r.asset_id for r in results] == ["2", "1"]
+    assert results[0].local_path == str(tmp_path / "2.mp4")
+    assert results[0].quality_score == 0.9
+    assert results[1].tags == ["ocean", "beach"]
+    assert await library.search("?!", AssetType.VIDEO) == []
+
+
+@pytest.mark.asyncio
+async def test_filters_and_incremental_updates(library, tmp_path):
+    path = _add(library, tmp_path, _asset("1", "Mountain lake", duration=20), category="nature", quality_score=0.8)
+    _add(library, tmp_path, _asset("2", "Mountain lake", duration=5), category="travel", quality_score=0.8)
+
+    assert [r.asset_id for r in await library.search("lake", AssetType.VIDEO, category="nature")] == ["1"]
+    assert [r.asset_id for r in await library.search("lake", AssetType.VIDEO, min_duration=10)] == ["1"]
+    assert await library.search("lake", AssetType.VIDEO, min_quality=0.9) == []
+
+    # Re-adding updates the text index in place
+    library.add(path, _asset("1", "Glacier"), category="nature")
+    assert [r.asset_id for r in await library.search("mountain", AssetType.VIDEO)] == ["2"]
+    assert [r.asset_id for r in await library.search("glacier", AssetType.VIDEO)] == ["1"]
+
+    # Deleted files and removed entries drop out
+    path.unlink()
+    assert await library.search("glacier", AssetType.VIDEO) == []
+    assert library.remove("pexels", "2")
+    assert len(library) == 1
+
+
+@pytest.mark.asyncio
+async def test_import_manifest(library, tmp_path):
+    clip = tmp_path / "pexels_meditation_42.mp4"
+    clip.write_bytes(b"video")
+    manifest = tmp_path / "asset_manifest.json"
+    manifest.write_text(json.dumps({"assets": [{
+        "url": "https://videos.pexels.com/42.mp4",
+        "source": "pexels",
+        "asset_id": "42",
+        "asset_type": "video",
+        "category": "meditation",
+        "filename": clip.name,
+        "file_path": str(clip),
+        "file_size": 5,
+        "duration": 12.4,
+        "resolution": "1920x1080",
+        "quality_score": 0.85,
+        "tags": ["calm"],
+    }]}))
+
+    assert library.import_manifest(manifest) == 1
+    result, = await library.search("meditation calm", AssetType.VIDEO)
+
+    assert (result.width, result.height, result.duration) == (1920, 1080, 12)
+    assert result.local_path == str(clip)
+    assert result.asset_id == "42"
+
+    # The provider's own result for the same clip is recognised as local
+    remote = RemoteScraper("pexels")
+    remote.search = AsyncMock(return_value=[_asset("42"), _asset("43")])
+    manager = ScraperManager()
+    manager.register_scraper(library, ScraperPriority.LOCAL)
+    manager.register_scraper(remote, ScraperPriority.HIGH)
+
+    results = await manager.search("meditation", AssetType.VIDEO, limit=3)
+
+    assert [(r.asset_id, r.local_path) for r in results] == [("42", str(clip)), ("43", None)]
+
+
+@pytest.mark.asyncio
+async def test_search_is_single_digit_milliseconds(library, tmp_path):
+    words = ["ocean", "forest", "city", "night", "rain", "desert", "snow", "river"]
+    clip = tmp_path / "clip.mp4"
+    clip.write_bytes(b"")
+    library.add_many([{
+        "asset_key": f"pexels:{i}",
+        "asset_id": str(i),
+        "source": "pexels",
+        "asset_type": "video",
+        "path": str(clip),
+        "url": f"https://pexels.example.com/{i}.mp4",
+        "title": f"{words[i % 8]} {words[(i * 3) % 8]} scene {i}",
+        "tags": words[(i * 5) % 8],
+        "quality_score": (i % 10) / 10,
+        "added_at": 0.0,
+    } for i in range(5000)])
+
+    start = time.perf_counter()
+    for _ in range(20):
+        results = await library.search("ocean rain", AssetType.VIDEO, limit=20)
+    per_search = (time.perf_counter() - start) / 20
+
+    assert len(results) == 20
+    assert per_search < 0.01, f"{per_search * 1e3:.1f} ms per search"
+
+
+@pytest.mark.asyncio
+async def test_manager_searches_local_first_and_fills_gaps(library, tmp_path):
+    _add(library, tmp_path, _asset("1", "Sunrise"))
+    _add(library, tmp_path, _asset("2", "Sunrise hills"))
+    remote = RemoteScraper()
+    manager = ScraperManager()
+    manager.register_scraper(remote, ScraperPriority.HIGH)
+    manager.register_scraper(library, ScraperPriority.LOCAL)
+
+    results = await manager.search("sunrise", AssetType.VIDEO, limit=5)
+
+    assert [r.source for r in results] == ["pexels", "pexels", "remote", "remote", "remote"]
+    assert remote.limits == [3]
+
+    # Fully covered locally: the remote API isn't asked
+    await manager.search("sunrise", AssetType.VIDEO, limit=2)
+    assert remote.limits == [3]
+
+
+@pytest.mark.asyncio
+async def test_manager_downloads_feed_the_library(library, tmp_path):
+    local = _asset("1", "Sunrise")
+    local_path = _add(library, tmp_path, local, sha256="ab" * 32)
+    fresh = _asset("9", "Sunrise over water", ["golden hour"], quality_score=0.7)
+    stored = tmp_path / "store" / "9.mp4"
+    stored.parent.mkdir()
+    stored.write_bytes(b"new")
+
+    downloader = MagicMock()
+    downloader.download_many = AsyncMock(return_value=[DownloadResult(
+        url=str(fresh.url), source="pexels", asset_id="9",
+        path=str(stored), sha256="cd" * 32, size=3,
+    )])
+    manager = ScraperManager(downloader=downloader)
+    manager.register_scraper(library, ScraperPriority.LOCAL)
+
+    local_hit, = await library.search("sunrise", AssetType.VIDEO, limit=1)
+    results = await manager.download([local_hit, fresh])
+
+    downloader.download_many.assert_awaited_once_with([fresh])
+    assert results[0].path == str(local_path) and results[0].deduplicated
+    assert results[1].path == str(stored)
+
+    found = await library.search("golden", AssetType.VIDEO)
+    assert [(r.asset_id, r.local_path, r.sha256) for r in found] == [("9", str(stored), "cd" * 32)]
@@ -0,0 +1,127 @@
+"""
+Tests for the near-duplicate perceptual hash index.
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.services.video_assembler import AssetMatcher, PerceptualHashIndex
+from src.services.video_assembler.near_duplicates import hamming, parse_hash, popcount
+
+
+def _random_hashes(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 2**64, n, dtype=np.uint64)
+
+
+def _flip(value: int, *bits: int) -> int:
+    for bit in bits:
+        value ^= 1 << int(bit)
+    return value
+
+
+def test_hash_helpers():
+    assert parse_hash("ffffffffffffffff") == 2**64 - 1
+    assert hamming("0f", 0) == 4
+    assert popcount(np.array([0, 1, 2**64 - 1], dtype=np.uint64)).tolist() == [0, 1, 64]
+    with pytest.raises(ValueError):
+        parse_hash("f" * 64)  # 256-bit imagehash
+
+
+class TestPerceptualHashIndex:
+    def test_query_matches_brute_force(self):
+        hashes = _random_hashes(5000)
+        index = PerceptualHashIndex(rebuild_threshold=1000)
+        index.add_many([str(i) for i in range(5000)], hashes.tolist())
+
+        rng = np.random.default_rng(1)
+        for i in range(0, 5000, 250):
+            query = _flip(int(hashes[i]), *rng.choice(64, 9, replace=False))
+            expected = {
+                str(j) for j, d in enumerate(popcount(hashes ^ np.uint64(query)))
+                if d <= 12
+            }
+
+            results = index.query(query, max_distance=12)
+
+            assert {key for key, _ in results} == expected
+            assert results[0] == (str(i), 9)
+            assert [d for _, d in results] == sorted(d for _, d in results)
+
+    def test_unindexed_tail_is_searched(self):
+        index = PerceptualHashIndex(rebuild_threshold=100)
+        index.add_many([str(i) for i in range(200)], _random_hashes(200).tolist())
+        index.add("new", 0xDEADBEEF)
+
+        assert index._indexed == 200
+        assert index.find_duplicate(_flip(0xDEADBEEF, 1, 50)) == ("new", 2)
+
+    def test_replace_and_remove(self):
+        index = PerceptualHashIndex(rebuild_threshold=1)
+        index.add("a", 0)
+        index.add("a", 2**64 - 1)
+
+        assert len(index) == 1
+        assert index.find_duplicate(0) is None
+        assert index.find_duplicate(2**64 - 1) == ("a", 0)
+
+        assert index.remove("a")
+        assert index.query(2**64 - 1) == []
+
+    def test_save_and_load(self, tmp_path):
+        path = tmp_path / "phash.npz"
+        index = PerceptualHashIndex(path)
+        index.add_many(["a", "b", "c"], ["00000000000000ff", "0f0f0f0f0f0f0f0f", 7])
+        index.remove("b")
+        index.save()
+
+        loaded = PerceptualHashIndex(path)
+
+        assert loaded.keys == ["a", "c"]
+        assert loaded.find_duplicate("00000000000000fe") == ("a", 1)
+
+    def test_groups_link_near_duplicates(self):
+        index = PerceptualHashIndex(max_distance=4)
+        index.add_many(["a", "b", "c", "d"], [0, 0b11, 0b1111111, 0xFFFF << 48])
+
+        groups = index.groups(["b", "a", "c", "d", "unhashed"])
+
+        assert groups["a"] == groups["b"] == "b"
+        assert groups["c"] == "c" and groups["d"] == "d"
+        assert groups["unhashed"] == "unhashed"
+
+    @pytest.mark.slow
+    def test_million_asset_queries_are_sub_millisecond(self):
+        hashes = _random_hashes(1_000_000, seed=2)
+        index = PerceptualHashIndex()
+        index.add_many([str(i) for i in range(len(hashes))], hashes.tolist())
+
+        queries = [_flip(int(h), 3, 40, 60) for h in hashes[:500]]
+        start = time.perf_counter()
+        for query in queries:
+            index.query(query)
+        per_query = (time.perf_counter() - start) / len(queries)
+
+        assert per_query < 1e-3, f"{per_query * 1e3:.2f} ms per query"
+
+
+@pytest.mark.asyncio
+async def test_matcher_treats_near_duplicates_as_repeats():
+    duplicates = PerceptualHashIndex(max_distance=6)
+    duplicates.add_many(["ocean.mp4", "ocean_reencoded.mp4"], [0xF0F0, _flip(0xF0F0, 2, 9)])
+
+    matcher = AssetMatcher(repeat_penalty=1.0, duplicates=duplicates)
+    await matcher.index_assets({
+        Path("ocean.mp4"): "ocean waves beach",
+        Path("ocean_reencoded.mp4"): "ocean waves beach",
+        Path("forest.mp4"): "forest trees",
+    })
+
+    picks = await matcher.match(
+        ["ocean waves", "ocean waves"],
+        [Path("ocean.mp4"), Path("ocean_reencoded.mp4"), Path("forest.mp4")],
+    )
+
+    assert picks[1] == Path("forest.mp4")
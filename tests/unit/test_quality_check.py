@@ -0,0 +1,132 @@
+"""
+Tests for post-render quality control.
+
+Frames and audio are synthesized in NumPy so these tests don't need ffmpeg.
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+
+import numpy as np
+import pytest
+
+from src.services.scheduler import ContentScheduler, JobStatus, ScheduleConfig
+from src.services.video_assembler import QCConfig, QCReport, QualityChecker
+from src.services.video_assembler.quality_check import analyze_audio, analyze_frames
+
+RATE = 16000
+
+
+def _frames(kinds):
+    """One 36x64 frame per kind: 'black', or an int seed for random content."""
+    rng = np.random.default_rng(0)
+    frames = []
+    for kind in kinds:
+        if kind == "black":
+            frames.append(np.full((36, 64), 8, dtype=np.uint8))
+        else:
+            frames.append(rng.integers(40, 255, (36, 64), dtype=np.uint8))
+    return np.stack(frames)
+
+
+def _tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (amplitude * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+class TestFrames:
+    def test_black_scene(self):
+        frames = _frames([0, "black", "black", 1, 2])
+        timestamps = np.array([0.0, 4.0, 6.0, 8.0, 12.0])
+
+        issues, black, frozen = analyze_frames(frames, timestamps, 16.0)
+
+        assert [i.kind for i in issues] == ["black"]
+        assert (issues[0].start, issues[0].end) == (4.0, 8.0)
+        assert black == 4.0
+        assert frozen == 0.0
+
+    def test_frozen_video(self):
+        frames = _frames([0, 1])
+        frames = np.concatenate([frames[:1]] * 6 + [frames[1:]])
+        timestamps = np.arange(7) * 5.0
+
+        issues, _, frozen = analyze_frames(frames, timestamps, 35.0)
+
+        assert [i.kind for i in issues] == ["frozen"]
+        assert frozen == 30.0
+
+    def test_short_fade_passes(self):
+        frames = _frames([0, "black", 1])
+        issues, black, _ = analyze_frames(frames, np.array([0.0, 4.0, 5.0]), 9.0)
+        assert issues == []
+        assert black == 1.0
+
+
+class TestAudio:
+    def test_dropout_detected(self):
+        samples = np.concatenate([_tone(5), np.zeros(5 * RATE, np.float32), _tone(5)])
+
+        issues, silence, clipped = analyze_audio(samples, RATE)
+
+        assert [i.kind for i in issues] == ["silence"]
+        assert issues[0].start == pytest.approx(5.0, abs=0.05)
+        assert silence == pytest.approx(5.0, abs=0.1)
+        assert clipped == 0.0
+
+    def test_clipping_detected_in_int16(self):
+        samples = np.clip(_tone(3, amplitude=2.0), -1, 1)
+        pcm = (samples * 32767).astype(np.int16)
+
+        issues, _, clipped = analyze_audio(pcm, RATE)
+
+        assert [i.kind for i in issues] == ["clipping"]
+        assert clipped > 0.1
+
+
+def test_evaluate_flags_tail_past_narration():
+    checker = QualityChecker(QCConfig(max_tail_seconds=5))
+    frames = _frames([0, 1, 2])
+
+    report = checker.evaluate(frames, np.array([0.0, 10.0, 20.0]), _tone(30), 30.0, 20.0)
+
+    assert not report.passed
+    assert [i.kind for i in report.issues] == ["tail"]
+    assert report.frames_sampled == 3
+    assert "past the narration" in report.summary()
+
+
+@pytest.mark.asyncio
+async def test_check_without_ffmpeg_is_skipped(tmp_path):
+    with patch("src.services.video_assembler.quality_check.shutil.which", return_value=None):
+        report = await QualityChecker().check(tmp_path / "video.mp4")
+
+    assert report.passed
+    assert report.skipped == "ffmpeg unavailable"
+
+
+@pytest.mark.asyncio
+async def test_scheduler_blocks_upload_on_failed_qc(tmp_path):
+    generator = AsyncMock()
+    generator.generate = AsyncMock(return_value=Mock(content="Script"))
+    assembler = AsyncMock()
+    assembler.assemble = AsyncMock(return_value=Mock(
+        output_path="video.mp4",
+        thumbnail_path=None,
+        qc=QCReport(passed=False),
+    ))
+    uploader = AsyncMock()
+    scheduler = ContentScheduler(
+        config=ScheduleConfig(jobs_storage_path=str(tmp_path), max_retries=1),
+        script_generator=generator,
+        video_assembler=assembler,
+        youtube_uploader=uploader,
+    )
+
+    job_id = await scheduler.schedule_video(topic="Trees", scheduled_at=datetime.utcnow())
+    job = await scheduler.get_job_status(job_id)
+    await scheduler._execute_job(job)
+
+    uploader.upload.assert_not_called()
+    assert job.status == JobStatus.FAILED
+    assert job.error_message.startswith("Upload blocked: QC failed")
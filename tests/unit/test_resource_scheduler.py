@@ -0,0 +1,191 @@
+"""
+Tests for resource-aware admission control.
+"""
+
+import asyncio
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.services.scheduler import (
+    AdmissionController,
+    ContentScheduler,
+    ExecutorConfig,
+    JobExecutor,
+    ResourceRequest,
+    ScheduleConfig,
+    detect_capacity,
+    estimate_stage_resources,
+)
+from src.services.scheduler.resource_scheduler import GB, cgroup_cpu_limit, cgroup_memory_limit
+
+
+def _controller(cpu=8, memory_gb=16, **kwargs):
+    return AdmissionController(
+        ResourceRequest(cpu=cpu, memory_bytes=memory_gb * GB, disk_bytes=100 * GB),
+        headroom=0,
+        **kwargs,
+    )
+
+
+class TestCapacity:
+    def test_cgroup_v2_limits(self, tmp_path):
+        group = tmp_path / "system.slice" / "worker.service"
+        group.mkdir(parents=True)
+        (group / "cpu.max").write_text("50000 100000\n")
+        (group / "memory.max").write_text(str(2 * GB))
+        proc = tmp_path / "proc_cgroup"
+        proc.write_text("0::/system.slice/worker.service\n")
+
+        capacity = detect_capacity(tmp_path, cgroup_root=tmp_path, proc_cgroup=proc)
+
+        assert capacity.cpu == 0.5
+        assert capacity.memory_bytes == 2 * GB
+        assert capacity.disk_bytes > 0
+
+    def test_cgroup_v1_and_unlimited(self, tmp_path):
+        (tmp_path / "cpu").mkdir()
+        (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1")
+        (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000")
+        (tmp_path / "memory").mkdir()
+        (tmp_path / "memory" / "memory.limit_in_bytes").write_text(str(1 << 63))
+        assert cgroup_cpu_limit(tmp_path) is None
+        assert cgroup_memory_limit(tmp_path) is None
+
+        (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("200000")
+        (tmp_path / "memory" / "memory.limit_in_bytes").write_text(str(GB))
+        assert cgroup_cpu_limit(tmp_path) == 2
+        assert cgroup_memory_limit(tmp_path) == GB
+
+    def test_estimates_scale_with_quality(self):
+        render_4k = estimate_stage_resources("video_assembly", "UHD_4K", 10)
+        render_720 = estimate_stage_resources("video_assembly", "720p", 10)
+        script = estimate_stage_resources("script_generation")
+
+        assert render_4k.cpu > render_720.cpu > script.cpu
+        assert render_4k.disk_bytes > render_720.disk_bytes
+
+
+class TestAdmission:
+    @pytest.mark.asyncio
+    async def test_packs_by_resources_and_queues_the_rest(self):
+        controller = _controller(cpu=8)
+        running, peak = 0, 0
+
+        async def render():
+            nonlocal running, peak
+            async with controller.reserve(ResourceRequest(cpu=4, memory_bytes=GB)):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(render() for _ in range(5)))
+
+        metrics = controller.get_metrics()
+        assert peak == 2
+        assert metrics["admitted_total"] == 5
+        assert metrics["running"] == metrics["queued"] == 0
+        assert metrics["reserved"]["cpu"] == 0
+
+    @pytest.mark.asyncio
+    async def test_backfill_is_bounded(self):
+        controller = _controller(cpu=8, max_bypass=1)
+        order = []
+
+        async def work(name, cpu, hold):
+            async with controller.reserve(ResourceRequest(cpu=cpu), name=name):
+                order.append(name)
+                await hold.wait()
+
+        hold_first, hold_big, hold_small = asyncio.Event(), asyncio.Event(), asyncio.Event()
+        first = asyncio.create_task(work("first", 6, hold_first))
+        await asyncio.sleep(0)
+        big = asyncio.create_task(work("big", 8, hold_big))
+        await asyncio.sleep(0)
+        small = [asyncio.create_task(work(f"small{i}", 1, hold_small)) for i in range(3)]
+        await asyncio.sleep(0.01)
+
+        # One small job backfills around the waiting big job, then the queue holds
+        assert order == ["first", "small0"]
+        assert controller.get_metrics()["queued"] == 3
+
+        hold_first.set()
+        hold_small.set()
+        await asyncio.sleep(0.01)
+        assert order[2] == "big"
+
+        hold_big.set()
+        await asyncio.gather(first, big, *small)
+        assert controller.get_metrics()["admitted_total"] == 5
+
+    @pytest.mark.asyncio
+    async def test_oversized_request_runs_alone(self):
+        controller = _controller(cpu=4)
+
+        async with controller.reserve(ResourceRequest(cpu=16)) as granted:
+            assert granted.cpu == 4
+            assert controller.get_metrics()["utilization"]["cpu"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        controller = _controller(cpu=2)
+
+        async with controller.reserve(ResourceRequest(cpu=2)):
+            waiter = asyncio.create_task(
+                controller.reserve(ResourceRequest(cpu=2)).__aenter__()
+            )
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        assert controller.get_metrics()["queued"] == 0
+        assert controller.free.cpu == 2
+
+
+@pytest.mark.asyncio
+async def test_executor_holds_declared_resources():
+    controller = _controller(cpu=4)
+    executor = JobExecutor(ExecutorConfig(max_concurrent_jobs=4), controller)
+    seen = []
+
+    async def job():
+        seen.append(controller.get_metrics()["reserved"]["cpu"])
+        await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(
+        executor.execute(job, resources=ResourceRequest(cpu=3)) for _ in range(2)
+    ))
+
+    assert seen == [3, 3]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_reserves_per_stage(tmp_path):
+    controller = _controller(cpu=8)
+    reserved = {}
+
+    async def assemble(**kwargs):
+        reserved["assembly"] = controller.get_metrics()["reserved"]["cpu"]
+        return Mock(output_path="video.mp4", thumbnail_path=None)
+
+    generator = AsyncMock()
+    generator.generate = AsyncMock(return_value=Mock(content="Script"))
+    assembler = AsyncMock()
+    assembler.assemble = assemble
+    scheduler = ContentScheduler(
+        config=ScheduleConfig(jobs_storage_path=str(tmp_path)),
+        script_generator=generator,
+        video_assembler=assembler,
+        admission_controller=controller,
+    )
+
+    job_id = await scheduler.schedule_video(topic="Trees", scheduled_at=datetime.utcnow())
+    job = await scheduler.get_job_status(job_id)
+    job.resources["video_assembly"] = ResourceRequest(cpu=6, memory_bytes=GB)
+    await scheduler._execute_job(job)
+
+    assert reserved["assembly"] == 6
+    assert scheduler.get_statistics()["resources"]["admitted_total"] == 2
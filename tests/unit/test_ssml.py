@@ -0,0 +1,106 @@
+"""
+Tests for SSML span parsing and span-by-span TTS rendering.
+"""
+
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from src.services.video_assembler import TTSConfig, TTSEngine, Voice
+from src.services.video_assembler.ssml import parse_rate, parse_ssml, plain_text
+
+
+class TestParseSSML:
+    """Tests for parse_ssml."""
+
+    def test_plain_text_is_one_span(self):
+        spans = parse_ssml("Just   some\ntext.")
+
+        assert len(spans) == 1
+        assert spans[0].text == "Just some text."
+        assert spans[0].rate == 1.0
+
+    def test_pause_becomes_silence_span(self):
+        spans = parse_ssml('Breathe in. <pause duration="2s"/> And out.')
+
+        assert [s.text for s in spans] == ["Breathe in.", "", "And out."]
+        assert spans[1].is_pause and spans[1].pause == 2.0
+
+    def test_consecutive_pauses_merge(self):
+        spans = parse_ssml('A. <pause duration="500ms"/><break time="1s"/> B.')
+
+        assert spans[1].pause == pytest.approx(1.5)
+        assert len(spans) == 3
+
+    def test_nested_rate_and_emphasis(self):
+        spans = parse_ssml(
+            'Start <rate speed="0.5">slow <emphasis>very</emphasis> part</rate> end'
+        )
+
+        assert [(s.text, s.rate) for s in spans] == [
+            ("Start", 1.0),
+            ("slow", 0.5),
+            ("very", pytest.approx(0.45)),
+            ("part", 0.5),
+            ("end", 1.0),
+        ]
+        assert spans[2].gain > 1.0
+
+    def test_unknown_tags_keep_text(self):
+        spans = parse_ssml("<speak>Hello <voice>there</voice></speak>")
+
+        assert plain_text(spans) == "Hello there"
+
+    def test_parse_rate(self):
+        assert parse_rate("80%") == 0.8
+        assert parse_rate("slow") == 0.8
+        assert parse_rate("1.25") == 1.25
+        assert parse_rate("bogus") == 1.0
+
+
+class TestSpanRendering:
+    """Tests for TTSEngine SSML rendering."""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = TTSEngine(TTSConfig(output_dir=tmp_path, sample_rate=100, enable_cache=False))
+        engine.tts_model = Mock()
+        engine.tts_model.model_name = Voice.FEMALE_CALM.value
+        engine.tts_model.tts.side_effect = lambda text: np.full(50, 0.5)
+        return engine
+
+    def test_pause_inserts_zeros_without_model_call(self, engine):
+        spans = parse_ssml('One. <pause duration="1s"/> Two.')
+
+        audio = engine._render_spans_sync(spans, speaking_rate=1.0)
+
+        assert len(audio) == 50 + 100 + 50
+        assert np.all(audio[50:150] == 0)
+        assert np.all(audio[:50] == 0.5)
+        assert engine.tts_model.tts.call_count == 2
+
+    def test_identical_spans_synthesized_once(self, engine):
+        spans = parse_ssml('Om. <pause duration="1s"/> Om.')
+
+        engine._render_spans_sync(spans, speaking_rate=1.0)
+
+        engine.tts_model.tts.assert_called_once_with(text="Om.")
+
+    def test_span_rate_is_applied(self, engine):
+        spans = parse_ssml('<rate speed="0.5">Slowly.</rate>')
+
+        with patch.object(engine, "_adjust_speaking_rate", side_effect=lambda a, r: a) as adjust:
+            engine._render_spans_sync(spans, speaking_rate=0.8)
+
+        assert adjust.call_args[0][1] == pytest.approx(0.4)
+
+    async def test_generate_renders_pauses(self, engine):
+        result = await engine.generate(
+            'Rest. <pause duration="2s"/> Continue.',
+            voice=Voice.FEMALE_CALM,
+            save_to_file=False,
+        )
+
+        assert result.text == "Rest. Continue."
+        assert result.duration == pytest.approx((50 + 200 + 50) / 100)
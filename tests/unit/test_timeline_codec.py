@@ -0,0 +1,112 @@
+"""
+Tests for the compact binary timeline format.
+"""
+
+import pytest
+
+from src.services.video_assembler import (
+    TimelineBuilder,
+    TimelineReader,
+    decode_timeline,
+    encode_timeline,
+)
+from src.services.video_assembler.timeline_builder import (
+    Asset,
+    AssetType,
+    BackgroundMusic,
+    Scene,
+    TextOverlay,
+    TextPosition,
+    Timeline,
+    TimelineConfig,
+    Transition,
+    TransitionType,
+)
+from src.services.video_assembler.timeline_codec import TimelineFormatError
+
+
+@pytest.fixture
+def timeline(tmp_path):
+    clips = []
+    for name in ("a.mp4", "b.jpg"):
+        path = tmp_path / name
+        path.write_bytes(b"")
+        clips.append(path)
+    narration = tmp_path / "narration.mp3"
+    narration.write_bytes(b"")
+    music = tmp_path / "music.mp3"
+    music.write_bytes(b"")
+
+    scenes = []
+    for i in range(25):
+        scenes.append(Scene(
+            assets=[Asset(
+                path=clips[i % 2],
+                type=AssetType.VIDEO if i % 2 == 0 else AssetType.IMAGE,
+                duration=None if i % 3 else 4.0,
+                video_end=2.5 if i % 2 == 0 else None,
+                position=(i, -i),
+            )],
+            narration_path=narration if i % 5 else None,
+            text_overlays=[TextOverlay(
+                text=f"Caption {i} — ünïcode",
+                position=TextPosition.TOP,
+                background_color=None,
+            )] if i % 4 == 0 else [],
+            start_time=i * 4.0,
+            duration=4.0,
+            transition_in=Transition(TransitionType.DISSOLVE, 1.0) if i else None,
+            script_segment=f"Segment {i}",
+            tags=["calm", f"s{i}"],
+        ))
+
+    return Timeline.from_scenes(
+        scenes,
+        TimelineConfig(resolution=(1280, 720), fps=24),
+        background_music=BackgroundMusic(path=music, duration=None, loop=False),
+    )
+
+
+def test_round_trip(timeline):
+    decoded = decode_timeline(encode_timeline(timeline))
+
+    assert decoded.model_dump() == timeline.model_dump()
+    assert decoded.scenes[1].assets[0].type is AssetType.IMAGE
+    assert decoded.scenes[0].transition_in is None
+
+
+def test_smaller_than_json(timeline):
+    assert len(encode_timeline(timeline)) < len(timeline.model_dump_json()) / 2
+
+
+def test_reader_loads_scene_ranges(timeline, tmp_path):
+    path = tmp_path / "video.timeline"
+    path.write_bytes(encode_timeline(timeline))
+
+    with TimelineReader(path) as reader:
+        assert len(reader) == 25
+        assert [s.id for s in reader.scenes(10, 13)] == [
+            s.id for s in timeline.scenes[10:13]
+        ]
+        assert reader[-1].script_segment == "Segment 24"
+
+        partial = reader.timeline(20)
+        assert len(partial.scenes) == 5
+        assert partial.scene_count == 25
+        assert partial.total_duration == timeline.total_duration
+
+
+def test_rejects_foreign_data():
+    with pytest.raises(TimelineFormatError):
+        TimelineReader(b'{"scenes": []}' * 4)
+
+
+@pytest.mark.asyncio
+async def test_builder_export_and_load(timeline, tmp_path):
+    builder = TimelineBuilder()
+    path = await builder.export_timeline(timeline, tmp_path / "out" / "video.timeline")
+
+    loaded = await builder.load_timeline(path, start=0, stop=2)
+
+    assert [s.id for s in loaded.scenes] == [s.id for s in timeline.scenes[:2]]
+    assert loaded.background_music.path == timeline.background_music.path
@@ -0,0 +1,154 @@
+"""
+Tests for script segment diffing and incremental video reassembly.
+"""
+
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.services.video_assembler import (
+    AssembledVideo,
+    BuilderTimeline,
+    SceneChange,
+    TimelineConfig,
+    TTSResult,
+    VideoAssembler,
+    VideoConfig,
+    VideoStatus,
+    diff_segments,
+)
+from src.services.video_assembler.tts_engine import AudioFormat
+from src.services.video_assembler.video_renderer import RenderResult
+
+
+def _tts_result(text: str, audio_path: Path, duration: float = 3.0) -> TTSResult:
+    return TTSResult(
+        text=text,
+        audio_path=str(audio_path),
+        duration=duration,
+        sample_rate=22050,
+        voice_used="female",
+        format=AudioFormat.WAV,
+    )
+
+
+class TestDiffSegments:
+    """Tests for diff_segments."""
+
+    def test_identical_segments(self):
+        diff = diff_segments(["A.", "B.", "C."], ["A.", "B.", "C."])
+
+        assert diff.is_identical
+        assert diff.unchanged == {0: 0, 1: 1, 2: 2}
+
+    def test_whitespace_only_edits_are_unchanged(self):
+        diff = diff_segments(["Breathe in.  Hold."], ["Breathe in.\nHold."])
+
+        assert diff.is_identical
+
+    def test_single_edit_is_changed(self):
+        diff = diff_segments(["A.", "B.", "C."], ["A.", "B edited.", "C."])
+
+        assert diff.unchanged == {0: 0, 2: 2}
+        assert diff.changed == [1]
+        assert not diff.added and not diff.removed
+
+    def test_insert_and_remove(self):
+        diff = diff_segments(["A.", "B.", "C."], ["A.", "New.", "B."])
+
+        assert diff.unchanged == {0: 0, 2: 1}
+        assert diff.added == [1]
+        assert diff.removed == [2]
+
+    def test_summary(self):
+        diff = diff_segments(["A.", "B."], ["A.", "C.", "D."])
+
+        assert diff.summary() == "1 unchanged, 1 changed, 1 added, 0 removed"
+        assert any(s.change == SceneChange.ADDED for s in diff.scenes)
+
+
+class TestIncrementalAssembly:
+    """Tests for VideoAssembler.assemble(previous=...)."""
+
+    async def test_reuses_narration_and_assets_of_unchanged_scenes(self, tmp_path):
+        segments = ["First paragraph.", "Second paragraph.", "Third paragraph."]
+        audio = [tmp_path / f"seg{i}.wav" for i in range(3)]
+        clips = [tmp_path / f"clip{i}.mp4" for i in range(3)]
+        for path in audio + clips:
+            path.write_bytes(b"data")
+
+        previous = AssembledVideo(
+            video_path=str(tmp_path / "old.mp4"),
+            script="\n\n".join(segments),
+            niche="meditation",
+            duration=9.0,
+            file_size=1,
+            resolution=(1920, 1080),
+            fps=30,
+            voice_used="female",
+            audio_duration=9.0,
+            scene_count=3,
+            asset_count=3,
+            assembly_time=1.0,
+            render_time=1.0,
+            segments=segments,
+            narration=[_tts_result(t, a) for t, a in zip(segments, audio)],
+            scene_assets=[str(c) for c in clips],
+        )
+
+        new_script = "First paragraph.\n\nSecond paragraph, edited.\n\nThird paragraph."
+        output_path = tmp_path / "new.mp4"
+        output_path.write_bytes(b"fake video")
+
+        with patch('src.services.video_assembler.video_assembler.TTSEngine') as mock_tts, \
+             patch('src.services.video_assembler.video_assembler.TimelineBuilder') as mock_builder, \
+             patch('src.services.video_assembler.video_assembler.VideoRenderer') as mock_renderer:
+
+            tts = Mock()
+            tts.generate = AsyncMock(
+                return_value=_tts_result("Second paragraph, edited.", audio[1], 4.0)
+            )
+            mock_tts.return_value = tts
+
+            timeline = BuilderTimeline.from_scenes(scenes=[], config=TimelineConfig())
+            builder = Mock()
+            builder.build = AsyncMock(return_value=timeline)
+            builder.optimize_timeline = AsyncMock(return_value=timeline)
+            mock_builder.return_value = builder
+
+            renderer = Mock()
+            renderer.render = AsyncMock(return_value=RenderResult(
+                output_path=str(output_path),
+                file_size=10,
+                duration=10.0,
+                resolution=(1920, 1080),
+                fps=30,
+                bitrate="8000k",
+                render_time=1.0,
+                scene_count=3,
+                has_audio=True,
+                has_background_music=False,
+            ))
+            mock_renderer.return_value = renderer
+
+            assembler = VideoAssembler(VideoConfig(
+                output_dir=tmp_path / "output",
+                temp_dir=tmp_path / "temp",
+            ))
+            with patch.object(assembler, '_create_thumbnail', return_value=None):
+                result = await assembler.assemble(
+                    script=new_script,
+                    niche="meditation",
+                    assets=clips,
+                    previous=previous,
+                )
+
+        assert result.status == VideoStatus.COMPLETED
+        tts.generate.assert_called_once()
+        assert tts.generate.call_args.kwargs["text"] == "Second paragraph, edited."
+
+        build_kwargs = builder.build.call_args.kwargs
+        assert build_kwargs["scene_assets"] == clips
+        assert build_kwargs["narration_durations"] == [3.0, 4.0, 3.0]
+        assert result.segments == [
+            "First paragraph.", "Second paragraph, edited.", "Third paragraph."
+        ]
@@ -0,0 +1,187 @@
+"""
+Tests for pipeline tracing.
+"""
+
+import asyncio
+import multiprocessing
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.services.scheduler import ContentScheduler, ExecutorConfig, JobExecutor, ScheduleConfig
+from src.utils.tracing import (
+    InMemorySpanExporter,
+    JsonLinesSpanExporter,
+    SpanStatus,
+    Tracer,
+    breakdown,
+    configure_tracing,
+    current_span,
+    extract,
+    get_tracer,
+    inject,
+    run_traced,
+    trace_id_from_request_id,
+    traced,
+)
+
+
+@pytest.fixture
+def exporter():
+    """Fresh in-memory exporter on the global tracer."""
+    tracer = get_tracer()
+    saved = tracer.exporters
+    memory = InMemorySpanExporter()
+    tracer.exporters = [memory]
+    yield memory
+    tracer.exporters = saved
+
+
+def _child_work(x):
+    with get_tracer().start_span("child.inner"):
+        return x * 2
+
+
+class TestSpans:
+    def test_nesting_and_status(self, exporter):
+        tracer = get_tracer()
+
+        with tracer.start_span("outer") as outer:
+            with tracer.start_span("inner") as inner:
+                assert current_span() is inner
+            with pytest.raises(ValueError):
+                with tracer.start_span("failing"):
+                    raise ValueError("boom")
+
+        spans = {s.name: s for s in exporter.spans()}
+        assert spans["inner"].parent_span_id == outer.span_id
+        assert spans["inner"].trace_id == outer.trace_id
+        assert spans["outer"].status == SpanStatus.OK
+        assert spans["failing"].status == SpanStatus.ERROR
+        assert spans["failing"].events[0]["attributes"]["exception.message"] == "boom"
+        assert current_span() is None
+
+    @pytest.mark.asyncio
+    async def test_context_follows_tasks_and_decorator(self, exporter):
+        @traced("work")
+        async def work(i):
+            await asyncio.sleep(0)
+            return current_span().parent_span_id
+
+        with get_tracer().start_span("root") as root:
+            parents = await asyncio.gather(*(work(i) for i in range(3)))
+
+        assert parents == [root.span_id] * 3
+        assert len(exporter.spans(root.trace_id)) == 4
+
+    def test_inject_extract_round_trip(self, exporter):
+        with get_tracer().start_span("root") as root:
+            carrier = inject()
+
+        context = extract(carrier)
+        assert (context.trace_id, context.span_id) == (root.trace_id, root.span_id)
+        assert extract("garbage") is None
+        assert extract(None) is None
+
+    def test_trace_id_from_request_id(self):
+        request_id = str(uuid.uuid4())
+        assert trace_id_from_request_id(request_id) == uuid.UUID(request_id).hex
+        assert len(trace_id_from_request_id("not-a-uuid")) == 32
+
+    def test_breakdown(self, exporter):
+        tracer = get_tracer()
+        with tracer.start_span("job") as job:
+            with tracer.start_span("render"):
+                pass
+
+        summary = breakdown(exporter.spans(job.trace_id))
+
+        assert summary["render"]["count"] == 1
+        assert summary["job"]["self"] <= summary["job"]["total"]
+
+
+def test_json_lines_across_processes(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracer = configure_tracing(path)
+    try:
+        with tracer.start_span("parent") as parent:
+            carrier = inject()
+            context = multiprocessing.get_context("fork")
+            with ProcessPoolExecutor(2, mp_context=context) as pool:
+                results = list(pool.map(
+                    run_traced,
+                    [carrier] * 3,
+                    ["child"] * 3,
+                    [_child_work] * 3,
+                    [1, 2, 3],
+                ))
+    finally:
+        configure_tracing()
+
+    assert results == [2, 4, 6]
+    records = JsonLinesSpanExporter(path).spans(parent.trace_id)
+    names = sorted(r["name"] for r in records)
+    assert names == ["child"] * 3 + ["child.inner"] * 3 + ["parent"]
+    assert all(
+        r["parentSpanId"] == parent.span_id for r in records if r["name"] == "child"
+    )
+
+
+@pytest.mark.asyncio
+async def test_scheduler_job_joins_request_trace(tmp_path, exporter):
+    generator = AsyncMock()
+    generator.generate = AsyncMock(return_value=Mock(content="Script"))
+    assembler = AsyncMock()
+    assembler.assemble = AsyncMock(return_value=Mock(
+        output_path="video.mp4",
+        thumbnail_path=None,
+    ))
+    scheduler = ContentScheduler(
+        config=ScheduleConfig(jobs_storage_path=str(tmp_path)),
+        script_generator=generator,
+        video_assembler=assembler,
+    )
+
+    request_id = str(uuid.uuid4())
+    with get_tracer().start_span(
+        "POST /api/schedule",
+        trace_id=trace_id_from_request_id(request_id),
+    ) as request_span:
+        job_id = await scheduler.schedule_video(topic="Trees", scheduled_at=datetime.utcnow())
+
+    # Runs later, outside the request's context
+    job = await scheduler.get_job_status(job_id)
+    await scheduler._execute_job(job)
+
+    job_span = next(s for s in exporter.spans() if s.name == "scheduler.job")
+    assert job_span.trace_id == uuid.UUID(request_id).hex
+    assert job_span.parent_span_id == request_span.span_id
+
+
+@pytest.mark.asyncio
+async def test_executor_propagates_into_threads(exporter):
+    executor = JobExecutor(ExecutorConfig(max_retries=0))
+
+    def sync_job():
+        return current_span().name
+
+    with get_tracer().start_span("batch") as batch:
+        result = await executor.execute(sync_job)
+
+    assert result.result_data == "executor.sync_job"
+    attempt = next(s for s in exporter.spans() if s.name == "executor.sync_job")
+    assert attempt.parent_span_id == batch.span_id
+    assert attempt.attributes["execution.attempt"] == 1
+
+
+def test_disabled_tracer_keeps_context():
+    memory = InMemorySpanExporter()
+    tracer = Tracer([memory], enabled=False)
+
+    with tracer.start_span("quiet") as span:
+        assert current_span() is span
+
+    assert memory.spans() == []
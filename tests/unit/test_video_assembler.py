@@ -314,6 +314,68 @@ class TestTimelineBuilder:
             assert timeline.scene_count == 2
             assert timeline.total_duration == 12.0
             assert timeline.video_assets > 0
+    
+    def test_wav_header_duration(self, tmp_path):
+        """Test WAV durations are read from the header without decoding."""
+        import wave
+        from src.services.video_assembler.media_probe import (
+            probe_audio_duration,
+            read_wav_duration,
+        )
+        
+        wav_path = tmp_path / "narration.wav"
+        with wave.open(str(wav_path), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(22050)
+            wav.writeframes(b"\x00" * 22050 * 2 * 3)  # 3 seconds
+        
+        assert read_wav_duration(wav_path) == pytest.approx(3.0)
+        assert probe_audio_duration(wav_path) == pytest.approx(3.0)
+        
+        not_wav = tmp_path / "fake.wav"
+        not_wav.write_bytes(b"not a wave file")
+        assert read_wav_duration(not_wav) is None
+    
+    async def test_build_uses_known_durations(self, tmp_path):
+        """Test known narration durations skip probing entirely."""
+        video = tmp_path / "clip.mp4"
+        video.write_bytes(b"fake video data")
+        narration = [tmp_path / "a.wav", tmp_path / "b.wav"]
+        
+        builder = TimelineBuilder()
+        
+        with patch.object(builder, '_get_audio_durations') as mock_probe:
+            timeline = await builder.build(
+                script_segments=["Segment 1", "Segment 2"],
+                narration_paths=narration,
+                assets=[video],
+                narration_durations=[4.0, 6.0],
+            )
+        
+        mock_probe.assert_not_called()
+        assert [s.duration for s in timeline.scenes] == [4.0, 6.0]
+    
+    async def test_build_probes_only_missing_durations(self, tmp_path):
+        """Test only narration files without a known duration are probed."""
+        video = tmp_path / "clip.mp4"
+        video.write_bytes(b"fake video data")
+        narration = [tmp_path / "a.wav", tmp_path / "b.wav"]
+        
+        builder = TimelineBuilder()
+        
+        with patch.object(
+            builder, '_get_audio_durations', return_value=[7.5]
+        ) as mock_probe:
+            timeline = await builder.build(
+                script_segments=["Segment 1", "Segment 2"],
+                narration_paths=narration,
+                assets=[video],
+                narration_durations=[4.0, None],
+            )
+        
+        mock_probe.assert_called_once_with([narration[1]])
+        assert [s.duration for s in timeline.scenes] == [4.0, 7.5]
 
 
 # ============================
@@ -594,9 +656,11 @@ class TestVideoAssembler:
         """Test batch video assembly with mocked components."""
         from unittest.mock import Mock, patch, AsyncMock
         
-        with patch.object(VideoAssembler, 'assemble', new_callable=AsyncMock) as mock_assemble:
+        with patch.object(VideoAssembler, '_stage_narrate', new_callable=AsyncMock), \
+             patch.object(VideoAssembler, '_stage_build_timeline', new_callable=AsyncMock), \
+             patch.object(VideoAssembler, '_stage_render', new_callable=AsyncMock) as mock_render:
             # Setup mock to return successful results
-            mock_assemble.side_effect = [
+            mock_render.side_effect = [
                 AssembledVideo(
                     id="video1",
                     video_path="output1.mp4",
@@ -645,7 +709,7 @@ class TestVideoAssembler:
             assert len(results) == 2
             assert all(isinstance(r, AssembledVideo) for r in results)
             assert all(r.status == VideoStatus.COMPLETED for r in results)
-            assert mock_assemble.call_count == 2
+            assert mock_render.call_count == 2
 
 
 # ============================
@@ -0,0 +1,134 @@
+"""
+Tests for per-job assembly workspaces.
+"""
+
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.services.video_assembler import (
+    VideoAssembler,
+    VideoConfig,
+    WorkspaceConfig,
+    WorkspaceManager,
+)
+from src.services.video_assembler.video_assembler import AssemblyJob
+from src.services.video_assembler.workspace import WorkspaceQuotaError
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return WorkspaceManager(WorkspaceConfig(root=tmp_path / "temp"))
+
+
+async def test_workspace_removed_on_success(manager):
+    async with manager.workspace("job1") as ws:
+        ws.path("render/part.mp4").write_bytes(b"data")
+        directory = ws.dir
+
+    assert not directory.exists()
+    assert manager.get("job1") is None
+
+
+async def test_workspace_removed_on_failure_and_cancel(manager):
+    with pytest.raises(RuntimeError):
+        async with manager.workspace("failing") as ws:
+            failed_dir = ws.dir
+            raise RuntimeError("render failed")
+
+    async def job():
+        async with manager.workspace("cancelled") as ws:
+            job.dir = ws.dir
+            await asyncio.sleep(10)
+
+    task = asyncio.create_task(job())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert not failed_dir.exists()
+    assert not job.dir.exists()
+
+
+async def test_promote_moves_artifact_and_holds_reference(manager, tmp_path):
+    output = tmp_path / "output" / "video.mp4"
+
+    async with manager.workspace("job1") as ws:
+        ws.path("video.mp4").write_bytes(b"video")
+        promoted = ws.promote(ws.path("video.mp4"), output)
+        assert manager.is_referenced(promoted)
+
+    assert output.read_bytes() == b"video"
+    assert not manager.is_referenced(output)
+
+
+def test_shared_artifact_refcount(manager, tmp_path):
+    narration = tmp_path / "narration.wav"
+    narration.write_bytes(b"audio")
+
+    first = manager.create("a")
+    second = manager.create("b")
+    first.retain(narration)
+    second.retain(narration)
+
+    first.close()
+    assert manager.is_referenced(narration)
+
+    second.close()
+    assert not manager.is_referenced(narration)
+
+
+def test_quota_exceeded(tmp_path):
+    manager = WorkspaceManager(
+        WorkspaceConfig(root=tmp_path / "temp", quota_bytes=8)
+    )
+    ws = manager.create("job1")
+    ws.path("small.bin").write_bytes(b"x" * 4)
+
+    ws.check_quota(4)
+    with pytest.raises(WorkspaceQuotaError):
+        ws.check_quota(5)  # About to write too much
+
+    ws.path("big.bin").write_bytes(b"x" * 16)
+    with pytest.raises(WorkspaceQuotaError):
+        ws.check_quota()
+
+    ws.close()
+
+
+async def test_assembler_checks_quota_before_render(tmp_path):
+    assembler = VideoAssembler(VideoConfig(
+        output_dir=tmp_path / "out",
+        temp_dir=tmp_path / "temp",
+        workspace_quota_bytes=1024 ** 2,
+    ))
+    assembler.video_renderer.render = AsyncMock()
+    job = AssemblyJob(script="Script", niche="meditation", assets=[])
+    job.timeline = SimpleNamespace(total_duration=60.0)
+
+    # A minute of 1080p needs far more than 1 MB of scratch space
+    with pytest.raises(WorkspaceQuotaError):
+        await assembler._stage_render(job)
+    assembler.video_renderer.render.assert_not_called()
+
+    assembler._release_job(job)
+
+
+def test_cleanup_orphans_skips_active(manager):
+    active = manager.create("active")
+    orphan = manager.config.root / "job_crashed"
+    orphan.mkdir()
+    old = time.time() - 3600
+    os.utime(orphan, (old, old))
+    os.utime(active.dir, (old, old))
+
+    assert manager.cleanup_orphans(max_age_seconds=60) == 1
+    assert not orphan.exists()
+    assert active.dir.exists()
+
+    active.close()